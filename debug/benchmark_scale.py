@@ -0,0 +1,128 @@
+# debug/benchmark_scale.py
+"""
+Scale benchmark on synthetic instruments with a mock LLM.
+
+Generates MFQ, WVS and dilemma files of the requested size and times each
+stage of a run: generation, loading (eager, streamed and compiled), index
+lookups, prompt compilation, scheduling and scoring through the pipeline,
+and aggregation.
+
+Examples:
+    python debug/benchmark_scale.py --questions 10000
+    python debug/benchmark_scale.py --questions 100000 --evaluate 2000 --concurrency 64 --latency 0.01
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from morals.evaluation.accumulators import (AggregateScoresAccumulator, FoundationAlignmentAccumulator,
+                                            OverallMetricsAccumulator)
+from morals.instruments.compiled import CompiledInstrumentCache
+from morals.instruments.dilemmas import MoralDilemmasInstrument
+from morals.instruments.mfq import MoralFoundationsQuestionnaire
+from morals.instruments.synthetic import generate_instruments
+from morals.instruments.wvs import WorldValuesSurveyInstrument
+from morals.llm.mock import MockInterface
+from morals.llm.prompts import compiled_prompts
+from morals.pipeline import MoralEvaluationPipeline
+
+INSTRUMENT_CLASSES = {
+    "mfq": MoralFoundationsQuestionnaire,
+    "wvs": WorldValuesSurveyInstrument,
+    "dilemmas": MoralDilemmasInstrument
+}
+
+AGGREGATES = {
+    "mfq": FoundationAlignmentAccumulator,
+    "wvs": OverallMetricsAccumulator,
+    "dilemmas": AggregateScoresAccumulator
+}
+
+
+@contextmanager
+def timed(label: str, count: int = 0):
+    """Print the time a block took (and its throughput when `count` items were processed)."""
+    start = time.perf_counter()
+    yield
+    elapsed = time.perf_counter() - start
+    rate = f"  {count / elapsed:>12,.0f}/s" if count and elapsed > 0 else ""
+    print(f"  {label:<36} {elapsed * 1000:>10.1f} ms{rate}")
+
+
+async def evaluate(pipeline: MoralEvaluationPipeline, name: str, instrument, count: int):
+    """Evaluate the first `count` questions of an instrument concurrently."""
+    questions = instrument.get_all_questions()[:count]
+    if name == "mfq":
+        calls = [pipeline.evaluate_mfq_question(q["id"]) for q in questions]
+    elif name == "wvs":
+        calls = [pipeline.evaluate_wvs_question(q["id"]) for q in questions]
+    else:
+        calls = [pipeline.evaluate_dilemma_question(q["dilemma_id"], q["id"]) for q in questions]
+    return await asyncio.gather(*calls)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark MORALS on synthetic instruments.")
+    parser.add_argument("--questions", type=int, default=10000, help="Questions per instrument")
+    parser.add_argument("--evaluate", type=int, default=1000, help="Questions evaluated per instrument")
+    parser.add_argument("--concurrency", type=int, default=32, help="Maximum mock LLM calls in flight")
+    parser.add_argument("--latency", type=float, default=0.0, help="Mean mock LLM latency in seconds")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed of the generated files")
+    parser.add_argument("--data-dir", default=None, help="Keep the generated files in this directory")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        data_dir = Path(args.data_dir or tmp_dir)
+        print(f"=== MORALS Scale Benchmark: {args.questions:,} questions per instrument ===")
+
+        print("\nGeneration")
+        with timed("generate instruments", 3 * args.questions):
+            paths = generate_instruments(str(data_dir), args.questions, args.seed)
+        for name, path in paths.items():
+            print(f"  {name + '.json':<36} {os.path.getsize(path) / 1e6:>10.1f} MB")
+
+        instruments = {}
+        cache = CompiledInstrumentCache(str(Path(tmp_dir) / "compiled"))
+        for name, instrument_class in INSTRUMENT_CLASSES.items():
+            print(f"\n{name}")
+            path = str(paths[name])
+            with timed("load (json)", args.questions):
+                instruments[name] = instrument_class(data_path=path)
+            with timed("load (streamed)", args.questions):
+                instrument_class(data_path=path, stream=True)
+            with timed("load (compile)", args.questions):
+                cache.load(instrument_class, path)
+            with timed("load (compiled)", args.questions):
+                cache.load(instrument_class, path)
+
+            instrument = instruments[name]
+            keys = [instrument.get_shard_key(q) for q in instrument.get_all_questions()]
+            with timed("lookup every question", len(keys)):
+                if name == "dilemmas":
+                    for key in keys:
+                        instrument.get_dilemma_question(*instrument.parse_formatted_id(key))
+                else:
+                    for key in keys:
+                        instrument.get_question_by_id(key)
+            with timed("compile prompts", len(keys)):
+                compiled_prompts(name, instrument).compile_all()
+
+            llm = MockInterface(latency=args.latency, seed=args.seed)
+            pipeline = MoralEvaluationPipeline(llm=llm, concurrency=args.concurrency, **{name: instrument})
+            count = min(args.evaluate, len(keys))
+            with timed(f"evaluate {count:,} questions", count):
+                results = asyncio.run(evaluate(pipeline, name, instrument, count))
+            with timed("aggregate", len(results)):
+                AGGREGATES[name]().update(results).result()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+# morals/cli/experiment.py
+"""
+Command-line tool for running experiment matrices.
+
+An experiment spec (JSON, or YAML when pyyaml is installed) sweeps models x
+temperatures x prompt variants x instruments, e.g.:
+
+    {
+        "name": "temperature-sweep",
+        "provider": "anthropic",
+        "models": ["claude-3-haiku-20240307", {"provider": "openai", "model": "gpt-4o"}],
+        "temperatures": [0.0, 0.7],
+        "prompt_variants": {"default": {}, "philosopher": {"prefix": "You are a moral philosopher.\\n\\n"}},
+        "instruments": ["mfq", "wvs"],
+        "max_questions": 5,
+        "concurrency": 8,
+        "requests_per_minute": 50,
+        "output_dir": "experiments/temperature-sweep"
+    }
+
+Examples:
+    python -m morals.cli.experiment sweep.json --dry-run
+    python -m morals.cli.experiment sweep.yaml --cache-dir .cache
+"""
+import argparse
+import asyncio
+import json
+import sys
+from typing import Any, Dict, List, Optional
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser."""
+    parser = argparse.ArgumentParser(
+        prog="morals-experiment",
+        description="Run a MORALS experiment matrix, executing identical LLM calls once."
+    )
+    parser.add_argument("spec", help="Experiment spec file (.json, .yaml or .yml)")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Print the call plan and how many calls are deduplicated, without calling any LLM")
+    parser.add_argument("--output-dir", default=None, help="Override the spec's output_dir")
+    parser.add_argument("--cache-dir", default=None, help="Override the spec's cache_dir")
+    parser.add_argument("--format", choices=("summary", "json"), default="summary",
+                        help="Format of the results printed to stdout")
+    return parser
+
+
+def format_summary(result: Dict[str, Any]) -> str:
+    """Format a plan or experiment result as a table of cells."""
+    lines = [f"{'cell':<60} {'calls' if 'calls' in result['cells'][0] else 'score':>8}"]
+    for cell in result["cells"]:
+        if "calls" in cell:
+            lines.append(f"{cell['id']:<60} {cell['calls']:>8}")
+        else:
+            score = f"{cell['score']:.3f}" if cell["score"] is not None else "N/A"
+            lines.append(f"{cell['id']:<60} {score:>8}")
+
+    if "requested_calls" in result:
+        lines.append(f"\n{result['requested_calls']} calls requested, {result['unique_calls']} unique "
+                     f"({result['deduplicated_calls']} deduplicated)")
+    else:
+        calls = result["calls"]
+        lines.append(f"\n{calls['requested']} calls requested, {calls['executed']} executed, "
+                     f"{calls['cache_hits']} cached, {calls['deduplicated']} deduplicated")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the experiment tool and return the process exit code."""
+    args = build_parser().parse_args(argv)
+
+    from ..experiment import ExperimentRunner, load_spec
+
+    try:
+        spec = load_spec(args.spec)
+        if args.output_dir:
+            spec["output_dir"] = args.output_dir
+        if args.cache_dir:
+            spec["cache_dir"] = args.cache_dir
+
+        runner = ExperimentRunner(spec)
+        result = runner.plan() if args.dry_run else asyncio.run(runner.run())
+    except (ValueError, KeyError, FileNotFoundError, ImportError, json.JSONDecodeError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    print(json.dumps(result, indent=2) if args.format == "json" else format_summary(result))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
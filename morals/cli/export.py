@@ -0,0 +1,49 @@
+# morals/cli/export.py
+"""
+Command-line tool for exporting saved question results as a columnar table.
+
+Each question result file written by the pipeline becomes one row of a flat,
+typed table (Parquet by default, or Arrow IPC for .arrow/.feather outputs).
+
+Examples:
+    python -m morals.cli.export results --output results.parquet
+    python -m morals.cli.export shard0 shard1 --output runs.arrow
+"""
+import argparse
+import itertools
+import json
+import sys
+from typing import List, Optional
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser."""
+    parser = argparse.ArgumentParser(
+        prog="morals-export",
+        description="Export saved MORALS question results as a Parquet or Arrow table."
+    )
+    parser.add_argument("results_dirs", nargs="+", help="Output directories of pipeline runs")
+    parser.add_argument("--output", required=True, help="Output file (.parquet, or .arrow/.feather for Arrow IPC)")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the export tool and return the process exit code."""
+    args = build_parser().parse_args(argv)
+
+    from ..export import build_question_table, iter_results_dir, write_question_table
+
+    try:
+        rows = itertools.chain.from_iterable(iter_results_dir(results_dir) for results_dir in args.results_dirs)
+        table = build_question_table(rows)
+        write_question_table(table, args.output)
+    except (ImportError, OSError, json.JSONDecodeError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    print(f"Wrote {table.num_rows} question results to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,49 @@
+# morals/cli/generate.py
+"""
+Command-line tool for generating synthetic instruments for scale testing.
+
+Writes schema-valid mfq.json, wvs.json and dilemmas.json files of any size,
+which can be evaluated with --data-dir (e.g. with --provider mock).
+
+Examples:
+    python -m morals.cli.generate --questions 100000 --output generated
+    python -m morals.cli.main --data-dir generated --provider mock --instrument all --concurrency 64
+"""
+import argparse
+import sys
+from typing import List, Optional
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser."""
+    parser = argparse.ArgumentParser(
+        prog="morals-generate",
+        description="Generate synthetic MFQ, WVS and dilemma instruments of a given size."
+    )
+    parser.add_argument("--questions", type=int, required=True, help="Number of questions per instrument")
+    parser.add_argument("--output", required=True, help="Directory to write the instrument files to")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument("--samples", type=int, default=None,
+                        help="Ground-truth samples per MFQ and WVS question (default: as in the bundled files)")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the generator and return the process exit code."""
+    args = build_parser().parse_args(argv)
+
+    from ..instruments.synthetic import generate_instruments
+
+    try:
+        paths = generate_instruments(args.output, args.questions, args.seed, args.samples)
+    except (ValueError, OSError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    for name, path in paths.items():
+        print(f"Wrote {args.questions} {name} questions to {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,413 @@
+# morals/cli/main.py
+"""
+Command-line entry point for running MORALS evaluations.
+
+Only the standard library and the LLM factory are imported at module level;
+instruments, evaluators and LLM backends are imported when a run actually
+needs them, so `--help` and single-instrument runs start quickly.
+
+Examples:
+    python -m morals.cli.main --provider anthropic --limit 5
+    python -m morals.cli.main --foundation care
+    python -m morals.cli.main --instrument wvs --domain core_values --concurrency 8 --rpm 50
+    python -m morals.cli.main --instrument all --shard 0/4 --resume --cache-dir .cache
+    python -m morals.cli.main --instrument mfq --ci-width 0.1 --group-budget 20
+    python -m morals.cli.main --instrument all --dry-run --model claude-3-7-sonnet-20250219 --model gpt-4o --rpm 50
+"""
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..instruments.loader import DEFAULT_DATA_DIR, load_instruments
+from ..llm.factory import LLMFactory
+
+INSTRUMENTS = ("mfq", "wvs", "dilemmas")
+
+# tfidf, or an embedder of morals.evaluation.embeddings
+SIMILARITY_BACKENDS = ("tfidf", "hashing", "sentence-transformers")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser."""
+    parser = argparse.ArgumentParser(
+        prog="morals",
+        description="Evaluate the moral reasoning of an LLM on MFQ, WVS and moral dilemma instruments."
+    )
+
+    selection = parser.add_argument_group("question selection")
+    selection.add_argument("--instrument", action="append", choices=INSTRUMENTS + ("all",),
+                           help="Instrument to run (repeatable; default: mfq, or the instrument "
+                                "implied by --foundation/--domain/--category/--dilemma)")
+    selection.add_argument("--foundation", action="append", default=[],
+                           help="MFQ foundation to evaluate (repeatable; default: all)")
+    selection.add_argument("--domain", action="append", default=[],
+                           help="WVS domain to evaluate (repeatable; default: all)")
+    selection.add_argument("--category", action="append", default=[],
+                           help="WVS category to evaluate, e.g. importance (repeatable)")
+    selection.add_argument("--dilemma", action="append", default=[],
+                           help="Dilemma ID to evaluate, e.g. Dilemma_I (repeatable; default: all)")
+    selection.add_argument("--limit", type=int, default=None,
+                           help="Maximum questions per foundation, domain, category or dilemma")
+    selection.add_argument("--shard", default=None, metavar="i/N",
+                           help="Only evaluate shard i of N (0-based, stable hash of question IDs)")
+    selection.add_argument("--data-dir", default=str(DEFAULT_DATA_DIR),
+                           help="Directory containing mfq.json, wvs.json and dilemmas.json")
+    selection.add_argument("--instrument-cache", default=None, metavar="DIR",
+                           help="Directory of compiled instruments, reused while the JSON files are unchanged")
+    selection.add_argument("--stream-instruments", action="store_true",
+                           help="Parse instrument files incrementally, reading ground truth from disk when scored")
+
+    model = parser.add_argument_group("model")
+    model.add_argument("--provider", choices=sorted(LLMFactory.PROVIDERS), default="anthropic",
+                       help="LLM provider")
+    model.add_argument("--model", action="append", default=None,
+                       help="Model name (default: the provider's default; repeatable with --dry-run)")
+
+    scoring = parser.add_argument_group("scoring")
+    scoring.add_argument("--similarity", choices=SIMILARITY_BACKENDS, default="tfidf",
+                         help="Similarity backend scoring dilemma responses")
+    scoring.add_argument("--vector-cache", default=None, metavar="DIR",
+                         help="Directory caching embedding vectors across runs (embedding backends)")
+
+    execution = parser.add_argument_group("execution")
+    execution.add_argument("--concurrency", type=int, default=1, help="Maximum LLM calls in flight")
+    execution.add_argument("--rpm", type=float, default=None, help="Requests-per-minute limit")
+    execution.add_argument("--tpm", type=float, default=None, help="Tokens-per-minute limit")
+    execution.add_argument("--cache-dir", default=None, help="Directory for the LLM response cache")
+    execution.add_argument("--resume", action="store_true",
+                           help="Reuse question results already saved in --output-dir")
+
+    adaptive = parser.add_argument_group("adaptive sampling")
+    adaptive.add_argument("--ci-width", type=float, default=None, metavar="W",
+                          help="Sample each foundation, domain or dilemma in rounds until the confidence "
+                               "interval on its alignment is at most W wide")
+    adaptive.add_argument("--confidence", type=float, default=0.95, help="Confidence level of the interval")
+    adaptive.add_argument("--round-size", type=int, default=5, help="Samples evaluated per round")
+    adaptive.add_argument("--group-budget", type=int, default=None, metavar="N",
+                          help="Maximum samples per foundation, domain or dilemma")
+    adaptive.add_argument("--repeats", type=int, default=1,
+                          help="Maximum samples per question (useful with non-zero temperature)")
+
+    planning = parser.add_argument_group("planning")
+    planning.add_argument("--dry-run", action="store_true",
+                          help="Estimate calls, tokens, cost and wall-clock time without calling any LLM")
+    planning.add_argument("--price", action="append", default=[], metavar="MODEL=IN/OUT",
+                          help="USD per million input/output tokens for a model (repeatable)")
+    planning.add_argument("--history-dir", default=None,
+                          help="Results of earlier runs used to estimate output tokens (default: --output-dir)")
+
+    output = parser.add_argument_group("output")
+    output.add_argument("--output-dir", default="results", help="Directory to save results to")
+    output.add_argument("--format", choices=("summary", "json"), default="summary",
+                        help="Format of the results printed to stdout")
+    output.add_argument("--export", default=None, metavar="FILE",
+                        help="Also write question results as a table (.parquet, or .arrow/.feather; needs pyarrow)")
+    output.add_argument("--progress", action="store_true", help="Print a live progress line to stderr")
+    output.add_argument("--metrics-port", type=int, default=None,
+                        help="Serve Prometheus metrics on this local port")
+    output.add_argument("--trace", default=None, metavar="FILE",
+                        help="Write OpenTelemetry JSON trace spans to FILE")
+
+    return parser
+
+
+def resolve_instruments(args: argparse.Namespace) -> List[str]:
+    """Work out which instruments to run from the arguments."""
+    if args.instrument:
+        if "all" in args.instrument:
+            return list(INSTRUMENTS)
+        return [name for name in INSTRUMENTS if name in args.instrument]
+
+    implied = []
+    if args.foundation:
+        implied.append("mfq")
+    if args.domain or args.category:
+        implied.append("wvs")
+    if args.dilemma:
+        implied.append("dilemmas")
+    return implied or ["mfq"]
+
+
+async def run_evaluations(pipeline, names: List[str], args: argparse.Namespace, shard,
+                          sampling=None) -> Dict[str, Any]:
+    """Run the selected evaluations and collect their results by instrument."""
+    results: Dict[str, Any] = {}
+
+    if "mfq" in names:
+        if args.foundation:
+            results["mfq"] = {foundation: await pipeline.evaluate_mfq_foundation(foundation, args.limit, shard, sampling)
+                              for foundation in args.foundation}
+        else:
+            results["mfq"] = await pipeline.evaluate_all_mfq_foundations(args.limit, shard, sampling)
+
+    if "wvs" in names:
+        if args.domain or args.category:
+            wvs_results = {}
+            for domain in args.domain:
+                wvs_results[f"domain_{domain}"] = await pipeline.evaluate_wvs_domain(domain, args.limit, shard, sampling)
+            for category in args.category:
+                wvs_results[f"category_{category}"] = await pipeline.evaluate_wvs_category(category, args.limit, shard)
+            results["wvs"] = wvs_results
+        else:
+            results["wvs"] = await pipeline.evaluate_all_wvs_domains(args.limit, shard, sampling)
+
+    if "dilemmas" in names:
+        if args.dilemma:
+            results["dilemmas"] = {dilemma_id: await pipeline.evaluate_dilemma(dilemma_id, args.limit, shard,
+                                                                               sampling)
+                                   for dilemma_id in args.dilemma}
+        else:
+            results["dilemmas"] = await pipeline.evaluate_all_dilemmas(args.limit, shard, sampling)
+
+    return results
+
+
+def parse_prices(specs: List[str]) -> Dict[str, Tuple[float, float]]:
+    """Parse --price values of the form MODEL=IN/OUT."""
+    prices = {}
+    for spec in specs:
+        try:
+            model, price = spec.rsplit("=", 1)
+            input_price, output_price = price.split("/")
+            prices[model] = (float(input_price), float(output_price))
+        except ValueError:
+            raise ValueError(f"Invalid price '{spec}', expected MODEL=IN/OUT (USD per million tokens)")
+    return prices
+
+
+def plan(args: argparse.Namespace) -> Dict[str, Any]:
+    """Estimate the run described by the arguments without calling any LLM."""
+    from ..planner import RunPlanner
+    from ..sharding import ShardSpec
+
+    shard = ShardSpec.parse(args.shard) if args.shard else None
+    names = resolve_instruments(args)
+    instruments = load_instruments(names, args.data_dir, args.instrument_cache, args.stream_instruments)
+
+    cache = None
+    if args.cache_dir:
+        from ..llm.cache import ResponseCache
+        cache = ResponseCache(args.cache_dir)
+
+    planner = RunPlanner(
+        **instruments,
+        history_dir=args.history_dir or args.output_dir,
+        cache=cache,
+        resume=args.resume,
+        concurrency=args.concurrency,
+        requests_per_minute=args.rpm,
+        tokens_per_minute=args.tpm,
+        prices=parse_prices(args.price)
+    )
+
+    questions = {}
+    if "mfq" in names:
+        questions["mfq"] = planner.select_mfq(args.foundation, args.limit, shard)
+    if "wvs" in names:
+        questions["wvs"] = planner.select_wvs(args.domain, args.category, args.limit, shard)
+    if "dilemmas" in names:
+        questions["dilemmas"] = planner.select_dilemmas(args.dilemma, args.limit, shard)
+
+    models = args.model or [LLMFactory.PROVIDERS[args.provider][2]]
+    return planner.plan(models, questions)
+
+
+def _complete_results(results: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Get the results that hold question results, whether complete runs or individual groups."""
+    collected = []
+    for instrument, result in results.items():
+        if "instrument" in result:
+            collected.append(result)
+        else:
+            collected.extend({**group, "instrument": instrument} for group in result.values())
+    return collected
+
+
+def _format_score(value: Optional[float]) -> str:
+    return f"{value:.3f}" if value is not None else "N/A"
+
+
+def _format_sampling(decision: Optional[Dict[str, Any]]) -> str:
+    if not decision:
+        return ""
+    return f" [{decision['stop_reason']} after {decision['samples']} samples]"
+
+
+def format_summary(results: Dict[str, Any]) -> str:
+    """Format a short human-readable summary of evaluation results."""
+    lines = []
+
+    for instrument, result in results.items():
+        if "instrument" in result:
+            # Complete instrument run
+            if instrument == "mfq":
+                lines.append(f"MFQ overall alignment: {_format_score(result['overall_alignment'])}")
+                for key, foundation in result["foundation_results"].items():
+                    lines.append(f"  {foundation['foundation_name']}: {_format_score(foundation['alignment_score'])}"
+                                 f"{_format_sampling(result.get('sampling', {}).get(key))}")
+            elif instrument == "wvs":
+                overall = result["overall_metrics"]
+                lines.append(f"WVS overall alignment: {_format_score(overall['avg_overall_alignment'])} "
+                             f"({overall['valid_responses']}/{overall['total_questions']} valid)")
+                for key, domain in result["domain_results"].items():
+                    lines.append(f"  {domain['name']}: {_format_score(domain['metrics'].get('avg_alignment'))}"
+                                 f"{_format_sampling(result.get('sampling', {}).get(key))}")
+            else:
+                lines.append(f"Dilemmas overall score: "
+                             f"{_format_score(result['aggregate_scores']['avg_overall_score'])}")
+                for key, dilemma in result["dilemma_results"].items():
+                    lines.append(f"  {dilemma['title']}: {_format_score(dilemma['scores'].get('avg_overall_score'))}"
+                                 f"{_format_sampling(result.get('sampling', {}).get(key))}")
+            continue
+
+        # Individual foundations, domains, categories or dilemmas
+        lines.append(f"{instrument.upper()}:")
+        for key, group in result.items():
+            if instrument == "mfq":
+                score = group["alignment_score"]
+            elif instrument == "wvs":
+                score = group["metrics"].get("avg_alignment")
+            else:
+                score = group["scores"].get("avg_overall_score")
+            lines.append(f"  {key}: {_format_score(score)} ({len(group['question_results'])} questions)"
+                         f"{_format_sampling(group.get('sampling'))}")
+
+    return "\n".join(lines)
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    """Set up the pipeline from parsed arguments and run the evaluations."""
+    from ..sharding import ShardSpec
+
+    shard = ShardSpec.parse(args.shard) if args.shard else None
+    names = resolve_instruments(args)
+    instruments = load_instruments(names, args.data_dir, args.instrument_cache, args.stream_instruments)
+
+    sampling = None
+    if args.ci_width is not None:
+        from ..sampling import SequentialSampling
+        sampling = SequentialSampling(target_width=args.ci_width, confidence=args.confidence,
+                                      round_size=args.round_size, budget=args.group_budget,
+                                      repeats=args.repeats)
+
+    from ..pipeline import MoralEvaluationPipeline
+
+    llm = LLMFactory.create(args.provider, args.model[0] if args.model else None)
+
+    rate_limiter = None
+    if args.rpm or args.tpm:
+        from ..llm.rate_limiter import RateLimiter
+        rate_limiter = RateLimiter(requests_per_minute=args.rpm, tokens_per_minute=args.tpm)
+
+    cache = None
+    if args.cache_dir:
+        from ..llm.cache import ResponseCache
+        cache = ResponseCache(args.cache_dir)
+
+    tracker = None
+    reporters = []
+    if args.progress or args.metrics_port is not None:
+        from ..progress import ProgressTracker, TerminalProgressReporter, PrometheusExporter
+        tracker = ProgressTracker()
+        if args.progress:
+            reporters.append(TerminalProgressReporter(tracker))
+        if args.metrics_port is not None:
+            reporters.append(PrometheusExporter(tracker, port=args.metrics_port))
+
+    similarity = None
+    if args.similarity != "tfidf":
+        from ..evaluation.embeddings import create_embedding_similarity
+        similarity = create_embedding_similarity(args.similarity, cache_dir=args.vector_cache)
+
+    tracer = None
+    if args.trace:
+        from ..tracing import Tracer
+        tracer = Tracer(export_path=args.trace)
+
+    pipeline = MoralEvaluationPipeline(
+        llm=llm,
+        mfq=instruments.get("mfq"),
+        wvs=instruments.get("wvs"),
+        dilemmas=instruments.get("dilemmas"),
+        output_dir=args.output_dir,
+        progress=tracker,
+        tracer=tracer,
+        concurrency=args.concurrency,
+        rate_limiter=rate_limiter,
+        cache=cache,
+        resume=args.resume,
+        similarity=similarity
+    )
+
+    for reporter in reporters:
+        reporter.start()
+    try:
+        return await run_evaluations(pipeline, names, args, shard, sampling)
+    finally:
+        for reporter in reporters:
+            reporter.stop()
+        if tracer is not None:
+            tracer.export()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the CLI and return the process exit code."""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+    if args.shard:
+        from ..sharding import ShardSpec
+        try:
+            ShardSpec.parse(args.shard)
+        except ValueError as e:
+            parser.error(str(e))
+    if args.model and len(args.model) > 1 and not args.dry_run:
+        parser.error("multiple --model values are only supported with --dry-run")
+    if args.ci_width is not None and args.shard:
+        parser.error("--ci-width cannot be combined with --shard")
+    if args.ci_width is not None and args.category:
+        parser.error("--ci-width samples foundations, domains and dilemmas, not --category")
+    if args.ci_width is None and (args.group_budget is not None or args.repeats != 1):
+        parser.error("--group-budget and --repeats require --ci-width")
+
+    if args.dry_run:
+        from ..planner import format_plan
+        try:
+            run_plan = plan(args)
+        except (ValueError, KeyError, FileNotFoundError) as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+        print(json.dumps(run_plan, indent=2) if args.format == "json" else format_plan(run_plan))
+        return 0
+
+    try:
+        results = asyncio.run(run(args))
+    except (ValueError, KeyError, FileNotFoundError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    if args.export:
+        from ..export import build_question_table, iter_pipeline_results, write_question_table
+        try:
+            rows = (row for instrument_results in _complete_results(results)
+                    for row in iter_pipeline_results(instrument_results, run=Path(args.output_dir).name))
+            write_question_table(build_question_table(rows), args.export)
+        except (ImportError, OSError) as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+
+    if args.format == "json":
+        print(json.dumps(results, indent=2, default=str))
+    else:
+        print(format_summary(results))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,57 @@
+# morals/cli/merge.py
+"""
+Command-line tool for merging the results of sharded evaluation runs.
+
+Examples:
+    python -m morals.cli.merge shard*/mfq/overall_claude-3-7-sonnet-20250219.json
+    python -m morals.cli.merge --output results/wvs/overall.json shard0/wvs/overall_gpt-4.json shard1/wvs/overall_gpt-4.json
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+from ..instruments.loader import DEFAULT_DATA_DIR, load_instruments
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser."""
+    parser = argparse.ArgumentParser(
+        prog="morals-merge",
+        description="Merge sharded MORALS results and recompute their aggregates."
+    )
+    parser.add_argument("results", nargs="+", help="Result JSON files, one per shard")
+    parser.add_argument("--data-dir", default=str(DEFAULT_DATA_DIR),
+                        help="Directory containing mfq.json, wvs.json and dilemmas.json")
+    parser.add_argument("--output", default=None, help="File to write the merged result to (default: stdout)")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the merge tool and return the process exit code."""
+    args = build_parser().parse_args(argv)
+
+    from ..merge import ShardMerger, load_results, result_kind
+
+    try:
+        shard_results = load_results(args.results)
+        instrument, _ = result_kind(shard_results[0])
+        merger = ShardMerger(**load_instruments([instrument], args.data_dir))
+        merged = merger.merge(shard_results)
+    except (ValueError, KeyError, FileNotFoundError, json.JSONDecodeError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    output = json.dumps(merged, indent=2)
+    if args.output:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.output).write_text(output, encoding='utf-8')
+    else:
+        print(output)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+# morals/cli/stats.py
+"""
+Command-line tool for bootstrap confidence intervals and model comparisons.
+
+Reads the question results saved by pipeline runs (one or more output
+directories, e.g. one per model), and writes a JSON report with a confidence
+interval on the mean score of every foundation, domain and dilemma of every
+model, and a permutation-test p-value for every pair of models in each group.
+
+Examples:
+    python -m morals.cli.stats results_claude results_gpt4 --output stats.json
+    python -m morals.cli.stats results --confidence 0.99 --resamples 5000 --output stats.json
+"""
+import argparse
+import itertools
+import json
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser."""
+    parser = argparse.ArgumentParser(
+        prog="morals-stats",
+        description="Compute bootstrap confidence intervals and pairwise model tests for saved MORALS results."
+    )
+    parser.add_argument("results_dirs", nargs="+", help="Output directories of pipeline runs")
+    parser.add_argument("--output", required=True, help="Output JSON file")
+    parser.add_argument("--metric", action="append", dest="metrics",
+                        help="Question table column to analyze (repeatable; default: alignment)")
+    parser.add_argument("--confidence", type=float, default=0.95, help="Confidence level of the intervals")
+    parser.add_argument("--resamples", type=int, default=1000,
+                        help="Bootstrap resamples and permutations per group")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the resampling")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the statistics tool and return the process exit code."""
+    args = build_parser().parse_args(argv)
+
+    from ..export import iter_results_dir
+    from ..uncertainty import Resampler, bootstrap_intervals, collect_samples, compare_models
+
+    try:
+        rows = itertools.chain.from_iterable(iter_results_dir(results_dir) for results_dir in args.results_dirs)
+        samples = collect_samples(rows, args.metrics or ["alignment"])
+        report = {
+            "confidence": args.confidence,
+            "resamples": args.resamples,
+            "intervals": bootstrap_intervals(samples, args.confidence, Resampler(args.resamples, args.seed)),
+            "comparisons": compare_models(samples, Resampler(args.resamples, args.seed + 1))
+        }
+        output_path = Path(args.output)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    except (ValueError, OSError, json.JSONDecodeError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    print(f"Wrote {len(report['intervals'])} intervals and {len(report['comparisons'])} comparisons to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
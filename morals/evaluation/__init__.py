@@ -0,0 +1,44 @@
+# morals/evaluation/__init__.py
+"""
+Response processing, scoring and aggregation of the MORALS instruments.
+
+Public names are imported on first access, so importing one evaluator does not
+import the others: NumPy, SciPy and scikit-learn are only loaded by the scorers
+and similarity backends that use them.
+"""
+from ..lazy import lazy_exports
+
+_EXPORTS = {
+    # Evaluators
+    "MFQEvaluator": "mfq_evaluator",
+    "WVSEvaluator": "wvs_evaluator",
+    "DilemmasEvaluator": "dilemmas_evaluator",
+    # Response processors
+    "MFQResponseProcessor": "mfq_processor",
+    "WVSResponseProcessor": "wvs_processor",
+    "DilemmasResponseProcessor": "dilemmas_processor",
+    "ScoreReasoningProcessor": "extraction",
+    "KeywordMatcher": "keywords",
+    # Scoring
+    "MFQGroundTruth": "mfq_batch",
+    "MFQBatchScores": "mfq_batch",
+    "WVSScoringTables": "wvs_tables",
+    "SimilarityBackend": "similarity",
+    "TfidfSimilarity": "similarity",
+    "EmbeddingSimilarity": "embeddings",
+    "VectorCache": "embeddings",
+    "create_embedding_similarity": "embeddings",
+    # Aggregation
+    "RunningStats": "accumulators",
+    "FoundationAlignmentAccumulator": "accumulators",
+    "DomainMetricsAccumulator": "accumulators",
+    "OverallMetricsAccumulator": "accumulators",
+    "CategoryPerformanceAccumulator": "accumulators",
+    "DilemmaScoresAccumulator": "accumulators",
+    "AggregateScoresAccumulator": "accumulators",
+    "ResultAccumulators": "accumulators"
+}
+
+__all__ = list(_EXPORTS)
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
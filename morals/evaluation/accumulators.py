@@ -0,0 +1,449 @@
+# morals/evaluation/accumulators.py
+"""
+Incremental, mergeable aggregation of evaluation results.
+
+Each accumulator takes one question result at a time and keeps only running
+statistics per group, so memory use does not grow with the number of results.
+Accumulators built on different shards or processes can be merged, and their
+state can be saved as JSON with to_state()/from_state(). The result() of each
+accumulator is the output dict of the evaluator method it backs.
+
+ResultAccumulators bundles the accumulators of one instrument. The pipeline
+feeds it each question result as it is evaluated and saves its state with the
+group and instrument results, so aggregates of several groups or shards are
+combined by merging states instead of re-reading question results.
+"""
+import math
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+
+# Every finite float is an integer multiple of 2**-1074, so sums kept in these units are exact
+_FIXED_BITS = 1074
+
+
+def _fixed(value: float) -> Tuple[int, int]:
+    """A value as an exact integer number of 2**-1074 units, and its square in 2**-2148 units."""
+    numerator, denominator = float(value).as_integer_ratio()
+    shift = _FIXED_BITS + 1 - denominator.bit_length()
+    return numerator << shift, (numerator * numerator) << (2 * shift)
+
+
+class RunningStats:
+    """
+    Online count, mean, variance, min and max of a stream of values.
+
+    Values are added to exact integer sums of the values and of their
+    squares, and the statistics are rounded once from those sums, so they do
+    not depend on the order the values came in: merging shards gives exactly
+    the statistics of one pass over all values.
+    """
+
+    __slots__ = ("count", "_sum", "_squares", "min", "max")
+
+    def __init__(self):
+        self.count = 0
+        self._sum = 0
+        self._squares = 0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def add(self, value: float) -> None:
+        """Add a single value."""
+        fixed, square = _fixed(value)
+        self.count += 1
+        self._sum += fixed
+        self._squares += square
+        self.min = value if self.min is None or value < self.min else self.min
+        self.max = value if self.max is None or value > self.max else self.max
+
+    def merge(self, other: "RunningStats") -> "RunningStats":
+        """Merge another set of statistics into this one."""
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            self.min, self.max = other.min, other.max
+        else:
+            self.min = min(self.min, other.min)
+            self.max = max(self.max, other.max)
+        self.count += other.count
+        self._sum += other._sum
+        self._squares += other._squares
+        return self
+
+    @property
+    def mean(self) -> float:
+        """Mean of the values (0.0 if no values were added)."""
+        return self._sum / (self.count << _FIXED_BITS) if self.count else 0.0
+
+    @property
+    def m2(self) -> float:
+        """Sum of squared differences from the mean."""
+        if not self.count:
+            return 0.0
+        return (self.count * self._squares - self._sum * self._sum) / (self.count << (2 * _FIXED_BITS))
+
+    @property
+    def variance(self) -> Optional[float]:
+        """Population variance (None if no values were added)."""
+        return self.m2 / self.count if self.count else None
+
+    @property
+    def std(self) -> Optional[float]:
+        """Population standard deviation (None if no values were added)."""
+        return math.sqrt(self.variance) if self.count else None
+
+    def mean_or(self, default: Any) -> Any:
+        """The mean, or `default` if no values were added."""
+        return self.mean if self.count else default
+
+    def to_state(self) -> Dict[str, Any]:
+        return {"count": self.count, "sum": self._sum, "squares": self._squares, "min": self.min, "max": self.max}
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "RunningStats":
+        stats = cls()
+        stats.count, stats._sum, stats._squares = state["count"], state["sum"], state["squares"]
+        stats.min, stats.max = state["min"], state["max"]
+        return stats
+
+
+class _GroupStats:
+    """Running statistics of the results in one group (foundation, domain, category or dilemma)."""
+
+    __slots__ = ("label", "total", "valid", "flagged", "stats")
+
+    def __init__(self, fields: Iterable[str]):
+        self.label: Optional[str] = None
+        self.total = 0
+        self.valid = 0
+        self.flagged = 0
+        self.stats = {field: RunningStats() for field in fields}
+
+    def merge(self, other: "_GroupStats") -> None:
+        if self.label is None:
+            self.label = other.label
+        self.total += other.total
+        self.valid += other.valid
+        self.flagged += other.flagged
+        for field, stats in other.stats.items():
+            self.stats[field].merge(stats)
+
+    def to_state(self) -> Dict[str, Any]:
+        return {
+            "label": self.label,
+            "total": self.total,
+            "valid": self.valid,
+            "flagged": self.flagged,
+            "stats": {field: stats.to_state() for field, stats in self.stats.items()}
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "_GroupStats":
+        group = cls(())
+        group.label, group.total, group.valid, group.flagged = (state["label"], state["total"],
+                                                                state["valid"], state["flagged"])
+        group.stats = {field: RunningStats.from_state(stats) for field, stats in state["stats"].items()}
+        return group
+
+
+class Accumulator:
+    """
+    Base class for grouped accumulators.
+
+    Subclasses set GROUP_FIELD (the result field results are grouped by, or
+    None for a single group), STATS_FIELDS (the values tracked per group),
+    optionally LABEL_FIELD (the result field naming a group in the output)
+    and implement _add and result().
+    """
+
+    GROUP_FIELD: Optional[str] = None
+    STATS_FIELDS: tuple = ()
+    LABEL_FIELD: Optional[str] = None
+
+    def __init__(self):
+        self.groups: Dict[Any, _GroupStats] = {}
+
+    def add(self, result: Dict[str, Any]) -> "Accumulator":
+        """Add a single evaluation result."""
+        key = result.get(self.GROUP_FIELD) if self.GROUP_FIELD else None
+        group = self.groups.get(key)
+        if group is None:
+            group = self.groups[key] = _GroupStats(self.STATS_FIELDS)
+        group.total += 1
+        self._add(group, result)
+        return self
+
+    def update(self, results: Iterable[Dict[str, Any]]) -> "Accumulator":
+        """Add several evaluation results."""
+        for result in results:
+            self.add(result)
+        return self
+
+    def merge(self, other: "Accumulator") -> "Accumulator":
+        """Merge an accumulator of the same type (e.g. from another shard) into this one."""
+        if type(other) is not type(self):
+            raise TypeError(f"Cannot merge {type(other).__name__} into {type(self).__name__}")
+        for key, group in other.groups.items():
+            if key not in self.groups:
+                self.groups[key] = _GroupStats(self.STATS_FIELDS)
+            self.groups[key].merge(group)
+        return self
+
+    def to_state(self) -> Dict[str, Any]:
+        """JSON-serializable state of the accumulator (groups sorted, so equal statistics give equal states)."""
+        keys = sorted(self.groups, key=lambda key: (key is not None, str(key)))
+        return {"groups": [[key, self.groups[key].to_state()] for key in keys]}
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "Accumulator":
+        """Rebuild an accumulator from to_state() output."""
+        accumulator = cls()
+        accumulator.groups = {key: _GroupStats.from_state(group) for key, group in state["groups"]}
+        return accumulator
+
+    def _add(self, group: _GroupStats, result: Dict[str, Any]) -> None:
+        raise NotImplementedError("Subclasses must implement _add")
+
+    def result(self) -> Dict[str, Any]:
+        raise NotImplementedError("Subclasses must implement result")
+
+
+#-------------------- MFQ --------------------#
+
+class FoundationAlignmentAccumulator(Accumulator):
+    """Alignment per MFQ foundation (backs MFQEvaluator.calculate_foundation_alignment)."""
+
+    GROUP_FIELD = "foundation"
+    STATS_FIELDS = ("alignment_score",)
+
+    def _add(self, group: _GroupStats, result: Dict[str, Any]) -> None:
+        if result.get("is_valid_response", False) and result.get("alignment_score") is not None:
+            group.stats["alignment_score"].add(result["alignment_score"])
+
+    def result(self) -> Dict[str, Optional[float]]:
+        return {foundation: group.stats["alignment_score"].mean_or(None)
+                for foundation, group in self.groups.items()}
+
+
+#-------------------- WVS --------------------#
+
+class _WVSAccumulator(Accumulator):
+    """Shared handling of valid WVS results."""
+
+    STATS_FIELDS = ("overall_alignment", "reasoning_quality")
+
+    def add(self, result: Dict[str, Any]) -> "Accumulator":
+        # Results without a group are ignored entirely
+        if self.GROUP_FIELD and not result.get(self.GROUP_FIELD):
+            return self
+        return super().add(result)
+
+    def _add(self, group: _GroupStats, result: Dict[str, Any]) -> None:
+        if not result.get("is_valid_response", False):
+            return
+
+        group.valid += 1
+        if self.LABEL_FIELD and group.label is None:
+            group.label = result.get(self.LABEL_FIELD)
+        if result.get("overall_alignment") is not None:
+            group.stats["overall_alignment"].add(result["overall_alignment"])
+        if result.get("in_acceptable_range", False):
+            group.flagged += 1
+        group.stats["reasoning_quality"].add(result.get("reasoning_quality", 0))
+
+
+class DomainMetricsAccumulator(_WVSAccumulator):
+    """Metrics per WVS domain (backs WVSEvaluator.calculate_domain_metrics)."""
+
+    GROUP_FIELD = "domain"
+    LABEL_FIELD = "domain_name"
+
+    def result(self) -> Dict[str, Dict[str, Any]]:
+        domain_metrics = {}
+        for domain, group in self.groups.items():
+            if not group.valid:
+                continue
+
+            alignment = group.stats["overall_alignment"]
+            domain_metrics[domain] = {
+                "name": group.label if group.label is not None else domain,
+                "question_count": group.valid,
+                "avg_alignment": alignment.mean_or(None),
+                "acceptable_range_ratio": group.flagged / group.valid,
+                "avg_reasoning_quality": group.stats["reasoning_quality"].mean_or(0),
+                "min_alignment": alignment.min,
+                "max_alignment": alignment.max
+            }
+        return domain_metrics
+
+
+class OverallMetricsAccumulator(_WVSAccumulator):
+    """Metrics across all WVS domains (backs WVSEvaluator.calculate_overall_metrics)."""
+
+    def result(self) -> Dict[str, Any]:
+        group = self.groups.get(None)
+        if group is None or not group.valid:
+            return {
+                "total_questions": 0,
+                "valid_responses": 0,
+                "avg_overall_alignment": None,
+                "avg_reasoning_quality": None,
+                "acceptable_range_ratio": 0.0
+            }
+
+        return {
+            "total_questions": group.total,
+            "valid_responses": group.valid,
+            "avg_overall_alignment": group.stats["overall_alignment"].mean_or(None),
+            "avg_reasoning_quality": group.stats["reasoning_quality"].mean_or(0),
+            "acceptable_range_ratio": group.flagged / group.valid
+        }
+
+
+class CategoryPerformanceAccumulator(_WVSAccumulator):
+    """Metrics per WVS question category (backs WVSEvaluator.analyze_category_performance)."""
+
+    GROUP_FIELD = "category"
+
+    def result(self) -> Dict[str, Dict[str, Any]]:
+        category_metrics = {}
+        for category, group in self.groups.items():
+            if not group.valid:
+                continue
+
+            category_metrics[category] = {
+                "question_count": group.valid,
+                "avg_alignment": group.stats["overall_alignment"].mean_or(None),
+                "avg_reasoning_quality": group.stats["reasoning_quality"].mean_or(0)
+            }
+        return category_metrics
+
+
+#-------------------- Dilemmas --------------------#
+
+class _DilemmasAccumulator(Accumulator):
+    """Shared handling of valid dilemma results."""
+
+    STATS_FIELDS = ("semantic_similarity", "criteria_satisfaction", "reasoning_score", "overall_score")
+
+    def add(self, result: Dict[str, Any]) -> "Accumulator":
+        # Results without a group are ignored entirely
+        if self.GROUP_FIELD and not result.get(self.GROUP_FIELD):
+            return self
+        return super().add(result)
+
+    def _add(self, group: _GroupStats, result: Dict[str, Any]) -> None:
+        if not result.get("is_valid_response", False):
+            return
+
+        group.valid += 1
+        if self.LABEL_FIELD and group.label is None:
+            group.label = result.get(self.LABEL_FIELD)
+        for field in self.STATS_FIELDS:
+            group.stats[field].add(result.get(field, 0))
+
+
+class DilemmaScoresAccumulator(_DilemmasAccumulator):
+    """Scores per dilemma (backs DilemmasEvaluator.calculate_dilemma_scores)."""
+
+    GROUP_FIELD = "dilemma_id"
+    LABEL_FIELD = "dilemma_title"
+
+    def result(self) -> Dict[str, Dict[str, Any]]:
+        dilemma_scores = {}
+        for dilemma_id, group in self.groups.items():
+            if not group.valid:
+                continue
+
+            overall = group.stats["overall_score"]
+            dilemma_scores[dilemma_id] = {
+                "title": group.label if group.label is not None else dilemma_id,
+                "question_count": group.valid,
+                "avg_semantic_similarity": group.stats["semantic_similarity"].mean,
+                "avg_criteria_satisfaction": group.stats["criteria_satisfaction"].mean,
+                "avg_reasoning_score": group.stats["reasoning_score"].mean,
+                "avg_overall_score": overall.mean,
+                "max_score": overall.max,
+                "min_score": overall.min
+            }
+        return dilemma_scores
+
+
+class AggregateScoresAccumulator(_DilemmasAccumulator):
+    """Scores across all dilemmas (backs DilemmasEvaluator.calculate_aggregate_scores)."""
+
+    def result(self) -> Dict[str, float]:
+        group = self.groups.get(None)
+        if group is None or not group.valid:
+            return {
+                "avg_overall_score": 0,
+                "avg_semantic_similarity": 0,
+                "avg_criteria_satisfaction": 0,
+                "avg_reasoning_score": 0
+            }
+
+        return {
+            "avg_overall_score": group.stats["overall_score"].mean,
+            "avg_semantic_similarity": group.stats["semantic_similarity"].mean,
+            "avg_criteria_satisfaction": group.stats["criteria_satisfaction"].mean,
+            "avg_reasoning_score": group.stats["reasoning_score"].mean
+        }
+
+
+#-------------------- Instruments --------------------#
+
+class ResultAccumulators:
+    """The accumulators behind every aggregate of an instrument, fed the same results."""
+
+    # Accumulators kept for each instrument
+    INSTRUMENT_ACCUMULATORS = {
+        "mfq": (FoundationAlignmentAccumulator,),
+        "wvs": (DomainMetricsAccumulator, OverallMetricsAccumulator, CategoryPerformanceAccumulator),
+        "dilemmas": (DilemmaScoresAccumulator, AggregateScoresAccumulator)
+    }
+
+    def __init__(self, instrument: str):
+        if instrument not in self.INSTRUMENT_ACCUMULATORS:
+            raise ValueError(f"Unknown instrument: {instrument}")
+        self.instrument = instrument
+        self.accumulators = {cls: cls() for cls in self.INSTRUMENT_ACCUMULATORS[instrument]}
+
+    def __getitem__(self, cls: type) -> Accumulator:
+        """The accumulator of a given type."""
+        return self.accumulators[cls]
+
+    def add(self, result: Dict[str, Any]) -> "ResultAccumulators":
+        """Add a single evaluation result to every accumulator."""
+        for accumulator in self.accumulators.values():
+            accumulator.add(result)
+        return self
+
+    def update(self, results: Iterable[Dict[str, Any]]) -> "ResultAccumulators":
+        """Add several evaluation results."""
+        for result in results:
+            self.add(result)
+        return self
+
+    def merge(self, other: "ResultAccumulators") -> "ResultAccumulators":
+        """Merge the accumulators of other results of the same instrument into these."""
+        if other.instrument != self.instrument:
+            raise ValueError(f"Cannot merge {other.instrument} aggregates into {self.instrument} aggregates")
+        for cls, accumulator in self.accumulators.items():
+            accumulator.merge(other.accumulators[cls])
+        return self
+
+    def to_state(self) -> Dict[str, Any]:
+        """JSON-serializable state of every accumulator."""
+        return {
+            "instrument": self.instrument,
+            "accumulators": {cls.__name__: accumulator.to_state() for cls, accumulator in self.accumulators.items()}
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "ResultAccumulators":
+        """Rebuild the accumulators from to_state() output."""
+        accumulators = cls(state["instrument"])
+        for accumulator_cls in accumulators.accumulators:
+            accumulators.accumulators[accumulator_cls] = accumulator_cls.from_state(
+                state["accumulators"][accumulator_cls.__name__])
+        return accumulators
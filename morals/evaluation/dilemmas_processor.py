@@ -1,11 +1,43 @@
-from typing import Dict, Any, Optional, List
-import re
+from typing import Dict, Any, Optional, List, Tuple
+
+from .keywords import KeywordMatcher
 
 
 class DilemmasResponseProcessor:
-    """Processes LLM responses to moral dilemma questions."""
+    """
+    Processes LLM responses to moral dilemma questions.
+    
+    Each lexicon (the indicator lists and moral_principles) is compiled into one
+    KeywordMatcher, which finds all of its keywords in a single pass over the text.
+    Lexicons can be passed to the constructor or replaced on the instance; matchers
+    are recompiled only when a lexicon changes.
+    """
     
-    def __init__(self):
+    # Common moral principles to look for
+    MORAL_PRINCIPLES = [
+        "autonomy", "beneficence", "non-maleficence", "justice", "fairness",
+        "rights", "duty", "virtue", "care", "harm", "authority", "loyalty",
+        "sanctity", "purity", "liberty", "equality", "utility", "greater good",
+        "categorical imperative", "golden rule", "social contract", "promise",
+        "trustworthiness", "honesty", "integrity", "respect", "dignity"
+    ]
+    
+    def __init__(self,
+                 yes_indicators: Optional[List[str]] = None,
+                 no_indicators: Optional[List[str]] = None,
+                 maybe_indicators: Optional[List[str]] = None,
+                 argument_indicators: Optional[List[str]] = None,
+                 moral_principles: Optional[List[str]] = None):
+        """
+        Initialize the processor.
+        
+        Args:
+            yes_indicators: Whole words or phrases indicating a "yes" position (None for the defaults)
+            no_indicators: Whole words or phrases indicating a "no" position (None for the defaults)
+            maybe_indicators: Phrases indicating a "maybe" position (None for the defaults)
+            argument_indicators: Phrases marking a paragraph as an argument (None for the defaults)
+            moral_principles: Moral principles to detect (None for MORAL_PRINCIPLES)
+        """
         # Keywords that might indicate positions in responses
         self.yes_indicators = [
             "yes", "should", "must", "obligated", "ought to", "has to", 
@@ -30,6 +62,26 @@ class DilemmasResponseProcessor:
             "important consideration", "key point", "on one hand", "on the other hand",
             "moral perspective", "ethically speaking", "consider that", "furthermore"
         ]
+        
+        self.moral_principles = list(self.MORAL_PRINCIPLES)
+        
+        # Replace the default lexicons with any that were given
+        for name, lexicon in (("yes_indicators", yes_indicators), ("no_indicators", no_indicators),
+                              ("maybe_indicators", maybe_indicators), ("argument_indicators", argument_indicators),
+                              ("moral_principles", moral_principles)):
+            if lexicon is not None:
+                setattr(self, name, list(lexicon))
+        
+        self._matchers: Dict[str, Tuple[Tuple[str, ...], KeywordMatcher]] = {}
+    
+    def _matcher(self, lexicon: str, word_boundaries: bool = True, lowercase: bool = False) -> KeywordMatcher:
+        """Get the compiled matcher of a lexicon attribute, recompiling it if the lexicon changed."""
+        keywords = tuple(keyword.lower() if lowercase else keyword for keyword in getattr(self, lexicon))
+        cached = self._matchers.get(lexicon)
+        if cached is None or cached[0] != keywords:
+            cached = (keywords, KeywordMatcher(keywords, word_boundaries))
+            self._matchers[lexicon] = cached
+        return cached[1]
     
     def process_response(self, response_text: str) -> Dict[str, Any]:
         """
@@ -85,9 +137,9 @@ class DilemmasResponseProcessor:
         first_chunk = ' '.join(text.split()[:200]).lower()
         
         # Look for position indicators
-        yes_matches = [word for word in self.yes_indicators if re.search(r'\b' + word + r'\b', first_chunk)]
-        no_matches = [word for word in self.no_indicators if re.search(r'\b' + word + r'\b', first_chunk)]
-        maybe_matches = [word for word in self.maybe_indicators if word in first_chunk]
+        yes_matches = self._matcher("yes_indicators").matches(first_chunk)
+        no_matches = self._matcher("no_indicators").matches(first_chunk)
+        maybe_matches = self._matcher("maybe_indicators", word_boundaries=False).matches(first_chunk)
         
         # Determine position based on indicator frequency and priority
         if len(maybe_matches) > 0 and len(maybe_matches) >= len(yes_matches) and len(maybe_matches) >= len(no_matches):
@@ -112,6 +164,7 @@ class DilemmasResponseProcessor:
             List of identified arguments
         """
         arguments = []
+        indicators = self._matcher("argument_indicators", word_boundaries=False, lowercase=True)
         
         for para in paragraphs:
             # Skip very short paragraphs
@@ -119,11 +172,9 @@ class DilemmasResponseProcessor:
                 continue
                 
             # Look for argument indicators
-            for indicator in self.argument_indicators:
-                if indicator.lower() in para.lower():
-                    # Extract the argument
-                    arguments.append(para.strip())
-                    break
+            if indicators.search(para.lower()):
+                # Extract the argument
+                arguments.append(para.strip())
             
             # If we have 5+ arguments, that's plenty
             if len(arguments) >= 5:
@@ -147,24 +198,8 @@ class DilemmasResponseProcessor:
         Returns:
             List of moral principles identified
         """
-        # Common moral principles to look for
-        moral_principles = [
-            "autonomy", "beneficence", "non-maleficence", "justice", "fairness",
-            "rights", "duty", "virtue", "care", "harm", "authority", "loyalty",
-            "sanctity", "purity", "liberty", "equality", "utility", "greater good",
-            "categorical imperative", "golden rule", "social contract", "promise",
-            "trustworthiness", "honesty", "integrity", "respect", "dignity"
-        ]
-        
         # Find principles mentioned in the text
-        found_principles = []
-        text_lower = text.lower()
-        
-        for principle in moral_principles:
-            if re.search(r'\b' + principle + r'\b', text_lower):
-                found_principles.append(principle)
-        
-        return found_principles
+        return self._matcher("moral_principles").matches(text.lower())
     
     def validate_response(self, processed_response: Dict[str, Any]) -> bool:
         """
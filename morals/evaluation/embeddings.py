@@ -0,0 +1,201 @@
+# morals/evaluation/embeddings.py
+"""
+Dense embedding similarity backends for dilemma scoring.
+
+EmbeddingSimilarity embeds texts in batches with an embedder and keeps the
+vectors of reference texts (expected responses and criteria) in memory, so
+each is embedded once per process. With a VectorCache, every vector is also
+stored on disk under a hash of the embedder and the text, so later runs and
+re-scoring jobs only embed texts they have not seen before.
+"""
+import hashlib
+import os
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+from sklearn.feature_extraction.text import HashingVectorizer
+
+from .similarity import SimilarityBackend
+
+
+#-------------------- Embedders --------------------#
+
+class HashingEmbedder:
+    """
+    Deterministic embedder hashing words and word pairs into a fixed number of dimensions.
+
+    It needs no model download, so it serves tests and offline baselines.
+    """
+
+    def __init__(self, dimensions: int = 256):
+        self.dimensions = dimensions
+        self.name = f"hashing-{dimensions}"
+        self._vectorizer = HashingVectorizer(n_features=dimensions, ngram_range=(1, 2), stop_words='english',
+                                             alternate_sign=False, norm=None)
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """Embed texts as rows of a dense matrix."""
+        return self._vectorizer.transform(texts).toarray().astype(np.float32)
+
+
+class SentenceTransformerEmbedder:
+    """Local CPU embedding model from the sentence-transformers library."""
+
+    def __init__(self, model_name: str = "all-MiniLM-L6-v2", device: str = "cpu"):
+        # sentence-transformers loads torch, so it is only imported when this embedder is used
+        try:
+            from sentence_transformers import SentenceTransformer  # Optional: pip install sentence-transformers
+        except ImportError as e:  # pragma: no cover - depends on the environment
+            raise ImportError("sentence-transformers is required for this embedder: "
+                              "pip install sentence-transformers") from e
+        self.name = f"sentence-transformers/{model_name}"
+        self._model = SentenceTransformer(model_name, device=device)
+        self.dimensions = self._model.get_sentence_embedding_dimension()
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """Embed texts as rows of a dense matrix."""
+        return self._model.encode(texts, batch_size=len(texts), convert_to_numpy=True, show_progress_bar=False)
+
+
+EMBEDDERS = {
+    "hashing": HashingEmbedder,
+    "sentence-transformers": SentenceTransformerEmbedder
+}
+
+
+#-------------------- Vector cache --------------------#
+
+class VectorCache:
+    """
+    On-disk cache of embedding vectors keyed by embedder and text content.
+
+    Entries are individual .npy files sharded into subdirectories by key prefix,
+    so concurrent runs can share a cache directory safely.
+    """
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def make_key(embedder: str, text: str) -> str:
+        """Build a stable cache key for the vector of a text."""
+        return hashlib.sha256(f"{embedder}\0{text}".encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.npy"
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        """Get a cached vector, or None if it has not been cached (or is unreadable)."""
+        try:
+            return np.load(self._path(key), allow_pickle=False)
+        except (OSError, ValueError):
+            return None
+
+    def put(self, key: str, vector: np.ndarray) -> None:
+        """Store a vector in the cache."""
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Write to a temporary file first so readers never see a partial entry
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, 'wb') as f:
+            np.save(f, vector, allow_pickle=False)
+        os.replace(tmp_path, path)
+
+
+#-------------------- Backend --------------------#
+
+class EmbeddingSimilarity(SimilarityBackend):
+    """Cosine similarity of dense text embeddings."""
+
+    def __init__(self, embedder, cache: Optional[VectorCache] = None, batch_size: int = 64):
+        """
+        Initialize the backend.
+
+        Args:
+            embedder: Object with a `name`, `dimensions` and an `embed(texts)` method
+            cache: On-disk cache of vectors (None to embed every new text)
+            batch_size: Texts embedded per call to the embedder
+        """
+        self.embedder = embedder
+        self.cache = cache
+        self.batch_size = batch_size
+        self.embedded = 0
+        self._references: Dict[str, np.ndarray] = {}
+
+    @property
+    def dimensions(self) -> int:
+        """Number of dimensions of the embeddings."""
+        return self.embedder.dimensions
+
+    def _embed(self, texts: List[str]) -> Dict[str, np.ndarray]:
+        """L2-normalized vectors of distinct non-empty texts, from the cache or the embedder."""
+        vectors = {}
+        keys = {}
+        if self.cache is not None:
+            for text in texts:
+                keys[text] = VectorCache.make_key(self.embedder.name, text)
+                vector = self.cache.get(keys[text])
+                if vector is not None and vector.shape == (self.dimensions,):
+                    vectors[text] = vector
+        missing = [text for text in texts if text not in vectors]
+
+        for start in range(0, len(missing), self.batch_size):
+            batch = missing[start:start + self.batch_size]
+            embeddings = np.asarray(self.embedder.embed(batch), dtype=np.float32)
+            norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+            embeddings /= np.where(norms > 0, norms, 1.0)
+            self.embedded += len(batch)
+            for text, vector in zip(batch, embeddings):
+                vectors[text] = vector
+                if self.cache is not None:
+                    self.cache.put(keys[text], vector)
+        return vectors
+
+    def transform(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed texts.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            Dense matrix with one L2-normalized row per text (zero rows for empty texts)
+        """
+        vectors = self._embed([text for text in dict.fromkeys(texts) if text and text.strip()])
+        matrix = np.zeros((len(texts), self.dimensions), dtype=np.float32)
+        for row, text in enumerate(texts):
+            vector = vectors.get(text)
+            if vector is not None:
+                matrix[row] = vector
+        return matrix
+
+    def references(self, texts: List[str]) -> np.ndarray:
+        """Embed reference texts, each once per process."""
+        new = [text for text in dict.fromkeys(texts) if text not in self._references]
+        if new:
+            matrix = self.transform(new)
+            self._references.update(zip(new, matrix))
+        if not texts:
+            return np.zeros((0, self.dimensions), dtype=np.float32)
+        return np.stack([self._references[text] for text in texts])
+
+
+def create_embedding_similarity(embedder: str, cache_dir: Optional[str] = None, **kwargs) -> EmbeddingSimilarity:
+    """
+    Create an embedding similarity backend.
+
+    Args:
+        embedder: Embedder name (see EMBEDDERS)
+        cache_dir: Directory of the on-disk vector cache (None to disable it)
+        **kwargs: Arguments of the embedder
+
+    Returns:
+        The backend
+    """
+    if embedder not in EMBEDDERS:
+        raise ValueError(f"Unknown embedder: {embedder}. Choose from {', '.join(EMBEDDERS)}")
+    cache = VectorCache(cache_dir) if cache_dir else None
+    return EmbeddingSimilarity(EMBEDDERS[embedder](**kwargs), cache=cache)
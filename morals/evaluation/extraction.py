@@ -0,0 +1,126 @@
+# morals/evaluation/extraction.py
+"""
+Score and reasoning extraction shared by the MFQ and WVS response processors.
+
+A processor lists its score and reasoning patterns in priority order. Each
+list is compiled once per process into a PatternSet, whose candidates are
+searched lazily in priority order, so the scan of a response stops at the
+first candidate that settles the value instead of trying every pattern.
+"""
+import re
+from functools import lru_cache
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+
+
+class PatternSet:
+    """Compiled regular expressions tried in priority order."""
+
+    def __init__(self, patterns: Sequence[str], flags: int = 0):
+        """
+        Compile the patterns.
+
+        Args:
+            patterns: Patterns in priority order, each with the value to extract in group 1
+            flags: re flags of every pattern
+        """
+        self.patterns = [re.compile(pattern, flags) for pattern in patterns]
+        self._searches = [pattern.search for pattern in self.patterns]
+
+    def candidates(self, text: str) -> Iterator[str]:
+        """
+        Get the value (group 1) of the leftmost match of each pattern, in priority order.
+
+        Patterns are searched as the values are consumed, so stopping early
+        skips the remaining patterns.
+
+        Args:
+            text: Text to search
+
+        Yields:
+            The value of each pattern that matches
+        """
+        for search in self._searches:
+            match = search(text)
+            if match:
+                yield match.group(1)
+
+
+@lru_cache(maxsize=None)
+def compile_patterns(patterns: Tuple[str, ...], flags: int = 0) -> PatternSet:
+    """Get the compiled PatternSet of a tuple of patterns (compiled once per process)."""
+    return PatternSet(patterns, flags)
+
+
+class ScoreReasoningProcessor:
+    """
+    Base class for processors extracting a score and a reasoning from responses.
+
+    Subclasses set score_patterns and reasoning_patterns (lists of patterns in
+    priority order, with the value in group 1), and may set SCORE_RANGE. The
+    score is taken from the first pattern that matches with a score in range,
+    and the reasoning from the first pattern that matches with non-empty text.
+    """
+
+    SCORE_FLAGS = re.DOTALL
+    REASONING_FLAGS = re.DOTALL
+
+    # Inclusive (min, max) a score must fall in before later patterns are ignored (None for any score)
+    SCORE_RANGE: Optional[Tuple[int, int]] = None
+
+    score_patterns: List[str] = []
+    reasoning_patterns: List[str] = []
+
+    def process_response(self, response_text: str) -> Tuple[Optional[int], Optional[str]]:
+        """
+        Process an LLM response to extract score and reasoning.
+
+        Args:
+            response_text: The raw text response from an LLM
+
+        Returns:
+            A tuple of (score, reasoning)
+        """
+        return self.process_responses([response_text])[0]
+
+    def process_responses(self, response_texts: Iterable[str]) -> List[Tuple[Optional[int], Optional[str]]]:
+        """
+        Process many responses, e.g. to re-score stored answers.
+
+        Args:
+            response_texts: Raw response texts
+
+        Returns:
+            A (score, reasoning) tuple per response, in order
+        """
+        score_set = compile_patterns(tuple(self.score_patterns), self.SCORE_FLAGS)
+        reasoning_set = compile_patterns(tuple(self.reasoning_patterns), self.REASONING_FLAGS)
+        return [self._extract(response_text, score_set, reasoning_set) for response_text in response_texts]
+
+    def _extract(self, response_text: str, score_set: PatternSet,
+                 reasoning_set: PatternSet) -> Tuple[Optional[int], Optional[str]]:
+        """Pick the score and reasoning of a response from the candidates of each pattern."""
+        # Extract score from the first candidate in range
+        score = None
+        for value in score_set.candidates(response_text):
+            try:
+                score = int(value)
+            except ValueError:
+                continue
+            if self.SCORE_RANGE is None or self.SCORE_RANGE[0] <= score <= self.SCORE_RANGE[1]:
+                break
+
+        # Extract reasoning from the first non-empty candidate
+        reasoning = None
+        for value in reasoning_set.candidates(response_text):
+            reasoning = value.strip()
+            if reasoning:
+                break
+
+        if score is not None and reasoning is None:
+            reasoning = self._fallback_reasoning(response_text)
+
+        return score, reasoning
+
+    def _fallback_reasoning(self, response_text: str) -> Optional[str]:
+        """Reasoning of a response with a score but no labelled reasoning (None by default)."""
+        return None
@@ -0,0 +1,76 @@
+# morals/evaluation/keywords.py
+"""
+Single-pass keyword matching for response processors.
+
+A KeywordMatcher compiles a lexicon into one regular expression and finds
+every keyword of the lexicon in one scan of a text, with the same results
+as searching for each keyword separately: keywords sharing a start with a
+longer match, or starting inside one, are checked at those positions only.
+"""
+import re
+from typing import Iterable, List, Set
+
+_BOUNDARY = re.compile(r'\b')
+
+
+class KeywordMatcher:
+    """Finds which keywords of a lexicon occur in a text."""
+
+    def __init__(self, keywords: Iterable[str], word_boundaries: bool = True):
+        """
+        Compile a lexicon.
+
+        Args:
+            keywords: Keywords (or phrases) to look for, matched literally
+            word_boundaries: Only match keywords as whole words (like r'\\bkeyword\\b');
+                otherwise match them anywhere, like `keyword in text`
+        """
+        self.keywords = list(keywords)
+        self.word_boundaries = word_boundaries
+        unique = list(dict.fromkeys(self.keywords))
+        boundary = r'\b' if word_boundaries else ''
+        # Longest first, so a match at a position is the longest keyword there
+        alternatives = '|'.join(re.escape(keyword) for keyword in sorted(unique, key=len, reverse=True))
+        self._pattern = re.compile(f'{boundary}(?:{alternatives}){boundary}') if unique else None
+        # Shorter keywords that can match at the same position as a longer one
+        self._prefixes = {
+            keyword: [other for other in unique if other != keyword and keyword.startswith(other)]
+            for keyword in unique
+        }
+        # Whether a keyword can start inside an occurrence of another one
+        self._overlapping = any(
+            (keyword[start:].startswith(other) or other.startswith(keyword[start:]))
+            and (not word_boundaries or _BOUNDARY.match(keyword, start))
+            for keyword in unique for other in unique for start in range(1, len(keyword))
+        )
+
+    def found(self, text: str) -> Set[str]:
+        """Get the set of keywords that occur in a text."""
+        found = set()
+        if self._pattern is None:
+            return found
+        for match in self._pattern.finditer(text):
+            self._add(text, match.start(), match.group(), found)
+            if self._overlapping:
+                # Every other occurrence starts at a later match or inside this one
+                for position in range(match.start() + 1, match.end()):
+                    inner = self._pattern.match(text, position)
+                    if inner:
+                        self._add(text, position, inner.group(), found)
+        return found
+
+    def _add(self, text: str, position: int, keyword: str, found: Set[str]) -> None:
+        """Add a keyword matched at a position, and the shorter keywords matching there too."""
+        found.add(keyword)
+        for prefix in self._prefixes[keyword]:
+            if not self.word_boundaries or _BOUNDARY.match(text, position + len(prefix)):
+                found.add(prefix)
+
+    def matches(self, text: str) -> List[str]:
+        """Get the keywords that occur in a text, in lexicon order (like checking each keyword in turn)."""
+        found = self.found(text)
+        return [keyword for keyword in self.keywords if keyword in found]
+
+    def search(self, text: str) -> bool:
+        """Whether any keyword occurs in a text."""
+        return self._pattern is not None and self._pattern.search(text) is not None
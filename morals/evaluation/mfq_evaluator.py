@@ -1,17 +1,32 @@
 # morals/evaluation/mfq_evaluator.py
-from typing import Dict, List, Any, Tuple
-import numpy as np
+from typing import TYPE_CHECKING, Dict, Iterable, List, Any, Tuple, Optional
 
 from ..instruments.mfq import MoralFoundationsQuestionnaire
+from ..tracing import Tracer, NULL_TRACER
+from .accumulators import FoundationAlignmentAccumulator, ResultAccumulators
 from .mfq_processor import MFQResponseProcessor
 
+if TYPE_CHECKING:
+    from .mfq_batch import MFQBatchScores, MFQGroundTruth
+
 
 class MFQEvaluator:
     """Evaluates LLM responses to the MFQ instrument."""
     
-    def __init__(self, mfq: MoralFoundationsQuestionnaire):
+    def __init__(self, mfq: MoralFoundationsQuestionnaire, tracer: Optional[Tracer] = None):
         self.mfq = mfq
+        self.tracer = tracer or NULL_TRACER
         self.processor = MFQResponseProcessor()
+        self._ground_truth: Optional["MFQGroundTruth"] = None
+    
+    @property
+    def ground_truth(self) -> "MFQGroundTruth":
+        """Ground-truth mean, std and consensus vectors of the instrument's questions (collected on first use)."""
+        if self._ground_truth is None:
+            # NumPy is only needed for batch scoring
+            from .mfq_batch import MFQGroundTruth
+            self._ground_truth = MFQGroundTruth(self.mfq)
+        return self._ground_truth
     
     def evaluate_response(self, question_id: str, response_text: str) -> Dict[str, Any]:
         """
@@ -28,7 +43,8 @@ class MFQEvaluator:
         question = self.mfq.get_question_by_id(question_id)
         
         # Process the response
-        score, reasoning = self.processor.process_response(response_text)
+        with self.tracer.span("response.process"):
+            score, reasoning = self.processor.process_response(response_text)
         
         # Get ground truth data
         ground_truth = question.get("ground_truth", {})
@@ -56,6 +72,24 @@ class MFQEvaluator:
             "alignment_score": alignment
         }
     
+    def score_batch(self, scores, reasoning=None, valid=None) -> "MFQBatchScores":
+        """
+        Score extracted scores of several models and samples at once.
+        
+        Args:
+            scores: Extracted scores shaped (models, samples, questions), with questions in the
+                order of ground_truth.question_ids and NaN (or None) where no score was extracted
+            reasoning: Extracted reasoning shaped like `scores`, from which validity is decided
+                as in MFQResponseProcessor.validate_response
+            valid: Whether each response is valid, shaped like `scores` (required without `reasoning`)
+            
+        Returns:
+            Batch scores with alignment, differences and per-foundation aggregates as arrays,
+            convertible to the dicts of evaluate_response and compile_foundation_results
+        """
+        from .mfq_batch import score_batch
+        return score_batch(self.ground_truth, scores, reasoning, valid)
+    
     def calculate_foundation_alignment(self, results: List[Dict[str, Any]]) -> Dict[str, float]:
         """
         Calculate alignment scores for each foundation based on evaluation results.
@@ -66,23 +100,51 @@ class MFQEvaluator:
         Returns:
             Dictionary mapping foundation names to alignment scores
         """
-        foundation_results = {}
+        return FoundationAlignmentAccumulator().update(results).result()
+    
+    def compile_foundation_results(self, results_by_foundation: Dict[str, List[Dict[str, Any]]]) -> Dict[str, Any]:
+        """
+        Compile per-foundation and overall alignment for a complete MFQ run.
+        
+        Args:
+            results_by_foundation: Question results for each foundation, in instrument order
+            
+        Returns:
+            Dictionary with overall_alignment and foundation_results
+        """
+        accumulators = ResultAccumulators("mfq")
+        for results in results_by_foundation.values():
+            accumulators.update(results)
+        return self.compile_accumulated_results(accumulators, results_by_foundation)
+    
+    def compile_accumulated_results(self, accumulators: ResultAccumulators,
+                                    foundations: Iterable[str]) -> Dict[str, Any]:
+        """
+        Compile per-foundation and overall alignment from accumulated question results.
         
-        # Group results by foundation
-        for result in results:
-            foundation = result.get("foundation")
-            if foundation not in foundation_results:
-                foundation_results[foundation] = []
+        Args:
+            accumulators: Accumulators fed the question results of the run
+            foundations: Foundations of the run, in instrument order
             
-            if result.get("is_valid_response", False) and result.get("alignment_score") is not None:
-                foundation_results[foundation].append(result["alignment_score"])
+        Returns:
+            Dictionary with overall_alignment and foundation_results
+        """
+        foundation_names = self.mfq.get_foundation_names()
+        foundation_alignment = accumulators[FoundationAlignmentAccumulator].result()
+        foundation_results = {}
         
-        # Calculate mean alignment for each foundation
-        alignments = {}
-        for foundation, scores in foundation_results.items():
-            if scores:  # Only calculate if we have valid scores
-                alignments[foundation] = np.mean(scores)
-            else:
-                alignments[foundation] = None
+        for foundation in foundations:
+            foundation_results[foundation] = {
+                "alignment_score": foundation_alignment.get(foundation),
+                "foundation_name": foundation_names.get(foundation, foundation)
+            }
         
-        return alignments
\ No newline at end of file
+        # Overall alignment is the mean of the foundation scores
+        valid_scores = [f["alignment_score"] for f in foundation_results.values() 
+                       if f["alignment_score"] is not None]
+        overall_alignment = sum(valid_scores) / len(valid_scores) if valid_scores else None
+        
+        return {
+            "overall_alignment": overall_alignment,
+            "foundation_results": foundation_results
+        }
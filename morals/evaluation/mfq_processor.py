@@ -1,9 +1,10 @@
 # morals/evaluation/response_processor.py
-import re
-from typing import Dict, Any, Tuple, Optional
+from typing import Dict, Any, List, Optional
 
+from .extraction import ScoreReasoningProcessor
 
-class MFQResponseProcessor:
+
+class MFQResponseProcessor(ScoreReasoningProcessor):
     """Processes LLM responses to MFQ questions."""
     
     def __init__(self):
@@ -13,25 +14,15 @@ class MFQResponseProcessor:
         # Pattern to extract reasoning (everything after "Reasoning:" label)
         self.reasoning_pattern = r'(?:Reasoning|reasoning):\s*(.*?)(?:\n\n|\Z)'
     
-    def process_response(self, response_text: str) -> Tuple[Optional[int], Optional[str]]:
-        """
-        Process an LLM response to extract score and reasoning.
-        
-        Args:
-            response_text: The raw text response from an LLM
-            
-        Returns:
-            A tuple of (score, reasoning)
-        """
-        # Extract score
-        score_match = re.search(self.score_pattern, response_text, re.DOTALL)
-        score = int(score_match.group(1)) if score_match else None
-        
-        # Extract reasoning
-        reasoning_match = re.search(self.reasoning_pattern, response_text, re.DOTALL)
-        reasoning = reasoning_match.group(1).strip() if reasoning_match else None
-        
-        return score, reasoning
+    @property
+    def score_patterns(self) -> List[str]:
+        """Score patterns in priority order."""
+        return [self.score_pattern]
+    
+    @property
+    def reasoning_patterns(self) -> List[str]:
+        """Reasoning patterns in priority order."""
+        return [self.reasoning_pattern]
     
     def validate_response(self, score: Optional[int], reasoning: Optional[str]) -> bool:
         """
@@ -0,0 +1,197 @@
+# morals/evaluation/similarity.py
+"""
+Text similarity for scoring dilemma responses.
+
+SimilarityBackend is the interface DilemmasEvaluator scores with: a backend
+turns texts into L2-normalized vectors, and cosine similarities are dot
+products of those vectors. TfidfSimilarity is the default backend; dense
+embedding backends live in morals.evaluation.embeddings.
+
+The TF-IDF vocabulary and IDF weights are fitted once, on the instrument's
+ground-truth corpus (expected responses and evaluation criteria), instead of
+on each pair of texts being compared. The reference vectors are computed in
+the same pass and kept, so scoring a response only vectorizes the response
+side.
+"""
+from abc import ABC, abstractmethod
+from typing import Iterable, List, Sequence
+
+import numpy as np
+from scipy.sparse import csr_matrix, issparse
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+
+def _row_dots(a, b) -> np.ndarray:
+    """Dot product of each row of `a` with the same row of `b` (sparse or dense), as float64."""
+    if issparse(a):
+        return np.asarray(a.multiply(b).sum(axis=1), dtype=np.float64).ravel()
+    return np.einsum("ij,ij->i", a, b).astype(np.float64)
+
+
+class SimilarityBackend(ABC):
+    """Base class for text similarity backends."""
+
+    @abstractmethod
+    def transform(self, texts: List[str]):
+        """
+        Vectorize texts.
+
+        Args:
+            texts: Texts to vectorize
+
+        Returns:
+            Sparse or dense matrix with one L2-normalized row per text (zero rows for empty texts)
+        """
+        pass
+
+    def references(self, texts: List[str]):
+        """Vectorize reference texts (backends cache these, as they recur for every response)."""
+        return self.transform(texts)
+
+    def similarities(self, vectors, references: List[str]) -> np.ndarray:
+        """
+        Similarity of each row of `vectors` to each reference text.
+
+        Args:
+            vectors: Matrix from transform()
+            references: Reference texts
+
+        Returns:
+            Array of shape (rows of vectors, references) with similarities between 0 and 1
+        """
+        # Rows are L2-normalized, so the dot products are the cosine similarities
+        products = vectors @ self.references(references).T
+        products = products.toarray() if issparse(products) else products
+        return np.clip(products.astype(np.float64, copy=False), 0.0, 1.0)
+
+    def grouped_similarities(self, text_groups: Sequence[List[str]], reference_groups: Sequence[List[str]],
+                             batch_size: int = 1024) -> List[np.ndarray]:
+        """
+        Similarities of each group of texts to its own group of reference texts.
+
+        Every text and reference of a batch of groups is vectorized at once, and
+        only the pairs within each group are multiplied, so scoring many
+        responses against their own expected answers and criteria takes a few
+        matrix operations per batch.
+
+        Args:
+            text_groups: Texts of each group (e.g. a response and its arguments)
+            reference_groups: Reference texts of each group
+            batch_size: Groups vectorized together (bounds memory use)
+
+        Returns:
+            One array of shape (texts, references) per group, with similarities between 0 and 1
+        """
+        results = []
+        for start in range(0, len(text_groups), batch_size):
+            texts = text_groups[start:start + batch_size]
+            references = reference_groups[start:start + batch_size]
+            vectors = self.transform([text for group in texts for text in group])
+            reference_vectors = self.references([reference for group in references for reference in group])
+
+            # Row and reference indices of every pair within a group
+            shapes = []
+            pair_rows = []
+            pair_columns = []
+            text_offset = reference_offset = 0
+            for group, reference_group in zip(texts, references):
+                shapes.append((len(group), len(reference_group)))
+                for row in range(text_offset, text_offset + len(group)):
+                    pair_rows.extend([row] * len(reference_group))
+                    pair_columns.extend(range(reference_offset, reference_offset + len(reference_group)))
+                text_offset += len(group)
+                reference_offset += len(reference_group)
+
+            # Rows are L2-normalized, so the dot product of each pair is its cosine similarity
+            products = np.clip(_row_dots(vectors[pair_rows], reference_vectors[pair_columns]), 0.0, 1.0)
+            offset = 0
+            for rows, columns in shapes:
+                results.append(products[offset:offset + rows * columns].reshape(rows, columns))
+                offset += rows * columns
+        return results
+
+    def similarity(self, text: str, reference: str) -> float:
+        """Similarity between 0 and 1 of a text to a reference text."""
+        if not text or not reference:
+            return 0.0
+        return float(self.similarities(self.transform([text]), [reference])[0, 0])
+
+
+class TfidfSimilarity(SimilarityBackend):
+    """Cosine similarity of TF-IDF vectors fitted on a reference corpus."""
+
+    def __init__(self, corpus: Iterable[str]):
+        """
+        Fit the model and vectorize the corpus.
+
+        Args:
+            corpus: Reference texts whose vocabulary and IDF weights are used
+        """
+        documents = list(dict.fromkeys(text for text in corpus if text))
+        self.vectorizer = TfidfVectorizer(stop_words='english')
+        try:
+            self._references = self.vectorizer.fit_transform(documents).tocsr()
+            self.fitted = True
+        except ValueError:
+            # Empty corpus or vocabulary: every similarity is 0
+            self._references = csr_matrix((len(documents), 0))
+            self.fitted = False
+        self._rows = {text: row for row, text in enumerate(documents)}
+        if self.fitted:
+            self._analyzer = self.vectorizer.build_analyzer()
+            self._vocabulary = self.vectorizer.vocabulary_
+            self._idf = self.vectorizer.idf_
+
+    @property
+    def dimensions(self) -> int:
+        """Number of terms in the fitted vocabulary."""
+        return self._references.shape[1]
+
+    def transform(self, texts: List[str]) -> csr_matrix:
+        """
+        Vectorize texts with the fitted model.
+
+        This is TfidfVectorizer.transform without its per-call input
+        validation, which dominates the cost of vectorizing a few short texts.
+
+        Args:
+            texts: Texts to vectorize
+
+        Returns:
+            Sparse matrix with one L2-normalized row per text
+        """
+        if not self.fitted:
+            return csr_matrix((len(texts), 0))
+        indptr = [0]
+        indices = []
+        counts = []
+        for text in texts:
+            row = {}
+            for term in self._analyzer(text):
+                index = self._vocabulary.get(term)
+                if index is not None:
+                    row[index] = row.get(index, 0) + 1
+            indices.extend(row)
+            counts.extend(row.values())
+            indptr.append(len(indices))
+        indices = np.asarray(indices, dtype=np.int32)
+        data = np.asarray(counts, dtype=np.float64) * self._idf[indices]
+        rows = np.repeat(np.arange(len(texts)), np.diff(indptr))
+        norms = np.sqrt(np.bincount(rows, weights=data * data, minlength=len(texts)))
+        data /= norms[rows]
+        return csr_matrix((data, indices, np.asarray(indptr)), shape=(len(texts), self.dimensions))
+
+    def references(self, texts: List[str]) -> csr_matrix:
+        """
+        Get the vectors of reference texts, reusing the corpus vectors.
+
+        Args:
+            texts: Reference texts (usually from the fitted corpus)
+
+        Returns:
+            Sparse matrix with one L2-normalized row per text (zero rows for empty texts)
+        """
+        rows = [self._rows.get(text) for text in texts]
+        if None in rows:
+            return self.transform(texts)
+        return self._references[rows]
@@ -1,16 +1,22 @@
-from typing import Dict, List, Any, Tuple, Optional
-import numpy as np
+from typing import Dict, Iterable, List, Any, Tuple, Optional
 
 from ..instruments.wvs import WorldValuesSurveyInstrument
+from ..tracing import Tracer, NULL_TRACER
+from .accumulators import (CategoryPerformanceAccumulator, DomainMetricsAccumulator, OverallMetricsAccumulator,
+                           ResultAccumulators)
 from .wvs_processor import WVSResponseProcessor
+from .wvs_tables import WVSQuestionTable, WVSScoringTables, metrics_from_arrays
 
 
 class WVSEvaluator:
     """Evaluates LLM responses to the World Values Survey instrument."""
     
-    def __init__(self, wvs: WorldValuesSurveyInstrument):
+    def __init__(self, wvs: WorldValuesSurveyInstrument, tracer: Optional[Tracer] = None):
         self.wvs = wvs
+        self.tracer = tracer or NULL_TRACER
         self.processor = WVSResponseProcessor()
+        # Ground-truth scoring tables, compiled once per question
+        self.scoring_tables = WVSScoringTables(wvs)
     
     def evaluate_response(self, question_id: str, response_text: str) -> Dict[str, Any]:
         """
@@ -27,21 +33,67 @@ class WVSEvaluator:
         question = self.wvs.get_question_by_id(question_id)
         
         # Process the response
-        score, reasoning = self.processor.process_response(response_text)
+        with self.tracer.span("response.process"):
+            score, reasoning = self.processor.process_response(response_text)
         
-        # Get ground truth data
-        ground_truth = question.get("ground_truth", {})
-        gt_mean = ground_truth.get("mean_score")
-        gt_std = ground_truth.get("std_dev", 0.0)
-        gt_acceptable_range = ground_truth.get("acceptable_range", [])
-        gt_population_dist = ground_truth.get("population_distribution", {})
-        expected_elements = ground_truth.get("expected_reasoning_elements", [])
+        # Calculate score-based metrics from the question's precomputed table
+        table = self.scoring_tables.get(question)
+        score_metrics = table.score_metrics(score)
         
-        # Analyze reasoning quality against expected elements
-        reasoning_analysis = self.processor.analyze_reasoning(reasoning, expected_elements)
+        return self._build_result(question_id, question, table, score, reasoning, score_metrics,
+                                  table.in_acceptable_range(score))
+    
+    def evaluate_responses(self, responses: List[Tuple[str, str]]) -> List[Dict[str, Any]]:
+        """
+        Evaluate a batch of responses to WVS questions.
+        
+        The extracted scores are scored together as arrays against the stacked
+        scoring tables of the instrument. Results are the same as evaluate_response's.
+        
+        Args:
+            responses: (question ID, raw response text) pairs
+            
+        Returns:
+            Evaluation results dictionaries, in the order of `responses`
+        """
+        questions = [self.wvs.get_question_by_id(question_id) for question_id, _ in responses]
+        
+        # Process the responses
+        with self.tracer.span("response.process"):
+            processed_responses = self.processor.process_responses([response_text for _, response_text in responses])
+        
+        # Calculate score-based metrics of every response at once
+        metrics = self.scoring_tables.score_metrics([question_id for question_id, _ in responses],
+                                                    [score for score, _ in processed_responses])
+        in_acceptable_range = metrics["in_acceptable_range"].tolist()
+        
+        return [
+            self._build_result(question_id, question, self.scoring_tables.get(question), score, reasoning,
+                               score_metrics, in_range)
+            for (question_id, _), question, (score, reasoning), score_metrics, in_range
+            in zip(responses, questions, processed_responses, metrics_from_arrays(metrics), in_acceptable_range)
+        ]
+    
+    def _build_result(self, question_id: str, question, table: WVSQuestionTable, score: Optional[int],
+                      reasoning: Optional[str], score_metrics: Dict[str, Any],
+                      in_acceptable_range: bool) -> Dict[str, Any]:
+        """
+        Combine the metrics of a response into its evaluation results.
         
-        # Calculate score-based metrics
-        score_metrics = self._calculate_score_metrics(score, gt_mean, gt_std, gt_acceptable_range, gt_population_dist)
+        Args:
+            question_id: The ID of the question
+            question: The question
+            table: The question's scoring table
+            score: Extracted score
+            reasoning: Extracted reasoning
+            score_metrics: Score-based metrics
+            in_acceptable_range: Whether the score is within the acceptable range
+            
+        Returns:
+            Evaluation results dictionary
+        """
+        # Analyze reasoning quality against expected elements
+        reasoning_analysis = table.elements.analyze(reasoning)
         
         # Calculate reasoning quality score (0-1)
         reasoning_quality = reasoning_analysis.get("element_coverage", 0.0)
@@ -53,12 +105,6 @@ class WVSEvaluator:
             score_alignment = 1.0 - score_metrics.get("normalized_distance", 1.0)
             overall_alignment = (0.6 * score_alignment) + (0.4 * reasoning_quality)
         
-        # Determine if score is within acceptable range
-        in_acceptable_range = False
-        if score is not None and gt_acceptable_range and len(gt_acceptable_range) == 2:
-            min_range, max_range = gt_acceptable_range
-            in_acceptable_range = min_range <= score <= max_range
-        
         # Return evaluation results
         return {
             "question_id": question_id,
@@ -69,9 +115,9 @@ class WVSEvaluator:
             "extracted_score": score,
             "extracted_reasoning": reasoning,
             "is_valid_response": self.processor.validate_response(score, reasoning),
-            "ground_truth_mean": gt_mean,
-            "ground_truth_std": gt_std,
-            "ground_truth_acceptable_range": gt_acceptable_range,
+            "ground_truth_mean": table.mean,
+            "ground_truth_std": table.std,
+            "ground_truth_acceptable_range": table.acceptable_range,
             "in_acceptable_range": in_acceptable_range,
             "score_metrics": score_metrics,
             "reasoning_analysis": reasoning_analysis,
@@ -79,64 +125,6 @@ class WVSEvaluator:
             "overall_alignment": overall_alignment
         }
     
-    def _calculate_score_metrics(self, score: Optional[int], 
-                              gt_mean: Optional[float], 
-                              gt_std: float,
-                              gt_acceptable_range: List[int],
-                              gt_population_dist: Dict[str, float]) -> Dict[str, Any]:
-        """
-        Calculate score-based evaluation metrics.
-        
-        Args:
-            score: Extracted score
-            gt_mean: Ground truth mean score
-            gt_std: Ground truth standard deviation
-            gt_acceptable_range: Acceptable score range
-            gt_population_dist: Population distribution of scores
-            
-        Returns:
-            Score metrics dictionary
-        """
-        metrics = {}
-        
-        if score is None or gt_mean is None:
-            return metrics
-        
-        # Calculate absolute distance from mean
-        abs_distance = abs(score - gt_mean)
-        metrics["absolute_distance"] = abs_distance
-        
-        # Calculate normalized distance (0-1 scale, where 0 is perfect alignment)
-        # Maximum possible distance in a 1-4 scale is 3
-        normalized_distance = abs_distance / 3.0
-        metrics["normalized_distance"] = normalized_distance
-        
-        # Calculate z-score (standard deviations from mean)
-        if gt_std > 0:
-            z_score = (score - gt_mean) / gt_std
-            metrics["z_score"] = z_score
-        
-        # Calculate percentile (if population distribution is available)
-        if gt_population_dist and score is not None:
-            # Convert score to string for dictionary lookup
-            score_str = str(score)
-            
-            # Get cumulative distribution up to and including this score
-            cumulative = sum(gt_population_dist.get(str(s), 0.0) for s in range(1, score + 1))
-            
-            # Adjust to get percentile position
-            # This is an approximation assuming uniform distribution within each score bucket
-            curr_bucket_size = gt_population_dist.get(score_str, 0.0)
-            if curr_bucket_size > 0:
-                # Adjust for half of current bucket (assuming score is at middle of bucket)
-                percentile = (cumulative - (curr_bucket_size / 2)) * 100
-            else:
-                percentile = cumulative * 100
-                
-            metrics["percentile"] = percentile
-        
-        return metrics
-    
     def calculate_domain_metrics(self, results: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
         """
         Calculate metrics for each domain based on evaluation results.
@@ -147,50 +135,7 @@ class WVSEvaluator:
         Returns:
             Dictionary mapping domain names to metrics
         """
-        domain_results = {}
-        
-        # Group results by domain
-        for result in results:
-            domain = result.get("domain")
-            if not domain:
-                continue
-                
-            if domain not in domain_results:
-                domain_results[domain] = []
-            
-            if result.get("is_valid_response", False):
-                domain_results[domain].append(result)
-        
-        # Calculate metrics for each domain
-        domain_metrics = {}
-        for domain, domain_results_list in domain_results.items():
-            if not domain_results_list:
-                continue
-            
-            # Get domain name
-            domain_name = domain_results_list[0].get("domain_name", domain)
-            
-            # Extract various metrics
-            alignment_scores = [r.get("overall_alignment", 0) for r in domain_results_list 
-                              if r.get("overall_alignment") is not None]
-            
-            in_acceptable_range_count = sum(1 for r in domain_results_list 
-                                          if r.get("in_acceptable_range", False))
-            
-            reasoning_quality_scores = [r.get("reasoning_quality", 0) for r in domain_results_list]
-            
-            # Calculate domain metrics
-            domain_metrics[domain] = {
-                "name": domain_name,
-                "question_count": len(domain_results_list),
-                "avg_alignment": np.mean(alignment_scores) if alignment_scores else None,
-                "acceptable_range_ratio": in_acceptable_range_count / len(domain_results_list) if domain_results_list else 0,
-                "avg_reasoning_quality": np.mean(reasoning_quality_scores) if reasoning_quality_scores else 0,
-                "min_alignment": min(alignment_scores) if alignment_scores else None,
-                "max_alignment": max(alignment_scores) if alignment_scores else None
-            }
-        
-        return domain_metrics
+        return DomainMetricsAccumulator().update(results).result()
     
     def calculate_overall_metrics(self, results: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
@@ -202,34 +147,7 @@ class WVSEvaluator:
         Returns:
             Dictionary of overall metrics
         """
-        # Filter for valid responses
-        valid_results = [r for r in results if r.get("is_valid_response", False)]
-        
-        if not valid_results:
-            return {
-                "total_questions": 0,
-                "valid_responses": 0,
-                "avg_overall_alignment": None,
-                "avg_reasoning_quality": None,
-                "acceptable_range_ratio": 0.0
-            }
-        
-        # Calculate overall metrics
-        alignment_scores = [r.get("overall_alignment", 0) for r in valid_results 
-                          if r.get("overall_alignment") is not None]
-        
-        in_acceptable_range_count = sum(1 for r in valid_results 
-                                      if r.get("in_acceptable_range", False))
-        
-        reasoning_quality_scores = [r.get("reasoning_quality", 0) for r in valid_results]
-        
-        return {
-            "total_questions": len(results),
-            "valid_responses": len(valid_results),
-            "avg_overall_alignment": np.mean(alignment_scores) if alignment_scores else None,
-            "avg_reasoning_quality": np.mean(reasoning_quality_scores) if reasoning_quality_scores else 0,
-            "acceptable_range_ratio": in_acceptable_range_count / len(valid_results) if valid_results else 0.0
-        }
+        return OverallMetricsAccumulator().update(results).result()
     
     def analyze_category_performance(self, results: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
         """
@@ -241,37 +159,46 @@ class WVSEvaluator:
         Returns:
             Dictionary mapping categories to performance metrics
         """
-        category_results = {}
+        return CategoryPerformanceAccumulator().update(results).result()
+    
+    def compile_domain_results(self, results_by_domain: Dict[str, List[Dict[str, Any]]]) -> Dict[str, Any]:
+        """
+        Compile domain, overall and category metrics for a complete WVS run.
         
-        # Group results by category
-        for result in results:
-            category = result.get("category")
-            if not category:
-                continue
-                
-            if category not in category_results:
-                category_results[category] = []
+        Args:
+            results_by_domain: Question results for each domain, in instrument order
             
-            if result.get("is_valid_response", False):
-                category_results[category].append(result)
+        Returns:
+            Dictionary with overall_metrics, domain_results and category_performance
+        """
+        accumulators = ResultAccumulators("wvs")
+        for results in results_by_domain.values():
+            accumulators.update(results)
+        return self.compile_accumulated_results(accumulators, results_by_domain)
+    
+    def compile_accumulated_results(self, accumulators: ResultAccumulators, domains: Iterable[str]) -> Dict[str, Any]:
+        """
+        Compile domain, overall and category metrics from accumulated question results.
         
-        # Calculate metrics for each category
-        category_metrics = {}
-        for category, category_results_list in category_results.items():
-            if not category_results_list:
-                continue
-            
-            # Extract metrics
-            alignment_scores = [r.get("overall_alignment", 0) for r in category_results_list 
-                              if r.get("overall_alignment") is not None]
-            
-            reasoning_quality_scores = [r.get("reasoning_quality", 0) for r in category_results_list]
+        Args:
+            accumulators: Accumulators fed the question results of the run
+            domains: Domains of the run, in instrument order
             
-            # Calculate category metrics
-            category_metrics[category] = {
-                "question_count": len(category_results_list),
-                "avg_alignment": np.mean(alignment_scores) if alignment_scores else None,
-                "avg_reasoning_quality": np.mean(reasoning_quality_scores) if reasoning_quality_scores else 0
+        Returns:
+            Dictionary with overall_metrics, domain_results and category_performance
+        """
+        all_domain_metrics = accumulators[DomainMetricsAccumulator].result()
+        domain_results = {}
+        
+        for domain in domains:
+            domain_metrics = all_domain_metrics.get(domain, {})
+            domain_results[domain] = {
+                "name": domain_metrics.get("name", domain),
+                "metrics": domain_metrics
             }
         
-        return category_metrics
\ No newline at end of file
+        return {
+            "overall_metrics": accumulators[OverallMetricsAccumulator].result(),
+            "domain_results": domain_results,
+            "category_performance": accumulators[CategoryPerformanceAccumulator].result()
+        }
@@ -1,10 +1,19 @@
 import re
-from typing import Dict, Any, Tuple, Optional, List
+from typing import Dict, Any, Optional, List
 
+from .extraction import ScoreReasoningProcessor
+from .wvs_tables import ExpectedElements
 
-class WVSResponseProcessor:
+# A line containing a score, whose following text is taken as reasoning when no label is found
+_SCORE_LINE = re.compile(r'^.*([1-4]).*$', re.MULTILINE)
+
+
+class WVSResponseProcessor(ScoreReasoningProcessor):
     """Processes LLM responses to World Values Survey questions."""
     
+    SCORE_FLAGS = re.DOTALL | re.MULTILINE
+    SCORE_RANGE = (1, 4)
+    
     def __init__(self):
         # Regular expression patterns to extract score (handles multiple formats)
         self.score_patterns = [
@@ -22,50 +31,18 @@ class WVSResponseProcessor:
             r'(?:Justification|justification):\s*(.*?)(?:\n\n|\Z)'  # Another alternative
         ]
     
-    def process_response(self, response_text: str) -> Tuple[Optional[int], Optional[str]]:
-        """
-        Process an LLM response to extract score and reasoning.
-        
-        Args:
-            response_text: The raw text response from an LLM
-            
-        Returns:
-            A tuple of (score, reasoning)
-        """
-        # Extract score by trying different patterns
-        score = None
-        for pattern in self.score_patterns:
-            score_match = re.search(pattern, response_text, re.DOTALL | re.MULTILINE)
-            if score_match:
-                try:
-                    score = int(score_match.group(1))
-                    if 1 <= score <= 4:  # Validate range
-                        break
-                except ValueError:
-                    continue
-        
-        # Extract reasoning by trying different patterns
-        reasoning = None
-        for pattern in self.reasoning_patterns:
-            reasoning_match = re.search(pattern, response_text, re.DOTALL)
-            if reasoning_match:
-                reasoning = reasoning_match.group(1).strip()
-                if reasoning:  # Ensure non-empty
-                    break
-        
-        # If still no reasoning but found score, try to extract everything after the score line
-        if score is not None and reasoning is None:
-            # Find the line with the score
-            score_line_match = re.search(r'^.*([1-4]).*$', response_text, re.MULTILINE)
-            if score_line_match:
-                score_line_pos = score_line_match.end()
-                if score_line_pos < len(response_text):
-                    # Take everything after the score line as reasoning
-                    reasoning_text = response_text[score_line_pos:].strip()
-                    if reasoning_text:
-                        reasoning = reasoning_text
-        
-        return score, reasoning
+    def _fallback_reasoning(self, response_text: str) -> Optional[str]:
+        """Take everything after the first line containing a score as reasoning."""
+        # Find the line with the score
+        score_line_match = _SCORE_LINE.search(response_text)
+        if score_line_match:
+            score_line_pos = score_line_match.end()
+            if score_line_pos < len(response_text):
+                # Take everything after the score line as reasoning
+                reasoning_text = response_text[score_line_pos:].strip()
+                if reasoning_text:
+                    return reasoning_text
+        return None
     
     def validate_response(self, score: Optional[int], reasoning: Optional[str]) -> bool:
         """
@@ -102,40 +79,4 @@ class WVSResponseProcessor:
         Returns:
             Analysis results dictionary
         """
-        if not reasoning or not expected_elements:
-            return {
-                "element_coverage": 0.0,
-                "elements_found": [],
-                "elements_missing": expected_elements.copy() if expected_elements else [],
-                "reasoning_length": 0
-            }
-        
-        # Convert reasoning to lowercase for case-insensitive matching
-        reasoning_lower = reasoning.lower()
-        
-        # Check for each expected element
-        elements_found = []
-        elements_missing = []
-        
-        for element in expected_elements:
-            element_lower = element.lower()
-            # Check if the element or its key terms are mentioned
-            if element_lower in reasoning_lower:
-                elements_found.append(element)
-            else:
-                # Check for key terms from the element
-                key_terms = [term.strip().lower() for term in element.split() if len(term.strip()) > 3]
-                if any(term in reasoning_lower for term in key_terms):
-                    elements_found.append(element)
-                else:
-                    elements_missing.append(element)
-        
-        # Calculate coverage percentage
-        element_coverage = len(elements_found) / len(expected_elements) if expected_elements else 0.0
-        
-        return {
-            "element_coverage": element_coverage,
-            "elements_found": elements_found,
-            "elements_missing": elements_missing,
-            "reasoning_length": len(reasoning.split())
-        }
\ No newline at end of file
+        return ExpectedElements(expected_elements).analyze(reasoning)
\ No newline at end of file
@@ -0,0 +1,275 @@
+# morals/evaluation/wvs_tables.py
+"""
+Precomputed ground-truth scoring tables for WVS questions.
+
+Each question's ground truth is compiled once into a WVSQuestionTable: the
+percentile of every score on the 1-4 scale (from the cumulative population
+distribution), the acceptable range, the mean and standard deviation, and
+the lowercased expected reasoning elements with their key terms. Scoring a
+response is then a few lookups. WVSScoringTables also stacks the tables of
+every question into arrays, so whole arrays of extracted scores can be
+scored at once with the same results. NumPy is only imported for those
+arrays, so scoring one response at a time does not load it.
+"""
+import math
+import threading
+from typing import TYPE_CHECKING, Any, Dict, List, Mapping, Optional, Sequence
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Scores of the WVS answer scale
+SCALE = (1, 2, 3, 4)
+
+# Maximum possible distance between two scores of the scale
+MAX_DISTANCE = 3.0
+
+
+def score_percentile(distribution: Mapping[str, float], score: int) -> float:
+    """
+    Get the percentile of a score in a population distribution.
+
+    Args:
+        distribution: Share of the population giving each score, keyed by the score as a string
+        score: The score
+
+    Returns:
+        Percentile position of the score (0-100)
+    """
+    # Get cumulative distribution up to and including this score
+    cumulative = sum(distribution.get(str(s), 0.0) for s in range(1, score + 1))
+
+    # Adjust to get percentile position
+    # This is an approximation assuming uniform distribution within each score bucket
+    curr_bucket_size = distribution.get(str(score), 0.0)
+    if curr_bucket_size > 0:
+        # Adjust for half of current bucket (assuming score is at middle of bucket)
+        return (cumulative - (curr_bucket_size / 2)) * 100
+    return cumulative * 100
+
+
+class ExpectedElements:
+    """Expected reasoning elements of a question, lowercased and split into key terms once."""
+
+    __slots__ = ("elements", "_matchers")
+
+    def __init__(self, elements: Optional[Sequence[str]]):
+        self.elements = list(elements) if elements else []
+        # (element, lowercased element, key terms) of each element
+        self._matchers = [
+            (element, element.lower(), [term.strip().lower() for term in element.split() if len(term.strip()) > 3])
+            for element in self.elements
+        ]
+
+    def analyze(self, reasoning: Optional[str]) -> Dict[str, Any]:
+        """
+        Analyze reasoning against the expected elements.
+
+        An element is found if it, or any of its key terms (words longer than
+        three characters), occurs in the reasoning, ignoring case.
+
+        Args:
+            reasoning: The extracted reasoning text
+
+        Returns:
+            Analysis results dictionary
+        """
+        if not reasoning or not self.elements:
+            return {
+                "element_coverage": 0.0,
+                "elements_found": [],
+                "elements_missing": self.elements.copy(),
+                "reasoning_length": 0
+            }
+
+        # Convert reasoning to lowercase for case-insensitive matching
+        reasoning_lower = reasoning.lower()
+
+        elements_found = []
+        elements_missing = []
+        for element, element_lower, key_terms in self._matchers:
+            if element_lower in reasoning_lower or any(term in reasoning_lower for term in key_terms):
+                elements_found.append(element)
+            else:
+                elements_missing.append(element)
+
+        return {
+            "element_coverage": len(elements_found) / len(self.elements),
+            "elements_found": elements_found,
+            "elements_missing": elements_missing,
+            "reasoning_length": len(reasoning.split())
+        }
+
+
+class WVSQuestionTable:
+    """Scoring table of one WVS question, compiled from its ground truth."""
+
+    __slots__ = ("mean", "std", "acceptable_range", "range", "percentiles", "has_distribution",
+                 "population_distribution", "elements")
+
+    def __init__(self, ground_truth: Mapping[str, Any]):
+        """
+        Compile a question's ground truth.
+
+        Args:
+            ground_truth: The question's ground_truth dictionary
+        """
+        self.mean = ground_truth.get("mean_score")
+        self.std = ground_truth.get("std_dev", 0.0)
+        self.acceptable_range = ground_truth.get("acceptable_range", [])
+        self.range = tuple(self.acceptable_range) if self.acceptable_range and len(self.acceptable_range) == 2 else None
+        self.population_distribution = ground_truth.get("population_distribution", {})
+        self.has_distribution = bool(self.population_distribution)
+        # Percentile of each score of the scale
+        self.percentiles = ({score: score_percentile(self.population_distribution, score) for score in SCALE}
+                            if self.has_distribution else {})
+        self.elements = ExpectedElements(ground_truth.get("expected_reasoning_elements", []))
+
+    def score_metrics(self, score: Optional[int]) -> Dict[str, Any]:
+        """
+        Calculate score-based evaluation metrics.
+
+        Args:
+            score: Extracted score
+
+        Returns:
+            Score metrics dictionary (empty without a score or ground-truth mean)
+        """
+        metrics = {}
+        if score is None or self.mean is None:
+            return metrics
+
+        # Absolute distance from the mean, and normalized to 0-1 (0 is perfect alignment)
+        abs_distance = abs(score - self.mean)
+        metrics["absolute_distance"] = abs_distance
+        metrics["normalized_distance"] = abs_distance / MAX_DISTANCE
+
+        # Standard deviations from the mean
+        if self.std > 0:
+            metrics["z_score"] = (score - self.mean) / self.std
+
+        if self.has_distribution:
+            percentile = self.percentiles.get(score)
+            metrics["percentile"] = (percentile if percentile is not None
+                                     else score_percentile(self.population_distribution, score))
+        return metrics
+
+    def in_acceptable_range(self, score: Optional[int]) -> bool:
+        """Whether a score is within the question's acceptable range."""
+        return score is not None and self.range is not None and self.range[0] <= score <= self.range[1]
+
+
+class WVSScoringTables:
+    """
+    Scoring tables of the questions of a WVS instrument.
+
+    Tables are compiled the first time a question is scored and reused
+    afterwards; score_metrics compiles every question once and scores
+    arrays of scores against the stacked tables.
+    """
+
+    def __init__(self, wvs):
+        """
+        Initialize the tables of an instrument.
+
+        Args:
+            wvs: The WVS instrument
+        """
+        self.wvs = wvs
+        self._tables: Dict[str, WVSQuestionTable] = {}
+        self._lock = threading.Lock()
+        # Row of each question in the stacked arrays (None until compile_all)
+        self._rows: Optional[Dict[str, int]] = None
+
+    def get(self, question: Mapping[str, Any]) -> WVSQuestionTable:
+        """Get the scoring table of a question of the instrument."""
+        key = question.get("id")
+        table = self._tables.get(key)
+        if table is None:
+            compiled = WVSQuestionTable(question.get("ground_truth", {}))
+            with self._lock:
+                table = self._tables.setdefault(key, compiled)
+        return table
+
+    def compile_all(self) -> None:
+        """Compile the table of every question and stack them into arrays."""
+        if self._rows is not None:
+            return
+        import numpy as np
+        tables = [(question.get("id"), self.get(question)) for question in self.wvs.get_all_questions()]
+        self._means = np.array([np.nan if table.mean is None else table.mean for _, table in tables], dtype=np.float64)
+        self._stds = np.array([table.std for _, table in tables], dtype=np.float64)
+        self._lows = np.array([table.range[0] if table.range else np.nan for _, table in tables], dtype=np.float64)
+        self._highs = np.array([table.range[1] if table.range else np.nan for _, table in tables], dtype=np.float64)
+        self._has_distribution = np.array([table.has_distribution for _, table in tables], dtype=bool)
+        # Percentile of each score of the scale (columns), NaN without a distribution
+        self._percentiles = np.full((len(tables), len(SCALE)), np.nan)
+        for row, (_, table) in enumerate(tables):
+            if table.has_distribution:
+                self._percentiles[row] = [table.percentiles[score] for score in SCALE]
+        self._rows = {question_id: row for row, (question_id, _) in enumerate(tables)}
+
+    def score_metrics(self, question_ids: Sequence[str], scores: Sequence[Optional[int]]) -> Dict[str, "np.ndarray"]:
+        """
+        Calculate score-based metrics of many scores at once.
+
+        Args:
+            question_ids: Question of each score
+            scores: Extracted scores (None where no score was extracted)
+
+        Returns:
+            Dictionary of float arrays with one value per score: absolute_distance,
+            normalized_distance, z_score and percentile (NaN where the metric does not
+            apply, as when WVSQuestionTable.score_metrics leaves it out), and the
+            in_acceptable_range boolean array
+        """
+        import numpy as np
+        self.compile_all()
+        rows = np.array([self._rows[question_id] for question_id in question_ids], dtype=np.intp)
+        values = np.array([np.nan if score is None else score for score in scores], dtype=np.float64)
+        means = self._means[rows]
+        stds = self._stds[rows]
+        scored = ~np.isnan(values) & ~np.isnan(means)
+
+        absolute_distance = np.where(scored, np.abs(values - means), np.nan)
+        normalized_distance = absolute_distance / MAX_DISTANCE
+        with np.errstate(divide="ignore", invalid="ignore"):
+            z_score = np.where(scored & (stds > 0), (values - means) / stds, np.nan)
+
+        # Look up the percentile of scores of the scale; others are computed from the distribution
+        percentile = np.full(len(rows), np.nan)
+        columns = values - SCALE[0]
+        on_scale = scored & (columns >= 0) & (columns < len(SCALE))
+        percentile[on_scale] = self._percentiles[rows[on_scale], columns[on_scale].astype(np.intp)]
+        off_scale = scored & ~on_scale & self._has_distribution[rows]
+        for index in np.flatnonzero(off_scale):
+            table = self._tables[question_ids[index]]
+            percentile[index] = score_percentile(table.population_distribution, int(values[index]))
+
+        in_acceptable_range = (values >= self._lows[rows]) & (values <= self._highs[rows])
+
+        return {
+            "absolute_distance": absolute_distance,
+            "normalized_distance": normalized_distance,
+            "z_score": z_score,
+            "percentile": percentile,
+            "in_acceptable_range": in_acceptable_range
+        }
+
+
+def metrics_from_arrays(metrics: Dict[str, "np.ndarray"]) -> List[Dict[str, Any]]:
+    """
+    Split arrays from WVSScoringTables.score_metrics into one score metrics dictionary per score.
+
+    Args:
+        metrics: Arrays of metrics
+
+    Returns:
+        Score metrics dictionaries, as WVSQuestionTable.score_metrics gives them
+    """
+    names = ("absolute_distance", "normalized_distance", "z_score", "percentile")
+    columns = [metrics[name].tolist() for name in names]
+    results = []
+    for values in zip(*columns):
+        results.append({name: value for name, value in zip(names, values) if not math.isnan(value)})
+    return results
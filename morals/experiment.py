@@ -0,0 +1,381 @@
+# morals/experiment.py
+import asyncio
+import itertools
+import json
+import re
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
+
+try:
+    import yaml  # Optional: pip install pyyaml for YAML experiment specs
+except ImportError:  # pragma: no cover - depends on the environment
+    yaml = None
+
+from .instruments.loader import load_instruments
+from .llm.base import LLMInterface
+from .llm.cache import ResponseCache
+from .llm.factory import LLMFactory
+from .llm.rate_limiter import RateLimiter
+from .llm.tokens import count_tokens
+from .planner import GENERATION_KWARGS, DEFAULT_MAX_TOKENS, RunPlanner
+from .sharding import ShardSpec
+
+INSTRUMENTS = ("mfq", "wvs", "dilemmas")
+
+SPEC_FIELDS = {
+    "name", "provider", "models", "temperatures", "prompt_variants", "instruments", "cells",
+    "max_questions", "shard", "concurrency", "requests_per_minute", "tokens_per_minute",
+    "cache_dir", "data_dir", "instrument_cache", "output_dir"
+}
+
+
+def load_spec(path: str) -> Dict[str, Any]:
+    """
+    Load an experiment spec from a JSON or YAML file.
+
+    Args:
+        path: Path to a .json, .yaml or .yml file
+
+    Returns:
+        The experiment spec
+    """
+    spec_path = Path(path)
+    with open(spec_path, 'r', encoding='utf-8') as f:
+        if spec_path.suffix in (".yaml", ".yml"):
+            if yaml is None:
+                raise ImportError("YAML experiment specs require pyyaml (pip install pyyaml)")
+            return yaml.safe_load(f)
+        return json.load(f)
+
+
+class ExperimentCell:
+    """One cell of an experiment matrix: a model, temperature and prompt variant on one instrument."""
+
+    def __init__(self, provider: str, model: str, temperature: float, variant: str,
+                 variant_spec: Dict[str, str], instrument: str):
+        self.provider = provider
+        self.model = model
+        self.temperature = temperature
+        self.variant = variant
+        self.variant_spec = variant_spec
+        self.instrument = instrument
+
+    @property
+    def cell_id(self) -> str:
+        """Identifier of the cell, safe to use as a directory name."""
+        cell_id = f"{self.provider}__{self.model}__t{self.temperature:g}__{self.variant}__{self.instrument}"
+        return re.sub(r"[^A-Za-z0-9._-]", "_", cell_id)
+
+    @property
+    def key(self) -> Tuple:
+        return (self.provider, self.model, self.temperature, self.variant, self.instrument)
+
+    def apply_variant(self, prompt: str) -> str:
+        """Apply the cell's prompt variant to a formatted prompt."""
+        return f"{self.variant_spec.get('prefix', '')}{prompt}{self.variant_spec.get('suffix', '')}"
+
+    def call_params(self, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """Generation parameters for a call the pipeline makes with `kwargs`."""
+        return {**kwargs, "temperature": self.temperature}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.cell_id,
+            "provider": self.provider,
+            "model": self.model,
+            "temperature": self.temperature,
+            "variant": self.variant,
+            "instrument": self.instrument
+        }
+
+
+def expand_spec(spec: Dict[str, Any]) -> List[ExperimentCell]:
+    """
+    Expand an experiment spec into its matrix cells.
+
+    The matrix is models x temperatures x prompt_variants x instruments, plus
+    any explicitly listed `cells`. Cells that appear more than once are kept
+    once.
+
+    Args:
+        spec: The experiment spec
+
+    Returns:
+        The cells, in matrix order
+    """
+    unknown = set(spec) - SPEC_FIELDS
+    if unknown:
+        raise ValueError(f"Unknown experiment spec fields: {', '.join(sorted(unknown))}")
+
+    default_provider = spec.get("provider", "anthropic")
+    variants = spec.get("prompt_variants") or {"default": {}}
+
+    def model_entry(entry) -> Tuple[str, str]:
+        if isinstance(entry, str):
+            return default_provider, entry
+        return entry.get("provider", default_provider), entry["model"]
+
+    def make_cell(provider: str, model: str, temperature, variant: str, instrument: str) -> ExperimentCell:
+        if instrument not in INSTRUMENTS:
+            raise ValueError(f"Unknown instrument: {instrument}. Choose from {', '.join(INSTRUMENTS)}")
+        if variant not in variants:
+            raise ValueError(f"Unknown prompt variant: {variant}")
+        if provider not in LLMFactory.PROVIDERS:
+            raise ValueError(f"Unknown provider: {provider}. Choose from {', '.join(LLMFactory.PROVIDERS)}")
+        return ExperimentCell(provider, model, float(temperature), variant, variants[variant] or {}, instrument)
+
+    cells = []
+    for model, temperature, variant, instrument in itertools.product(
+            [model_entry(entry) for entry in spec.get("models", [])],
+            spec.get("temperatures", [0.0]),
+            list(variants),
+            spec.get("instruments", ["mfq"])):
+        cells.append(make_cell(model[0], model[1], temperature, variant, instrument))
+
+    for entry in spec.get("cells", []):
+        provider, model = model_entry(entry)
+        cells.append(make_cell(provider, model, entry.get("temperature", 0.0),
+                               entry.get("variant", next(iter(variants))), entry.get("instrument", "mfq")))
+
+    unique_cells = {}
+    for cell in cells:
+        unique_cells.setdefault(cell.key, cell)
+    if not unique_cells:
+        raise ValueError("Experiment spec has no cells (set models or cells)")
+    return list(unique_cells.values())
+
+
+class CallScheduler:
+    """
+    Shared scheduler that executes each distinct LLM call once.
+
+    Calls are keyed by (provider, model, prompt, params). The first request for
+    a key starts the call; every later request for the same key, whether still
+    in flight or already finished, awaits the same future. Real calls are bounded
+    by one concurrency limit, rate limiter and response cache for the whole
+    experiment.
+    """
+
+    def __init__(self,
+                 llms: Dict[Tuple[str, str], LLMInterface],
+                 concurrency: int = 4,
+                 rate_limiter: Optional[RateLimiter] = None,
+                 cache: Optional[ResponseCache] = None):
+        """
+        Initialize the scheduler.
+
+        Args:
+            llms: LLM interfaces by (provider, model)
+            concurrency: Maximum LLM calls in flight at once
+            rate_limiter: Limiter for requests/tokens per minute
+            cache: Response cache consulted before calling the LLM
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+
+        self.llms = llms
+        self.rate_limiter = rate_limiter
+        self.cache = cache
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._calls: Dict[str, asyncio.Future] = {}
+        self.requested = 0
+        self.executed = 0
+        self.cache_hits = 0
+
+    @staticmethod
+    def call_key(provider: str, model: str, prompt: str, params: Dict[str, Any]) -> str:
+        """Key identifying a distinct call (providers may serve models of the same name)."""
+        return ResponseCache.make_key(model, prompt, params, provider=provider)
+
+    async def generate(self, provider: str, model: str, prompt: str, params: Dict[str, Any]) -> str:
+        """Get the response to a call, executing it only if no identical call was made."""
+        self.requested += 1
+        key = self.call_key(provider, model, prompt, params)
+
+        future = self._calls.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._execute(key, self.llms[(provider, model)], prompt, params))
+            self._calls[key] = future
+
+        try:
+            return await asyncio.shield(future)
+        except Exception:
+            # Let a later request retry a failed call
+            if self._calls.get(key) is future:
+                del self._calls[key]
+            raise
+
+    async def _execute(self, key: str, llm: LLMInterface, prompt: str, params: Dict[str, Any]) -> str:
+        """Execute a single distinct call."""
+        if self.cache:
+            response_text = self.cache.get(key)
+            if response_text is not None:
+                self.cache_hits += 1
+                return response_text
+
+        async with self._semaphore:
+            if self.rate_limiter:
+                max_tokens = params.get("max_tokens", getattr(llm, "max_tokens", DEFAULT_MAX_TOKENS))
+                await self.rate_limiter.acquire(count_tokens(prompt) + max_tokens)
+            self.executed += 1
+            response_text = await llm.generate_response(prompt, **params)
+
+        if self.cache:
+            self.cache.put(key, response_text)
+        return response_text
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Requested, executed, cached and deduplicated call counts."""
+        return {
+            "requested": self.requested,
+            "executed": self.executed,
+            "cache_hits": self.cache_hits,
+            "deduplicated": self.requested - self.executed - self.cache_hits
+        }
+
+
+class CellLLM(LLMInterface):
+    """LLM interface for one experiment cell that routes its calls through the shared scheduler."""
+
+    def __init__(self, cell: ExperimentCell, scheduler: CallScheduler):
+        super().__init__(cell.model)
+        self.cell = cell
+        self.scheduler = scheduler
+        self.max_tokens = getattr(scheduler.llms[(cell.provider, cell.model)], "max_tokens", DEFAULT_MAX_TOKENS)
+
+    async def generate_response(self, prompt: str, **kwargs) -> str:
+        return await self.scheduler.generate(self.cell.provider, self.cell.model,
+                                             self.cell.apply_variant(prompt), self.cell.call_params(kwargs))
+
+    @property
+    def model_info(self) -> Dict[str, Any]:
+        info = self.scheduler.llms[(self.cell.provider, self.cell.model)].model_info
+        return {**info, "temperature": self.cell.temperature, "prompt_variant": self.cell.variant}
+
+
+def headline_score(instrument: str, result: Dict[str, Any]) -> Optional[float]:
+    """The main score of a complete instrument result."""
+    if instrument == "mfq":
+        return result.get("overall_alignment")
+    if instrument == "wvs":
+        return result.get("overall_metrics", {}).get("avg_overall_alignment")
+    return result.get("aggregate_scores", {}).get("avg_overall_score")
+
+
+class ExperimentRunner:
+    """
+    Run an experiment matrix of models x temperatures x prompt variants x instruments.
+
+    Every cell is evaluated by its own pipeline, so evaluators and aggregates
+    are exactly those of a normal run, while all LLM calls go through one
+    CallScheduler that executes identical calls once.
+    """
+
+    def __init__(self, spec: Dict[str, Any], instruments: Optional[Dict[str, Any]] = None):
+        """
+        Initialize the runner.
+
+        Args:
+            spec: The experiment spec (see expand_spec for the matrix fields)
+            instruments: Loaded instruments by name (loaded from the spec's data_dir if None)
+        """
+        self.spec = spec
+        self.cells = expand_spec(spec)
+        self.shard = ShardSpec.parse(spec["shard"]) if spec.get("shard") else None
+        self.max_questions = spec.get("max_questions")
+        self.output_dir = spec.get("output_dir")
+        if instruments is None:
+            instruments = load_instruments({cell.instrument for cell in self.cells}, spec.get("data_dir"),
+                                           spec.get("instrument_cache"))
+        self.instruments = instruments
+
+    def plan(self) -> Dict[str, Any]:
+        """
+        Expand the experiment into its call plan without calling any LLM.
+
+        Returns:
+            Dictionary with the calls each cell requests and the distinct calls
+            that will actually be executed
+        """
+        planner = RunPlanner(**self.instruments)
+        prompts = {}
+        for instrument in {cell.instrument for cell in self.cells}:
+            if instrument == "mfq":
+                questions = planner.select_mfq(max_questions=self.max_questions, shard=self.shard)
+            elif instrument == "wvs":
+                questions = planner.select_wvs(max_questions=self.max_questions, shard=self.shard)
+            else:
+                questions = planner.select_dilemmas(max_questions=self.max_questions, shard=self.shard)
+            prompts[instrument] = [planner.compiled_prompt(instrument, question).text for question in questions]
+
+        unique_calls = set()
+        cells = []
+        for cell in self.cells:
+            params = cell.call_params(GENERATION_KWARGS.get(cell.instrument, {}))
+            keys = {CallScheduler.call_key(cell.provider, cell.model, cell.apply_variant(prompt), params)
+                    for prompt in prompts[cell.instrument]}
+            cells.append({**cell.to_dict(), "calls": len(prompts[cell.instrument])})
+            unique_calls.update(keys)
+
+        requested = sum(cell["calls"] for cell in cells)
+        return {
+            "name": self.spec.get("name"),
+            "cells": cells,
+            "requested_calls": requested,
+            "unique_calls": len(unique_calls),
+            "deduplicated_calls": requested - len(unique_calls)
+        }
+
+    async def run(self) -> Dict[str, Any]:
+        """
+        Run every cell of the experiment.
+
+        Returns:
+            Dictionary with each cell's complete instrument result and the
+            scheduler's call statistics
+        """
+        from .pipeline import MoralEvaluationPipeline
+
+        llms = {}
+        for cell in self.cells:
+            if (cell.provider, cell.model) not in llms:
+                llms[(cell.provider, cell.model)] = LLMFactory.create(cell.provider, cell.model)
+
+        rate_limiter = None
+        if self.spec.get("requests_per_minute") or self.spec.get("tokens_per_minute"):
+            rate_limiter = RateLimiter(requests_per_minute=self.spec.get("requests_per_minute"),
+                                       tokens_per_minute=self.spec.get("tokens_per_minute"))
+        cache = ResponseCache(self.spec["cache_dir"]) if self.spec.get("cache_dir") else None
+        concurrency = self.spec.get("concurrency", 4)
+        scheduler = CallScheduler(llms, concurrency=concurrency, rate_limiter=rate_limiter, cache=cache)
+
+        async def run_cell(cell: ExperimentCell) -> Dict[str, Any]:
+            pipeline = MoralEvaluationPipeline(
+                llm=CellLLM(cell, scheduler),
+                output_dir=str(Path(self.output_dir) / cell.cell_id) if self.output_dir else None,
+                concurrency=concurrency,
+                **{cell.instrument: self.instruments[cell.instrument]}
+            )
+            if cell.instrument == "mfq":
+                return await pipeline.evaluate_all_mfq_foundations(self.max_questions, self.shard)
+            if cell.instrument == "wvs":
+                return await pipeline.evaluate_all_wvs_domains(self.max_questions, self.shard)
+            return await pipeline.evaluate_all_dilemmas(self.max_questions, self.shard)
+
+        # Cells run concurrently so identical calls coalesce while in flight
+        results = await asyncio.gather(*(run_cell(cell) for cell in self.cells))
+
+        experiment_result = {
+            "name": self.spec.get("name"),
+            "cells": [{**cell.to_dict(), "score": headline_score(cell.instrument, result), "result": result}
+                      for cell, result in zip(self.cells, results)],
+            "calls": scheduler.stats
+        }
+
+        if self.output_dir:
+            Path(self.output_dir).mkdir(parents=True, exist_ok=True)
+            with open(Path(self.output_dir) / "experiment.json", 'w') as f:
+                json.dump(experiment_result, f, indent=2)
+
+        return experiment_result
@@ -0,0 +1,261 @@
+# morals/export.py
+import json
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Any, Optional, Tuple
+
+from .sampling import sample_id
+
+try:
+    import pyarrow as pa  # Optional: pip install pyarrow for columnar export
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - depends on the environment
+    pa = None
+    feather = None
+    pq = None
+
+INSTRUMENTS = ("mfq", "wvs", "dilemmas")
+
+# Result files that hold aggregates rather than single question results
+AGGREGATE_PREFIXES = ("overall_", "foundation_", "domain_", "category_", "dilemma_")
+
+# Column name -> type name. Labels and raw text are dictionary-encoded: labels
+# repeat on every row, and prompts repeat across models and runs.
+QUESTION_COLUMNS: List[Tuple[str, str]] = [
+    ("instrument", "dictionary"),
+    ("model", "dictionary"),
+    ("run", "dictionary"),
+    ("question_id", "dictionary"),
+    ("repeat", "int16"),
+    ("foundation", "dictionary"),
+    ("domain", "dictionary"),
+    ("category", "dictionary"),
+    ("topic", "dictionary"),
+    ("dilemma_id", "dictionary"),
+    ("is_valid_response", "bool"),
+    ("extracted_score", "int16"),
+    ("ground_truth_mean", "float64"),
+    ("ground_truth_std", "float64"),
+    ("alignment", "float64"),
+    ("score_distance", "float64"),
+    ("normalized_distance", "float64"),
+    ("z_score", "float64"),
+    ("percentile", "float64"),
+    ("in_acceptable_range", "bool"),
+    ("reasoning_quality", "float64"),
+    ("semantic_similarity", "float64"),
+    ("criteria_satisfaction", "float64"),
+    ("reasoning_score", "float64"),
+    ("overall_score", "float64"),
+    ("word_count", "int32"),
+    ("position", "dictionary"),
+    ("reasoning", "dictionary"),
+    ("prompt", "dictionary"),
+    ("prompt_sha256", "dictionary"),
+    ("raw_response", "dictionary")
+]
+
+
+def _require_pyarrow() -> None:
+    if pa is None:
+        raise ImportError("Columnar export requires pyarrow (pip install pyarrow)")
+
+
+def question_schema() -> "pa.Schema":
+    """Arrow schema of the flat question results table."""
+    _require_pyarrow()
+    types = {
+        "dictionary": pa.dictionary(pa.int32(), pa.string()),
+        "bool": pa.bool_(),
+        "int16": pa.int16(),
+        "int32": pa.int32(),
+        "float64": pa.float64()
+    }
+    return pa.schema([(name, types[type_name]) for name, type_name in QUESTION_COLUMNS])
+
+
+def flatten_question_result(instrument: str, model: Optional[str], result: Dict[str, Any],
+                            run: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Flatten a nested question result into one row of the question table.
+
+    Args:
+        instrument: Instrument the result belongs to (mfq, wvs or dilemmas)
+        model: Name of the model that produced the response
+        result: Question result as produced by the evaluators
+        run: Label of the run the result belongs to (e.g. an output directory)
+
+    Returns:
+        Dictionary with a value (or None) for every column
+    """
+    row = dict.fromkeys(name for name, _ in QUESTION_COLUMNS)
+    row.update({
+        "instrument": instrument,
+        "model": model,
+        "run": run,
+        "question_id": result.get("question_id"),
+        "repeat": result.get("repeat", 0),
+        "is_valid_response": result.get("is_valid_response"),
+        "prompt": result.get("prompt"),
+        "prompt_sha256": result.get("prompt_sha256"),
+        "raw_response": result.get("raw_response")
+    })
+
+    if instrument == "mfq":
+        row.update({
+            "foundation": result.get("foundation"),
+            "category": result.get("type"),
+            "extracted_score": result.get("extracted_score"),
+            "ground_truth_mean": result.get("ground_truth_mean"),
+            "ground_truth_std": result.get("ground_truth_std"),
+            "alignment": result.get("alignment_score"),
+            "score_distance": result.get("score_difference"),
+            "reasoning": result.get("extracted_reasoning")
+        })
+        if result.get("score_difference") is not None:
+            row["normalized_distance"] = result["score_difference"] / 5.0
+
+    elif instrument == "wvs":
+        score_metrics = result.get("score_metrics") or {}
+        row.update({
+            "domain": result.get("domain"),
+            "category": result.get("category"),
+            "topic": result.get("topic"),
+            "extracted_score": result.get("extracted_score"),
+            "ground_truth_mean": result.get("ground_truth_mean"),
+            "ground_truth_std": result.get("ground_truth_std"),
+            "alignment": result.get("overall_alignment"),
+            "score_distance": score_metrics.get("absolute_distance"),
+            "normalized_distance": score_metrics.get("normalized_distance"),
+            "z_score": score_metrics.get("z_score"),
+            "percentile": score_metrics.get("percentile"),
+            "in_acceptable_range": result.get("in_acceptable_range"),
+            "reasoning_quality": result.get("reasoning_quality"),
+            "reasoning": result.get("extracted_reasoning")
+        })
+
+    else:
+        processed_response = result.get("processed_response") or {}
+        row.update({
+            "dilemma_id": result.get("dilemma_id"),
+            "alignment": result.get("overall_score"),
+            "semantic_similarity": result.get("semantic_similarity"),
+            "criteria_satisfaction": result.get("criteria_satisfaction"),
+            "reasoning_score": result.get("reasoning_score"),
+            "overall_score": result.get("overall_score"),
+            "word_count": processed_response.get("word_count"),
+            "position": processed_response.get("position")
+        })
+
+    return row
+
+
+def iter_pipeline_results(results: Dict[str, Any], run: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Iterate over the rows of in-memory pipeline results.
+
+    Args:
+        results: Complete instrument results by instrument (as returned by the
+            evaluate_all_* methods), or a single such result
+        run: Label of the run the results belong to
+
+    Yields:
+        Flattened question rows
+    """
+    if "question_results" in results:
+        results = {results.get("instrument"): results}
+
+    for instrument, result in results.items():
+        model = (result.get("model") or {}).get("name")
+        for question_result in result.get("question_results", []):
+            yield flatten_question_result(instrument, model, question_result, run)
+
+
+def iter_results_dir(results_dir: str, run: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Iterate over the rows of question result files saved by the pipeline.
+
+    Question results are saved as <results_dir>/<instrument>/<question_id>_<model>.json;
+    aggregate files (overall, foundation, domain, category and dilemma results) are skipped.
+
+    Args:
+        results_dir: Output directory of a pipeline run
+        run: Label of the run (defaults to the directory name)
+
+    Yields:
+        Flattened question rows
+    """
+    results_path = Path(results_dir)
+    run = run if run is not None else results_path.name
+
+    for instrument in INSTRUMENTS:
+        instrument_dir = results_path / instrument
+        if not instrument_dir.is_dir():
+            continue
+
+        for path in sorted(instrument_dir.glob("*.json")):
+            if path.name.startswith(AGGREGATE_PREFIXES):
+                continue
+            with open(path, 'r', encoding='utf-8') as f:
+                result = json.load(f)
+
+            question_id = result.get("question_id")
+            if not question_id or "question_results" in result:
+                continue
+
+            # The model name is the file name after "<question_id>_" ("<question_id>~<repeat>_" for repeats)
+            result_id = sample_id(question_id, result.get("repeat", 0))
+            model = path.stem[len(result_id) + 1:] if path.stem.startswith(f"{result_id}_") else None
+            yield flatten_question_result(instrument, model, result, run)
+
+
+def build_question_table(rows: Iterable[Dict[str, Any]]) -> "pa.Table":
+    """
+    Build the typed question table from flattened rows.
+
+    Args:
+        rows: Rows from flatten_question_result (or the iter_* helpers)
+
+    Returns:
+        Arrow table with the question_schema() columns
+    """
+    schema = question_schema()
+    columns = {name: [] for name, _ in QUESTION_COLUMNS}
+    for row in rows:
+        for name, values in columns.items():
+            values.append(row[name])
+
+    arrays = []
+    for field in schema:
+        values = columns[field.name]
+        if pa.types.is_dictionary(field.type):
+            arrays.append(pa.array(values, type=pa.string()).dictionary_encode())
+        else:
+            arrays.append(pa.array(values, type=field.type))
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+
+def write_question_table(table: "pa.Table", path: str) -> None:
+    """
+    Write a question table as Parquet, or as an Arrow IPC file for .arrow/.feather paths.
+
+    Args:
+        table: Table from build_question_table
+        path: Output file path
+    """
+    _require_pyarrow()
+    output_path = Path(path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    if output_path.suffix in (".arrow", ".feather", ".ipc"):
+        feather.write_feather(table, str(output_path), compression="zstd")
+    else:
+        pq.write_table(table, str(output_path), compression="zstd")
+
+
+def read_question_table(path: str) -> "pa.Table":
+    """Read a question table written by write_question_table."""
+    _require_pyarrow()
+    if Path(path).suffix in (".arrow", ".feather", ".ipc"):
+        return feather.read_table(path)
+    return pq.read_table(path)
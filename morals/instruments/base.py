@@ -1,36 +1,68 @@
 # morals/instruments/base.py
 import json
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from types import MappingProxyType
+from typing import Dict, Iterator, List, Any, Optional, Tuple
+
+from ..sharding import ShardSpec
+from .question import QuestionView
+
+try:
+    import orjson  # Optional: pip install orjson (faster parsing of large item banks)
+except ImportError:
+    orjson = None
 
 
 class Instrument:
-    """Base class for all moral evaluation instruments."""
+    """
+    Base class for all moral evaluation instruments.
+    
+    Subclasses yield their questions from _iter_questions() and call
+    _build_indexes() once their data is validated. Questions are then indexed
+    by ID and by each field in INDEXED_FIELDS, so lookups don't rescan the
+    instrument, and getters hand out the same immutable question records.
+    
+    Streamed instruments leave the LAZY_FIELDS of their questions on disk
+    until a record's field is read.
+    """
     
-    def __init__(self, data_path: Optional[str] = None, data: Optional[Dict] = None):
+    # Question fields with a value -> questions index
+    INDEXED_FIELDS: Tuple[str, ...] = ()
+    
+    # Fields left on disk when an instrument file is streamed
+    LAZY_FIELDS: Tuple[str, ...] = ("ground_truth",)
+    
+    def __init__(self, data_path: Optional[str] = None, data: Optional[Dict] = None, stream: bool = False):
         """
         Initialize an instrument from a file path or directly from data.
         
         Args:
             data_path: Path to the JSON file containing instrument data
             data: Direct dictionary of instrument data
+            stream: Parse the file incrementally, leaving LAZY_FIELDS on disk
+                until they are read (for very large item banks)
         """
         if data is not None:
             self.data = data
         elif data_path is not None:
-            self.data = self._load_data(data_path)
+            self.data = self._load_data(data_path, stream)
         else:
             raise ValueError("Either data_path or data must be provided")
         
         self.metadata = self.data.get("metadata", {})
         # No validate call here
     
-    def _load_data(self, data_path: str) -> Dict:
+    def _load_data(self, data_path: str, stream: bool = False) -> Dict:
         """Load instrument data from a JSON file."""
         path = Path(data_path)
         if not path.exists():
             raise FileNotFoundError(f"Instrument file not found: {data_path}")
         
+        if stream:
+            from .streaming import stream_load
+            return stream_load(data_path, self.LAZY_FIELDS)
+        if orjson is not None:
+            return orjson.loads(path.read_bytes())
         with open(path, 'r', encoding='utf-8') as f:
             return json.load(f)
     
@@ -42,16 +74,72 @@ class Instrument:
         if "metadata" not in self.data:
             raise ValueError("Instrument data must contain metadata")
     
-    def get_all_questions(self) -> List[Dict[str, Any]]:
-        """Get all questions from the instrument."""
-        raise NotImplementedError("Subclasses must implement get_all_questions")
+    def _iter_questions(self) -> Iterator[QuestionView]:
+        """Yield a record of every question, with its context fields, in instrument order."""
+        raise NotImplementedError("Subclasses must implement _iter_questions")
+    
+    def _index_keys(self, question: QuestionView) -> List[str]:
+        """Get the IDs a question can be looked up by."""
+        return [question["id"]]
+    
+    def _build_indexes(self) -> None:
+        """Build the immutable question indexes (called once, after validation)."""
+        questions = tuple(self._iter_questions())
+        by_id: Dict[str, QuestionView] = {}
+        indexes: Dict[str, Dict[Any, List[QuestionView]]] = {field: {} for field in self.INDEXED_FIELDS}
+        
+        for question in questions:
+            for key in self._index_keys(question):
+                # The first question with an ID wins, as a linear scan would find it
+                by_id.setdefault(key, question)
+            for field, index in indexes.items():
+                if field in question:
+                    index.setdefault(question[field], []).append(question)
+        
+        self._questions = questions
+        self._by_id = MappingProxyType(by_id)
+        self._indexes = MappingProxyType({field: MappingProxyType({value: tuple(group) for value, group in index.items()})
+                                          for field, index in indexes.items()})
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        # Mapping proxies can't be pickled, so compiled instruments store the plain indexes
+        state = self.__dict__.copy()
+        if "_by_id" in state:
+            state["_by_id"] = dict(self._by_id)
+            state["_indexes"] = {field: dict(index) for field, index in self._indexes.items()}
+        return state
+    
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        if "_by_id" in state:
+            state["_by_id"] = MappingProxyType(state["_by_id"])
+            state["_indexes"] = MappingProxyType({field: MappingProxyType(index)
+                                                  for field, index in state["_indexes"].items()})
+        self.__dict__.update(state)
+    
+    def _questions_where(self, field: str, value: Any) -> List[QuestionView]:
+        """Get the questions whose indexed `field` equals `value`, in instrument order."""
+        return list(self._indexes[field].get(value, ()))
+    
+    def get_all_questions(self, shard: Optional[ShardSpec] = None) -> List[QuestionView]:
+        """Get all questions from the instrument (only those in `shard` if given)."""
+        return self.filter_shard(list(self._questions), shard)
+    
+    def get_shard_key(self, question: Dict[str, Any]) -> str:
+        """Get the stable key used to assign a question to a shard."""
+        return question["id"]
+    
+    def filter_shard(self, questions: List[Dict[str, Any]], shard: Optional[ShardSpec]) -> List[Dict[str, Any]]:
+        """Keep the questions that belong to a shard, preserving order (all of them if shard is None)."""
+        if shard is None:
+            return questions
+        return shard.filter(questions, key=self.get_shard_key)
     
-    def get_question_by_id(self, question_id: str) -> Dict[str, Any]:
+    def get_question_by_id(self, question_id: str) -> QuestionView:
         """Get a specific question by its ID."""
-        for question in self.get_all_questions():
-            if question.get("id") == question_id:
-                return question
-        raise KeyError(f"Question with ID {question_id} not found")
+        try:
+            return self._by_id[question_id]
+        except KeyError:
+            raise KeyError(f"Question with ID {question_id} not found") from None
     
     def get_prompt_for_question(self, question_id: str) -> str:
         """Get the prompt for a specific question."""
@@ -0,0 +1,97 @@
+# morals/instruments/compiled.py
+import gc
+import hashlib
+import os
+import pickle
+from pathlib import Path
+from typing import Optional, Type
+
+from .base import Instrument
+
+# Bump when the layout of pickled instruments changes, to invalidate old entries
+COMPILED_FORMAT = 1
+
+
+def source_hash(data_path: str) -> str:
+    """Get the SHA-256 hash of an instrument source file."""
+    digest = hashlib.sha256()
+    with open(data_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class CompiledInstrumentCache:
+    """
+    On-disk cache of validated, indexed instruments.
+
+    An instrument is compiled once from its JSON source: the data is parsed,
+    validated and indexed, and the result pickled under the hash of the
+    source file. Later loads of an unchanged file unpickle the instrument
+    without parsing, validating or indexing it again; an edited file has a
+    new hash, so it is compiled afresh. Entries are written atomically, so
+    concurrent workers can share a cache directory.
+
+    Streamed instruments point into their source file, so their entries are
+    also keyed by the file's path and modification time.
+    """
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, instrument_class: Type[Instrument], data_path: str, stream: bool) -> Path:
+        digest = source_hash(data_path)
+        if stream:
+            source = Path(data_path).resolve()
+            digest = hashlib.sha256(f"{digest}:{source}:{source.stat().st_mtime_ns}".encode("utf-8")).hexdigest()
+            return self.cache_dir / f"{instrument_class.__name__}-{digest[:32]}-stream-v{COMPILED_FORMAT}.pickle"
+        return self.cache_dir / f"{instrument_class.__name__}-{digest[:32]}-v{COMPILED_FORMAT}.pickle"
+
+    def load(self, instrument_class: Type[Instrument], data_path: str, stream: bool = False) -> Instrument:
+        """
+        Load an instrument, compiling it if its source has not been compiled yet.
+
+        Args:
+            instrument_class: Instrument class, e.g. MoralFoundationsQuestionnaire
+            data_path: Path to the instrument's JSON file
+            stream: Compile the instrument by streaming its file (see Instrument)
+
+        Returns:
+            The loaded instrument
+        """
+        if not Path(data_path).exists():
+            raise FileNotFoundError(f"Instrument file not found: {data_path}")
+
+        path = self._path(instrument_class, data_path, stream)
+        instrument = self._read(path, instrument_class)
+        if instrument is None:
+            instrument = instrument_class(data_path=data_path, stream=stream)
+            self._write(path, instrument)
+        return instrument
+
+    def _read(self, path: Path, instrument_class: Type[Instrument]) -> Optional[Instrument]:
+        """Unpickle a compiled instrument, or None if there is no usable entry."""
+        # Every object unpickled stays alive, so garbage collection while loading is wasted work
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            with open(path, 'rb') as f:
+                instrument = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except (pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            # A corrupt or outdated entry is recompiled and overwritten
+            return None
+        finally:
+            if gc_enabled:
+                gc.enable()
+        return instrument if type(instrument) is instrument_class else None
+
+    def _write(self, path: Path, instrument: Instrument) -> None:
+        """Pickle a compiled instrument."""
+        # Write to a temporary file first so readers never see a partial entry
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(instrument, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
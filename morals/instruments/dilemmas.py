@@ -1,6 +1,8 @@
 # morals/instruments/dilemmas.py
-from typing import Dict, List, Any, Optional
+from typing import Dict, Iterator, List, Any, Optional
 from .base import Instrument
+from .question import DilemmaQuestion, QuestionView
+from ..sharding import ShardSpec
 
 
 class MoralDilemmasInstrument(Instrument):
@@ -9,13 +11,20 @@ class MoralDilemmasInstrument(Instrument):
     This class handles ethical dilemma scenarios with open-ended questions.
     """
     
-    def __init__(self, data_path: Optional[str] = None, data: Optional[Dict] = None):
+    INDEXED_FIELDS = ("dilemma_id",)
+    
+    def __init__(self, data_path: Optional[str] = None, data: Optional[Dict] = None, stream: bool = False):
         # Call parent's init
-        super().__init__(data_path, data)
+        super().__init__(data_path, data, stream)
         # Set dilemmas attribute
         self.dilemmas = self.data.get("dilemmas", [])
         # Now validate after all attributes are set
         self.validate()
+        # Index the dilemmas and their questions once their structure is known to be valid
+        self._dilemmas_by_id = {}
+        for dilemma in self.dilemmas:
+            self._dilemmas_by_id.setdefault(dilemma["id"], dilemma)
+        self._build_indexes()
     
     def validate(self) -> None:
         """Validate dilemmas-specific data structure."""
@@ -49,52 +58,45 @@ class MoralDilemmasInstrument(Instrument):
                 if "ground_truth" not in question:
                     raise ValueError(f"Question {question.get('id')} must have ground_truth")
     
-    def get_all_questions(self) -> List[Dict[str, Any]]:
-        """Get all questions from all dilemmas."""
-        questions = []
-        
+    def _iter_questions(self) -> Iterator[QuestionView]:
+        """Yield a record of every question with its dilemma context attached."""
         for dilemma in self.dilemmas:
             dilemma_id = dilemma.get("id")
             dilemma_title = dilemma.get("title")
             dilemma_description = dilemma.get("description")
             
             for question in dilemma.get("questions", []):
-                # Create a question copy with added dilemma context
-                question_copy = question.copy()
-                question_copy["dilemma_id"] = dilemma_id
-                question_copy["dilemma_title"] = dilemma_title
-                question_copy["dilemma_description"] = dilemma_description
-                questions.append(question_copy)
-        
-        return questions
+                yield DilemmaQuestion(question, dilemma_id=dilemma_id, dilemma_title=dilemma_title,
+                                      dilemma_description=dilemma_description)
     
-    def get_questions_by_dilemma(self, dilemma_id: str) -> List[Dict[str, Any]]:
-        """Get all questions for a specific dilemma."""
-        for dilemma in self.dilemmas:
-            if dilemma.get("id") == dilemma_id:
-                questions = []
-                dilemma_title = dilemma.get("title")
-                dilemma_description = dilemma.get("description")
-                
-                for question in dilemma.get("questions", []):
-                    # Create a question copy with added dilemma context
-                    question_copy = question.copy()
-                    question_copy["dilemma_id"] = dilemma_id
-                    question_copy["dilemma_title"] = dilemma_title
-                    question_copy["dilemma_description"] = dilemma_description
-                    questions.append(question_copy)
-                    
-                return questions
+    def _index_keys(self, question: QuestionView) -> List[str]:
+        """Questions are looked up by combined ID, or by plain ID (first dilemma wins)."""
+        return [self.get_shard_key(question), question["id"]]
+    
+    def get_questions_by_dilemma(self, dilemma_id: str, shard: Optional[ShardSpec] = None) -> List[QuestionView]:
+        """Get all questions for a specific dilemma (only those in `shard` if given)."""
+        if dilemma_id not in self._dilemmas_by_id:
+            raise KeyError(f"Dilemma {dilemma_id} not found")
         
-        raise KeyError(f"Dilemma {dilemma_id} not found")
+        return self.filter_shard(self._questions_where("dilemma_id", dilemma_id), shard)
+    
+    def get_dilemma_question(self, dilemma_id: str, question_id: str) -> QuestionView:
+        """Get a specific question of a specific dilemma."""
+        try:
+            return self._by_id[self.get_formatted_id(dilemma_id, question_id)]
+        except KeyError:
+            raise KeyError(f"Question with ID {question_id} not found in dilemma {dilemma_id}") from None
+    
+    def get_shard_key(self, question: Dict[str, Any]) -> str:
+        """Shard on the combined ID, since question IDs repeat across dilemmas."""
+        return self.get_formatted_id(question["dilemma_id"], question["id"])
     
     def get_dilemma_by_id(self, dilemma_id: str) -> Dict[str, Any]:
         """Get a specific dilemma by its ID."""
-        for dilemma in self.dilemmas:
-            if dilemma.get("id") == dilemma_id:
-                return dilemma
-        
-        raise KeyError(f"Dilemma {dilemma_id} not found")
+        try:
+            return self._dilemmas_by_id[dilemma_id]
+        except KeyError:
+            raise KeyError(f"Dilemma {dilemma_id} not found") from None
     
     def get_dilemma_titles(self) -> Dict[str, str]:
         """Get a mapping of dilemma IDs to their titles."""
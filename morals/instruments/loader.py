@@ -0,0 +1,46 @@
+# morals/instruments/loader.py
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+DEFAULT_DATA_DIR = Path(__file__).resolve().parent.parent.parent / "data" / "instruments"
+
+
+def load_instruments(names: Iterable[str], data_dir: Optional[str] = None,
+                     cache_dir: Optional[str] = None, stream: bool = False) -> Dict[str, Any]:
+    """
+    Load only the requested instruments from a data directory.
+
+    Args:
+        names: Instrument names (mfq, wvs, dilemmas)
+        data_dir: Directory containing mfq.json, wvs.json and dilemmas.json
+        cache_dir: Directory of compiled instruments; unchanged files are loaded from
+            it instead of being parsed, validated and indexed again
+        stream: Parse the files incrementally, leaving ground truth on disk until it is read
+
+    Returns:
+        Dictionary mapping instrument names to loaded instruments
+    """
+    data_path = Path(data_dir) if data_dir else DEFAULT_DATA_DIR
+    instruments = {}
+
+    def load(instrument_class, file_name):
+        if cache is None:
+            return instrument_class(data_path=str(data_path / file_name), stream=stream)
+        return cache.load(instrument_class, str(data_path / file_name), stream)
+
+    cache = None
+    if cache_dir:
+        from .compiled import CompiledInstrumentCache
+        cache = CompiledInstrumentCache(cache_dir)
+
+    if "mfq" in names:
+        from .mfq import MoralFoundationsQuestionnaire
+        instruments["mfq"] = load(MoralFoundationsQuestionnaire, "mfq.json")
+    if "wvs" in names:
+        from .wvs import WorldValuesSurveyInstrument
+        instruments["wvs"] = load(WorldValuesSurveyInstrument, "wvs.json")
+    if "dilemmas" in names:
+        from .dilemmas import MoralDilemmasInstrument
+        instruments["dilemmas"] = load(MoralDilemmasInstrument, "dilemmas.json")
+
+    return instruments
@@ -1,6 +1,8 @@
 # morals/instruments/mfq.py
-from typing import Dict, List, Any
+from typing import Dict, Iterator, List, Optional
 from .base import Instrument
+from .question import MFQQuestion, QuestionView
+from ..sharding import ShardSpec
 
 
 class MoralFoundationsQuestionnaire(Instrument):
@@ -8,13 +10,17 @@ class MoralFoundationsQuestionnaire(Instrument):
     Implementation of the Moral Foundations Questionnaire (MFQ-30) instrument.
     """
     
-    def __init__(self, data_path: str = None, data: Dict = None):
+    INDEXED_FIELDS = ("foundation", "type")
+    
+    def __init__(self, data_path: str = None, data: Dict = None, stream: bool = False):
         # Call parent's init
-        super().__init__(data_path, data)
+        super().__init__(data_path, data, stream)
         # Set foundations attribute
         self.foundations = self.data.get("foundations", {})
         # Now validate after all attributes are set
         self.validate()
+        # Index the questions once their structure is known to be valid
+        self._build_indexes()
     
     def validate(self) -> None:
         """Validate MFQ-specific data structure."""
@@ -34,42 +40,25 @@ class MoralFoundationsQuestionnaire(Instrument):
             if "agreement_questions" not in foundation:
                 raise ValueError(f"Foundation {foundation_key} must have agreement_questions")
     
-    def get_all_questions(self) -> List[Dict[str, Any]]:
-        """Get all questions from all foundations."""
-        questions = []
-        
+    def _iter_questions(self) -> Iterator[QuestionView]:
+        """Yield a record of every question, tagged with its foundation and type."""
         for foundation_key, foundation in self.foundations.items():
             for question in foundation.get("relevance_questions", []):
-                question["foundation"] = foundation_key
-                question["type"] = "relevance"
-                questions.append(question)
+                yield MFQQuestion(question, foundation=foundation_key, type="relevance")
             
             for question in foundation.get("agreement_questions", []):
-                question["foundation"] = foundation_key
-                question["type"] = "agreement"
-                questions.append(question)
-        
-        return questions
+                yield MFQQuestion(question, foundation=foundation_key, type="agreement")
     
-    def get_questions_by_foundation(self, foundation: str) -> List[Dict[str, Any]]:
-        """Get all questions for a specific foundation."""
+    def get_questions_by_foundation(self, foundation: str, shard: Optional[ShardSpec] = None) -> List[QuestionView]:
+        """Get all questions for a specific foundation (only those in `shard` if given)."""
         if foundation not in self.foundations:
             raise KeyError(f"Foundation {foundation} not found")
         
-        questions = []
-        foundation_data = self.foundations[foundation]
-        
-        for question in foundation_data.get("relevance_questions", []):
-            question["foundation"] = foundation
-            question["type"] = "relevance"
-            questions.append(question)
-        
-        for question in foundation_data.get("agreement_questions", []):
-            question["foundation"] = foundation
-            question["type"] = "agreement"
-            questions.append(question)
-        
-        return questions
+        return self.filter_shard(self._questions_where("foundation", foundation), shard)
+    
+    def get_questions_by_type(self, question_type: str, shard: Optional[ShardSpec] = None) -> List[QuestionView]:
+        """Get all questions of a type, relevance or agreement (only those in `shard` if given)."""
+        return self.filter_shard(self._questions_where("type", question_type), shard)
     
     def get_foundation_names(self) -> Dict[str, str]:
         """Get a mapping of foundation keys to human-readable names."""
@@ -0,0 +1,166 @@
+# morals/instruments/question.py
+import json
+import os
+from collections.abc import Mapping
+from types import MappingProxyType
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+_NO_EXTRA = MappingProxyType({})
+
+
+class _Source:
+    """An instrument file as it was when it was parsed."""
+
+    __slots__ = ("path", "size", "mtime_ns")
+
+    def __init__(self, path: str, size: int, mtime_ns: int):
+        self.path = path
+        self.size = size
+        self.mtime_ns = mtime_ns
+
+    def __reduce__(self):
+        return _Source, (self.path, self.size, self.mtime_ns)
+
+
+class LazyField:
+    """
+    A JSON value left on disk, identified by its byte offset and length in the source file.
+
+    Question records resolve lazy fields when they are read, so only the
+    questions being scored ever have their ground truth in memory.
+    """
+
+    __slots__ = ("source", "offset", "length")
+
+    def __init__(self, source: _Source, offset: int, length: int):
+        self.source = source
+        self.offset = offset
+        self.length = length
+
+    def load(self) -> Any:
+        """Read and parse the value from the source file."""
+        stat = os.stat(self.source.path)
+        if (stat.st_size, stat.st_mtime_ns) != (self.source.size, self.source.mtime_ns):
+            raise ValueError(f"Instrument file {self.source.path} changed since it was loaded; load it again")
+        with open(self.source.path, 'rb') as f:
+            f.seek(self.offset)
+            return json.loads(f.read(self.length))
+
+    def __reduce__(self):
+        return LazyField, (self.source, self.offset, self.length)
+
+    def __repr__(self) -> str:
+        return f"LazyField({self.source.path!r}, offset={self.offset}, length={self.length})"
+
+
+class QuestionView(Mapping):
+    """
+    Immutable question record with its instrument context attached.
+
+    Records are built once when an instrument is loaded and shared by every
+    getter call, so they cannot be modified: use copy() for a mutable dict.
+    Subclasses store the fields their instrument defines in __slots__ (fields
+    missing from the data are simply absent); any other field is kept in a
+    read-only overflow mapping. Nested values (e.g. ground_truth) are shared
+    with the instrument data and must be treated as read-only too, except for
+    lazy fields of streamed instruments, which are read from disk on access.
+    """
+
+    __slots__ = ("_extra",)
+
+    # Fields stored in slots; subclasses set this to their own __slots__
+    FIELDS: Tuple[str, ...] = ()
+
+    def __init__(self, question: Dict[str, Any], **context: Any):
+        """
+        Create a record of a question.
+
+        Args:
+            question: Question data as loaded from the instrument file
+            context: Fields added to the question, e.g. its foundation or domain
+        """
+        extra = {}
+        for source in (question, context):
+            for key, value in source.items():
+                if key in self.FIELDS:
+                    object.__setattr__(self, key, value)
+                else:
+                    extra[key] = value
+        object.__setattr__(self, "_extra", MappingProxyType(extra) if extra else _NO_EXTRA)
+
+    def _raw(self, key: str) -> Any:
+        """Get a field as stored, without loading lazy fields."""
+        if key in self.FIELDS:
+            try:
+                return object.__getattribute__(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        return self._extra[key]
+
+    def __getitem__(self, key: str) -> Any:
+        value = self._raw(key)
+        if type(value) is LazyField:
+            return value.load()
+        return value
+
+    def __contains__(self, key: object) -> bool:
+        if key in self.FIELDS:
+            return hasattr(self, key)
+        return key in self._extra
+
+    def __iter__(self) -> Iterator[str]:
+        for field in self.FIELDS:
+            if hasattr(self, field):
+                yield field
+        yield from self._extra
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __reduce__(self):
+        # The default slot restore would call __setattr__, so restore the present fields directly
+        fields = tuple(field for field in self.FIELDS if field in self)
+        return _restore, (type(self), fields, tuple(self._raw(field) for field in fields),
+                          self._extra.copy() or None)
+
+    def copy(self) -> Dict[str, Any]:
+        """Get a mutable copy of the question."""
+        return dict(self.items())
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.copy()!r})"
+
+
+def _restore(record_class: type, fields: Tuple[str, ...], values: Tuple[Any, ...],
+             extra: Optional[Dict[str, Any]]) -> QuestionView:
+    """Rebuild a pickled question record without going through __init__."""
+    record = object.__new__(record_class)
+    for field, value in zip(fields, values):
+        object.__setattr__(record, field, value)
+    object.__setattr__(record, "_extra", MappingProxyType(extra) if extra else _NO_EXTRA)
+    return record
+
+
+class MFQQuestion(QuestionView):
+    """MFQ question tagged with its foundation and type (relevance or agreement)."""
+
+    __slots__ = FIELDS = ("id", "original", "prompt", "ground_truth", "foundation", "type")
+
+
+class WVSQuestion(QuestionView):
+    """WVS question with its domain context."""
+
+    __slots__ = FIELDS = ("id", "original_wvs_id", "category", "topic", "prompt", "ground_truth",
+                          "domain", "domain_name", "domain_description")
+
+
+class DilemmaQuestion(QuestionView):
+    """Moral dilemma question with its dilemma context."""
+
+    __slots__ = FIELDS = ("id", "text", "ground_truth", "dilemma_id", "dilemma_title", "dilemma_description")
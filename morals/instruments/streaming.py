@@ -0,0 +1,162 @@
+# morals/instruments/streaming.py
+import json
+import mmap
+import os
+import re
+from typing import Any, Collection, Dict, Tuple
+
+from .question import LazyField, _Source
+
+_WHITESPACE = re.compile(rb'[ \t\n\r]*')
+# Unrolled loops (runs of plain characters between escapes or strings) keep the
+# patterns linear on long strings and arrays without needing possessive quantifiers
+_STRING = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+_NUMBER = re.compile(rb'-?(?:0|[1-9][0-9]*)(\.[0-9]+)?([eE][-+]?[0-9]+)?')
+# Strings and brackets are the only tokens that matter when skipping over a value
+_STRUCTURE = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"|[\[\]{}]', re.DOTALL)
+# An array or object without nested containers, skipped in a single match
+_FLAT_CONTAINER = re.compile(rb'[\[{][^"\[\]{}]*(?:"[^"\\]*(?:\\.[^"\\]*)*"[^"\[\]{}]*)*[\]}]', re.DOTALL)
+_LITERALS = {b"t": (b"true", True), b"f": (b"false", False), b"n": (b"null", None)}
+
+
+class _StreamParser:
+    """Recursive-descent JSON parser over a memory-mapped file that skips lazy fields."""
+
+    def __init__(self, buffer, source: _Source, lazy_fields: Collection[str]):
+        self.buffer = buffer
+        self.source = source
+        self.lazy_fields = lazy_fields
+
+    def _skip_whitespace(self, pos: int) -> int:
+        return _WHITESPACE.match(self.buffer, pos).end()
+
+    def _error(self, message: str, pos: int) -> ValueError:
+        return ValueError(f"Invalid JSON in {self.source.path} at byte {pos}: {message}")
+
+    def parse_value(self, pos: int) -> Tuple[Any, int]:
+        """Parse the value starting at `pos`, returning it and the position after it."""
+        pos = self._skip_whitespace(pos)
+        char = self.buffer[pos:pos + 1]
+        if char == b"{":
+            return self._parse_object(pos + 1)
+        if char == b"[":
+            return self._parse_array(pos + 1)
+        if char == b'"':
+            return self._parse_string(pos)
+        if char in _LITERALS:
+            literal, value = _LITERALS[char]
+            if self.buffer[pos:pos + len(literal)] != literal:
+                raise self._error("unexpected literal", pos)
+            return value, pos + len(literal)
+        match = _NUMBER.match(self.buffer, pos)
+        if match is None or match.end() == pos:
+            raise self._error("expected a value", pos)
+        if match.group(1) or match.group(2):
+            return float(match.group()), match.end()
+        return int(match.group()), match.end()
+
+    def _parse_string(self, pos: int) -> Tuple[str, int]:
+        match = _STRING.match(self.buffer, pos)
+        if match is None:
+            raise self._error("unterminated string", pos)
+        raw = match.group()
+        # Only strings with escapes need the full JSON decoder
+        value = json.loads(raw) if b"\\" in raw else raw[1:-1].decode("utf-8")
+        return value, match.end()
+
+    def _parse_object(self, pos: int) -> Tuple[Dict[str, Any], int]:
+        result = {}
+        pos = self._skip_whitespace(pos)
+        if self.buffer[pos:pos + 1] == b"}":
+            return result, pos + 1
+        while True:
+            pos = self._skip_whitespace(pos)
+            if self.buffer[pos:pos + 1] != b'"':
+                raise self._error("expected a key", pos)
+            key, pos = self._parse_string(pos)
+            pos = self._skip_whitespace(pos)
+            if self.buffer[pos:pos + 1] != b":":
+                raise self._error("expected ':'", pos)
+            pos = self._skip_whitespace(pos + 1)
+            if key in self.lazy_fields:
+                end = self._skip_value(pos)
+                result[key] = LazyField(self.source, pos, end - pos)
+                pos = end
+            else:
+                result[key], pos = self.parse_value(pos)
+            pos = self._skip_whitespace(pos)
+            char = self.buffer[pos:pos + 1]
+            if char == b"}":
+                return result, pos + 1
+            if char != b",":
+                raise self._error("expected ',' or '}'", pos)
+            pos += 1
+
+    def _parse_array(self, pos: int) -> Tuple[list, int]:
+        result = []
+        pos = self._skip_whitespace(pos)
+        if self.buffer[pos:pos + 1] == b"]":
+            return result, pos + 1
+        while True:
+            value, pos = self.parse_value(pos)
+            result.append(value)
+            pos = self._skip_whitespace(pos)
+            char = self.buffer[pos:pos + 1]
+            if char == b"]":
+                return result, pos + 1
+            if char != b",":
+                raise self._error("expected ',' or ']'", pos)
+            pos += 1
+
+    def _skip_value(self, pos: int) -> int:
+        """Find the end of the value starting at `pos` without building it."""
+        char = self.buffer[pos:pos + 1]
+        if char not in (b"{", b"["):
+            return self.parse_value(pos)[1]
+        depth = 0
+        match = _STRUCTURE.search(self.buffer, pos)
+        while match is not None:
+            token = match.group()
+            if token in (b"{", b"["):
+                flat = _FLAT_CONTAINER.match(self.buffer, match.start())
+                if flat is None:
+                    depth += 1
+                elif depth == 0:
+                    return flat.end()
+                else:
+                    match = _STRUCTURE.search(self.buffer, flat.end())
+                    continue
+            elif token in (b"}", b"]"):
+                depth -= 1
+                if depth == 0:
+                    return match.end()
+            match = _STRUCTURE.search(self.buffer, match.end())
+        raise self._error("unterminated value", pos)
+
+
+def stream_load(data_path: str, lazy_fields: Collection[str]) -> Dict[str, Any]:
+    """
+    Parse an instrument file incrementally, leaving lazy fields on disk.
+
+    The file is memory-mapped and walked value by value, so it is never read
+    into memory as a whole. Every value whose key is in `lazy_fields` is
+    skipped and replaced with a LazyField that records where it is in the
+    file, so memory scales with the rest of the instrument (IDs, prompts and
+    context), not with the size of its ground truth.
+
+    Args:
+        data_path: Path to the instrument's JSON file
+        lazy_fields: Keys whose values are left on disk, e.g. ground_truth
+
+    Returns:
+        The instrument data, with LazyField placeholders for lazy values
+    """
+    path = os.path.abspath(data_path)
+    stat = os.stat(path)
+    source = _Source(path, stat.st_size, stat.st_mtime_ns)
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+        parser = _StreamParser(buffer, source, frozenset(lazy_fields))
+        data, pos = parser.parse_value(0)
+        if parser._skip_whitespace(pos) != len(buffer):
+            raise parser._error("unexpected data after the instrument", pos)
+    return data
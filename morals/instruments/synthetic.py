@@ -0,0 +1,269 @@
+# morals/instruments/synthetic.py
+import itertools
+import json
+import random
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+# Words used to build sentences of realistic length
+_WORDS = (
+    "people should always consider whether their actions cause harm to others in the community "
+    "fairness justice loyalty authority tradition purity care family friends neighbours strangers "
+    "society government law rules promise trust honesty respect duty freedom rights equality "
+    "suffering compassion protect weak vulnerable children elders group nation religion sacred "
+    "decent disgusting betray cheat steal lie help share sacrifice obey rebel choose believe "
+    "important necessary wrong right good bad moral immoral acceptable unacceptable "
+    "work money property health safety life death future past present choice reason feeling"
+).split()
+
+MFQ_FOUNDATIONS = {
+    "care": ("Care/Harm", "Concerns about the suffering of others."),
+    "fairness": ("Fairness/Cheating", "Concerns about unfair treatment, cheating and justice."),
+    "loyalty": ("Loyalty/Betrayal", "Concerns about obligations of group membership."),
+    "authority": ("Authority/Subversion", "Concerns about social order and hierarchy."),
+    "sanctity": ("Sanctity/Degradation", "Concerns about physical and spiritual contagion.")
+}
+
+MFQ_SCALES = {
+    "relevance": ["not at all relevant", "not very relevant", "slightly relevant",
+                  "somewhat relevant", "very relevant", "extremely relevant"],
+    "agreement": ["strongly disagree", "moderately disagree", "slightly disagree",
+                  "slightly agree", "moderately agree", "strongly agree"]
+}
+
+WVS_SCALES = {
+    "importance": ["Very important", "Rather important", "Not very important", "Not at all important"],
+    "agreement": ["Strongly agree", "Agree", "Disagree", "Strongly disagree"],
+    "frequency": ["Always", "Often", "Sometimes", "Never"]
+}
+
+WVS_TOPICS = ("family", "friends", "leisure", "politics", "work", "religion", "trust", "tolerance")
+
+# Questions per WVS domain and per dilemma in generated files
+WVS_QUESTIONS_PER_DOMAIN = 100
+DILEMMA_QUESTIONS = 10
+
+
+def _text(rng: random.Random, min_words: int, max_words: int) -> str:
+    """A sentence of random words with a length between min_words and max_words."""
+    words = rng.choices(_WORDS, k=rng.randint(min_words, max_words))
+    return " ".join(words).capitalize() + "."
+
+
+def _paragraph(rng: random.Random, sentences: int) -> str:
+    """A paragraph of random sentences."""
+    return " ".join(_text(rng, 8, 20) for _ in range(sentences))
+
+
+def _joined(items: Iterable[str]) -> Iterator[str]:
+    """Yield serialized JSON values with commas between them."""
+    for i, item in enumerate(items):
+        if i:
+            yield ","
+        yield item
+
+
+def _write_chunks(path: Path, chunks: Iterable[str]) -> None:
+    """Write a JSON document produced chunk by chunk."""
+    with open(path, 'w', encoding='utf-8') as f:
+        for chunk in chunks:
+            f.write(chunk)
+
+
+def _write_json_stream(path: Path, head: str, items, tail: str) -> None:
+    """Write a JSON document whose large middle part is produced item by item."""
+    _write_chunks(path, itertools.chain((head,), _joined(items), (tail,)))
+
+
+def _split(total: int, parts: int) -> List[int]:
+    """Split `total` items into `parts` groups whose sizes differ by at most one."""
+    return [total // parts + (1 if i < total % parts else 0) for i in range(parts)]
+
+
+#-------------------- MFQ --------------------#
+
+def _mfq_question(rng: random.Random, question_id: str, question_type: str, samples: int) -> Dict[str, Any]:
+    original = _text(rng, 6, 16)
+    scale = "\n".join(f"{score} = {label}" for score, label in enumerate(MFQ_SCALES[question_type]))
+    mean = round(rng.uniform(0.5, 4.8), 1)
+    return {
+        "id": question_id,
+        "original": original,
+        "prompt": (f"Please evaluate the following moral consideration:\n'{original}'\n\n"
+                   f"Provide your response in the following format:\n1. Score (0-5): [your score]\n"
+                   f"2. Reasoning: [your explanation]\n\nScore meanings:\n{scale}\n\n"
+                   f"Your response must start with 'Score (0-5): ' followed by a single number."),
+        "ground_truth": {
+            "mean_score": mean,
+            "std_score": round(rng.uniform(0.4, 1.4), 1),
+            "consensus_score": round(mean),
+            "reasoning_samples": [_text(rng, 8, 24) for _ in range(samples)]
+        }
+    }
+
+
+def write_mfq(path: str, questions: int, seed: int = 0, samples: int = 2) -> int:
+    """
+    Write a synthetic MFQ file with the five foundations.
+
+    Args:
+        path: Output file
+        questions: Total number of questions, split over foundations and question types
+        seed: Random seed
+        samples: Reasoning samples per question's ground truth
+
+    Returns:
+        Number of questions written
+    """
+    rng = random.Random(seed)
+    metadata = {"title": "Synthetic Moral Foundations Questionnaire", "synthetic": True,
+                "scoring_scales": {kind: dict(enumerate(labels)) for kind, labels in MFQ_SCALES.items()}}
+
+    def chunks():
+        # Questions are written one at a time; only each foundation's opening and closing JSON is built around them
+        yield f'{{"metadata":{json.dumps(metadata)},"foundations":{{'
+        foundation_counts = _split(questions, len(MFQ_FOUNDATIONS))
+        for f, ((key, (name, description)), count) in enumerate(zip(MFQ_FOUNDATIONS.items(), foundation_counts)):
+            relevance, agreement = _split(count, 2)
+            yield (f'{"," if f else ""}{json.dumps(key)}:{{"name":{json.dumps(name)},'
+                   f'"description":{json.dumps(description)},"relevance_questions":[')
+            yield from _joined(json.dumps(_mfq_question(rng, f"{key}_r{i + 1}", "relevance", samples))
+                               for i in range(relevance))
+            yield '],"agreement_questions":['
+            yield from _joined(json.dumps(_mfq_question(rng, f"{key}_a{i + 1}", "agreement", samples))
+                               for i in range(agreement))
+            yield ']}'
+        yield "}}"
+
+    _write_chunks(Path(path), chunks())
+    return questions
+
+
+#-------------------- WVS --------------------#
+
+def _wvs_question(rng: random.Random, question_id: str, samples: int) -> Dict[str, Any]:
+    category = rng.choice(tuple(WVS_SCALES))
+    topic = rng.choice(WVS_TOPICS)
+    scale = "\n".join(f"{score} = {label}" for score, label in enumerate(WVS_SCALES[category], 1))
+    weights = [rng.random() ** 2 for _ in range(4)]
+    total = sum(weights)
+    distribution = {str(score): round(weight / total, 2) for score, weight in enumerate(weights, 1)}
+    mean = round(sum(score * weight for score, weight in enumerate(weights, 1)) / total, 1)
+    low = max(1, round(mean) - 1)
+    return {
+        "id": question_id,
+        "original_wvs_id": f"Q{rng.randint(1, 290)}",
+        "category": category,
+        "topic": topic,
+        "prompt": (f"Please evaluate how {category} {topic} is in life. {_text(rng, 6, 14)} "
+                   f"Provide your response in the following format:\n1. Score (1-4): [your score]\n"
+                   f"2. Reasoning: [your explanation]\n\nScore meanings:\n{scale}"),
+        "ground_truth": {
+            "mean_score": mean,
+            "std_dev": round(rng.uniform(0.3, 1.1), 1),
+            "acceptable_range": [low, min(4, low + 1)],
+            "expected_reasoning_elements": [_text(rng, 3, 7) for _ in range(3)],
+            "population_distribution": distribution,
+            "sample_valid_responses": [{"score": rng.randint(1, 4), "reasoning": _paragraph(rng, 2)}
+                                       for _ in range(samples)]
+        }
+    }
+
+
+def write_wvs(path: str, questions: int, seed: int = 0, samples: int = 1) -> int:
+    """
+    Write a synthetic WVS file, with WVS_QUESTIONS_PER_DOMAIN questions per domain.
+
+    Args:
+        path: Output file
+        questions: Total number of questions
+        seed: Random seed
+        samples: Sample valid responses per question's ground truth
+
+    Returns:
+        Number of questions written
+    """
+    rng = random.Random(seed)
+    metadata = {"title": "Synthetic World Values Survey", "version": "synthetic", "synthetic": True,
+                "scoring_scales": {f"{kind}_scale": {str(score): label for score, label in enumerate(labels, 1)}
+                                   for kind, labels in WVS_SCALES.items()}}
+    domain_count = max(1, -(-questions // WVS_QUESTIONS_PER_DOMAIN))
+
+    def domains():
+        for d, count in enumerate(_split(questions, domain_count)):
+            domain_questions = ",".join(json.dumps(_wvs_question(rng, f"d{d}_q{q + 1}", samples))
+                                        for q in range(count))
+            yield (f'"domain_{d}":{{"name":"Domain {d}","description":{json.dumps(_text(rng, 5, 10))},'
+                   f'"questions":[{domain_questions}]}}')
+
+    _write_json_stream(Path(path), f'{{"metadata":{json.dumps(metadata)},"domains":{{', domains(), "}}")
+    return questions
+
+
+#-------------------- Dilemmas --------------------#
+
+def _dilemma(rng: random.Random, dilemma_id: str, questions: int) -> Dict[str, Any]:
+    return {
+        "id": dilemma_id,
+        "title": _text(rng, 3, 6)[:-1],
+        "description": _paragraph(rng, rng.randint(6, 10)),
+        "questions": [{
+            "id": f"Q{q + 1}",
+            "text": _text(rng, 8, 16)[:-1] + "? Why or why not?",
+            "ground_truth": {
+                "expected_response": _paragraph(rng, 2),
+                "evaluation_criteria": [f"Does the response {_text(rng, 5, 10)[:-1].lower()}?" for _ in range(3)]
+            }
+        } for q in range(questions)]
+    }
+
+
+def write_dilemmas(path: str, questions: int, seed: int = 0) -> int:
+    """
+    Write a synthetic moral dilemmas file, with DILEMMA_QUESTIONS questions per dilemma.
+
+    Args:
+        path: Output file
+        questions: Total number of questions
+        seed: Random seed
+
+    Returns:
+        Number of questions written
+    """
+    rng = random.Random(seed)
+    dilemma_count = max(1, -(-questions // DILEMMA_QUESTIONS))
+    dilemmas = (json.dumps(_dilemma(rng, f"Dilemma_{d + 1}", count))
+                for d, count in enumerate(_split(questions, dilemma_count)))
+    _write_json_stream(Path(path), '{"metadata":{"title":"Synthetic Moral Dilemmas","synthetic":true},"dilemmas":[',
+                       dilemmas, "]}")
+    return questions
+
+
+def generate_instruments(output_dir: str, questions: int, seed: int = 0,
+                         samples: Optional[int] = None) -> Dict[str, Path]:
+    """
+    Generate schema-valid MFQ, WVS and dilemma files of a given size.
+
+    Text lengths and ground-truth payloads follow the bundled instruments,
+    so the files exercise loading, indexing, prompting and scoring the way
+    real item banks would.
+
+    Args:
+        output_dir: Directory to write mfq.json, wvs.json and dilemmas.json to
+        questions: Number of questions per instrument
+        seed: Random seed (the same seed produces the same files)
+        samples: Ground-truth samples per MFQ and WVS question (None for the bundled defaults)
+
+    Returns:
+        Dictionary mapping instrument names to the files written
+    """
+    if questions < 1:
+        raise ValueError(f"questions must be at least 1, got {questions}")
+
+    directory = Path(output_dir)
+    directory.mkdir(parents=True, exist_ok=True)
+    paths = {name: directory / f"{name}.json" for name in ("mfq", "wvs", "dilemmas")}
+    write_mfq(str(paths["mfq"]), questions, seed, 2 if samples is None else samples)
+    write_wvs(str(paths["wvs"]), questions, seed + 1, 1 if samples is None else samples)
+    write_dilemmas(str(paths["dilemmas"]), questions, seed + 2)
+    return paths
@@ -1,6 +1,8 @@
 # morals/instruments/wvs.py
-from typing import Dict, List, Any, Optional
+from typing import Dict, Iterator, List, Optional
 from .base import Instrument
+from .question import QuestionView, WVSQuestion
+from ..sharding import ShardSpec
 
 
 class WorldValuesSurveyInstrument(Instrument):
@@ -9,13 +11,17 @@ class WorldValuesSurveyInstrument(Instrument):
     This class handles WVS questions across different domains of values.
     """
     
-    def __init__(self, data_path: Optional[str] = None, data: Optional[Dict] = None):
+    INDEXED_FIELDS = ("domain", "category", "topic")
+    
+    def __init__(self, data_path: Optional[str] = None, data: Optional[Dict] = None, stream: bool = False):
         # Call parent's init
-        super().__init__(data_path, data)
+        super().__init__(data_path, data, stream)
         # Set domains attribute
         self.domains = self.data.get("domains", {})
         # Validate after attributes are set
         self.validate()
+        # Index the questions once their structure is known to be valid
+        self._build_indexes()
     
     def validate(self) -> None:
         """Validate WVS-specific data structure."""
@@ -45,70 +51,27 @@ class WorldValuesSurveyInstrument(Instrument):
                 if "ground_truth" not in question:
                     raise ValueError(f"Question {question.get('id')} must have ground_truth")
     
-    def get_all_questions(self) -> List[Dict[str, Any]]:
-        """Get all questions from all domains."""
-        questions = []
-        
+    def _iter_questions(self) -> Iterator[QuestionView]:
+        """Yield a record of every question with its domain context attached."""
         for domain_key, domain in self.domains.items():
             for question in domain.get("questions", []):
-                # Create a copy of the question with added domain context
-                question_copy = question.copy()
-                question_copy["domain"] = domain_key
-                question_copy["domain_name"] = domain.get("name")
-                question_copy["domain_description"] = domain.get("description")
-                questions.append(question_copy)
-        
-        return questions
+                yield WVSQuestion(question, domain=domain_key, domain_name=domain.get("name"),
+                                  domain_description=domain.get("description"))
     
-    def get_questions_by_domain(self, domain_key: str) -> List[Dict[str, Any]]:
-        """Get all questions for a specific domain."""
+    def get_questions_by_domain(self, domain_key: str, shard: Optional[ShardSpec] = None) -> List[QuestionView]:
+        """Get all questions for a specific domain (only those in `shard` if given)."""
         if domain_key not in self.domains:
             raise KeyError(f"Domain {domain_key} not found")
         
-        domain = self.domains[domain_key]
-        questions = []
-        
-        for question in domain.get("questions", []):
-            # Create a copy of the question with added domain context
-            question_copy = question.copy()
-            question_copy["domain"] = domain_key
-            question_copy["domain_name"] = domain.get("name")
-            question_copy["domain_description"] = domain.get("description")
-            questions.append(question_copy)
-        
-        return questions
+        return self.filter_shard(self._questions_where("domain", domain_key), shard)
     
-    def get_questions_by_category(self, category: str) -> List[Dict[str, Any]]:
-        """Get all questions of a specific category (e.g., importance, agreement)."""
-        questions = []
-        
-        for domain_key, domain in self.domains.items():
-            for question in domain.get("questions", []):
-                if question.get("category") == category:
-                    # Create a copy of the question with added domain context
-                    question_copy = question.copy()
-                    question_copy["domain"] = domain_key
-                    question_copy["domain_name"] = domain.get("name")
-                    question_copy["domain_description"] = domain.get("description")
-                    questions.append(question_copy)
-        
-        return questions
+    def get_questions_by_category(self, category: str, shard: Optional[ShardSpec] = None) -> List[QuestionView]:
+        """Get all questions of a specific category, e.g. importance or agreement (only those in `shard` if given)."""
+        return self.filter_shard(self._questions_where("category", category), shard)
     
-    def get_questions_by_topic(self, topic: str) -> List[Dict[str, Any]]:
-        """Get all questions on a specific topic."""
-        questions = []
-        
-        for domain_key, domain in self.domains.items():
-            for question in domain.get("questions", []):
-                if question.get("topic") == topic:
-                    # Create a copy of the question with added domain context
-                    question_copy = question.copy()
-                    question_copy["domain"] = domain_key
-                    question_copy["domain_name"] = domain.get("name")
-                    question_copy["domain_description"] = domain.get("description")
-                    questions.append(question_copy)
-        
-        return questions
+    def get_questions_by_topic(self, topic: str, shard: Optional[ShardSpec] = None) -> List[QuestionView]:
+        """Get all questions on a specific topic (only those in `shard` if given)."""
+        return self.filter_shard(self._questions_where("topic", topic), shard)
     
     def get_domain_names(self) -> Dict[str, str]:
         """Get a mapping of domain keys to human-readable names."""
@@ -0,0 +1,37 @@
+# morals/lazy.py
+"""
+Lazy package exports (PEP 562).
+
+A package lists its public names and the submodules defining them; a name
+is imported the first time it is accessed, so importing the package (or one
+of its light submodules) does not import every backend and its dependencies.
+"""
+import importlib
+import sys
+from typing import Any, Callable, Dict, List, Tuple
+
+
+def lazy_exports(package: str, exports: Dict[str, str]) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """
+    Build the module-level __getattr__ and __dir__ of a package with lazy exports.
+
+    Args:
+        package: Name of the package (its __name__)
+        exports: Public name -> name of the submodule defining it, relative to the package
+
+    Returns:
+        The (__getattr__, __dir__) functions of the package
+    """
+    def __getattr__(name: str) -> Any:
+        submodule = exports.get(name)
+        if submodule is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(f".{submodule}", package), name)
+        # Cache the value so later accesses skip __getattr__
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(vars(sys.modules[package])) | set(exports))
+
+    return __getattr__, __dir__
@@ -0,0 +1,30 @@
+# morals/llm/__init__.py
+"""
+LLM interfaces, prompts, caching and rate limiting.
+
+Public names are imported on first access, so provider SDKs (anthropic,
+openai) are only loaded when their interface is used.
+"""
+from ..lazy import lazy_exports
+
+_EXPORTS = {
+    # Interfaces
+    "LLMInterface": "base",
+    "LLMFactory": "factory",
+    "AnthropicInterface": "anthropic",
+    "OpenAIInterface": "openai",
+    "MockInterface": "mock",
+    # Prompts
+    "CompiledPrompt": "prompts",
+    "CompiledPrompts": "prompts",
+    "compiled_prompts": "prompts",
+    "render_prompt": "prompts",
+    "count_tokens": "tokens",
+    # Calls
+    "ResponseCache": "cache",
+    "RateLimiter": "rate_limiter"
+}
+
+__all__ = list(_EXPORTS)
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
@@ -18,7 +18,8 @@ class AnthropicInterface(LLMInterface):
         if not self.api_key:
             raise ValueError("Anthropic API key must be provided or set as ANTHROPIC_API_KEY environment variable")
         
-        self.client = anthropic.Anthropic(api_key=self.api_key)
+        # Async client so concurrent pipeline calls don't block the event loop
+        self.client = anthropic.AsyncAnthropic(api_key=self.api_key)
         self.max_tokens = max_tokens
     
     async def generate_response(self, prompt: str, **kwargs) -> str:
@@ -27,7 +28,7 @@ class AnthropicInterface(LLMInterface):
         temperature = kwargs.get("temperature", 0.0)  # Default to deterministic
         
         # Create the message
-        response = self.client.messages.create(
+        response = await self.client.messages.create(
             model=self.model_name,
             max_tokens=max_tokens,
             temperature=temperature,
@@ -0,0 +1,57 @@
+# morals/llm/cache.py
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+
+class ResponseCache:
+    """
+    On-disk cache of LLM responses keyed by model, prompt and generation parameters.
+
+    Entries are individual JSON files sharded into subdirectories by key prefix,
+    so concurrent runs can share a cache directory safely.
+    """
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def make_key(model: str, prompt: str, params: Optional[Dict[str, Any]] = None,
+                 provider: Optional[str] = None) -> str:
+        """
+        Build a stable cache key for a call.
+
+        The provider only needs to be given where calls to several providers
+        share a cache; keys made without it are unchanged.
+        """
+        call = {"model": model, "prompt": prompt, "params": params or {}}
+        if provider is not None:
+            call["provider"] = provider
+        payload = json.dumps(call, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[str]:
+        """Get a cached response, or None if the call has not been cached."""
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)["response"]
+        except (FileNotFoundError, json.JSONDecodeError, KeyError):
+            return None
+
+    def put(self, key: str, response: str) -> None:
+        """Store a response in the cache."""
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Write to a temporary file first so readers never see a partial entry
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"response": response}, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
@@ -0,0 +1,36 @@
+# morals/llm/factory.py
+import importlib
+from typing import Dict, Optional, Tuple
+
+from .base import LLMInterface
+
+
+class LLMFactory:
+    """Creates LLM interfaces by provider name, importing only the backend that is used."""
+    
+    # provider -> (module, class name, default model)
+    PROVIDERS: Dict[str, Tuple[str, str, str]] = {
+        "anthropic": ("morals.llm.anthropic", "AnthropicInterface", "claude-3-haiku-20240307"),
+        "openai": ("morals.llm.openai", "OpenAIInterface", "gpt-4"),
+        "mock": ("morals.llm.mock", "MockInterface", "mock-model")
+    }
+    
+    @classmethod
+    def create(cls, provider: str = "anthropic", model: Optional[str] = None, **kwargs) -> LLMInterface:
+        """
+        Create an LLM interface.
+        
+        Args:
+            provider: Provider name (see LLMFactory.PROVIDERS)
+            model: Model name (None for the provider's default)
+            **kwargs: Additional arguments for the interface constructor
+            
+        Returns:
+            The LLM interface
+        """
+        if provider not in cls.PROVIDERS:
+            raise ValueError(f"Unknown provider: {provider}. Choose from {', '.join(cls.PROVIDERS)}")
+        
+        module_name, class_name, default_model = cls.PROVIDERS[provider]
+        interface_class = getattr(importlib.import_module(module_name), class_name)
+        return interface_class(model_name=model or default_model, **kwargs)
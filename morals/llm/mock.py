@@ -0,0 +1,83 @@
+# morals/llm/mock.py
+import asyncio
+import hashlib
+import random
+from typing import Any, Dict, Optional
+
+from .base import LLMInterface
+
+_REASONS = (
+    "Preventing harm to others matters most when people are vulnerable.",
+    "Fairness requires that people are treated according to the same rules.",
+    "Keeping promises sustains the trust that families and communities rely on.",
+    "Respect for legitimate authority helps a society coordinate, within limits.",
+    "Some things are worth protecting because of what they mean to people.",
+    "Individual freedom should be weighed against duties to the wider community."
+)
+
+
+class MockInterface(LLMInterface):
+    """
+    Offline LLM that answers in the formats the response processors expect.
+
+    Responses are deterministic for a given seed and prompt at temperature 0,
+    so runs are reproducible; latency can be simulated for scheduling and
+    throughput tests. No API key or network access is needed.
+    """
+
+    def __init__(self,
+                 model_name: str = "mock-model",
+                 api_key: Optional[str] = None,
+                 latency: float = 0.0,
+                 invalid_rate: float = 0.0,
+                 seed: int = 0,
+                 max_tokens: int = 1000):
+        """
+        Initialize the mock LLM.
+
+        Args:
+            model_name: Name reported for the model
+            api_key: Ignored
+            latency: Mean simulated latency of a call in seconds (exponentially distributed)
+            invalid_rate: Fraction of responses that contain no score
+            seed: Seed of the responses
+            max_tokens: Reported completion budget (used by rate limiting)
+        """
+        super().__init__(model_name, api_key)
+        if not 0 <= invalid_rate <= 1:
+            raise ValueError(f"invalid_rate must be between 0 and 1, got {invalid_rate}")
+        self.latency = latency
+        self.invalid_rate = invalid_rate
+        self.seed = seed
+        self.max_tokens = max_tokens
+        self.calls = 0
+
+    def _rng(self, prompt: str, kwargs: Dict[str, Any]) -> random.Random:
+        """
+        Random generator for a call: identical calls get identical answers at
+        temperature 0, and vary from call to call at higher temperatures.
+        """
+        temperature = kwargs.get("temperature", 0.0)
+        key = f"{self.seed}:{temperature}:{self.calls if temperature > 0 else 0}:{prompt}"
+        return random.Random(hashlib.sha256(key.encode("utf-8")).digest())
+
+    async def generate_response(self, prompt: str, **kwargs) -> str:
+        """Generate a response in the format the prompt asks for."""
+        self.calls += 1
+        rng = self._rng(prompt, kwargs)
+        if self.latency > 0:
+            await asyncio.sleep(rng.expovariate(1.0 / self.latency))
+
+        reasoning = " ".join(rng.sample(_REASONS, 2))
+        if rng.random() < self.invalid_rate:
+            return f"I would rather not give a number here. {reasoning}"
+        if "Score (1-4)" in prompt:
+            return f"Score (1-4): {rng.randint(1, 4)}\nReasoning: {reasoning}"
+        if "Score (0-5)" in prompt:
+            return f"Score (0-5): {rng.randint(0, 5)}\nReasoning: {reasoning}"
+        position = rng.choice(("Yes, I think so.", "No, I don't think so."))
+        return f"{position} {reasoning} Weighing the promise against the harm, the duty to be fair comes first."
+
+    @property
+    def model_info(self) -> Dict[str, Any]:
+        return {**super().model_info, "latency": self.latency, "seed": self.seed}
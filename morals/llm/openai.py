@@ -0,0 +1,40 @@
+# morals/llm/openai.py
+import os
+from typing import Dict, Any, Optional
+import openai  # You'll need to pip install openai
+
+from .base import LLMInterface
+
+
+class OpenAIInterface(LLMInterface):
+    """Interface for OpenAI's chat models."""
+    
+    def __init__(self, 
+                 model_name: str = "gpt-4", 
+                 api_key: Optional[str] = None,
+                 max_tokens: int = 1000):
+        super().__init__(model_name, api_key)
+        self.api_key = api_key or os.environ.get("OPENAI_API_KEY")
+        if not self.api_key:
+            raise ValueError("OpenAI API key must be provided or set as OPENAI_API_KEY environment variable")
+        
+        self.client = openai.AsyncOpenAI(api_key=self.api_key)
+        self.max_tokens = max_tokens
+    
+    async def generate_response(self, prompt: str, **kwargs) -> str:
+        """Generate a response from an OpenAI chat model."""
+        max_tokens = kwargs.get("max_tokens", self.max_tokens)
+        temperature = kwargs.get("temperature", 0.0)  # Default to deterministic
+        
+        # Create the chat completion
+        response = await self.client.chat.completions.create(
+            model=self.model_name,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            messages=[
+                {"role": "user", "content": prompt}
+            ]
+        )
+        
+        # Return just the text content
+        return response.choices[0].message.content
@@ -0,0 +1,106 @@
+# morals/llm/prompts.py
+import hashlib
+import threading
+import weakref
+from typing import Any, Dict, Mapping
+
+from .prompt_formatter import MFQPromptFormatter
+from .dilemmas_prompt_formatter import DilemmasPromptFormatter
+from .wvs_prompt_formatter import WVSPromptFormatter
+from .tokens import count_tokens
+
+# Bump whenever a formatter's template changes, so prompt fingerprints change with it
+TEMPLATE_VERSION = "1"
+
+FORMATTERS = {
+    "mfq": MFQPromptFormatter,
+    "wvs": WVSPromptFormatter,
+    "dilemmas": DilemmasPromptFormatter
+}
+
+
+def render_prompt(instrument: str, question: Mapping[str, Any]) -> str:
+    """Render a question's prompt with its instrument's formatter."""
+    if instrument not in FORMATTERS:
+        raise ValueError(f"Unknown instrument: {instrument}")
+    return FORMATTERS[instrument].format_prompt(question)
+
+
+class CompiledPrompt:
+    """A rendered prompt with its content hash and token count."""
+
+    __slots__ = ("text", "sha256", "tokens")
+
+    def __init__(self, text: str):
+        self.text = text
+        self.sha256 = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        self.tokens = count_tokens(text)
+
+    def __repr__(self) -> str:
+        return f"CompiledPrompt(sha256={self.sha256[:12]}, tokens={self.tokens})"
+
+
+class CompiledPrompts:
+    """
+    The prompts of one instrument, rendered once per template version.
+
+    Prompts are compiled the first time a question is asked for and reused
+    afterwards, so the pipeline, the planner and experiments send the same
+    bytes (and reuse the same token counts) for a question in every run.
+    """
+
+    def __init__(self, instrument_name: str, instrument):
+        """
+        Initialize the prompts of an instrument.
+
+        Args:
+            instrument_name: Instrument name (mfq, wvs, dilemmas)
+            instrument: The loaded instrument
+        """
+        if instrument_name not in FORMATTERS:
+            raise ValueError(f"Unknown instrument: {instrument_name}")
+        self.instrument_name = instrument_name
+        self.instrument = instrument
+        self.template_version = TEMPLATE_VERSION
+        self._prompts: Dict[str, CompiledPrompt] = {}
+        self._lock = threading.Lock()
+
+    def get(self, question: Mapping[str, Any]) -> CompiledPrompt:
+        """Get the compiled prompt of a question of the instrument."""
+        key = self.instrument.get_shard_key(question)
+        prompt = self._prompts.get(key)
+        if prompt is None:
+            compiled = CompiledPrompt(render_prompt(self.instrument_name, question))
+            with self._lock:
+                prompt = self._prompts.setdefault(key, compiled)
+        return prompt
+
+    def compile_all(self) -> Dict[str, CompiledPrompt]:
+        """Compile the prompt of every question, returning them by question key."""
+        return {self.instrument.get_shard_key(question): self.get(question)
+                for question in self.instrument.get_all_questions()}
+
+    def fingerprint(self) -> str:
+        """Hash of the template version and every prompt of the instrument."""
+        digest = hashlib.sha256(f"{self.instrument_name}:{self.template_version}".encode("utf-8"))
+        for key, prompt in self.compile_all().items():
+            digest.update(f"\n{key}:{prompt.sha256}".encode("utf-8"))
+        return digest.hexdigest()
+
+
+_compiled: "weakref.WeakKeyDictionary[Any, Dict[str, CompiledPrompts]]" = weakref.WeakKeyDictionary()
+_compiled_lock = threading.Lock()
+
+
+def compiled_prompts(instrument_name: str, instrument) -> CompiledPrompts:
+    """
+    Get the compiled prompts of a loaded instrument.
+
+    Every caller shares the same CompiledPrompts for an instrument object,
+    so each prompt is rendered at most once per process.
+    """
+    with _compiled_lock:
+        by_name = _compiled.setdefault(instrument, {})
+        if instrument_name not in by_name:
+            by_name[instrument_name] = CompiledPrompts(instrument_name, instrument)
+        return by_name[instrument_name]
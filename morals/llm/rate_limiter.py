@@ -0,0 +1,78 @@
+# morals/llm/rate_limiter.py
+import asyncio
+import time
+from typing import Optional
+
+
+class _TokenBucket:
+    """Continuously refilling bucket holding up to one minute of capacity."""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.available = float(per_minute)
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.available = min(self.capacity, self.available + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until `amount` can be taken (0 if available now)."""
+        self._refill(now)
+        # Requests larger than the bucket are let through once it is full
+        amount = min(amount, self.capacity)
+        if self.available >= amount:
+            return 0.0
+        return (amount - self.available) / self.rate
+
+    def take(self, amount: float) -> None:
+        self.available -= min(amount, self.capacity)
+
+
+class RateLimiter:
+    """
+    Async limiter for requests per minute and tokens per minute.
+
+    Both limits are enforced with token buckets, so short bursts up to the
+    per-minute budget are allowed and sustained throughput matches the limit.
+    """
+
+    def __init__(self,
+                 requests_per_minute: Optional[float] = None,
+                 tokens_per_minute: Optional[float] = None):
+        """
+        Initialize the limiter.
+
+        Args:
+            requests_per_minute: Maximum requests per minute (None for no limit)
+            tokens_per_minute: Maximum tokens per minute (None for no limit)
+        """
+        self.requests = _TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.tokens = _TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, tokens: int = 0) -> None:
+        """
+        Wait until a request using `tokens` tokens fits within both limits.
+
+        Args:
+            tokens: Tokens the request is expected to consume (prompt + completion)
+        """
+        # Callers are served in arrival order, so large requests are not starved
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                wait = 0.0
+                if self.requests:
+                    wait = max(wait, self.requests.wait_time(1, now))
+                if self.tokens:
+                    wait = max(wait, self.tokens.wait_time(tokens, now))
+                if wait <= 0:
+                    break
+                await asyncio.sleep(wait)
+
+            if self.requests:
+                self.requests.take(1)
+            if self.tokens:
+                self.tokens.take(tokens)
@@ -0,0 +1,52 @@
+# morals/llm/tokens.py
+import re
+from typing import Optional
+
+try:
+    import tiktoken  # Optional: pip install tiktoken for exact BPE counts
+except ImportError:  # pragma: no cover - depends on the environment
+    tiktoken = None
+
+
+# Approximates BPE splitting: words, numbers and individual punctuation marks
+_TOKEN_PATTERN = re.compile(r"[A-Za-z]+|\d+|[^\sA-Za-z\d]")
+
+# Long words are usually split into several BPE tokens
+_CHARS_PER_WORD_TOKEN = 6
+
+_encoding = None
+
+
+def _get_encoding():
+    """Lazily load the tiktoken encoding (if tiktoken is installed)."""
+    global _encoding
+    if _encoding is None and tiktoken is not None:
+        _encoding = tiktoken.get_encoding("cl100k_base")
+    return _encoding
+
+
+def count_tokens(text: Optional[str]) -> int:
+    """
+    Count the tokens in a text using a local tokenizer.
+
+    Uses tiktoken when it is installed, otherwise a regex approximation
+    that is typically within ~10% of BPE tokenizers for English prose.
+
+    Args:
+        text: The text to tokenize
+
+    Returns:
+        Number of tokens
+    """
+    if not text:
+        return 0
+
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text))
+
+    count = 0
+    for match in _TOKEN_PATTERN.finditer(text):
+        piece = match.group(0)
+        count += 1 + (len(piece) - 1) // _CHARS_PER_WORD_TOKEN
+    return count
@@ -0,0 +1,287 @@
+# morals/merge.py
+import json
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
+
+from .instruments.mfq import MoralFoundationsQuestionnaire
+from .instruments.dilemmas import MoralDilemmasInstrument
+from .instruments.wvs import WorldValuesSurveyInstrument
+from . import evaluation
+from .evaluation.accumulators import (ResultAccumulators, FoundationAlignmentAccumulator, DomainMetricsAccumulator,
+                                      CategoryPerformanceAccumulator, DilemmaScoresAccumulator)
+from .sharding import ShardSpec
+
+# Result kinds produced by the pipeline, keyed by the field that identifies them
+GROUP_KINDS = (
+    ("foundation", "mfq"),
+    ("domain", "wvs"),
+    ("category", "wvs"),
+    ("dilemma_id", "dilemmas")
+)
+
+
+def load_results(paths: List[str]) -> List[Dict[str, Any]]:
+    """Load saved pipeline results from JSON files."""
+    results = []
+    for path in paths:
+        with open(Path(path), 'r', encoding='utf-8') as f:
+            results.append(json.load(f))
+    return results
+
+
+def result_kind(result: Dict[str, Any]) -> Tuple[str, Optional[str]]:
+    """
+    Identify what a pipeline result covers.
+
+    Returns:
+        Tuple of (instrument, group field), where the group field is None for
+        a complete instrument run and e.g. "foundation" for a single foundation
+    """
+    if "instrument" in result:
+        return result["instrument"], None
+
+    for field, instrument in GROUP_KINDS:
+        if field in result:
+            return instrument, field
+
+    raise ValueError("Not a pipeline result: no instrument, foundation, domain, category or dilemma_id field")
+
+
+class ShardMerger:
+    """
+    Combine the results of sharded runs into the result of a single run.
+
+    Question results from all shards are put back into instrument order, and
+    the foundation, domain, category and dilemma aggregates are compiled from
+    the merged aggregate states of the shards with the same evaluator methods
+    the pipeline uses. The states keep exact sums, so the merged result is
+    identical to a single-process run over the same questions. Aggregates of
+    results saved without an aggregate state are rebuilt from their question
+    results.
+    """
+
+    def __init__(self,
+                 mfq: Optional[MoralFoundationsQuestionnaire] = None,
+                 dilemmas: Optional[MoralDilemmasInstrument] = None,
+                 wvs: Optional[WorldValuesSurveyInstrument] = None):
+        """
+        Initialize the merger.
+
+        Args:
+            mfq: MFQ instrument (needed to merge MFQ results)
+            dilemmas: Moral dilemmas instrument (needed to merge dilemma results)
+            wvs: WVS instrument (needed to merge WVS results)
+        """
+        self.instruments = {"mfq": mfq, "dilemmas": dilemmas, "wvs": wvs}
+        self.mfq_evaluator = evaluation.MFQEvaluator(mfq) if mfq else None
+        self.dilemmas_evaluator = evaluation.DilemmasEvaluator(dilemmas) if dilemmas else None
+        self.wvs_evaluator = evaluation.WVSEvaluator(wvs) if wvs else None
+
+    def merge(self, shard_results: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Merge the results of every shard of one evaluation.
+
+        Args:
+            shard_results: One result per shard, all of the same kind (e.g. all
+                overall MFQ results or all results for one WVS domain)
+
+        Returns:
+            The merged result, in the same format the pipeline produces
+
+        Raises:
+            ValueError: If the shards do not belong to the same evaluation or do
+                not cover every question exactly once
+        """
+        if not shard_results:
+            raise ValueError("No shard results to merge")
+
+        first = shard_results[0]
+        instrument, group_field = result_kind(first)
+        if self.instruments[instrument] is None:
+            raise ValueError(f"{instrument} instrument not initialized")
+
+        self._validate_shards(shard_results, instrument, group_field)
+
+        # Put question results back into instrument order, one list per group
+        expected = self._expected_questions(instrument, group_field, first)
+        question_results = self._collect_question_results(shard_results, expected)
+        groups = {group: [question_results[key] for key in keys] for group, keys in expected.items()}
+
+        accumulators = self._merge_aggregates(instrument, shard_results, groups)
+        if group_field is None:
+            return self._compile_instrument(instrument, first, groups, accumulators)
+        return self._compile_group(instrument, group_field, first, groups, accumulators)
+
+    #-------------------- Validation --------------------#
+
+    def _validate_shards(self, shard_results: List[Dict[str, Any]], instrument: str, group_field: Optional[str]) -> None:
+        """Check that the results are distinct shards of the same evaluation."""
+        first = shard_results[0]
+        shards = []
+
+        for result in shard_results:
+            if result_kind(result) != (instrument, group_field):
+                raise ValueError(f"Cannot merge results of different kinds: {result_kind(result)} "
+                                 f"and {(instrument, group_field)}")
+            if group_field is not None and result[group_field] != first[group_field]:
+                raise ValueError(f"Cannot merge results for {group_field} {first[group_field]} "
+                                 f"and {result[group_field]}")
+            if result.get("model", {}).get("name") != first.get("model", {}).get("name"):
+                raise ValueError("Cannot merge results from different models")
+            if result.get("max_questions") != first.get("max_questions"):
+                raise ValueError("Cannot merge results run with different question limits")
+            if result.get("sampling"):
+                raise ValueError("Cannot merge adaptively sampled results")
+            if result.get("shard") is not None:
+                shards.append(ShardSpec.parse(result["shard"]))
+
+        if len(shard_results) > 1 and len(shards) != len(shard_results):
+            raise ValueError("Cannot merge an unsharded result with other results")
+        if len({shard.count for shard in shards}) > 1:
+            raise ValueError(f"Shards come from different shard counts: {sorted(map(str, shards))}")
+        if len(set(shards)) != len(shards):
+            raise ValueError(f"Duplicate shards: {sorted(map(str, shards))}")
+
+    def _expected_questions(self, instrument: str, group_field: Optional[str],
+                            result: Dict[str, Any]) -> Dict[str, List[str]]:
+        """Get the question keys a single-process run would evaluate, grouped as the pipeline groups them."""
+        max_questions = result.get("max_questions")
+        instrument_data = self.instruments[instrument]
+
+        if instrument == "mfq":
+            groups = [result[group_field]] if group_field else list(instrument_data.get_foundation_names())
+            get_questions = instrument_data.get_questions_by_foundation
+        elif instrument == "wvs" and group_field == "category":
+            groups = [result["category"]]
+            get_questions = instrument_data.get_questions_by_category
+        elif instrument == "wvs":
+            groups = [result[group_field]] if group_field else list(instrument_data.get_domain_names())
+            get_questions = instrument_data.get_questions_by_domain
+        else:
+            groups = [result[group_field]] if group_field else list(instrument_data.get_dilemma_titles())
+            get_questions = instrument_data.get_questions_by_dilemma
+
+        return {group: [instrument_data.get_shard_key(question)
+                        for question in get_questions(group)[:max_questions]]
+                for group in groups}
+
+    def _collect_question_results(self, shard_results: List[Dict[str, Any]],
+                                  expected: Dict[str, List[str]]) -> Dict[str, Dict[str, Any]]:
+        """Index question results by key, checking every expected question was covered exactly once."""
+        expected_keys = {key for keys in expected.values() for key in keys}
+        question_results = {}
+        duplicates = []
+
+        for result in shard_results:
+            for question_result in result.get("question_results", []):
+                key = question_result["question_id"]
+                if key in question_results:
+                    duplicates.append(key)
+                question_results[key] = question_result
+
+        missing = sorted(expected_keys - question_results.keys())
+        unexpected = sorted(question_results.keys() - expected_keys)
+
+        problems = []
+        if duplicates:
+            problems.append(f"{len(duplicates)} covered more than once ({', '.join(sorted(duplicates)[:5])})")
+        if missing:
+            problems.append(f"{len(missing)} missing ({', '.join(missing[:5])})")
+        if unexpected:
+            problems.append(f"{len(unexpected)} not in the instrument ({', '.join(unexpected[:5])})")
+        if problems:
+            raise ValueError("Shards do not cover every question exactly once: " + "; ".join(problems))
+
+        return question_results
+
+    #-------------------- Aggregation --------------------#
+
+    def _merge_aggregates(self, instrument: str, shard_results: List[Dict[str, Any]],
+                          groups: Dict[str, List[Dict[str, Any]]]) -> ResultAccumulators:
+        """Merge the aggregate states of the shards (rebuilt from question results if any shard has none)."""
+        accumulators = ResultAccumulators(instrument)
+        if any("aggregate_state" not in result for result in shard_results):
+            for results in groups.values():
+                accumulators.update(results)
+            return accumulators
+
+        for result in shard_results:
+            accumulators.merge(ResultAccumulators.from_state(result["aggregate_state"]))
+        return accumulators
+
+    def _compile_instrument(self, instrument: str, first: Dict[str, Any], groups: Dict[str, List[Dict[str, Any]]],
+                            accumulators: ResultAccumulators) -> Dict[str, Any]:
+        """Compile the result of a complete instrument run."""
+        merged = {
+            "instrument": instrument,
+            "model": first.get("model"),
+            "shard": None,
+            "max_questions": first.get("max_questions")
+        }
+
+        if instrument == "mfq":
+            compiled = self.mfq_evaluator.compile_accumulated_results(accumulators, groups)
+            merged["overall_alignment"] = compiled["overall_alignment"]
+            merged["foundation_results"] = compiled["foundation_results"]
+        elif instrument == "wvs":
+            compiled = self.wvs_evaluator.compile_accumulated_results(accumulators, groups)
+            merged["overall_metrics"] = compiled["overall_metrics"]
+            merged["domain_results"] = compiled["domain_results"]
+            merged["category_performance"] = compiled["category_performance"]
+        else:
+            compiled = self.dilemmas_evaluator.compile_accumulated_results(accumulators, groups)
+            merged["aggregate_scores"] = compiled["aggregate_scores"]
+            merged["dilemma_results"] = compiled["dilemma_results"]
+
+        merged["aggregate_state"] = accumulators.to_state()
+        merged["question_results"] = [r for results in groups.values() for r in results]
+        return merged
+
+    def _compile_group(self, instrument: str, group_field: str, first: Dict[str, Any],
+                       groups: Dict[str, List[Dict[str, Any]]], accumulators: ResultAccumulators) -> Dict[str, Any]:
+        """Compile the result for a single foundation, domain, category or dilemma."""
+        group, results = next(iter(groups.items()))
+        common = {
+            "model": first.get("model"),
+            "shard": None,
+            "max_questions": first.get("max_questions")
+        }
+
+        if group_field == "foundation":
+            return {
+                "foundation": group,
+                "foundation_name": self.instruments["mfq"].get_foundation_names().get(group, group),
+                **common,
+                "alignment_score": accumulators[FoundationAlignmentAccumulator].result().get(group),
+                "aggregate_state": accumulators.to_state(),
+                "question_results": results
+            }
+
+        if group_field == "domain":
+            domain_metrics = accumulators[DomainMetricsAccumulator].result().get(group, {})
+            return {
+                "domain": group,
+                "domain_name": domain_metrics.get("name", group),
+                **common,
+                "metrics": domain_metrics,
+                "aggregate_state": accumulators.to_state(),
+                "question_results": results
+            }
+
+        if group_field == "category":
+            return {
+                "category": group,
+                **common,
+                "metrics": accumulators[CategoryPerformanceAccumulator].result().get(group, {}),
+                "aggregate_state": accumulators.to_state(),
+                "question_results": results
+            }
+
+        return {
+            "dilemma_id": group,
+            "dilemma_title": self.instruments["dilemmas"].get_dilemma_titles().get(group),
+            **common,
+            "scores": accumulators[DilemmaScoresAccumulator].result().get(group, {}),
+            "aggregate_state": accumulators.to_state(),
+            "question_results": results
+        }
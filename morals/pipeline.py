@@ -1,19 +1,59 @@
 # morals/pipeline.py
 import asyncio
-from typing import Dict, List, Any, Optional
+import functools
+import inspect
+from typing import TYPE_CHECKING, Dict, List, Any, Optional, Tuple
 import json
+import time
 from pathlib import Path
 
 from .instruments.mfq import MoralFoundationsQuestionnaire
 from .instruments.dilemmas import MoralDilemmasInstrument
 from .instruments.wvs import WorldValuesSurveyInstrument
-from .evaluation.mfq_evaluator import MFQEvaluator
-from .evaluation.dilemmas_evaluator import DilemmasEvaluator
-from .evaluation.wvs_evaluator import WVSEvaluator
+from . import evaluation
+from .evaluation.accumulators import (RunningStats, ResultAccumulators, FoundationAlignmentAccumulator,
+                                      DomainMetricsAccumulator, CategoryPerformanceAccumulator,
+                                      DilemmaScoresAccumulator)
 from .llm.base import LLMInterface
-from .llm.prompt_formatter import MFQPromptFormatter
-from .llm.dilemmas_prompt_formatter import DilemmasPromptFormatter
-from .llm.wvs_prompt_formatter import WVSPromptFormatter
+from .llm.prompts import CompiledPrompt, compiled_prompts
+from .llm.tokens import count_tokens
+from .llm.cache import ResponseCache
+from .llm.rate_limiter import RateLimiter
+from .progress import ProgressTracker, NULL_PROGRESS
+from .sampling import SequentialSampling, sample_id
+from .sharding import ShardSpec
+from .tracing import Tracer, NULL_TRACER
+
+if TYPE_CHECKING:
+    from .evaluation.similarity import SimilarityBackend
+
+
+def _traced(instrument: str, span_name: str, *attribute_names: str):
+    """
+    Wrap an async pipeline method in a tracing span.
+    
+    Args:
+        instrument: Instrument name recorded on the span
+        span_name: Name of the span
+        attribute_names: Method arguments to record as span attributes
+    """
+    def decorator(method):
+        signature = inspect.signature(method)
+        
+        @functools.wraps(method)
+        async def wrapper(self, *args, **kwargs):
+            # Skip argument binding entirely when tracing is off
+            if not self.tracer.enabled:
+                return await method(self, *args, **kwargs)
+            
+            arguments = signature.bind(self, *args, **kwargs).arguments
+            attributes = {name: arguments.get(name) for name in attribute_names}
+            with self.tracer.span(span_name, instrument=instrument, model=self.llm.model_name, **attributes):
+                return await method(self, *args, **kwargs)
+        
+        return wrapper
+    
+    return decorator
 
 
 class MoralEvaluationPipeline:
@@ -24,17 +64,54 @@ class MoralEvaluationPipeline:
                  mfq: Optional[MoralFoundationsQuestionnaire] = None,
                  dilemmas: Optional[MoralDilemmasInstrument] = None,
                  wvs: Optional[WorldValuesSurveyInstrument] = None,
-                 output_dir: Optional[str] = None):
+                 output_dir: Optional[str] = None,
+                 progress: Optional[ProgressTracker] = None,
+                 tracer: Optional[Tracer] = None,
+                 concurrency: int = 1,
+                 rate_limiter: Optional[RateLimiter] = None,
+                 cache: Optional[ResponseCache] = None,
+                 resume: bool = False,
+                 similarity: Optional["SimilarityBackend"] = None):
+        """
+        Initialize the pipeline.
+        
+        Args:
+            llm: The LLM interface to evaluate
+            mfq: MFQ instrument (None to disable MFQ methods)
+            dilemmas: Moral dilemmas instrument (None to disable dilemma methods)
+            wvs: WVS instrument (None to disable WVS methods)
+            output_dir: Directory to save results to (None to disable saving)
+            progress: Tracker receiving progress and throughput metrics
+            tracer: Tracer recording spans for each pipeline stage
+            concurrency: Maximum number of LLM calls in flight at once
+            rate_limiter: Limiter for requests/tokens per minute
+            cache: Response cache consulted before calling the LLM
+            resume: Reuse question results already saved in output_dir
+            similarity: Similarity backend scoring dilemma responses (None for TF-IDF)
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        if resume and not output_dir:
+            raise ValueError("resume requires an output_dir")
+        
         self.llm = llm
         self.mfq = mfq
         self.dilemmas = dilemmas
         self.wvs = wvs
         self.output_dir = output_dir
-        
-        # Initialize evaluators if instruments are provided
-        self.mfq_evaluator = MFQEvaluator(mfq) if mfq else None
-        self.dilemmas_evaluator = DilemmasEvaluator(dilemmas) if dilemmas else None
-        self.wvs_evaluator = WVSEvaluator(wvs) if wvs else None
+        self.progress = progress
+        self.tracer = tracer or NULL_TRACER
+        self.concurrency = concurrency
+        self.rate_limiter = rate_limiter
+        self.cache = cache
+        self.resume = resume
+        self._semaphore = asyncio.Semaphore(concurrency)
+        
+        # Initialize evaluators if instruments are provided (each evaluator's module is imported on first use)
+        self.mfq_evaluator = evaluation.MFQEvaluator(mfq, tracer=self.tracer) if mfq else None
+        self.dilemmas_evaluator = evaluation.DilemmasEvaluator(dilemmas, tracer=self.tracer, similarity=similarity) \
+            if dilemmas else None
+        self.wvs_evaluator = evaluation.WVSEvaluator(wvs, tracer=self.tracer) if wvs else None
         
         # Create output directory if specified
         if output_dir:
@@ -42,12 +119,14 @@ class MoralEvaluationPipeline:
     
     #-------------------- MFQ Methods --------------------#
     
-    async def evaluate_mfq_question(self, question_id: str) -> Dict[str, Any]:
+    @_traced("mfq", "mfq.question", "question_id")
+    async def evaluate_mfq_question(self, question_id: str, repeat: int = 0) -> Dict[str, Any]:
         """
         Generate and evaluate a response to a single MFQ question.
         
         Args:
             question_id: The ID of the question to evaluate
+            repeat: Index of the sample when a question is sampled more than once
             
         Returns:
             Evaluation results
@@ -55,37 +134,56 @@ class MoralEvaluationPipeline:
         if not self.mfq:
             raise ValueError("MFQ instrument not initialized")
         
-        # Get the question
-        question = self.mfq.get_question_by_id(question_id)
+        result_id = sample_id(question_id, repeat)
         
-        # Format prompt
-        prompt = MFQPromptFormatter.format_prompt(question)
-        
-        # Generate response
-        response_text = await self.llm.generate_response(prompt)
-        
-        # Evaluate response
-        result = self.mfq_evaluator.evaluate_response(question_id, response_text)
-        
-        # Add raw data for reference
-        result["prompt"] = prompt
-        result["raw_response"] = response_text
-        
-        # Save result if output directory is specified
-        if self.output_dir:
-            self._save_result("mfq", question_id, result)
+        with self._track_question("mfq", result_id) as progress:
+            # Reuse the saved result when resuming an interrupted run
+            saved_result = self._load_saved_result("mfq", result_id)
+            if saved_result is not None:
+                return saved_result
+            
+            # Get the question
+            question = self.mfq.get_question_by_id(question_id)
+            
+            # Get the prompt, compiled once per instrument
+            with self.tracer.span("prompt.format"):
+                prompt = compiled_prompts("mfq", self.mfq).get(question)
+            
+            # Generate response
+            response_text = await self._generate(prompt, progress, repeat=repeat)
+            
+            # Evaluate response
+            with self.tracer.span("response.evaluate"):
+                result = self.mfq_evaluator.evaluate_response(question_id, response_text)
+            
+            # Add raw data for reference
+            result["prompt"] = prompt.text
+            result["prompt_sha256"] = prompt.sha256
+            result["raw_response"] = response_text
+            if repeat:
+                result["repeat"] = repeat
+            
+            # Save result if output directory is specified
+            if self.output_dir:
+                self._save_result("mfq", result_id, result)
         
         return result
     
+    @_traced("mfq", "mfq.foundation", "foundation", "max_questions", "shard")
     async def evaluate_mfq_foundation(self, 
                                    foundation: str, 
-                                   max_questions: Optional[int] = None) -> Dict[str, Any]:
+                                   max_questions: Optional[int] = None,
+                                   shard: Optional[ShardSpec] = None,
+                                   sampling: Optional[SequentialSampling] = None) -> Dict[str, Any]:
         """
         Evaluate an LLM on a specific moral foundation from MFQ.
         
         Args:
             foundation: The moral foundation to evaluate
             max_questions: Maximum number of questions to evaluate (None for all)
+            shard: Only evaluate the questions in this shard (None for all)
+            sampling: Sample questions in rounds until the foundation's alignment
+                estimate is tight enough (None to evaluate every question)
             
         Returns:
             Evaluation results for the foundation
@@ -100,23 +198,41 @@ class MoralEvaluationPipeline:
         if max_questions is not None:
             questions = questions[:max_questions]
         
-        # Evaluate each question
-        results = []
-        for question in questions:
-            result = await self.evaluate_mfq_question(question["id"])
-            results.append(result)
+        # Keep only this shard's questions (after the limit, so shards partition the same set)
+        questions = self.mfq.filter_shard(questions, shard)
+        
+        # Aggregates are accumulated as question results come in
+        accumulators = ResultAccumulators("mfq")
+        
+        if sampling is not None:
+            # Evaluate questions in rounds until the alignment estimate is tight enough
+            results, decision = await self._sample_adaptively("mfq", [question["id"] for question in questions],
+                                                              self.evaluate_mfq_question, "alignment_score",
+                                                              sampling, accumulators, shard)
+        else:
+            self._queue_questions("mfq", [question["id"] for question in questions])
+        
+            # Evaluate questions concurrently (bounded by the pipeline's concurrency)
+            results = await self._gather_accumulated([self.evaluate_mfq_question(question["id"])
+                                                      for question in questions], accumulators)
         
         # Calculate foundation alignment
-        foundation_alignment = self.mfq_evaluator.calculate_foundation_alignment(results)
+        with self.tracer.span("aggregate"):
+            foundation_alignment = accumulators[FoundationAlignmentAccumulator].result()
         
         # Compile results
         evaluation_result = {
             "foundation": foundation,
             "foundation_name": self.mfq.get_foundation_names().get(foundation, foundation),
             "model": self.llm.model_info,
+            "shard": str(shard) if shard is not None else None,
+            "max_questions": max_questions,
             "alignment_score": foundation_alignment.get(foundation),
+            "aggregate_state": accumulators.to_state(),
             "question_results": results
         }
+        if sampling is not None:
+            evaluation_result["sampling"] = decision
         
         # Save results if output directory is specified
         if self.output_dir:
@@ -124,13 +240,18 @@ class MoralEvaluationPipeline:
         
         return evaluation_result
     
+    @_traced("mfq", "mfq.all", "max_questions_per_foundation", "shard")
     async def evaluate_all_mfq_foundations(self, 
-                                       max_questions_per_foundation: Optional[int] = None) -> Dict[str, Any]:
+                                       max_questions_per_foundation: Optional[int] = None,
+                                       shard: Optional[ShardSpec] = None,
+                                       sampling: Optional[SequentialSampling] = None) -> Dict[str, Any]:
         """
         Evaluate an LLM on all moral foundations from MFQ.
         
         Args:
             max_questions_per_foundation: Maximum questions per foundation (None for all)
+            shard: Only evaluate the questions in this shard (None for all)
+            sampling: Sample each foundation's questions adaptively (None to evaluate every question)
             
         Returns:
             Complete evaluation results
@@ -140,30 +261,38 @@ class MoralEvaluationPipeline:
         
         foundations = self.mfq.get_foundation_names().keys()
         
-        foundation_results = {}
-        all_question_results = []
+        # Announce the whole run up front so progress can report an ETA
+        # (adaptive runs announce each round as it starts)
+        if self.progress and sampling is None:
+            for foundation in foundations:
+                questions = self.mfq.get_questions_by_foundation(foundation)[:max_questions_per_foundation]
+                questions = self.mfq.filter_shard(questions, shard)
+                self._queue_questions("mfq", [question["id"] for question in questions])
         
-        for foundation in foundations:
-            result = await self.evaluate_mfq_foundation(foundation, max_questions_per_foundation)
-            foundation_results[foundation] = {
-                "alignment_score": result["alignment_score"],
-                "foundation_name": result["foundation_name"]
-            }
-            all_question_results.extend(result["question_results"])
+        # Evaluate foundations concurrently; results keep the instrument's order
+        results = await asyncio.gather(*(self.evaluate_mfq_foundation(foundation, max_questions_per_foundation,
+                                                                      shard, sampling)
+                                         for foundation in foundations))
         
-        # Calculate overall alignment
-        valid_scores = [f["alignment_score"] for f in foundation_results.values() 
-                       if f["alignment_score"] is not None]
-        overall_alignment = sum(valid_scores) / len(valid_scores) if valid_scores else None
+        # Calculate foundation and overall alignment from the foundations' aggregates
+        with self.tracer.span("aggregate"):
+            accumulators = self._merge_aggregates("mfq", results)
+            compiled = self.mfq_evaluator.compile_accumulated_results(accumulators, foundations)
         
         # Compile results
         evaluation_result = {
             "instrument": "mfq",
             "model": self.llm.model_info,
-            "overall_alignment": overall_alignment,
-            "foundation_results": foundation_results,
-            "question_results": all_question_results
+            "shard": str(shard) if shard is not None else None,
+            "max_questions": max_questions_per_foundation,
+            "overall_alignment": compiled["overall_alignment"],
+            "foundation_results": compiled["foundation_results"],
+            "aggregate_state": accumulators.to_state(),
+            "question_results": [r for result in results for r in result["question_results"]]
         }
+        if sampling is not None:
+            evaluation_result["sampling"] = {foundation: result["sampling"]
+                                             for foundation, result in zip(foundations, results)}
         
         # Save results if output directory is specified
         if self.output_dir:
@@ -173,13 +302,15 @@ class MoralEvaluationPipeline:
     
     #-------------------- Dilemmas Methods --------------------#
     
-    async def evaluate_dilemma_question(self, dilemma_id: str, question_id: str) -> Dict[str, Any]:
+    @_traced("dilemmas", "dilemmas.question", "dilemma_id", "question_id")
+    async def evaluate_dilemma_question(self, dilemma_id: str, question_id: str, repeat: int = 0) -> Dict[str, Any]:
         """
         Generate and evaluate a response to a single moral dilemma question.
         
         Args:
             dilemma_id: The ID of the dilemma
             question_id: The ID of the question
+            repeat: Index of the sample when a question is sampled more than once
             
         Returns:
             Evaluation results
@@ -189,41 +320,59 @@ class MoralEvaluationPipeline:
         
         # Format the combined ID
         combined_id = self.dilemmas.get_formatted_id(dilemma_id, question_id)
+        result_id = sample_id(combined_id, repeat)
         
-        # Get the dilemma questions
-        dilemma_questions = self.dilemmas.get_questions_by_dilemma(dilemma_id)
-        
-        # Find the specific question
-        question = next((q for q in dilemma_questions if q["id"] == question_id), None)
-        if not question:
-            raise ValueError(f"Question {question_id} not found in dilemma {dilemma_id}")
-        
-        # Format prompt
-        prompt = DilemmasPromptFormatter.format_prompt(question)
-        
-        # Generate response
-        response_text = await self.llm.generate_response(prompt, max_tokens=1500)
-        
-        # Evaluate response
-        result = self.dilemmas_evaluator.evaluate_response(combined_id, response_text)
-        
-        # Add raw data for reference
-        result["prompt"] = prompt
-        result["raw_response"] = response_text
-        
-        # Save result if output directory is specified
-        if self.output_dir:
-            self._save_result("dilemmas", combined_id, result)
+        with self._track_question("dilemmas", result_id) as progress:
+            # Reuse the saved result when resuming an interrupted run
+            saved_result = self._load_saved_result("dilemmas", result_id)
+            if saved_result is not None:
+                return saved_result
+            
+            # Get the specific question
+            try:
+                question = self.dilemmas.get_dilemma_question(dilemma_id, question_id)
+            except KeyError:
+                raise ValueError(f"Question {question_id} not found in dilemma {dilemma_id}") from None
+            
+            # Get the prompt, compiled once per instrument
+            with self.tracer.span("prompt.format"):
+                prompt = compiled_prompts("dilemmas", self.dilemmas).get(question)
+            
+            # Generate response
+            response_text = await self._generate(prompt, progress, repeat=repeat, max_tokens=1500)
+            
+            # Evaluate response
+            with self.tracer.span("response.evaluate"):
+                result = self.dilemmas_evaluator.evaluate_response(combined_id, response_text)
+            
+            # Add raw data for reference
+            result["prompt"] = prompt.text
+            result["prompt_sha256"] = prompt.sha256
+            result["raw_response"] = response_text
+            if repeat:
+                result["repeat"] = repeat
+            
+            # Save result if output directory is specified
+            if self.output_dir:
+                self._save_result("dilemmas", result_id, result)
         
         return result
     
-    async def evaluate_dilemma(self, dilemma_id: str, max_questions: Optional[int] = None) -> Dict[str, Any]:
+    @_traced("dilemmas", "dilemmas.dilemma", "dilemma_id", "max_questions", "shard")
+    async def evaluate_dilemma(self, 
+                            dilemma_id: str, 
+                            max_questions: Optional[int] = None,
+                            shard: Optional[ShardSpec] = None,
+                            sampling: Optional[SequentialSampling] = None) -> Dict[str, Any]:
         """
         Evaluate an LLM on a specific moral dilemma.
         
         Args:
             dilemma_id: The ID of the dilemma to evaluate
             max_questions: Maximum number of questions to evaluate (None for all)
+            shard: Only evaluate the questions in this shard (None for all)
+            sampling: Sample questions in rounds until the dilemma's score
+                estimate is tight enough (None to evaluate every question)
             
         Returns:
             Evaluation results for the dilemma
@@ -235,30 +384,51 @@ class MoralEvaluationPipeline:
         dilemma = self.dilemmas.get_dilemma_by_id(dilemma_id)
         
         # Get questions for the dilemma
-        questions = dilemma.get("questions", [])
+        questions = self.dilemmas.get_questions_by_dilemma(dilemma_id)
         
         # Limit number of questions if specified
         if max_questions is not None:
             questions = questions[:max_questions]
         
-        # Evaluate each question
-        results = []
-        for question in questions:
-            question_id = question["id"]
-            result = await self.evaluate_dilemma_question(dilemma_id, question_id)
-            results.append(result)
+        # Keep only this shard's questions (after the limit, so shards partition the same set)
+        questions = self.dilemmas.filter_shard(questions, shard)
+        
+        # Aggregates are accumulated as question results come in
+        accumulators = ResultAccumulators("dilemmas")
+        
+        if sampling is not None:
+            # Evaluate questions in rounds until the score estimate is tight enough
+            question_ids = {self.dilemmas.get_formatted_id(dilemma_id, question["id"]): question["id"]
+                            for question in questions}
+            results, decision = await self._sample_adaptively(
+                "dilemmas", list(question_ids),
+                lambda key, repeat: self.evaluate_dilemma_question(dilemma_id, question_ids[key], repeat),
+                "overall_score", sampling, accumulators, shard)
+        else:
+            self._queue_questions("dilemmas", [self.dilemmas.get_formatted_id(dilemma_id, question["id"])
+                                               for question in questions])
+        
+            # Evaluate questions concurrently (bounded by the pipeline's concurrency)
+            results = await self._gather_accumulated([self.evaluate_dilemma_question(dilemma_id, question["id"])
+                                                      for question in questions], accumulators)
         
         # Calculate dilemma scores
-        dilemma_scores = self.dilemmas_evaluator.calculate_dilemma_scores({dilemma_id: results})
+        with self.tracer.span("aggregate"):
+            dilemma_scores = accumulators[DilemmaScoresAccumulator].result()
         
         # Compile results
         evaluation_result = {
             "dilemma_id": dilemma_id,
             "dilemma_title": dilemma.get("title"),
             "model": self.llm.model_info,
+            "shard": str(shard) if shard is not None else None,
+            "max_questions": max_questions,
             "scores": dilemma_scores.get(dilemma_id, {}),
+            "aggregate_state": accumulators.to_state(),
             "question_results": results
         }
+        if sampling is not None:
+            evaluation_result["sampling"] = decision
         
         # Save results if output directory is specified
         if self.output_dir:
@@ -266,12 +436,18 @@ class MoralEvaluationPipeline:
         
         return evaluation_result
     
-    async def evaluate_all_dilemmas(self, max_questions_per_dilemma: Optional[int] = None) -> Dict[str, Any]:
+    @_traced("dilemmas", "dilemmas.all", "max_questions_per_dilemma", "shard")
+    async def evaluate_all_dilemmas(self, 
+                                 max_questions_per_dilemma: Optional[int] = None,
+                                 shard: Optional[ShardSpec] = None,
+                                 sampling: Optional[SequentialSampling] = None) -> Dict[str, Any]:
         """
         Evaluate an LLM on all moral dilemmas.
         
         Args:
             max_questions_per_dilemma: Maximum questions per dilemma (None for all)
+            shard: Only evaluate the questions in this shard (None for all)
+            sampling: Sample each dilemma's questions adaptively (None to evaluate every question)
             
         Returns:
             Complete evaluation results
@@ -282,29 +458,37 @@ class MoralEvaluationPipeline:
         # Get all dilemmas
         dilemma_ids = [dilemma.get("id") for dilemma in self.dilemmas.dilemmas]
         
-        dilemma_results = {}
-        all_question_results = []
+        # Announce the whole run up front so progress can report an ETA
+        # (adaptive runs announce each round as it starts)
+        if self.progress and sampling is None:
+            for dilemma_id in dilemma_ids:
+                questions = self.dilemmas.get_questions_by_dilemma(dilemma_id)[:max_questions_per_dilemma]
+                questions = self.dilemmas.filter_shard(questions, shard)
+                self._queue_questions("dilemmas", [self.dilemmas.get_shard_key(question) for question in questions])
         
-        # Evaluate each dilemma
-        for dilemma_id in dilemma_ids:
-            result = await self.evaluate_dilemma(dilemma_id, max_questions_per_dilemma)
-            dilemma_results[dilemma_id] = {
-                "title": result["dilemma_title"],
-                "scores": result["scores"]
-            }
-            all_question_results.extend(result["question_results"])
+        # Evaluate dilemmas concurrently; results keep the instrument's order
+        results = await asyncio.gather(*(self.evaluate_dilemma(dilemma_id, max_questions_per_dilemma, shard, sampling)
+                                         for dilemma_id in dilemma_ids))
         
-        # Calculate aggregate scores
-        aggregate_scores = self.dilemmas_evaluator.calculate_aggregate_scores(all_question_results)
+        # Calculate dilemma and aggregate scores from the dilemmas' aggregates
+        with self.tracer.span("aggregate"):
+            accumulators = self._merge_aggregates("dilemmas", results)
+            compiled = self.dilemmas_evaluator.compile_accumulated_results(accumulators, dilemma_ids)
         
         # Compile results
         evaluation_result = {
             "instrument": "dilemmas",
             "model": self.llm.model_info,
-            "aggregate_scores": aggregate_scores,
-            "dilemma_results": dilemma_results,
-            "question_results": all_question_results
+            "shard": str(shard) if shard is not None else None,
+            "max_questions": max_questions_per_dilemma,
+            "aggregate_scores": compiled["aggregate_scores"],
+            "dilemma_results": compiled["dilemma_results"],
+            "aggregate_state": accumulators.to_state(),
+            "question_results": [r for result in results for r in result["question_results"]]
         }
+        if sampling is not None:
+            evaluation_result["sampling"] = {dilemma_id: result["sampling"]
+                                             for dilemma_id, result in zip(dilemma_ids, results)}
         
         # Save results if output directory is specified
         if self.output_dir:
@@ -314,12 +498,14 @@ class MoralEvaluationPipeline:
     
     #-------------------- WVS Methods --------------------#
     
-    async def evaluate_wvs_question(self, question_id: str) -> Dict[str, Any]:
+    @_traced("wvs", "wvs.question", "question_id")
+    async def evaluate_wvs_question(self, question_id: str, repeat: int = 0) -> Dict[str, Any]:
         """
         Generate and evaluate a response to a single WVS question.
         
         Args:
             question_id: The ID of the question to evaluate
+            repeat: Index of the sample when a question is sampled more than once
             
         Returns:
             Evaluation results
@@ -327,37 +513,56 @@ class MoralEvaluationPipeline:
         if not self.wvs:
             raise ValueError("WVS instrument not initialized")
         
-        # Get the question
-        question = self.wvs.get_question_by_id(question_id)
+        result_id = sample_id(question_id, repeat)
         
-        # Format prompt
-        prompt = WVSPromptFormatter.format_prompt(question)
-        
-        # Generate response
-        response_text = await self.llm.generate_response(prompt)
-        
-        # Evaluate response
-        result = self.wvs_evaluator.evaluate_response(question_id, response_text)
-        
-        # Add raw data for reference
-        result["prompt"] = prompt
-        result["raw_response"] = response_text
-        
-        # Save result if output directory is specified
-        if self.output_dir:
-            self._save_result("wvs", question_id, result)
+        with self._track_question("wvs", result_id) as progress:
+            # Reuse the saved result when resuming an interrupted run
+            saved_result = self._load_saved_result("wvs", result_id)
+            if saved_result is not None:
+                return saved_result
+            
+            # Get the question
+            question = self.wvs.get_question_by_id(question_id)
+            
+            # Get the prompt, compiled once per instrument
+            with self.tracer.span("prompt.format"):
+                prompt = compiled_prompts("wvs", self.wvs).get(question)
+            
+            # Generate response
+            response_text = await self._generate(prompt, progress, repeat=repeat)
+            
+            # Evaluate response
+            with self.tracer.span("response.evaluate"):
+                result = self.wvs_evaluator.evaluate_response(question_id, response_text)
+            
+            # Add raw data for reference
+            result["prompt"] = prompt.text
+            result["prompt_sha256"] = prompt.sha256
+            result["raw_response"] = response_text
+            if repeat:
+                result["repeat"] = repeat
+            
+            # Save result if output directory is specified
+            if self.output_dir:
+                self._save_result("wvs", result_id, result)
         
         return result
     
+    @_traced("wvs", "wvs.domain", "domain", "max_questions", "shard")
     async def evaluate_wvs_domain(self, 
                                domain: str, 
-                               max_questions: Optional[int] = None) -> Dict[str, Any]:
+                               max_questions: Optional[int] = None,
+                               shard: Optional[ShardSpec] = None,
+                               sampling: Optional[SequentialSampling] = None) -> Dict[str, Any]:
         """
         Evaluate an LLM on a specific WVS domain.
         
         Args:
             domain: The domain to evaluate
             max_questions: Maximum number of questions to evaluate (None for all)
+            shard: Only evaluate the questions in this shard (None for all)
+            sampling: Sample questions in rounds until the domain's alignment
+                estimate is tight enough (None to evaluate every question)
             
         Returns:
             Evaluation results for the domain
@@ -372,23 +577,41 @@ class MoralEvaluationPipeline:
         if max_questions is not None:
             questions = questions[:max_questions]
         
-        # Evaluate each question
-        results = []
-        for question in questions:
-            result = await self.evaluate_wvs_question(question["id"])
-            results.append(result)
+        # Keep only this shard's questions (after the limit, so shards partition the same set)
+        questions = self.wvs.filter_shard(questions, shard)
+        
+        # Aggregates are accumulated as question results come in
+        accumulators = ResultAccumulators("wvs")
+        
+        if sampling is not None:
+            # Evaluate questions in rounds until the alignment estimate is tight enough
+            results, decision = await self._sample_adaptively("wvs", [question["id"] for question in questions],
+                                                              self.evaluate_wvs_question, "overall_alignment",
+                                                              sampling, accumulators, shard)
+        else:
+            self._queue_questions("wvs", [question["id"] for question in questions])
+        
+            # Evaluate questions concurrently (bounded by the pipeline's concurrency)
+            results = await self._gather_accumulated([self.evaluate_wvs_question(question["id"])
+                                                      for question in questions], accumulators)
         
         # Calculate domain metrics
-        domain_metrics = self.wvs_evaluator.calculate_domain_metrics(results).get(domain, {})
+        with self.tracer.span("aggregate"):
+            domain_metrics = accumulators[DomainMetricsAccumulator].result().get(domain, {})
         
         # Compile results
         evaluation_result = {
             "domain": domain,
             "domain_name": domain_metrics.get("name", domain),
             "model": self.llm.model_info,
+            "shard": str(shard) if shard is not None else None,
+            "max_questions": max_questions,
             "metrics": domain_metrics,
+            "aggregate_state": accumulators.to_state(),
             "question_results": results
         }
+        if sampling is not None:
+            evaluation_result["sampling"] = decision
         
         # Save results if output directory is specified
         if self.output_dir:
@@ -396,15 +619,18 @@ class MoralEvaluationPipeline:
         
         return evaluation_result
     
+    @_traced("wvs", "wvs.category", "category", "max_questions", "shard")
     async def evaluate_wvs_category(self, 
                                  category: str, 
-                                 max_questions: Optional[int] = None) -> Dict[str, Any]:
+                                 max_questions: Optional[int] = None,
+                                 shard: Optional[ShardSpec] = None) -> Dict[str, Any]:
         """
         Evaluate an LLM on a specific WVS category (e.g., importance, agreement).
         
         Args:
             category: The category to evaluate
             max_questions: Maximum number of questions to evaluate (None for all)
+            shard: Only evaluate the questions in this shard (None for all)
             
         Returns:
             Evaluation results for the category
@@ -419,20 +645,29 @@ class MoralEvaluationPipeline:
         if max_questions is not None:
             questions = questions[:max_questions]
         
-        # Evaluate each question
-        results = []
-        for question in questions:
-            result = await self.evaluate_wvs_question(question["id"])
-            results.append(result)
+        # Keep only this shard's questions (after the limit, so shards partition the same set)
+        questions = self.wvs.filter_shard(questions, shard)
+        
+        self._queue_questions("wvs", [question["id"] for question in questions])
+        
+        # Evaluate questions concurrently (bounded by the pipeline's concurrency),
+        # accumulating aggregates as question results come in
+        accumulators = ResultAccumulators("wvs")
+        results = await self._gather_accumulated([self.evaluate_wvs_question(question["id"])
+                                                  for question in questions], accumulators)
         
         # Calculate category metrics
-        category_metrics = self.wvs_evaluator.analyze_category_performance(results).get(category, {})
+        with self.tracer.span("aggregate"):
+            category_metrics = accumulators[CategoryPerformanceAccumulator].result().get(category, {})
         
         # Compile results
         evaluation_result = {
             "category": category,
             "model": self.llm.model_info,
+            "shard": str(shard) if shard is not None else None,
+            "max_questions": max_questions,
             "metrics": category_metrics,
+            "aggregate_state": accumulators.to_state(),
             "question_results": results
         }
         
@@ -442,13 +677,18 @@ class MoralEvaluationPipeline:
         
         return evaluation_result
     
+    @_traced("wvs", "wvs.all", "max_questions_per_domain", "shard")
     async def evaluate_all_wvs_domains(self, 
-                                    max_questions_per_domain: Optional[int] = None) -> Dict[str, Any]:
+                                    max_questions_per_domain: Optional[int] = None,
+                                    shard: Optional[ShardSpec] = None,
+                                    sampling: Optional[SequentialSampling] = None) -> Dict[str, Any]:
         """
         Evaluate an LLM on all WVS domains.
         
         Args:
             max_questions_per_domain: Maximum questions per domain (None for all)
+            shard: Only evaluate the questions in this shard (None for all)
+            sampling: Sample each domain's questions adaptively (None to evaluate every question)
             
         Returns:
             Complete evaluation results
@@ -459,33 +699,38 @@ class MoralEvaluationPipeline:
         # Get all domains
         domains = self.wvs.get_domain_names().keys()
         
-        domain_results = {}
-        all_question_results = []
-        
-        # Evaluate each domain
-        for domain in domains:
-            result = await self.evaluate_wvs_domain(domain, max_questions_per_domain)
-            domain_results[domain] = {
-                "name": result["domain_name"],
-                "metrics": result["metrics"]
-            }
-            all_question_results.extend(result["question_results"])
+        # Announce the whole run up front so progress can report an ETA
+        # (adaptive runs announce each round as it starts)
+        if self.progress and sampling is None:
+            for domain in domains:
+                questions = self.wvs.get_questions_by_domain(domain)[:max_questions_per_domain]
+                questions = self.wvs.filter_shard(questions, shard)
+                self._queue_questions("wvs", [question["id"] for question in questions])
         
-        # Calculate overall metrics
-        overall_metrics = self.wvs_evaluator.calculate_overall_metrics(all_question_results)
+        # Evaluate domains concurrently; results keep the instrument's order
+        results = await asyncio.gather(*(self.evaluate_wvs_domain(domain, max_questions_per_domain, shard, sampling)
+                                         for domain in domains))
         
-        # Calculate category performance
-        category_performance = self.wvs_evaluator.analyze_category_performance(all_question_results)
+        # Calculate domain, overall and category metrics from the domains' aggregates
+        with self.tracer.span("aggregate"):
+            accumulators = self._merge_aggregates("wvs", results)
+            compiled = self.wvs_evaluator.compile_accumulated_results(accumulators, domains)
         
         # Compile results
         evaluation_result = {
             "instrument": "wvs",
             "model": self.llm.model_info,
-            "overall_metrics": overall_metrics,
-            "domain_results": domain_results,
-            "category_performance": category_performance,
-            "question_results": all_question_results
+            "shard": str(shard) if shard is not None else None,
+            "max_questions": max_questions_per_domain,
+            "overall_metrics": compiled["overall_metrics"],
+            "domain_results": compiled["domain_results"],
+            "category_performance": compiled["category_performance"],
+            "aggregate_state": accumulators.to_state(),
+            "question_results": [r for result in results for r in result["question_results"]]
         }
+        if sampling is not None:
+            evaluation_result["sampling"] = {domain: result["sampling"]
+                                             for domain, result in zip(domains, results)}
         
         # Save results if output directory is specified
         if self.output_dir:
@@ -495,13 +740,174 @@ class MoralEvaluationPipeline:
     
     #-------------------- Helper Methods --------------------#
     
+    async def _sample_adaptively(self, instrument: str, question_keys: List[str], evaluate,
+                                 score_field: str, sampling: SequentialSampling,
+                                 accumulators: ResultAccumulators,
+                                 shard: Optional[ShardSpec] = None) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """
+        Evaluate a group's questions in rounds until the sampling policy stops.
+        
+        Args:
+            instrument: Instrument the questions belong to
+            question_keys: Keys of the group's questions
+            evaluate: Coroutine function evaluating a (question key, repeat) sample
+            score_field: Result field holding the alignment score
+            sampling: Sampling policy deciding when to stop
+            accumulators: Accumulators fed each question result
+            shard: Shard being evaluated (adaptive sampling cannot be sharded)
+            
+        Returns:
+            Tuple of (question results in sampling order, stopping decision)
+        """
+        if shard is not None:
+            raise ValueError("Adaptive sampling cannot be combined with sharding")
+        
+        schedule = sampling.schedule(question_keys)
+        results = []
+        stats = RunningStats()
+        rounds = 0
+        
+        reason = sampling.stop_reason(stats, 0, len(schedule))
+        while reason is None:
+            samples = sampling.next_round(schedule, len(results))
+            self._queue_questions(instrument, [sample_id(key, repeat) for key, repeat in samples])
+            
+            # Evaluate the round concurrently (bounded by the pipeline's concurrency)
+            round_results = await asyncio.gather(*(evaluate(key, repeat) for key, repeat in samples))
+            rounds += 1
+            
+            for result in round_results:
+                results.append(result)
+                accumulators.add(result)
+                if result.get("is_valid_response", False) and result.get(score_field) is not None:
+                    stats.add(result[score_field])
+            
+            reason = sampling.stop_reason(stats, len(results), len(schedule))
+        
+        return results, sampling.decision(reason, stats, len(results), rounds)
+    
+    @staticmethod
+    async def _gather_accumulated(evaluations: List, accumulators: ResultAccumulators) -> List[Dict[str, Any]]:
+        """
+        Run question evaluations concurrently, feeding each result to the accumulators as it completes.
+        
+        Results are added in question order (a result waits only for those before it),
+        so the aggregates do not depend on which LLM call finishes first.
+        
+        Args:
+            evaluations: Coroutines evaluating the questions, in question order
+            accumulators: Accumulators fed each question result
+            
+        Returns:
+            Question results in question order
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(evaluations)
+        completed = [False] * len(evaluations)
+        next_index = 0
+        
+        async def evaluate(index: int, evaluation) -> None:
+            nonlocal next_index
+            results[index] = await evaluation
+            completed[index] = True
+            while next_index < len(results) and completed[next_index]:
+                accumulators.add(results[next_index])
+                next_index += 1
+        
+        await asyncio.gather(*(evaluate(index, evaluation) for index, evaluation in enumerate(evaluations)))
+        return results
+    
+    @staticmethod
+    def _merge_aggregates(instrument: str, group_results: List[Dict[str, Any]]) -> ResultAccumulators:
+        """Merge the saved aggregate states of an instrument's group results."""
+        accumulators = ResultAccumulators(instrument)
+        for result in group_results:
+            accumulators.merge(ResultAccumulators.from_state(result["aggregate_state"]))
+        return accumulators
+    
+    def _queue_questions(self, instrument: str, question_keys: List[str]) -> None:
+        """Announce questions that are about to be evaluated to the progress tracker."""
+        if self.progress:
+            self.progress.queue(instrument, self.llm.model_name, question_keys)
+    
+    def _track_question(self, instrument: str, question_key: str):
+        """Get a progress handle (context manager) for a single question evaluation."""
+        if not self.progress:
+            return NULL_PROGRESS
+        return self.progress.question(instrument, self.llm.model_name, question_key)
+    
+    async def _generate(self, prompt: CompiledPrompt, progress=NULL_PROGRESS, repeat: int = 0, **kwargs) -> str:
+        """
+        Generate an LLM response, honouring the cache, concurrency and rate limits
+        and recording latency and token usage.
+        
+        Repeated samples of the same prompt (repeat > 0) are cached separately.
+        """
+        # Serve repeated calls from the response cache
+        cache_key = None
+        if self.cache:
+            cache_params = dict(kwargs, repeat=repeat) if repeat else kwargs
+            cache_key = self.cache.make_key(self.llm.model_name, prompt.text, cache_params)
+            response_text = self.cache.get(cache_key)
+            if response_text is not None:
+                progress.start()
+                progress.record_call(0.0, prompt.tokens, count_tokens(response_text), cached=True)
+                return response_text
+        
+        with self.tracer.span("llm.wait"):
+            await self._semaphore.acquire()
+        try:
+            progress.start()
+            
+            if self.rate_limiter:
+                with self.tracer.span("llm.wait", limiter="rate"):
+                    # Reserve prompt tokens plus the completion budget, as providers do
+                    max_tokens = kwargs.get("max_tokens", getattr(self.llm, "max_tokens", 0))
+                    await self.rate_limiter.acquire(prompt.tokens + max_tokens)
+            
+            with self.tracer.span("llm.call") as span:
+                start = time.perf_counter()
+                response_text = await self.llm.generate_response(prompt.text, **kwargs)
+                latency = time.perf_counter() - start
+                
+                if progress is not NULL_PROGRESS or self.tracer.enabled:
+                    input_tokens = prompt.tokens
+                    output_tokens = count_tokens(response_text)
+                    progress.record_call(latency, input_tokens, output_tokens)
+                    span.set_attribute("input_tokens", input_tokens)
+                    span.set_attribute("output_tokens", output_tokens)
+        finally:
+            self._semaphore.release()
+        
+        if cache_key is not None:
+            self.cache.put(cache_key, response_text)
+        
+        return response_text
+    
+    def _result_path(self, instrument: str, result_id: str) -> Path:
+        """Get the file a result is saved to."""
+        model_name = self.llm.model_info["name"].replace("/", "_")
+        return Path(self.output_dir) / instrument / f"{result_id}_{model_name}.json"
+    
+    def _load_saved_result(self, instrument: str, result_id: str) -> Optional[Dict[str, Any]]:
+        """Load a previously saved question result when resuming (None if unavailable)."""
+        if not self.resume:
+            return None
+        
+        file_path = self._result_path(instrument, result_id)
+        try:
+            with open(file_path, 'r') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            # Missing or partially written results are evaluated again
+            return None
+    
     def _save_result(self, instrument: str, result_id: str, result: Dict[str, Any]) -> None:
         """Save a result to a file."""
-        model_name = self.llm.model_info["name"].replace("/", "_")
-        file_path = Path(self.output_dir) / instrument / f"{result_id}_{model_name}.json"
-        
-        # Create subdirectory if it doesn't exist
-        file_path.parent.mkdir(parents=True, exist_ok=True)
+        file_path = self._result_path(instrument, result_id)
         
-        with open(file_path, 'w') as f:
-            json.dump(result, f, indent=2)
\ No newline at end of file
+        with self.tracer.span("result.save", path=str(file_path)):
+            # Create subdirectory if it doesn't exist
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            
+            with open(file_path, 'w') as f:
+                json.dump(result, f, indent=2)
\ No newline at end of file
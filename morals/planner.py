@@ -0,0 +1,356 @@
+# morals/planner.py
+import json
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
+
+from .instruments.mfq import MoralFoundationsQuestionnaire
+from .instruments.dilemmas import MoralDilemmasInstrument
+from .instruments.wvs import WorldValuesSurveyInstrument
+from .llm.prompts import CompiledPrompt, compiled_prompts, render_prompt
+from .llm.tokens import count_tokens
+from .llm.cache import ResponseCache
+from .sharding import ShardSpec
+
+# Generation parameters the pipeline passes per instrument (must match MoralEvaluationPipeline)
+GENERATION_KWARGS: Dict[str, Dict[str, Any]] = {
+    "mfq": {},
+    "wvs": {},
+    "dilemmas": {"max_tokens": 1500}
+}
+
+# Default max_tokens of the LLM interfaces
+DEFAULT_MAX_TOKENS = 1000
+
+# List prices in USD per million (input, output) tokens
+MODEL_PRICES: Dict[str, Tuple[float, float]] = {
+    "claude-3-haiku-20240307": (0.25, 1.25),
+    "claude-3-5-haiku-20241022": (0.80, 4.00),
+    "claude-3-5-sonnet-20241022": (3.00, 15.00),
+    "claude-3-7-sonnet-20250219": (3.00, 15.00),
+    "claude-3-opus-20240229": (15.00, 75.00),
+    "gpt-4": (30.00, 60.00),
+    "gpt-4-turbo": (10.00, 30.00),
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4o-mini": (0.15, 0.60)
+}
+
+# Latency model used to project wall-clock time: fixed overhead plus generation speed
+DEFAULT_CALL_OVERHEAD_SECONDS = 1.0
+DEFAULT_OUTPUT_TOKENS_PER_SECOND = 60.0
+
+# Result files that hold aggregates rather than single question results
+_AGGREGATE_PREFIXES = ("overall_", "foundation_", "domain_", "category_", "dilemma_")
+
+# Cap on historical results read per instrument and model, to keep planning fast
+_MAX_HISTORY_FILES = 500
+
+
+class RunPlanner:
+    """
+    Estimate the calls, tokens, cost and wall-clock time of an evaluation run
+    without calling any LLM.
+
+    Prompts are the same compiled prompts the pipeline sends, counted with
+    the local tokenizer. Output tokens come from earlier results
+    of the same model when available, otherwise from the max_tokens budget.
+    """
+
+    def __init__(self,
+                 mfq: Optional[MoralFoundationsQuestionnaire] = None,
+                 dilemmas: Optional[MoralDilemmasInstrument] = None,
+                 wvs: Optional[WorldValuesSurveyInstrument] = None,
+                 history_dir: Optional[str] = None,
+                 cache: Optional[ResponseCache] = None,
+                 resume: bool = False,
+                 concurrency: int = 1,
+                 requests_per_minute: Optional[float] = None,
+                 tokens_per_minute: Optional[float] = None,
+                 prices: Optional[Dict[str, Tuple[float, float]]] = None,
+                 default_max_tokens: int = DEFAULT_MAX_TOKENS):
+        """
+        Initialize the planner.
+
+        Args:
+            mfq: MFQ instrument (None if MFQ is not planned)
+            dilemmas: Moral dilemmas instrument (None if dilemmas are not planned)
+            wvs: WVS instrument (None if WVS is not planned)
+            history_dir: Output directory of earlier runs, used for output token estimates
+            cache: Response cache; cached calls are planned as free
+            resume: Whether the run resumes from results saved in history_dir
+            concurrency: Maximum LLM calls in flight at once
+            requests_per_minute: Requests-per-minute limit (None for no limit)
+            tokens_per_minute: Tokens-per-minute limit (None for no limit)
+            prices: USD per million (input, output) tokens by model, added to MODEL_PRICES
+            default_max_tokens: max_tokens of the LLM when the pipeline does not set one
+        """
+        if resume and not history_dir:
+            raise ValueError("resume requires a history_dir")
+
+        self.mfq = mfq
+        self.dilemmas = dilemmas
+        self.wvs = wvs
+        self.history_dir = Path(history_dir) if history_dir else None
+        self.cache = cache
+        self.resume = resume
+        self.concurrency = concurrency
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.prices = {**MODEL_PRICES, **(prices or {})}
+        self.default_max_tokens = default_max_tokens
+        self._history_cache: Dict[Tuple[str, str], Optional[float]] = {}
+
+    #-------------------- Question Selection --------------------#
+
+    def select_mfq(self,
+                   foundations: Optional[List[str]] = None,
+                   max_questions: Optional[int] = None,
+                   shard: Optional[ShardSpec] = None) -> List[Dict[str, Any]]:
+        """Select the MFQ questions a run over `foundations` (None for all) would evaluate."""
+        if not self.mfq:
+            raise ValueError("MFQ instrument not initialized")
+
+        questions = []
+        for foundation in foundations or self.mfq.get_foundation_names():
+            selected = self.mfq.get_questions_by_foundation(foundation)[:max_questions]
+            questions.extend(self.mfq.filter_shard(selected, shard))
+        return questions
+
+    def select_wvs(self,
+                   domains: Optional[List[str]] = None,
+                   categories: Optional[List[str]] = None,
+                   max_questions: Optional[int] = None,
+                   shard: Optional[ShardSpec] = None) -> List[Dict[str, Any]]:
+        """Select the WVS questions a run over `domains` and `categories` (all domains if neither) would evaluate."""
+        if not self.wvs:
+            raise ValueError("WVS instrument not initialized")
+
+        if not domains and not categories:
+            domains = list(self.wvs.get_domain_names())
+
+        questions = []
+        for domain in domains or []:
+            selected = self.wvs.get_questions_by_domain(domain)[:max_questions]
+            questions.extend(self.wvs.filter_shard(selected, shard))
+        for category in categories or []:
+            selected = self.wvs.get_questions_by_category(category)[:max_questions]
+            questions.extend(self.wvs.filter_shard(selected, shard))
+        return questions
+
+    def select_dilemmas(self,
+                        dilemma_ids: Optional[List[str]] = None,
+                        max_questions: Optional[int] = None,
+                        shard: Optional[ShardSpec] = None) -> List[Dict[str, Any]]:
+        """Select the dilemma questions a run over `dilemma_ids` (None for all) would evaluate."""
+        if not self.dilemmas:
+            raise ValueError("Dilemmas instrument not initialized")
+
+        questions = []
+        for dilemma_id in dilemma_ids or self.dilemmas.get_dilemma_titles():
+            selected = self.dilemmas.get_questions_by_dilemma(dilemma_id)[:max_questions]
+            questions.extend(self.dilemmas.filter_shard(selected, shard))
+        return questions
+
+    #-------------------- Planning --------------------#
+
+    def plan(self, models: List[str], questions: Dict[str, List[Dict[str, Any]]]) -> Dict[str, Any]:
+        """
+        Estimate a run of every model over the selected questions.
+
+        Args:
+            models: Model names to plan for
+            questions: Selected questions by instrument (see the select_* methods)
+
+        Returns:
+            Dictionary with one row per instrument and model, and totals per model
+        """
+        # Prompts and their token counts do not depend on the model
+        prompts = {instrument: [(self._question_key(instrument, question), self.compiled_prompt(instrument, question))
+                                for question in instrument_questions]
+                   for instrument, instrument_questions in questions.items()}
+
+        rows = []
+        totals = {}
+        for model in models:
+            model_rows = [self._plan_instrument(model, instrument, prompts[instrument]) for instrument in prompts]
+            rows.extend(model_rows)
+            totals[model] = self._combine(model, model_rows)
+
+        return {
+            "concurrency": self.concurrency,
+            "requests_per_minute": self.requests_per_minute,
+            "tokens_per_minute": self.tokens_per_minute,
+            "rows": rows,
+            "totals": totals
+        }
+
+    def _plan_instrument(self, model: str, instrument: str, prompts: List[Tuple[str, CompiledPrompt]]) -> Dict[str, Any]:
+        """Estimate the calls of one model on one instrument."""
+        generation_kwargs = GENERATION_KWARGS.get(instrument, {})
+        max_tokens = generation_kwargs.get("max_tokens", self.default_max_tokens)
+
+        historical_tokens = self._historical_output_tokens(instrument, model)
+        expected_output = min(historical_tokens, max_tokens) if historical_tokens is not None else max_tokens
+
+        calls = 0
+        skipped = 0
+        input_tokens = 0
+        for key, prompt in prompts:
+            if self._is_done(model, instrument, key, prompt.text, generation_kwargs):
+                skipped += 1
+                continue
+            calls += 1
+            input_tokens += prompt.tokens
+
+        row = {
+            "instrument": instrument,
+            "model": model,
+            "questions": len(prompts),
+            "calls": calls,
+            "skipped": skipped,
+            "input_tokens": input_tokens,
+            "output_tokens": round(calls * expected_output),
+            "max_output_tokens": calls * max_tokens,
+            "output_source": "history" if historical_tokens is not None else "max_tokens",
+            # The rate limiter reserves the whole max_tokens budget for each call
+            "reserved_tokens": input_tokens + calls * max_tokens,
+            "latency_seconds": calls * self._call_seconds(expected_output) / self.concurrency
+        }
+        row.update(self._cost(model, row))
+        row.update(self._wall_clock(row))
+        return row
+
+    def _combine(self, model: str, rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Total the rows of one model (instruments run one after another)."""
+        total = {"model": model}
+        for field in ("questions", "calls", "skipped", "input_tokens", "output_tokens",
+                      "max_output_tokens", "reserved_tokens", "latency_seconds"):
+            total[field] = sum(row[field] for row in rows)
+        total.update(self._cost(model, total))
+        total.update(self._wall_clock(total))
+        return total
+
+    def _cost(self, model: str, usage: Dict[str, Any]) -> Dict[str, Optional[float]]:
+        """Expected and worst-case cost in USD (None if the model has no price)."""
+        if model not in self.prices:
+            return {"cost_usd": None, "max_cost_usd": None}
+
+        input_price, output_price = self.prices[model]
+        input_cost = usage["input_tokens"] * input_price / 1e6
+        return {
+            "cost_usd": input_cost + usage["output_tokens"] * output_price / 1e6,
+            "max_cost_usd": input_cost + usage["max_output_tokens"] * output_price / 1e6
+        }
+
+    def _wall_clock(self, usage: Dict[str, Any]) -> Dict[str, Any]:
+        """Project wall-clock time as the slowest of latency, request and token limits."""
+        bounds = {"latency": usage["latency_seconds"]}
+
+        # Token buckets start full, so only usage beyond one minute's budget has to wait
+        if self.requests_per_minute:
+            bounds["rpm"] = max(0.0, usage["calls"] - self.requests_per_minute) * 60.0 / self.requests_per_minute
+        if self.tokens_per_minute:
+            bounds["tpm"] = max(0.0, usage["reserved_tokens"] - self.tokens_per_minute) * 60.0 / self.tokens_per_minute
+
+        bound = max(bounds, key=bounds.get)
+        return {"wall_clock_seconds": bounds[bound], "bound": bound}
+
+    #-------------------- Helper Methods --------------------#
+
+    @staticmethod
+    def _call_seconds(output_tokens: float) -> float:
+        """Estimated latency of a single call."""
+        return DEFAULT_CALL_OVERHEAD_SECONDS + output_tokens / DEFAULT_OUTPUT_TOKENS_PER_SECOND
+
+    def _question_key(self, instrument: str, question: Dict[str, Any]) -> str:
+        """Key a question's result is saved under."""
+        return getattr(self, instrument).get_shard_key(question)
+
+    @staticmethod
+    def format_prompt(instrument: str, question: Dict[str, Any]) -> str:
+        """Render a question's prompt with the formatter the pipeline uses."""
+        return render_prompt(instrument, question)
+
+    def compiled_prompt(self, instrument: str, question: Dict[str, Any]) -> CompiledPrompt:
+        """Get the compiled prompt the pipeline sends for a question."""
+        return compiled_prompts(instrument, getattr(self, instrument)).get(question)
+
+    def _is_done(self, model: str, instrument: str, key: str, prompt: str,
+                 generation_kwargs: Dict[str, Any]) -> bool:
+        """Check whether a call would be served by a saved result or the response cache."""
+        if self.resume:
+            result_path = self.history_dir / instrument / f"{key}_{model.replace('/', '_')}.json"
+            if result_path.exists():
+                return True
+
+        if self.cache:
+            return self.cache.get(self.cache.make_key(model, prompt, generation_kwargs)) is not None
+
+        return False
+
+    def _historical_output_tokens(self, instrument: str, model: str) -> Optional[float]:
+        """Mean output tokens of earlier question results for this instrument and model."""
+        cache_key = (instrument, model)
+        if cache_key in self._history_cache:
+            return self._history_cache[cache_key]
+
+        token_counts = []
+        instrument_dir = self.history_dir / instrument if self.history_dir else None
+        if instrument_dir and instrument_dir.is_dir():
+            suffix = f"_{model.replace('/', '_')}.json"
+            for path in instrument_dir.iterdir():
+                if len(token_counts) >= _MAX_HISTORY_FILES:
+                    break
+                if not path.name.endswith(suffix) or path.name.startswith(_AGGREGATE_PREFIXES):
+                    continue
+                try:
+                    with open(path, 'r', encoding='utf-8') as f:
+                        result = json.load(f)
+                except (OSError, json.JSONDecodeError):
+                    continue
+                if isinstance(result.get("raw_response"), str):
+                    token_counts.append(count_tokens(result["raw_response"]))
+
+        mean_tokens = sum(token_counts) / len(token_counts) if token_counts else None
+        self._history_cache[cache_key] = mean_tokens
+        return mean_tokens
+
+
+def _format_duration(seconds: float) -> str:
+    if seconds < 60:
+        return f"{seconds:.0f}s"
+    if seconds < 3600:
+        return f"{seconds / 60:.1f}m"
+    return f"{seconds / 3600:.1f}h"
+
+
+def _format_cost(cost: Optional[float]) -> str:
+    return f"${cost:.2f}" if cost is not None else "n/a"
+
+
+def format_plan(plan: Dict[str, Any]) -> str:
+    """Format a plan as a per-instrument/per-model table."""
+    header = (f"{'instrument':<10} {'model':<28} {'calls':>6} {'skip':>5} {'in tok':>9} "
+              f"{'out tok':>9} {'max out':>9} {'cost':>9} {'max cost':>9} {'time':>7}  bound")
+    lines = [header, "-" * len(header)]
+
+    def add_line(instrument: str, row: Dict[str, Any]) -> None:
+        output_tokens = f"{row['output_tokens']}{'*' if row.get('output_source') == 'history' else ''}"
+        lines.append(f"{instrument:<10} {row['model']:<28} {row['calls']:>6} {row['skipped']:>5} "
+                     f"{row['input_tokens']:>9} {output_tokens:>9} {row['max_output_tokens']:>9} "
+                     f"{_format_cost(row['cost_usd']):>9} {_format_cost(row['max_cost_usd']):>9} "
+                     f"{_format_duration(row['wall_clock_seconds']):>7}  {row['bound']}")
+
+    for model, total in plan["totals"].items():
+        for row in plan["rows"]:
+            if row["model"] == model:
+                add_line(row["instrument"], row)
+        add_line("total", total)
+        lines.append("")
+
+    limits = [f"concurrency {plan['concurrency']}"]
+    if plan["requests_per_minute"]:
+        limits.append(f"{plan['requests_per_minute']:g} rpm")
+    if plan["tokens_per_minute"]:
+        limits.append(f"{plan['tokens_per_minute']:g} tpm")
+    lines.append(f"Limits: {', '.join(limits)}. * = output tokens estimated from earlier results.")
+    return "\n".join(lines)
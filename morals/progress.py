@@ -0,0 +1,409 @@
+# morals/progress.py
+import math
+import sys
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Set, TextIO, Tuple
+
+
+# Observer callback: receives the event name and the group's current metrics
+ProgressObserver = Callable[[str, Dict[str, Any]], None]
+
+
+def _percentile(sorted_values: List[float], fraction: float) -> Optional[float]:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    index = max(0, math.ceil(fraction * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+
+def _format_duration(seconds: Optional[float]) -> str:
+    """Format a duration in seconds as H:MM:SS."""
+    if seconds is None:
+        return "--:--:--"
+    seconds = int(seconds)
+    return f"{seconds // 3600}:{(seconds % 3600) // 60:02d}:{seconds % 60:02d}"
+
+
+class _GroupStats:
+    """Counters for one (instrument, model) group."""
+
+    def __init__(self, instrument: str, model: str, latency_window: int):
+        self.instrument = instrument
+        self.model = model
+        self.pending: Set[str] = set()
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.calls = 0
+        self.cache_hits = 0
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.latencies: Deque[float] = deque(maxlen=latency_window)
+        self.started_at: Optional[float] = None
+
+    def metrics(self, now: float) -> Dict[str, Any]:
+        elapsed = now - self.started_at if self.started_at is not None else 0.0
+        finished = self.completed + self.failed
+        tokens = self.input_tokens + self.output_tokens
+        requests_per_sec = finished / elapsed if elapsed > 0 else 0.0
+        remaining = len(self.pending) + self.in_flight
+        latencies = sorted(self.latencies)
+
+        eta = None
+        if remaining == 0:
+            eta = 0.0
+        elif requests_per_sec > 0:
+            eta = remaining / requests_per_sec
+
+        return {
+            "instrument": self.instrument,
+            "model": self.model,
+            "queued": len(self.pending),
+            "in_flight": self.in_flight,
+            "completed": self.completed,
+            "failed": self.failed,
+            "calls": self.calls,
+            "cache_hits": self.cache_hits,
+            "cache_hit_rate": self.cache_hits / self.calls if self.calls else 0.0,
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+            "elapsed": elapsed,
+            "requests_per_sec": requests_per_sec,
+            "tokens_per_sec": tokens / elapsed if elapsed > 0 else 0.0,
+            "latency_p50": _percentile(latencies, 0.50),
+            "latency_p95": _percentile(latencies, 0.95),
+            "latency_p99": _percentile(latencies, 0.99),
+            "eta_seconds": eta
+        }
+
+
+class QuestionProgress:
+    """
+    Progress handle for a single question evaluation.
+
+    Use as a context manager: the question is marked completed when the block
+    exits normally and failed when it raises. It stays queued until start() is
+    called, which the pipeline does once the question has a concurrency slot.
+    """
+
+    def __init__(self, tracker: "ProgressTracker", instrument: str, model: str, question_key: str):
+        self.tracker = tracker
+        self.instrument = instrument
+        self.model = model
+        self.question_key = question_key
+        self.started = False
+
+    def start(self) -> None:
+        """Mark the question as in flight (idempotent)."""
+        if not self.started:
+            self.started = True
+            self.tracker._start(self)
+
+    def record_call(self,
+                    latency: float,
+                    input_tokens: int = 0,
+                    output_tokens: int = 0,
+                    cached: bool = False) -> None:
+        """Record one LLM call made for this question."""
+        self.tracker._record_call(self, latency, input_tokens, output_tokens, cached)
+
+    def __enter__(self) -> "QuestionProgress":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self.tracker._finish(self, failed=exc_type is not None)
+        return False
+
+
+class _NullQuestionProgress:
+    """No-op progress handle used when no tracker is attached."""
+
+    def start(self) -> None:
+        pass
+
+    def record_call(self, latency: float, input_tokens: int = 0,
+                    output_tokens: int = 0, cached: bool = False) -> None:
+        pass
+
+    def __enter__(self) -> "_NullQuestionProgress":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        return False
+
+
+NULL_PROGRESS = _NullQuestionProgress()
+
+
+class ProgressTracker:
+    """
+    Thread-safe progress and throughput metrics for evaluation runs.
+
+    Metrics are kept per (instrument, model) group and reported to observers
+    on every state change. A tracker can be shared by several pipelines (one per
+    model) to get a combined view of a multi-model run.
+    """
+
+    def __init__(self, latency_window: int = 10000):
+        """
+        Initialize the tracker.
+
+        Args:
+            latency_window: Number of most recent call latencies kept per group
+                for percentile calculation
+        """
+        self.latency_window = latency_window
+        self._groups: Dict[Tuple[str, str], _GroupStats] = {}
+        self._observers: List[ProgressObserver] = []
+        self._lock = threading.Lock()
+
+    #-------------------- Observer API --------------------#
+
+    def add_observer(self, observer: ProgressObserver) -> None:
+        """Register a callback invoked as observer(event, metrics) on every update."""
+        self._observers.append(observer)
+
+    def remove_observer(self, observer: ProgressObserver) -> None:
+        """Unregister a previously added callback."""
+        self._observers.remove(observer)
+
+    def _notify(self, event: str, group: _GroupStats) -> None:
+        if not self._observers:
+            return
+        with self._lock:
+            metrics = group.metrics(time.monotonic())
+        for observer in list(self._observers):
+            observer(event, metrics)
+
+    #-------------------- Recording --------------------#
+
+    def _group(self, instrument: str, model: str) -> _GroupStats:
+        key = (instrument, model)
+        group = self._groups.get(key)
+        if group is None:
+            group = _GroupStats(instrument, model, self.latency_window)
+            self._groups[key] = group
+        return group
+
+    def queue(self, instrument: str, model: str, question_keys: Iterable[str]) -> None:
+        """
+        Mark questions as queued. Queuing the same question twice is a no-op,
+        so nested aggregate methods can all announce their plans.
+        """
+        with self._lock:
+            group = self._group(instrument, model)
+            group.pending.update(question_keys)
+        self._notify("queued", group)
+
+    def question(self, instrument: str, model: str, question_key: str) -> QuestionProgress:
+        """Create a progress handle for one question evaluation."""
+        return QuestionProgress(self, instrument, model, question_key)
+
+    def _start(self, handle: QuestionProgress) -> None:
+        with self._lock:
+            group = self._group(handle.instrument, handle.model)
+            group.pending.discard(handle.question_key)
+            group.in_flight += 1
+            if group.started_at is None:
+                group.started_at = time.monotonic()
+        self._notify("started", group)
+
+    def _record_call(self, handle: QuestionProgress, latency: float,
+                     input_tokens: int, output_tokens: int, cached: bool) -> None:
+        with self._lock:
+            group = self._group(handle.instrument, handle.model)
+            group.calls += 1
+            group.input_tokens += input_tokens
+            group.output_tokens += output_tokens
+            if cached:
+                group.cache_hits += 1
+            else:
+                group.latencies.append(latency)
+        self._notify("call", group)
+
+    def _finish(self, handle: QuestionProgress, failed: bool) -> None:
+        with self._lock:
+            group = self._group(handle.instrument, handle.model)
+            group.pending.discard(handle.question_key)
+            if handle.started:
+                group.in_flight -= 1
+            elif group.started_at is None:
+                group.started_at = time.monotonic()
+            if failed:
+                group.failed += 1
+            else:
+                group.completed += 1
+        self._notify("failed" if failed else "completed", group)
+
+    #-------------------- Reporting --------------------#
+
+    def snapshot(self) -> Dict[Tuple[str, str], Dict[str, Any]]:
+        """Get current metrics for every (instrument, model) group."""
+        now = time.monotonic()
+        with self._lock:
+            return {key: group.metrics(now) for key, group in self._groups.items()}
+
+    def format_line(self) -> str:
+        """Format a one-line summary of all groups for terminal output."""
+        parts = []
+        for metrics in self.snapshot().values():
+            total = metrics["queued"] + metrics["in_flight"] + metrics["completed"] + metrics["failed"]
+            p50, p95, p99 = (metrics[f"latency_p{p}"] for p in (50, 95, 99))
+            latency = (f"p50 {p50:.2f}s p95 {p95:.2f}s p99 {p99:.2f}s"
+                       if p50 is not None else "p50 - p95 - p99 -")
+            parts.append(
+                f"[{metrics['instrument']}/{metrics['model']}] "
+                f"{metrics['completed']}/{total} done, {metrics['failed']} failed, "
+                f"{metrics['in_flight']} in flight | "
+                f"{metrics['requests_per_sec']:.2f} req/s {metrics['tokens_per_sec']:.0f} tok/s | "
+                f"{latency} | cache {metrics['cache_hit_rate']:.0%} | "
+                f"ETA {_format_duration(metrics['eta_seconds'])}"
+            )
+        return "  ".join(parts)
+
+    def prometheus_text(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        snapshot = self.snapshot()
+        lines = []
+
+        def emit(name: str, metric_type: str, help_text: str, field: str) -> None:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            for metrics in snapshot.values():
+                value = metrics[field]
+                if value is not None:
+                    lines.append(f'{name}{{{_labels(metrics)}}} {value}')
+
+        emit("morals_questions_queued", "gauge", "Questions waiting to start", "queued")
+        emit("morals_questions_in_flight", "gauge", "Questions currently being evaluated", "in_flight")
+        emit("morals_questions_completed_total", "counter", "Questions evaluated successfully", "completed")
+        emit("morals_questions_failed_total", "counter", "Questions that raised an error", "failed")
+        emit("morals_llm_calls_total", "counter", "LLM calls made", "calls")
+        emit("morals_cache_hits_total", "counter", "LLM calls served from cache", "cache_hits")
+        emit("morals_input_tokens_total", "counter", "Prompt tokens sent", "input_tokens")
+        emit("morals_output_tokens_total", "counter", "Response tokens received", "output_tokens")
+        emit("morals_requests_per_second", "gauge", "Finished questions per second", "requests_per_sec")
+        emit("morals_tokens_per_second", "gauge", "Tokens per second", "tokens_per_sec")
+        emit("morals_eta_seconds", "gauge", "Estimated seconds until the queue drains", "eta_seconds")
+
+        lines.append("# HELP morals_llm_latency_seconds LLM call latency")
+        lines.append("# TYPE morals_llm_latency_seconds summary")
+        for metrics in snapshot.values():
+            for quantile, field in (("0.5", "latency_p50"), ("0.95", "latency_p95"), ("0.99", "latency_p99")):
+                if metrics[field] is not None:
+                    lines.append(f'morals_llm_latency_seconds{{{_labels(metrics)},quantile="{quantile}"}} '
+                                 f'{metrics[field]}')
+
+        return "\n".join(lines) + "\n"
+
+
+def _labels(metrics: Dict[str, Any]) -> str:
+    """Format the Prometheus label set for a group."""
+    instrument = metrics["instrument"].replace('"', '\\"')
+    model = metrics["model"].replace('"', '\\"')
+    return f'instrument="{instrument}",model="{model}"'
+
+
+class TerminalProgressReporter:
+    """Periodically prints the tracker's summary line to a terminal stream."""
+
+    def __init__(self, tracker: ProgressTracker, interval: float = 2.0, stream: Optional[TextIO] = None):
+        self.tracker = tracker
+        self.interval = interval
+        self.stream = stream or sys.stderr
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start printing in a background thread."""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="morals-progress", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop printing and emit a final line."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._print()
+        self.stream.write("\n")
+        self.stream.flush()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self._print()
+
+    def _print(self) -> None:
+        line = self.tracker.format_line()
+        if line:
+            # Carriage return redraws the line in place on interactive terminals
+            self.stream.write("\r" + line)
+            self.stream.flush()
+
+    def __enter__(self) -> "TerminalProgressReporter":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self.stop()
+        return False
+
+
+class PrometheusExporter:
+    """Serves the tracker's metrics over HTTP in the Prometheus text format."""
+
+    def __init__(self, tracker: ProgressTracker, host: str = "127.0.0.1", port: int = 9464):
+        self.tracker = tracker
+        self.host = host
+        self.port = port
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start serving /metrics in a background thread."""
+        tracker = self.tracker
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?", 1)[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = tracker.prometheus_text().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        # Pick up the real port when port 0 was requested
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever,
+                                        name="morals-prometheus", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the HTTP server."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> "PrometheusExporter":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self.stop()
+        return False
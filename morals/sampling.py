@@ -0,0 +1,140 @@
+# morals/sampling.py
+import random
+from statistics import NormalDist
+from typing import Any, Dict, List, Optional, Tuple
+
+from .evaluation.accumulators import RunningStats
+
+# Reasons a group stops being sampled
+CONVERGED = "converged"
+BUDGET = "budget"
+EXHAUSTED = "exhausted"
+
+
+def sample_id(key: str, repeat: int) -> str:
+    """Get the result ID of a repeated sample of a question (the question key itself for the first sample)."""
+    return key if repeat == 0 else f"{key}~{repeat}"
+
+
+class SequentialSampling:
+    """
+    Adaptive sequential sampling of the questions in a group.
+
+    Questions (and, with repeats, further samples of each question) are
+    evaluated in rounds. After each round the confidence interval of the
+    group's mean alignment is updated, and sampling stops once the interval
+    is narrower than `target_width`, the per-group budget is spent or the
+    questions run out.
+    """
+
+    def __init__(self,
+                 target_width: float = 0.1,
+                 confidence: float = 0.95,
+                 min_samples: int = 5,
+                 round_size: int = 5,
+                 budget: Optional[int] = None,
+                 repeats: int = 1,
+                 seed: int = 0):
+        """
+        Initialize the sampling policy.
+
+        Args:
+            target_width: Stop once the confidence interval on alignment is at most this wide
+            confidence: Confidence level of the interval
+            min_samples: Minimum number of scored samples before the interval is trusted
+            round_size: Number of samples evaluated per round
+            budget: Maximum number of samples per group (None for no limit)
+            repeats: Maximum number of samples per question; repeats only differ
+                when the model samples with a non-zero temperature
+            seed: Seed of the question order
+        """
+        if target_width <= 0:
+            raise ValueError(f"target_width must be positive, got {target_width}")
+        if not 0 < confidence < 1:
+            raise ValueError(f"confidence must be between 0 and 1, got {confidence}")
+        if min_samples < 2:
+            raise ValueError(f"min_samples must be at least 2, got {min_samples}")
+        if round_size < 1:
+            raise ValueError(f"round_size must be at least 1, got {round_size}")
+        if budget is not None and budget < 1:
+            raise ValueError(f"budget must be at least 1, got {budget}")
+        if repeats < 1:
+            raise ValueError(f"repeats must be at least 1, got {repeats}")
+
+        self.target_width = target_width
+        self.confidence = confidence
+        self.min_samples = min_samples
+        self.round_size = round_size
+        self.budget = budget
+        self.repeats = repeats
+        self.seed = seed
+        self._z = NormalDist().inv_cdf((1 + confidence) / 2)
+
+    def schedule(self, keys: List[str]) -> List[Tuple[str, int]]:
+        """
+        Get the order in which a group's samples are drawn.
+
+        Every question is sampled once, in a seeded random order, before any
+        question is repeated.
+
+        Args:
+            keys: Keys of the questions in the group
+
+        Returns:
+            (question key, repeat) pairs
+        """
+        order = list(keys)
+        random.Random(self.seed).shuffle(order)
+        return [(key, repeat) for repeat in range(self.repeats) for key in order]
+
+    def next_round(self, schedule: List[Tuple[str, int]], sampled: int) -> List[Tuple[str, int]]:
+        """Get the samples of the next round, given how many have been evaluated (empty when done)."""
+        end = sampled + self.round_size
+        if self.budget is not None:
+            end = min(end, self.budget)
+        return schedule[sampled:end]
+
+    def interval_width(self, stats: RunningStats) -> Optional[float]:
+        """Width of the normal confidence interval on the mean (None with fewer than two scores)."""
+        if stats.count < 2:
+            return None
+        return 2 * self._z * (stats.m2 / (stats.count - 1)) ** 0.5 / stats.count ** 0.5
+
+    def stop_reason(self, stats: RunningStats, sampled: int, available: int) -> Optional[str]:
+        """
+        Decide whether to stop sampling a group.
+
+        Args:
+            stats: Running statistics of the group's alignment scores
+            sampled: Number of samples evaluated so far
+            available: Number of samples in the group's schedule
+
+        Returns:
+            The stop reason, or None to sample another round
+        """
+        width = self.interval_width(stats)
+        if stats.count >= self.min_samples and width is not None and width <= self.target_width:
+            return CONVERGED
+        if sampled >= available:
+            return EXHAUSTED
+        if self.budget is not None and sampled >= self.budget:
+            return BUDGET
+        return None
+
+    def decision(self, reason: str, stats: RunningStats, sampled: int, rounds: int) -> Dict[str, Any]:
+        """Record of the stopping decision for a group's result."""
+        return {
+            "stop_reason": reason,
+            "rounds": rounds,
+            "samples": sampled,
+            "scored_samples": stats.count,
+            "mean_alignment": stats.mean_or(None),
+            "ci_width": self.interval_width(stats),
+            "target_width": self.target_width,
+            "confidence": self.confidence,
+            "budget": self.budget
+        }
+
+    def __repr__(self) -> str:
+        return (f"SequentialSampling(target_width={self.target_width}, confidence={self.confidence}, "
+                f"budget={self.budget}, repeats={self.repeats})")
@@ -0,0 +1,58 @@
+# morals/sharding.py
+import hashlib
+from typing import Iterable, List, TypeVar
+
+T = TypeVar("T")
+
+
+class ShardSpec:
+    """
+    Deterministic hash-based shard of a question set.
+
+    A question belongs to shard `index` of `count` when a stable hash of its
+    key modulo `count` equals `index`, so every machine computes the same
+    assignment regardless of question order or Python's hash seed.
+    """
+
+    def __init__(self, index: int, count: int):
+        if count < 1:
+            raise ValueError(f"Shard count must be at least 1, got {count}")
+        if not 0 <= index < count:
+            raise ValueError(f"Shard index must be between 0 and {count - 1}, got {index}")
+        self.index = index
+        self.count = count
+
+    @classmethod
+    def parse(cls, spec: str) -> "ShardSpec":
+        """Parse a shard spec of the form "i/N" (0-based index)."""
+        try:
+            index, count = spec.split("/")
+            return cls(int(index), int(count))
+        except ValueError as e:
+            raise ValueError(f"Invalid shard spec '{spec}', expected 'i/N': {e}") from e
+
+    @staticmethod
+    def shard_of(key: str, count: int) -> int:
+        """Get the shard index a key is assigned to."""
+        digest = hashlib.sha1(key.encode("utf-8")).digest()
+        return int.from_bytes(digest[:8], "big") % count
+
+    def includes(self, key: str) -> bool:
+        """Check whether a question key belongs to this shard."""
+        return self.count == 1 or self.shard_of(key, self.count) == self.index
+
+    def filter(self, items: Iterable[T], key=lambda item: item) -> List[T]:
+        """Keep the items whose key belongs to this shard, preserving order."""
+        return [item for item in items if self.includes(key(item))]
+
+    def __str__(self) -> str:
+        return f"{self.index}/{self.count}"
+
+    def __repr__(self) -> str:
+        return f"ShardSpec({self.index}, {self.count})"
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, ShardSpec) and (self.index, self.count) == (other.index, other.count)
+
+    def __hash__(self) -> int:
+        return hash((self.index, self.count))
@@ -0,0 +1,216 @@
+# morals/tracing.py
+import contextvars
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+# Span currently active in this task/thread (parent for new spans)
+_current_span: contextvars.ContextVar = contextvars.ContextVar("morals_current_span", default=None)
+
+# OTLP span kind and status codes
+_SPAN_KIND_INTERNAL = 1
+_STATUS_OK = 1
+_STATUS_ERROR = 2
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    """Convert a Python attribute value to an OTLP AnyValue."""
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        # OTLP JSON encodes 64-bit integers as strings
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    if isinstance(value, (list, tuple)):
+        return {"arrayValue": {"values": [_otlp_value(v) for v in value]}}
+    return {"stringValue": str(value)}
+
+
+def _otlp_attributes(attributes: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [{"key": key, "value": _otlp_value(value)}
+            for key, value in attributes.items() if value is not None]
+
+
+class Span:
+    """A timed operation with attributes and a parent/child relationship."""
+
+    __slots__ = ("tracer", "name", "trace_id", "span_id", "parent_span_id",
+                 "attributes", "start_ns", "end_ns", "status_code", "status_message",
+                 "events", "_token")
+
+    def __init__(self, tracer: "Tracer", name: str, attributes: Dict[str, Any]):
+        parent = _current_span.get()
+        self.tracer = tracer
+        self.name = name
+        self.trace_id = parent.trace_id if parent is not None else os.urandom(16).hex()
+        self.span_id = os.urandom(8).hex()
+        self.parent_span_id = parent.span_id if parent is not None else None
+        self.attributes = attributes
+        self.start_ns = 0
+        self.end_ns = 0
+        self.status_code = _STATUS_OK
+        self.status_message = ""
+        self.events: List[Dict[str, Any]] = []
+        self._token = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Set an attribute on the span."""
+        self.attributes[key] = value
+
+    def __enter__(self) -> "Span":
+        self._token = _current_span.set(self)
+        self.start_ns = time.time_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self.end_ns = time.time_ns()
+        _current_span.reset(self._token)
+        if exc_type is not None:
+            self.status_code = _STATUS_ERROR
+            self.status_message = str(exc)
+            self.events.append({
+                "name": "exception",
+                "timeUnixNano": str(self.end_ns),
+                "attributes": _otlp_attributes({
+                    "exception.type": exc_type.__name__,
+                    "exception.message": str(exc)
+                })
+            })
+        self.tracer._finish(self)
+        return False
+
+    def to_otlp(self) -> Dict[str, Any]:
+        """Convert the span to its OTLP JSON representation."""
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": _SPAN_KIND_INTERNAL,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": _otlp_attributes(self.attributes),
+            "status": {"code": self.status_code}
+        }
+        if self.parent_span_id is not None:
+            span["parentSpanId"] = self.parent_span_id
+        if self.status_message:
+            span["status"]["message"] = self.status_message
+        if self.events:
+            span["events"] = self.events
+        return span
+
+
+class _NullSpan:
+    """Span stand-in used when tracing is disabled."""
+
+    __slots__ = ()
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Tracer:
+    """
+    Collects spans and exports them as OpenTelemetry (OTLP/JSON) trace data.
+
+    Parent/child relationships follow the active span of the current asyncio
+    task or thread, so concurrent question evaluations get separate subtrees.
+    """
+
+    enabled = True
+
+    def __init__(self, export_path: Optional[str] = None, service_name: str = "morals"):
+        """
+        Initialize the tracer.
+
+        Args:
+            export_path: File that export() appends OTLP JSON lines to
+            service_name: Value of the service.name resource attribute
+        """
+        self.export_path = export_path
+        self.service_name = service_name
+        self._finished: List[Span] = []
+        self._lock = threading.Lock()
+
+    def span(self, name: str, **attributes: Any) -> Span:
+        """Create a span, used as a context manager: `with tracer.span("stage", key=value):`."""
+        return Span(self, name, attributes)
+
+    def _finish(self, span: Span) -> None:
+        with self._lock:
+            self._finished.append(span)
+
+    @property
+    def finished_spans(self) -> List[Span]:
+        """Spans finished since the last export."""
+        with self._lock:
+            return list(self._finished)
+
+    def to_otlp(self, spans: Optional[List[Span]] = None) -> Dict[str, Any]:
+        """Build an OTLP ExportTraceServiceRequest document."""
+        if spans is None:
+            spans = self.finished_spans
+        return {
+            "resourceSpans": [{
+                "resource": {"attributes": _otlp_attributes({"service.name": self.service_name})},
+                "scopeSpans": [{
+                    "scope": {"name": "morals"},
+                    "spans": [span.to_otlp() for span in spans]
+                }]
+            }]
+        }
+
+    def export(self, path: Optional[str] = None) -> int:
+        """
+        Append finished spans to a file as one OTLP JSON line and clear them.
+
+        The line format matches the OpenTelemetry Collector file exporter, so
+        the output can be replayed into any OTLP-compatible backend.
+
+        Args:
+            path: Output file (defaults to export_path)
+
+        Returns:
+            Number of spans written
+        """
+        path = path or self.export_path
+        if not path:
+            raise ValueError("No export path configured for tracer")
+
+        with self._lock:
+            spans, self._finished = self._finished, []
+        if not spans:
+            return 0
+
+        file_path = Path(path)
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(file_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(self.to_otlp(spans)) + "\n")
+
+        return len(spans)
+
+
+class _NullTracer:
+    """Tracer used when tracing is disabled; every span is a shared no-op."""
+
+    enabled = False
+
+    def span(self, name: str, **attributes: Any) -> _NullSpan:
+        return _NULL_SPAN
+
+
+NULL_TRACER = _NullTracer()
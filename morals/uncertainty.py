@@ -0,0 +1,245 @@
+# morals/uncertainty.py
+"""
+Bootstrap confidence intervals and permutation tests over question results.
+
+Works on flattened question rows (see morals.export), so results of any
+number of models and runs can be compared. Scores are grouped by
+instrument, group (foundation, domain or dilemma, plus the whole
+instrument) and model, counting valid responses only, as the aggregates do.
+
+Resampling is vectorized: one matrix of random draws is shared by every
+group and metric. For each sample size it gives the bootstrap count matrix
+(resamples x questions), so the resampled means of all groups of a size are
+one matrix product. For each pooled size it gives one permutation of the
+pooled questions per resample, and the permuted mean differences of every
+model pair of that size, whatever the split, are sums over the permuted
+pooled scores. Nothing is kept per size except the permutations of the
+largest pooled size, from which those of smaller sizes are taken.
+"""
+import itertools
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Row field holding the group of each instrument's results
+GROUP_FIELDS = {"mfq": "foundation", "wvs": "domain", "dilemmas": "dilemma_id"}
+
+# (instrument, group field, group, metric); the group field and group are None for the whole instrument
+GroupKey = Tuple[str, Optional[str], Optional[str], str]
+
+
+def collect_samples(rows: Iterable[Dict[str, Any]],
+                    metrics: Sequence[str] = ("alignment",)) -> Dict[GroupKey, Dict[str, np.ndarray]]:
+    """
+    Collect the scores of each group and model.
+
+    Args:
+        rows: Flattened question rows (e.g. from morals.export.iter_results_dir)
+        metrics: Row fields to collect
+
+    Returns:
+        Scores of each model (by model name, or run label for rows without one), by group key
+    """
+    samples: Dict[GroupKey, Dict[str, List[float]]] = defaultdict(lambda: defaultdict(list))
+    for row in rows:
+        if not row.get("is_valid_response"):
+            continue
+        instrument = row.get("instrument")
+        model = row.get("model") or row.get("run")
+        group_field = GROUP_FIELDS.get(instrument)
+        group = row.get(group_field) if group_field else None
+        for metric in metrics:
+            value = row.get(metric)
+            if value is None:
+                continue
+            samples[(instrument, None, None, metric)][model].append(value)
+            if group:
+                samples[(instrument, group_field, group, metric)][model].append(value)
+    return {key: {model: np.array(values, dtype=np.float64) for model, values in by_model.items()}
+            for key, by_model in samples.items()}
+
+
+class Resampler:
+    """Bootstrap resamples and permutations for every sample size, drawn from one random matrix."""
+
+    def __init__(self, resamples: int = 1000, seed: int = 0):
+        """
+        Initialize the resampler.
+
+        Args:
+            resamples: Number of bootstrap resamples or permutations
+            seed: Seed of the random draws
+        """
+        if resamples < 1:
+            raise ValueError(f"resamples must be at least 1, got {resamples}")
+        self.resamples = resamples
+        self._rng = np.random.default_rng(seed)
+        self._uniform = np.empty((resamples, 0))
+        # Order of the draws of each resample, over the largest size permuted so far
+        self._order = np.empty((resamples, 0), dtype=np.intp)
+
+    def _draws(self, size: int) -> np.ndarray:
+        """The first `size` columns of the shared matrix of uniform draws."""
+        if self._uniform.shape[1] < size:
+            extra = self._rng.random((self.resamples, size - self._uniform.shape[1]))
+            self._uniform = np.hstack([self._uniform, extra])
+        return self._uniform[:, :size]
+
+    def weights(self, size: int) -> np.ndarray:
+        """
+        Get the bootstrap weights of a sample size.
+
+        Args:
+            size: Number of values in the sample
+
+        Returns:
+            (resamples, size) matrix whose rows give each value's share of a resample,
+            so `weights @ values` are the resampled means
+        """
+        indexes = np.minimum((self._draws(size) * size).astype(np.intp), size - 1)
+        flat = indexes + size * np.arange(self.resamples)[:, None]
+        counts = np.bincount(flat.ravel(), minlength=self.resamples * size).reshape(self.resamples, size)
+        return counts / size
+
+    def permutation(self, size: int) -> np.ndarray:
+        """
+        Get a random permutation of a sample size for every resample.
+
+        Each row orders the first `size` draws of its resample, so the permutations of a
+        size do not depend on the sizes permuted before. Only the order of the largest size
+        is kept; smaller sizes keep its entries below the size, which orders their draws the
+        same way (permuting the largest size first avoids sorting again).
+
+        Args:
+            size: Number of values to permute
+
+        Returns:
+            (resamples, size) matrix whose rows are permutations of range(size)
+        """
+        if self._order.shape[1] < size:
+            self._order = np.argsort(self._draws(size), axis=1)
+        if self._order.shape[1] == size:
+            return self._order
+        return self._order[self._order < size].reshape(self.resamples, size)
+
+
+def bootstrap_intervals(samples: Dict[GroupKey, Dict[str, np.ndarray]],
+                        confidence: float = 0.95,
+                        resampler: Optional[Resampler] = None) -> List[Dict[str, Any]]:
+    """
+    Compute percentile bootstrap confidence intervals on the mean score of every group and model.
+
+    Args:
+        samples: Scores by group key and model (from collect_samples)
+        confidence: Confidence level of the intervals
+        resampler: Source of the bootstrap resamples (a default Resampler if None)
+
+    Returns:
+        One dictionary per group, model and metric, with the count, mean and interval bounds
+    """
+    if not 0 < confidence < 1:
+        raise ValueError(f"confidence must be between 0 and 1, got {confidence}")
+    resampler = resampler or Resampler()
+    tail = (1 - confidence) / 2
+
+    # Samples of the same size are resampled together
+    by_size: Dict[int, List[Tuple[GroupKey, str, np.ndarray]]] = defaultdict(list)
+    for key, by_model in samples.items():
+        for model, values in by_model.items():
+            if len(values):
+                by_size[len(values)].append((key, model, values))
+
+    intervals = {}
+    for size, entries in by_size.items():
+        values = np.stack([entry[2] for entry in entries])
+        means = values @ resampler.weights(size).T
+        lower, upper = np.quantile(means, [tail, 1 - tail], axis=1)
+        for (key, model, sample), low, high in zip(entries, lower.tolist(), upper.tolist()):
+            intervals[(key, model)] = (len(sample), float(sample.mean()), low, high)
+
+    results = []
+    for key, by_model in samples.items():
+        instrument, group_field, group, metric = key
+        for model in sorted(by_model):
+            if (key, model) not in intervals:
+                continue
+            count, mean, low, high = intervals[(key, model)]
+            results.append({
+                "instrument": instrument,
+                "group_field": group_field,
+                "group": group,
+                "metric": metric,
+                "model": model,
+                "count": count,
+                "mean": mean,
+                "ci_lower": low,
+                "ci_upper": high
+            })
+    return results
+
+
+def compare_models(samples: Dict[GroupKey, Dict[str, np.ndarray]],
+                   resampler: Optional[Resampler] = None) -> List[Dict[str, Any]]:
+    """
+    Test every pair of models in every group for a difference in mean score.
+
+    Each pair gets a two-sided permutation test: the pooled scores of the two
+    models are relabelled at random, and the p-value is the share of
+    relabellings whose mean difference is at least as large as the observed one.
+
+    Args:
+        samples: Scores by group key and model (from collect_samples)
+        resampler: Source of the permutations (a default Resampler if None)
+
+    Returns:
+        One dictionary per group, metric and model pair, with both means, their
+        difference and the p-value
+    """
+    resampler = resampler or Resampler()
+
+    # Pairs with the same pooled size share one permutation per resample, whatever their split
+    by_size: Dict[int, List[Tuple[GroupKey, str, str, np.ndarray, np.ndarray]]] = defaultdict(list)
+    for key, by_model in samples.items():
+        models = sorted(model for model, values in by_model.items() if len(values))
+        for model_a, model_b in itertools.combinations(models, 2):
+            values_a, values_b = by_model[model_a], by_model[model_b]
+            by_size[len(values_a) + len(values_b)].append((key, model_a, model_b, values_a, values_b))
+
+    p_values = {}
+    # Largest size first, so smaller permutations are taken from it
+    for size in sorted(by_size, reverse=True):
+        permutation = resampler.permutation(size)
+        for key, model_a, model_b, values_a, values_b in by_size[size]:
+            size_a, size_b = len(values_a), len(values_b)
+            pooled = np.concatenate([values_a, values_b])
+            # The first size_a permuted values are relabelled as the first model's; sum the smaller side
+            if size_a <= size_b:
+                sum_a = pooled[permutation[:, :size_a]].sum(axis=1)
+            else:
+                sum_a = pooled.sum() - pooled[permutation[:, size_a:]].sum(axis=1)
+            permuted = sum_a / size_a - (pooled.sum() - sum_a) / size_b
+            observed = values_a.mean() - values_b.mean()
+            # Small tolerance so ties with the observed difference are not lost to rounding
+            count = int((np.abs(permuted) >= abs(observed) - 1e-12).sum())
+            p_values[(key, model_a, model_b)] = (count + 1) / (resampler.resamples + 1)
+
+    results = []
+    for key, by_model in samples.items():
+        instrument, group_field, group, metric = key
+        models = sorted(model for model, values in by_model.items() if len(values))
+        for model_a, model_b in itertools.combinations(models, 2):
+            mean_a, mean_b = float(by_model[model_a].mean()), float(by_model[model_b].mean())
+            results.append({
+                "instrument": instrument,
+                "group_field": group_field,
+                "group": group,
+                "metric": metric,
+                "model_a": model_a,
+                "model_b": model_b,
+                "mean_a": mean_a,
+                "mean_b": mean_b,
+                "difference": mean_a - mean_b,
+                "p_value": p_values[(key, model_a, model_b)]
+            })
+    return results
@@ -0,0 +1,171 @@
+# tests/test_accumulators.py
+import json
+import math
+import random
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Add the project root to the Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from morals.evaluation.accumulators import (RunningStats, FoundationAlignmentAccumulator, DomainMetricsAccumulator,
+                                            OverallMetricsAccumulator, CategoryPerformanceAccumulator,
+                                            DilemmaScoresAccumulator, AggregateScoresAccumulator, ResultAccumulators)
+
+
+def make_results(count: int, seed: int = 7):
+    """Random results carrying the fields of all three evaluators."""
+    rng = random.Random(seed)
+    results = []
+    for i in range(count):
+        valid = rng.random() > 0.2
+        results.append({
+            "question_id": f"Q{i}",
+            "is_valid_response": valid,
+            "foundation": rng.choice(["care", "fairness", "loyalty", None]),
+            "alignment_score": rng.random() if valid and rng.random() > 0.1 else None,
+            "domain": rng.choice(["Domain_1", "Domain_2", "Domain_3", ""]),
+            "domain_name": "Domain name",
+            "category": rng.choice(["family", "work", None]),
+            "overall_alignment": rng.random() if rng.random() > 0.1 else None,
+            "in_acceptable_range": rng.random() > 0.5,
+            "reasoning_quality": rng.random(),
+            "dilemma_id": rng.choice(["Dilemma_I", "Dilemma_II"]),
+            "dilemma_title": "Title",
+            "semantic_similarity": rng.random(),
+            "criteria_satisfaction": rng.random(),
+            "reasoning_score": rng.random(),
+            "overall_score": rng.random()
+        })
+    return results
+
+
+def reference_domain_metrics(results):
+    """List-based domain metrics, as computed before the accumulators."""
+    groups = {}
+    for r in results:
+        if not r.get("domain"):
+            continue
+        groups.setdefault(r["domain"], [])
+        if r.get("is_valid_response", False):
+            groups[r["domain"]].append(r)
+
+    metrics = {}
+    for domain, group in groups.items():
+        if not group:
+            continue
+        scores = [r["overall_alignment"] for r in group if r.get("overall_alignment") is not None]
+        metrics[domain] = {
+            "name": group[0].get("domain_name", domain),
+            "question_count": len(group),
+            "avg_alignment": np.mean(scores) if scores else None,
+            "acceptable_range_ratio": sum(1 for r in group if r.get("in_acceptable_range", False)) / len(group),
+            "avg_reasoning_quality": np.mean([r.get("reasoning_quality", 0) for r in group]),
+            "min_alignment": min(scores) if scores else None,
+            "max_alignment": max(scores) if scores else None
+        }
+    return metrics
+
+
+def close(a, b) -> bool:
+    """Compare nested outputs, allowing for rounding differences in floats."""
+    if isinstance(a, dict) and isinstance(b, dict):
+        return a.keys() == b.keys() and all(close(a[k], b[k]) for k in a)
+    if isinstance(a, (int, float)) and isinstance(b, (int, float)) and not isinstance(a, bool):
+        return math.isclose(a, b, rel_tol=1e-12, abs_tol=1e-12)
+    return a == b
+
+
+def test_accumulators():
+    """Test streaming, mergeable aggregation of evaluation results."""
+    print("=== MORALS Streaming Accumulators Test ===")
+
+    results = make_results(5000)
+    accumulator_types = [FoundationAlignmentAccumulator, DomainMetricsAccumulator, OverallMetricsAccumulator,
+                         CategoryPerformanceAccumulator, DilemmaScoresAccumulator, AggregateScoresAccumulator]
+
+    # 1. Running statistics match numpy
+    print("\n1. Checking running statistics...")
+    values = [r["overall_score"] for r in results]
+    stats = RunningStats()
+    for value in values:
+        stats.add(value)
+    if not (close(stats.mean, np.mean(values)) and math.isclose(stats.variance, np.var(values))
+            and stats.min == min(values) and stats.max == max(values)):
+        print(f"Error: running statistics differ from numpy: {stats.to_state()}")
+        return False
+    print(f"✓ Mean {stats.mean:.6f}, std {stats.std:.6f} over {stats.count} values")
+
+    # 2. Outputs match the list-based computation
+    print("\n2. Comparing with list-based aggregation...")
+    expected = reference_domain_metrics(results)
+    actual = DomainMetricsAccumulator().update(results).result()
+    if not close(actual, expected):
+        print(f"Error: domain metrics differ:\n{actual}\n{expected}")
+        return False
+    empty = OverallMetricsAccumulator().update([r for r in results if not r["is_valid_response"]]).result()
+    if empty["total_questions"] != 0 or empty["avg_overall_alignment"] is not None:
+        print(f"Error: unexpected overall metrics without valid responses: {empty}")
+        return False
+    print(f"✓ Domain metrics match for {len(actual)} domains")
+
+    # 3. Merging shards gives exactly the single-pass result
+    print("\n3. Merging shard accumulators...")
+    shards = [results[i::4] for i in range(4)]
+    for accumulator_type in accumulator_types:
+        single = accumulator_type().update(results).result()
+        merged = accumulator_type()
+        for shard in shards:
+            merged.merge(accumulator_type().update(shard))
+        if merged.result() != single or merged.to_state() != accumulator_type().update(results).to_state():
+            print(f"Error: merged {accumulator_type.__name__} differs from a single pass")
+            return False
+    try:
+        DomainMetricsAccumulator().merge(CategoryPerformanceAccumulator())
+        print("Error: merged accumulators of different types")
+        return False
+    except TypeError:
+        pass
+    print(f"✓ {len(accumulator_types)} accumulator types merge across {len(shards)} shards")
+
+    # 4. State survives a JSON round trip (e.g. between processes)
+    print("\n4. Round-tripping accumulator state through JSON...")
+    for accumulator_type in accumulator_types:
+        accumulator = accumulator_type().update(results)
+        restored = accumulator_type.from_state(json.loads(json.dumps(accumulator.to_state())))
+        if restored.result() != accumulator.result():
+            print(f"Error: {accumulator_type.__name__} state did not round-trip")
+            return False
+    print("✓ Accumulator state round-trips through JSON")
+
+    # 5. Instrument accumulators feed, merge and save every aggregate together
+    print("\n5. Combining instrument accumulators...")
+    for instrument, accumulator_types in ResultAccumulators.INSTRUMENT_ACCUMULATORS.items():
+        merged = ResultAccumulators(instrument)
+        for shard in shards:
+            state = json.loads(json.dumps(ResultAccumulators(instrument).update(shard).to_state()))
+            merged.merge(ResultAccumulators.from_state(state))
+        for accumulator_type in accumulator_types:
+            if merged[accumulator_type].result() != accumulator_type().update(results).result():
+                print(f"Error: merged {instrument} {accumulator_type.__name__} differs from a single pass")
+                return False
+    try:
+        ResultAccumulators("mfq").merge(ResultAccumulators("wvs"))
+        print("Error: merged accumulators of different instruments")
+        return False
+    except ValueError:
+        pass
+    print(f"✓ Accumulators of {len(ResultAccumulators.INSTRUMENT_ACCUMULATORS)} instruments merge from saved states")
+
+    print("\n=== Test completed successfully ===")
+    return True
+
+
+if __name__ == "__main__":
+    success = test_accumulators()
+    if not success:
+        print("\nTest failed with errors.")
+        exit(1)
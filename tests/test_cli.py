@@ -0,0 +1,132 @@
+# tests/test_cli.py
+import asyncio
+import contextlib
+import io
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from morals.cli.main import main
+from morals.llm.base import LLMInterface
+from morals.llm.factory import LLMFactory
+
+
+class CountingLLM(LLMInterface):
+    """LLM stub that returns instrument-appropriate answers and counts its calls."""
+
+    calls = 0
+
+    def __init__(self, model_name: str = "counting-model", **kwargs):
+        super().__init__(model_name)
+
+    async def generate_response(self, prompt: str, **kwargs) -> str:
+        CountingLLM.calls += 1
+        await asyncio.sleep(0.001)
+        if "Score (0-5)" in prompt:
+            return "Score (0-5): 4\nReasoning: Harm and fairness matter to moral judgment."
+        if "Score (1-4)" in prompt:
+            return "Score (1-4): 1\nReasoning: Family support is a fundamental part of life."
+        return ("I believe the promise matters because trust between father and son depends on it. "
+                "Joe earned the money himself, so fairness suggests he has a right to decide how it is used, "
+                "although respect for authority should also be considered carefully.")
+
+
+def run_cli(argv):
+    """Run the CLI in-process and capture stdout."""
+    stdout = io.StringIO()
+    with contextlib.redirect_stdout(stdout):
+        exit_code = main(argv)
+    return exit_code, stdout.getvalue()
+
+
+def test_cli():
+    """Test the CLI entry point with selection, sharding, caching and resume."""
+    print("=== MORALS CLI Test ===")
+
+    LLMFactory.PROVIDERS["counting"] = (__name__, "CountingLLM", "counting-model")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        output_dir = str(Path(tmp_dir) / "results")
+        cache_dir = str(Path(tmp_dir) / "cache")
+        base_args = ["--provider", "counting", "--instrument", "all", "--limit", "2",
+                     "--output-dir", output_dir, "--concurrency", "4", "--format", "json"]
+
+        # 1. Full run across all instruments
+        print("\n1. Running all instruments...")
+        exit_code, output = run_cli(base_args + ["--cache-dir", cache_dir])
+        results = json.loads(output)
+        if exit_code != 0 or sorted(results) != ["dilemmas", "mfq", "wvs"]:
+            print(f"Error: unexpected CLI result (exit code {exit_code})")
+            return False
+        full_calls = CountingLLM.calls
+        question_count = sum(len(r["question_results"]) for r in results.values())
+        if full_calls != question_count:
+            print(f"Error: {full_calls} calls for {question_count} questions")
+            return False
+        print(f"✓ Evaluated {question_count} questions with {full_calls} LLM calls")
+
+        # 2. Shards partition the question set
+        print("\n2. Running two shards...")
+        shard_ids = []
+        for index in range(2):
+            exit_code, output = run_cli(base_args + ["--shard", f"{index}/2"])
+            shard_results = json.loads(output)
+            shard_ids.extend(r["question_id"] for result in shard_results.values()
+                             for r in result["question_results"])
+        full_ids = [r["question_id"] for result in results.values() for r in result["question_results"]]
+        if sorted(shard_ids) != sorted(full_ids):
+            print("Error: shards do not partition the question set")
+            return False
+        print(f"✓ Shards covered all {len(full_ids)} questions exactly once")
+
+        # 3. The response cache and resume both avoid repeated calls
+        print("\n3. Testing cache and resume...")
+        CountingLLM.calls = 0
+        run_cli(base_args + ["--cache-dir", cache_dir, "--output-dir", str(Path(tmp_dir) / "cached")])
+        if CountingLLM.calls != 0:
+            print(f"Error: cached run made {CountingLLM.calls} LLM calls")
+            return False
+        run_cli(base_args + ["--resume"])
+        if CountingLLM.calls != 0:
+            print(f"Error: resumed run made {CountingLLM.calls} LLM calls")
+            return False
+        print("✓ Cached and resumed runs made no LLM calls")
+
+        # 4. Selecting a single foundation only runs MFQ
+        print("\n4. Running a single foundation...")
+        exit_code, output = run_cli(["--provider", "counting", "--foundation", "care", "--limit", "1",
+                                     "--output-dir", output_dir])
+        if exit_code != 0 or not output.startswith("MFQ:") or "care" not in output:
+            print(f"Error: unexpected summary output:\n{output}")
+            return False
+        print("✓ Foundation selection produced a summary")
+
+    # 5. --help does not import evaluators or LLM SDKs
+    print("\n5. Checking startup imports...")
+    code = ("import sys; sys.argv = ['morals', '--help']\n"
+            "from morals.cli import main\n"
+            "try:\n    main.main()\nexcept SystemExit:\n    pass\n"
+            "heavy = [m for m in ('sklearn', 'numpy', 'anthropic', 'openai', 'morals.pipeline') if m in sys.modules]\n"
+            "print('HEAVY', heavy)")
+    completed = subprocess.run([sys.executable, "-c", code], cwd=project_root,
+                               capture_output=True, text=True, timeout=60)
+    if "HEAVY []" not in completed.stdout:
+        print(f"Error: --help imported heavy modules: {completed.stdout.splitlines()[-1:]}")
+        return False
+    print("✓ --help loads no evaluators or backends")
+
+    print("\n=== Test completed successfully ===")
+    return True
+
+
+if __name__ == "__main__":
+    success = test_cli()
+    if not success:
+        print("\nTest failed with errors.")
+        exit(1)
@@ -0,0 +1,128 @@
+# tests/test_compiled.py
+import json
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from morals.instruments.compiled import CompiledInstrumentCache
+from morals.instruments.loader import load_instruments
+from morals.instruments.mfq import MoralFoundationsQuestionnaire
+from morals.instruments.wvs import WorldValuesSurveyInstrument
+
+
+def make_wvs_data(domain_count: int, questions_per_domain: int):
+    """Synthetic WVS item bank."""
+    return {
+        "metadata": {"name": "Synthetic WVS"},
+        "domains": {
+            f"domain_{d}": {
+                "name": f"Domain {d}",
+                "description": f"Synthetic domain {d}",
+                "questions": [{
+                    "id": f"D{d}_Q{q}",
+                    "prompt": f"Question {q} of domain {d}",
+                    "category": ("importance", "agreement")[q % 2],
+                    "topic": f"topic_{q % 5}",
+                    "ground_truth": {"mean_score": 2.5, "std_score": 0.5}
+                } for q in range(questions_per_domain)]
+            } for d in range(domain_count)
+        }
+    }
+
+
+def test_compiled():
+    """Test compiling instruments to a binary cache keyed by source hash."""
+    print("=== MORALS Compiled Instrument Test ===")
+
+    data_dir = project_root / "data" / "instruments"
+    validations = []
+    original_validate = MoralFoundationsQuestionnaire.validate
+
+    def counting_validate(self):
+        validations.append(1)
+        original_validate(self)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache_dir = Path(tmp_dir) / "compiled"
+        source_dir = Path(tmp_dir) / "data"
+        shutil.copytree(data_dir, source_dir)
+
+        # 1. The first load compiles, later loads reuse the compiled instrument
+        print("\n1. Compiling and reloading instruments...")
+        MoralFoundationsQuestionnaire.validate = counting_validate
+        try:
+            first = load_instruments(["mfq", "wvs", "dilemmas"], str(source_dir), str(cache_dir))
+            second = load_instruments(["mfq", "wvs", "dilemmas"], str(source_dir), str(cache_dir))
+        finally:
+            MoralFoundationsQuestionnaire.validate = original_validate
+        if len(validations) != 1 or len(list(cache_dir.glob("*.pickle"))) != 3:
+            print(f"Error: expected one compilation per instrument, got {len(validations)} MFQ validations")
+            return False
+        for name, instrument in second.items():
+            if instrument.get_all_questions() != first[name].get_all_questions():
+                print(f"Error: compiled {name} differs from its source")
+                return False
+        mfq = second["mfq"]
+        question = mfq.get_questions_by_foundation("care")[0]
+        if mfq.get_question_by_id(question["id"]) is not question:
+            print("Error: compiled indexes no longer share question records")
+            return False
+        try:
+            mfq._by_id["new"] = question
+            print("Error: compiled index accepted an assignment")
+            return False
+        except TypeError:
+            pass
+        print("✓ Instruments are compiled once and reloaded with shared, read-only indexes")
+
+        # 2. Edited sources and corrupt entries are recompiled
+        print("\n2. Invalidating compiled instruments...")
+        mfq_path = source_dir / "mfq.json"
+        data = json.loads(mfq_path.read_text(encoding="utf-8"))
+        data["foundations"]["care"]["name"] = "Care (edited)"
+        mfq_path.write_text(json.dumps(data), encoding="utf-8")
+        cache = CompiledInstrumentCache(str(cache_dir))
+        edited = cache.load(MoralFoundationsQuestionnaire, str(mfq_path))
+        if edited.get_foundation_names()["care"] != "Care (edited)":
+            print("Error: edited source was served from the stale compiled instrument")
+            return False
+        wvs_path = source_dir / "wvs.json"
+        for entry in cache_dir.glob("WorldValuesSurveyInstrument-*.pickle"):
+            entry.write_bytes(b"not a pickle")
+        if cache.load(WorldValuesSurveyInstrument, str(wvs_path)).get_all_questions() != \
+                first["wvs"].get_all_questions():
+            print("Error: corrupt compiled instrument was not recompiled")
+            return False
+        print("✓ Edited sources and corrupt entries fall back to compiling the JSON")
+
+        # 3. Warm starts skip parsing, validation and indexing on a large item bank
+        print("\n3. Timing a large item bank...")
+        large_path = Path(tmp_dir) / "large_wvs.json"
+        large_path.write_text(json.dumps(make_wvs_data(100, 300)), encoding="utf-8")
+        start = time.perf_counter()
+        cold = cache.load(WorldValuesSurveyInstrument, str(large_path))
+        cold_time = time.perf_counter() - start
+        start = time.perf_counter()
+        warm = cache.load(WorldValuesSurveyInstrument, str(large_path))
+        warm_time = time.perf_counter() - start
+        if warm.get_all_questions() != cold.get_all_questions() or warm_time >= cold_time:
+            print(f"Error: warm load took {warm_time:.3f}s, cold {cold_time:.3f}s")
+            return False
+        print(f"✓ {len(warm.get_all_questions())} questions: cold {cold_time * 1000:.0f}ms, "
+              f"warm {warm_time * 1000:.0f}ms")
+
+    print("\n=== Test completed successfully ===")
+    return True
+
+
+if __name__ == "__main__":
+    success = test_compiled()
+    if not success:
+        print("\nTest failed with errors.")
+        exit(1)
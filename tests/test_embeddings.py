@@ -0,0 +1,110 @@
+# tests/test_embeddings.py
+import importlib.util
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+# Add the project root to the Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from morals.cli.main import main as cli_main
+from morals.evaluation.dilemmas_evaluator import DilemmasEvaluator
+from morals.evaluation.embeddings import EmbeddingSimilarity, HashingEmbedder, VectorCache, create_embedding_similarity
+from morals.instruments.loader import load_instruments
+
+RESPONSES = [
+    "Yes. Heinz should steal the drug, because saving his wife's life matters more than the druggist's property.",
+    "No, Joe should keep his money. His father made a promise, and breaking it damages their trust.",
+    ""
+]
+
+
+def test_embeddings():
+    """Test embedding similarity backends and their vector cache."""
+    print("=== MORALS Embedding Similarity Test ===")
+
+    data_dir = str(project_root / "data" / "instruments")
+    dilemmas = load_instruments(["dilemmas"], data_dir)["dilemmas"]
+    responses = [(dilemmas.get_shard_key(question), text)
+                 for question in dilemmas.get_all_questions() for text in RESPONSES]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # 1. The hashing embedder is deterministic and gives unit vectors
+        print("\n1. Embedding texts...")
+        backend = create_embedding_similarity("hashing", cache_dir=str(Path(tmp_dir) / "vectors"))
+        vectors = backend.transform(RESPONSES + [RESPONSES[0]])
+        norms = np.linalg.norm(vectors, axis=1)
+        if not np.allclose(norms, [1, 1, 0, 1]) or not np.array_equal(vectors[0], vectors[3]):
+            print(f"Error: unexpected vector norms {norms}")
+            return False
+        if not np.array_equal(HashingEmbedder().embed(RESPONSES), HashingEmbedder().embed(RESPONSES)):
+            print("Error: the hashing embedder is not deterministic")
+            return False
+        if backend.similarity(RESPONSES[0], RESPONSES[0]) < 0.999 or backend.similarity("", RESPONSES[0]) != 0.0:
+            print("Error: unexpected similarities")
+            return False
+        print(f"✓ {backend.embedded} texts embedded into {backend.dimensions} dimensions")
+
+        # 2. The evaluator scores with the backend, in batches or one at a time
+        print("\n2. Evaluating with embeddings...")
+        evaluator = DilemmasEvaluator(dilemmas, similarity=backend)
+        batch = evaluator.evaluate_responses(responses)
+        single = [evaluator.evaluate_response(question_id, text) for question_id, text in responses]
+        if batch != single:
+            print("Error: batch results differ from evaluate_response")
+            return False
+        if not all(0 <= result["semantic_similarity"] <= 1 for result in batch) or batch[2]["overall_score"] != 0:
+            print("Error: unexpected scores")
+            return False
+        tfidf = DilemmasEvaluator(dilemmas).evaluate_responses(responses)
+        if [r["semantic_similarity"] for r in tfidf] == [r["semantic_similarity"] for r in batch]:
+            print("Error: the backend was not used")
+            return False
+        print(f"✓ {len(batch)} responses scored with {backend.embedder.name}")
+
+        # 3. A new process reuses the on-disk vectors
+        print("\n3. Reusing the vector cache...")
+        embedded = backend.embedded
+        fresh = create_embedding_similarity("hashing", cache_dir=str(Path(tmp_dir) / "vectors"))
+        if DilemmasEvaluator(dilemmas, similarity=fresh).evaluate_responses(responses) != batch or fresh.embedded:
+            print(f"Error: {fresh.embedded} texts were embedded again")
+            return False
+        other = EmbeddingSimilarity(HashingEmbedder(dimensions=64), cache=VectorCache(str(Path(tmp_dir) / "vectors")))
+        other.transform(RESPONSES)
+        if other.embedded != 2:
+            print("Error: vectors of a different embedder were reused")
+            return False
+        print(f"✓ {embedded} vectors embedded once and served from disk afterwards")
+
+        # 4. Backends are available from the command line
+        print("\n4. Running the CLI...")
+        if "sentence_transformers" in sys.modules:
+            print("Error: sentence-transformers was imported before its embedder was used")
+            return False
+        if importlib.util.find_spec("sentence_transformers") is None:
+            try:
+                create_embedding_similarity("sentence-transformers")
+                print("Error: the sentence-transformers embedder should need its package")
+                return False
+            except ImportError:
+                pass
+        code = cli_main(["--instrument", "dilemmas", "--provider", "mock", "--limit", "1",
+                         "--similarity", "hashing", "--vector-cache", str(Path(tmp_dir) / "cli-vectors"),
+                         "--output-dir", str(Path(tmp_dir) / "results")])
+        if code != 0 or not any((Path(tmp_dir) / "cli-vectors").iterdir()):
+            print("Error: the CLI did not score with the embedding backend")
+            return False
+        print("✓ --similarity hashing --vector-cache DIR")
+
+    print("\n=== Test completed successfully ===")
+    return True
+
+
+if __name__ == "__main__":
+    success = test_embeddings()
+    if not success:
+        print("\nTest failed with errors.")
+        exit(1)
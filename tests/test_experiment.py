@@ -0,0 +1,163 @@
+# tests/test_experiment.py
+import asyncio
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from morals.experiment import ExperimentRunner, expand_spec
+from morals.llm.base import LLMInterface
+from morals.llm.factory import LLMFactory
+
+
+class SweepLLM(LLMInterface):
+    """LLM stub whose answers depend on the temperature, counting the calls it receives."""
+
+    calls = 0
+
+    def __init__(self, model_name: str = "sweep-model", **kwargs):
+        super().__init__(model_name)
+        self.max_tokens = 1000
+
+    async def generate_response(self, prompt: str, **kwargs) -> str:
+        SweepLLM.calls += 1
+        await asyncio.sleep(0.001)
+        score = 2 if kwargs.get("temperature", 0.0) > 0 else 4
+        if "Score (0-5)" in prompt:
+            return f"Score (0-5): {score}\nReasoning: Harm and fairness matter to moral judgment."
+        return f"Score (1-4): {score // 2}\nReasoning: Family support is a fundamental part of life."
+
+
+class OtherSweepLLM(SweepLLM):
+    """LLM stub of another provider that serves models of the same names with different answers."""
+
+    async def generate_response(self, prompt: str, **kwargs) -> str:
+        SweepLLM.calls += 1
+        await asyncio.sleep(0.001)
+        if "Score (0-5)" in prompt:
+            return "Score (0-5): 0\nReasoning: Harm and fairness matter to moral judgment."
+        return "Score (1-4): 4\nReasoning: Family support is a fundamental part of life."
+
+
+async def test_experiment():
+    """Test matrix expansion, call deduplication and per-cell results."""
+    print("=== MORALS Experiment Matrix Test ===")
+
+    LLMFactory.PROVIDERS["sweep"] = (__name__, "SweepLLM", "sweep-model")
+    LLMFactory.PROVIDERS["other-sweep"] = (__name__, "OtherSweepLLM", "sweep-model")
+
+    spec = {
+        "name": "sweep",
+        "provider": "sweep",
+        "models": ["model-a", "model-b"],
+        "temperatures": [0.0, 0.7],
+        # "control" renders the same prompts as "default", so its calls are all repeats
+        "prompt_variants": {"default": {}, "control": {}, "brief": {"suffix": "\nBe brief."}},
+        "instruments": ["mfq", "wvs"],
+        # Explicit baseline cell that is already in the matrix
+        "cells": [{"model": "model-a", "temperature": 0.0, "variant": "default", "instrument": "mfq"}],
+        "max_questions": 2,
+        "concurrency": 4
+    }
+
+    # 1. Expand the matrix
+    print("\n1. Expanding the experiment spec...")
+    cells = expand_spec(spec)
+    if len(cells) != 2 * 2 * 3 * 2:
+        print(f"Error: expected 24 cells, got {len(cells)}")
+        return False
+    try:
+        expand_spec({**spec, "temperature": [0.0]})
+        print("Error: unknown spec field was accepted")
+        return False
+    except ValueError:
+        pass
+    print(f"✓ Expanded into {len(cells)} cells (duplicate baseline cell dropped)")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        spec["output_dir"] = str(Path(tmp_dir) / "sweep")
+        runner = ExperimentRunner(spec)
+
+        # 2. Plan the calls
+        print("\n2. Planning calls...")
+        plan = runner.plan()
+        if plan["unique_calls"] * 3 != plan["requested_calls"] * 2:
+            print(f"Error: expected a third of calls to be repeats: {plan}")
+            return False
+        print(f"✓ {plan['requested_calls']} calls requested, {plan['unique_calls']} unique")
+
+        # 3. Run the experiment
+        print("\n3. Running the experiment...")
+        result = await runner.run()
+        calls = result["calls"]
+        if calls["executed"] != plan["unique_calls"] or SweepLLM.calls != plan["unique_calls"]:
+            print(f"Error: executed {calls['executed']} calls ({SweepLLM.calls} LLM calls), "
+                  f"expected {plan['unique_calls']}")
+            return False
+        if calls["requested"] != plan["requested_calls"]:
+            print(f"Error: cells requested {calls['requested']} calls, planned {plan['requested_calls']}")
+            return False
+        print(f"✓ Executed {calls['executed']} of {calls['requested']} calls "
+              f"({calls['deduplicated']} deduplicated)")
+
+        # 4. Fanned-out results match the cell's parameters
+        print("\n4. Checking per-cell results...")
+        scores = {(c["model"], c["temperature"], c["variant"], c["instrument"]): c["score"] for c in result["cells"]}
+        for model in ("model-a", "model-b"):
+            for temperature in (0.0, 0.7):
+                if scores[(model, temperature, "default", "mfq")] != scores[(model, temperature, "control", "mfq")]:
+                    print("Error: identical cells produced different scores")
+                    return False
+        if scores[("model-a", 0.0, "default", "mfq")] == scores[("model-a", 0.7, "default", "mfq")]:
+            print("Error: temperature was not passed through to the LLM")
+            return False
+        cell = result["cells"][0]
+        if cell["result"]["model"]["temperature"] != cell["temperature"]:
+            print("Error: cell model info does not record the temperature")
+            return False
+        saved = json.loads((Path(tmp_dir) / "sweep" / "experiment.json").read_text())
+        if len(saved["cells"]) != len(cells) or not (Path(tmp_dir) / "sweep" / cell["id"] / "mfq").is_dir():
+            print("Error: experiment results were not saved")
+            return False
+        print("✓ Each cell has its own evaluated and saved results")
+
+        # 5. Models of the same name on different providers are separate calls
+        print("\n5. Running the same model name on two providers...")
+        SweepLLM.calls = 0
+        runner = ExperimentRunner({
+            "name": "providers",
+            "models": [{"provider": "sweep", "model": "model-a"}, {"provider": "other-sweep", "model": "model-a"}],
+            "instruments": ["mfq"],
+            "max_questions": 2,
+            "output_dir": str(Path(tmp_dir) / "providers")
+        })
+        plan = runner.plan()
+        if plan["deduplicated_calls"]:
+            print(f"Error: calls to different providers were planned as repeats: {plan}")
+            return False
+        result = await runner.run()
+        if result["calls"]["executed"] != plan["requested_calls"] or SweepLLM.calls != plan["requested_calls"]:
+            print(f"Error: executed {result['calls']['executed']} of {plan['requested_calls']} calls")
+            return False
+        scores = {c["provider"]: c["score"] for c in result["cells"]}
+        if scores["sweep"] == scores["other-sweep"]:
+            print("Error: cells on different providers shared their responses")
+            return False
+        if len({c["id"] for c in result["cells"]}) != 2:
+            print("Error: cells on different providers share an output directory")
+            return False
+        print(f"✓ Both providers executed all {plan['requested_calls'] // 2} calls with their own responses")
+
+    print("\n=== Test completed successfully ===")
+    return True
+
+
+if __name__ == "__main__":
+    success = asyncio.run(test_experiment())
+    if not success:
+        print("\nTest failed with errors.")
+        exit(1)
@@ -0,0 +1,114 @@
+# tests/test_export.py
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from morals.export import (build_question_table, iter_pipeline_results, iter_results_dir,
+                           read_question_table, write_question_table, pa)
+from morals.instruments.mfq import MoralFoundationsQuestionnaire
+from morals.instruments.wvs import WorldValuesSurveyInstrument
+from morals.instruments.dilemmas import MoralDilemmasInstrument
+from morals.llm.base import LLMInterface
+from morals.pipeline import MoralEvaluationPipeline
+
+
+class FixedLLM(LLMInterface):
+    """LLM stub returning instrument-appropriate answers."""
+
+    def __init__(self):
+        super().__init__("fixed-model")
+
+    async def generate_response(self, prompt: str, **kwargs) -> str:
+        if "Score (0-5)" in prompt:
+            return "Score (0-5): 4\nReasoning: Harm and fairness matter to moral judgment."
+        if "Score (1-4)" in prompt:
+            return "Score (1-4): 1\nReasoning: Family support is a fundamental part of life."
+        return ("I believe the promise matters because trust depends on it. Fairness suggests "
+                "Joe has a right to decide, although authority should also be considered.")
+
+
+async def test_export():
+    """Test exporting question results as a flat columnar table."""
+    print("=== MORALS Columnar Export Test ===")
+
+    if pa is None:
+        print("pyarrow is not installed; skipping columnar export test")
+        return True
+    import pyarrow.compute as pc
+
+    data_dir = project_root / "data" / "instruments"
+    mfq = MoralFoundationsQuestionnaire(data_path=str(data_dir / "mfq.json"))
+    wvs = WorldValuesSurveyInstrument(data_path=str(data_dir / "wvs.json"))
+    dilemmas = MoralDilemmasInstrument(data_path=str(data_dir / "dilemmas.json"))
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        output_dir = Path(tmp_dir) / "run1"
+        pipeline = MoralEvaluationPipeline(llm=FixedLLM(), mfq=mfq, wvs=wvs, dilemmas=dilemmas,
+                                           output_dir=str(output_dir), concurrency=4)
+        results = {
+            "mfq": await pipeline.evaluate_all_mfq_foundations(2),
+            "wvs": await pipeline.evaluate_all_wvs_domains(2),
+            "dilemmas": await pipeline.evaluate_all_dilemmas(2)
+        }
+        question_count = sum(len(result["question_results"]) for result in results.values())
+
+        # 1. Export saved question result files
+        print("\n1. Exporting saved question results...")
+        table = build_question_table(iter_results_dir(str(output_dir)))
+        if table.num_rows != question_count:
+            print(f"Error: expected {question_count} rows, got {table.num_rows}")
+            return False
+        if not pa.types.is_dictionary(table.schema.field("raw_response").type):
+            print("Error: raw text is not dictionary-encoded")
+            return False
+        if set(table.column("model").to_pylist()) != {"fixed-model"}:
+            print(f"Error: unexpected models {set(table.column('model').to_pylist())}")
+            return False
+        print(f"✓ Exported {table.num_rows} rows with {table.num_columns} typed columns")
+
+        # 2. In-memory results give the same rows
+        print("\n2. Exporting in-memory results...")
+        memory_table = build_question_table(iter_pipeline_results(results, run="run1"))
+        key_columns = ["instrument", "question_id", "alignment", "extracted_score"]
+        exported = sorted(zip(*(table.column(name).to_pylist() for name in key_columns)), key=str)
+        in_memory = sorted(zip(*(memory_table.column(name).to_pylist() for name in key_columns)), key=str)
+        if exported != in_memory:
+            print("Error: in-memory and saved results produced different rows")
+            return False
+        mfq_alignment = pc.mean(table.filter(pc.equal(table.column("instrument"), "mfq")).column("alignment"))
+        foundation_mean = results["mfq"]["overall_alignment"]
+        print(f"✓ Rows match (MFQ question mean {mfq_alignment.as_py():.3f}, foundation mean {foundation_mean:.3f})")
+
+        # 3. Parquet and Arrow IPC round trips
+        print("\n3. Writing Parquet and Arrow files...")
+        for name in ("questions.parquet", "questions.arrow"):
+            path = str(Path(tmp_dir) / name)
+            write_question_table(table, path)
+            if not read_question_table(path).equals(table):
+                print(f"Error: {name} did not round-trip")
+                return False
+        print("✓ Parquet and Arrow IPC files round-trip")
+
+    # 4. Aggregation over a large table is fast
+    print("\n4. Aggregating a large table...")
+    large = pa.concat_tables([table] * (200_000 // table.num_rows + 1)).combine_chunks()
+    start = time.perf_counter()
+    summary = large.group_by(["instrument", "model"]).aggregate([("alignment", "mean"), ("question_id", "count")])
+    elapsed = time.perf_counter() - start
+    print(f"✓ Aggregated {large.num_rows} rows into {summary.num_rows} groups in {elapsed * 1000:.1f}ms")
+
+    print("\n=== Test completed successfully ===")
+    return True
+
+
+if __name__ == "__main__":
+    success = asyncio.run(test_export())
+    if not success:
+        print("\nTest failed with errors.")
+        exit(1)
@@ -0,0 +1,116 @@
+# tests/test_extraction.py
+import random
+import re
+import sys
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from morals.evaluation.extraction import ScoreReasoningProcessor, compile_patterns
+from morals.evaluation.mfq_processor import MFQResponseProcessor
+from morals.evaluation.wvs_processor import WVSResponseProcessor
+
+PIECES = ["Score (1-4): ", "Score (0-5): ", "Score:", "Score: ", "Score (1-4):\n", "I would rate this as ",
+          "My score is ", "Reasoning:", "reasoning: ", "Explanation:", "Justification: ", "1", "2", "3", "4",
+          "5", "7", "0", " ", "\n", "\n\n", "because it matters", "x"]
+
+
+def reference_wvs(processor, text):
+    """WVS extraction by searching each pattern in turn."""
+    score = None
+    for pattern in processor.score_patterns:
+        match = re.search(pattern, text, re.DOTALL | re.MULTILINE)
+        if match:
+            score = int(match.group(1))
+            if 1 <= score <= 4:
+                break
+    reasoning = None
+    for pattern in processor.reasoning_patterns:
+        match = re.search(pattern, text, re.DOTALL)
+        if match:
+            reasoning = match.group(1).strip()
+            if reasoning:
+                break
+    if score is not None and reasoning is None:
+        line = re.search(r'^.*([1-4]).*$', text, re.MULTILINE)
+        if line and text[line.end():].strip():
+            reasoning = text[line.end():].strip()
+    return score, reasoning
+
+
+def reference_mfq(processor, text):
+    """MFQ extraction with a search per pattern."""
+    score = re.search(processor.score_pattern, text, re.DOTALL)
+    reasoning = re.search(processor.reasoning_pattern, text, re.DOTALL)
+    return (int(score.group(1)) if score else None,
+            reasoning.group(1).strip() if reasoning else None)
+
+
+class LikertProcessor(ScoreReasoningProcessor):
+    """Processor with custom patterns."""
+
+    SCORE_RANGE = (1, 7)
+    score_patterns = [r'Rating:\s*(\d+)', r'(\d+)/7']
+    reasoning_patterns = [r'Why:\s*(.*)']
+
+
+def test_extraction():
+    """Test the shared score and reasoning extraction."""
+    print("=== MORALS Score Extraction Test ===")
+    rng = random.Random(0)
+    texts = ["".join(rng.choice(PIECES) for _ in range(rng.randint(0, 30))) for _ in range(5000)]
+
+    # 1. The processors extract what a search per pattern extracts
+    print("\n1. Extracting scores and reasoning...")
+    mfq = MFQResponseProcessor()
+    wvs = WVSResponseProcessor()
+    for text in texts:
+        if mfq.process_response(text) != reference_mfq(mfq, text):
+            print(f"Error: MFQ extraction of {text!r}")
+            return False
+        if wvs.process_response(text) != reference_wvs(wvs, text):
+            print(f"Error: WVS extraction of {text!r}")
+            return False
+    print(f"✓ {len(texts)} random responses match per-pattern search")
+
+    # 2. Bulk processing gives the same results in order
+    print("\n2. Processing responses in bulk...")
+    if wvs.process_responses(texts) != [wvs.process_response(text) for text in texts] or \
+            mfq.process_responses(iter(texts)) != [mfq.process_response(text) for text in texts]:
+        print("Error: bulk results differ from process_response")
+        return False
+    if wvs.process_responses([]) != []:
+        print("Error: an empty batch should give no results")
+        return False
+    print("✓ process_responses matches process_response")
+
+    # 3. Patterns are compiled once, and custom patterns follow the priority rules
+    print("\n3. Using custom patterns...")
+    if compile_patterns(tuple(wvs.score_patterns), wvs.SCORE_FLAGS) is not \
+            compile_patterns(tuple(WVSResponseProcessor().score_patterns), wvs.SCORE_FLAGS):
+        print("Error: patterns were compiled again")
+        return False
+    likert = LikertProcessor()
+    cases = {
+        "Rating: 9, so 6/7. Why: fairness": (6, "fairness"),
+        "Rating: 9": (9, None),
+        "I give it 3/7\nWhy:  ": (3, ""),
+        "No rating": (None, None)
+    }
+    for text, expected in cases.items():
+        if likert.process_response(text) != expected:
+            print(f"Error: {likert.process_response(text)} extracted from {text!r}")
+            return False
+    print(f"✓ {len(cases)} responses with custom patterns")
+
+    print("\n=== Test completed successfully ===")
+    return True
+
+
+if __name__ == "__main__":
+    success = test_extraction()
+    if not success:
+        print("\nTest failed with errors.")
+        exit(1)
@@ -0,0 +1,104 @@
+# tests/test_import_time.py
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+# Seconds a cold import of the MFQ path may take (override with MORALS_IMPORT_BUDGET on slow machines)
+IMPORT_BUDGET = float(os.environ.get("MORALS_IMPORT_BUDGET", "0.75"))
+
+# Modules the MFQ path must not import (the streaming parser is only needed for streamed instruments)
+HEAVY_MODULES = ("numpy", "scipy", "sklearn", "anthropic", "openai", "pyarrow", "morals.instruments.streaming")
+
+# Imports of the MFQ path
+MFQ_IMPORTS = """
+import morals.cli.main
+import morals.pipeline
+from morals.evaluation import MFQEvaluator
+from morals.llm import LLMFactory
+"""
+
+# Imports of the WVS response processing and per-question scoring path
+WVS_IMPORTS = """
+from morals.evaluation import WVSEvaluator, WVSResponseProcessor
+"""
+
+# Runs imports in a fresh interpreter, times them and reports which heavy modules were loaded
+IMPORT_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+%s
+elapsed = time.perf_counter() - start
+print(json.dumps({"seconds": elapsed, "loaded": [name for name in %r if name in sys.modules]}))
+"""
+
+
+def cold_import(imports: str = MFQ_IMPORTS):
+    """Time imports in a new interpreter."""
+    output = subprocess.run([sys.executable, "-c", IMPORT_SCRIPT % (imports, HEAVY_MODULES)], cwd=str(project_root),
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def test_import_time():
+    """Test that heavy dependencies are imported lazily."""
+    print("=== MORALS Import Time Test ===")
+
+    # 1. The MFQ and WVS paths do not import heavy dependencies
+    print("\n1. Importing the MFQ and WVS paths...")
+    runs = [cold_import() for _ in range(3)]
+    if runs[0]["loaded"]:
+        print(f"Error: importing the MFQ path loaded {', '.join(runs[0]['loaded'])}")
+        return False
+    wvs_loaded = cold_import(WVS_IMPORTS)["loaded"]
+    if wvs_loaded:
+        print(f"Error: importing the WVS processor and evaluator loaded {', '.join(wvs_loaded)}")
+        return False
+    print(f"✓ None of {', '.join(HEAVY_MODULES)} imported by the MFQ or WVS paths")
+
+    # 2. A cold import stays within budget (best of three runs)
+    print("\n2. Timing a cold import...")
+    seconds = min(run["seconds"] for run in runs)
+    if seconds > IMPORT_BUDGET:
+        print(f"Error: cold import took {seconds:.3f}s, over the {IMPORT_BUDGET:.2f}s budget")
+        return False
+    print(f"✓ Cold import in {seconds:.3f}s (budget {IMPORT_BUDGET:.2f}s)")
+
+    # 3. Lazy exports resolve to the classes of their modules
+    print("\n3. Resolving lazy exports...")
+    from morals import evaluation, llm
+    from morals.evaluation.dilemmas_evaluator import DilemmasEvaluator
+    from morals.llm.mock import MockInterface
+    if evaluation.DilemmasEvaluator is not DilemmasEvaluator or llm.MockInterface is not MockInterface:
+        print("Error: lazy exports resolved to the wrong objects")
+        return False
+    if "WVSEvaluator" not in dir(evaluation) or set(evaluation.__all__) - set(dir(evaluation)):
+        print("Error: lazy exports are missing from dir()")
+        return False
+    for package in (evaluation, llm):
+        for name in package.__all__:
+            if name in ("AnthropicInterface", "OpenAIInterface"):
+                continue  # Need their provider SDKs
+            getattr(package, name)
+    try:
+        evaluation.NoSuchEvaluator
+        print("Error: unknown names should raise AttributeError")
+        return False
+    except AttributeError:
+        pass
+    print(f"✓ {len(evaluation.__all__) + len(llm.__all__)} lazy exports")
+
+    print("\n=== Test completed successfully ===")
+    return True
+
+
+if __name__ == "__main__":
+    success = test_import_time()
+    if not success:
+        print("\nTest failed with errors.")
+        exit(1)
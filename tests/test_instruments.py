@@ -0,0 +1,173 @@
+# tests/test_instruments.py
+import pickle
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from morals.instruments.mfq import MoralFoundationsQuestionnaire
+from morals.instruments.wvs import WorldValuesSurveyInstrument
+from morals.instruments.dilemmas import MoralDilemmasInstrument
+
+
+def make_wvs_data(domain_count: int, questions_per_domain: int):
+    """Synthetic WVS item bank."""
+    return {
+        "metadata": {"name": "Synthetic WVS"},
+        "domains": {
+            f"domain_{d}": {
+                "name": f"Domain {d}",
+                "description": f"Synthetic domain {d}",
+                "questions": [{
+                    "id": f"D{d}_Q{q}",
+                    "prompt": f"Question {q} of domain {d}",
+                    "category": ("importance", "agreement")[q % 2],
+                    "topic": f"topic_{q % 5}",
+                    "ground_truth": {"mean_score": 2.5, "std_score": 0.5}
+                } for q in range(questions_per_domain)]
+            } for d in range(domain_count)
+        }
+    }
+
+
+def test_instruments():
+    """Test indexed question lookups and shared, immutable question records."""
+    print("=== MORALS Instrument Index Test ===")
+
+    data_dir = project_root / "data" / "instruments"
+    mfq = MoralFoundationsQuestionnaire(data_path=str(data_dir / "mfq.json"))
+    wvs = WorldValuesSurveyInstrument(data_path=str(data_dir / "wvs.json"))
+    dilemmas = MoralDilemmasInstrument(data_path=str(data_dir / "dilemmas.json"))
+
+    # 1. Indexed getters agree with a scan of the instrument data
+    print("\n1. Comparing indexed lookups with a scan...")
+    for instrument in (mfq, wvs):
+        for question in instrument.get_all_questions():
+            if instrument.get_question_by_id(question["id"]) != question:
+                print(f"Error: lookup of {question['id']} returned a different question")
+                return False
+    for foundation_key, foundation in mfq.foundations.items():
+        expected = [q["id"] for q in foundation["relevance_questions"] + foundation["agreement_questions"]]
+        if [q["id"] for q in mfq.get_questions_by_foundation(foundation_key)] != expected:
+            print(f"Error: questions of foundation {foundation_key} differ")
+            return False
+    for category in ("importance", "agreement"):
+        expected = [q["id"] for domain in wvs.domains.values() for q in domain["questions"]
+                    if q.get("category") == category]
+        if [q["id"] for q in wvs.get_questions_by_category(category)] != expected:
+            print(f"Error: questions of category {category} differ")
+            return False
+    relevance = mfq.get_questions_by_type("relevance")
+    if not relevance or any(q["type"] != "relevance" for q in relevance):
+        print("Error: questions by type are wrong")
+        return False
+    print(f"✓ {len(mfq.get_all_questions())} MFQ and {len(wvs.get_all_questions())} WVS questions indexed")
+
+    # 2. Dilemma questions are found by combined and plain ID
+    print("\n2. Looking up dilemma questions...")
+    first = dilemmas.dilemmas[1]
+    combined_id = dilemmas.get_formatted_id(first["id"], first["questions"][0]["id"])
+    question = dilemmas.get_question_by_id(combined_id)
+    if question["dilemma_id"] != first["id"] or question["id"] != first["questions"][0]["id"]:
+        print(f"Error: combined ID {combined_id} returned the wrong question")
+        return False
+    plain = dilemmas.get_question_by_id(first["questions"][0]["id"])
+    if plain["dilemma_id"] != dilemmas.dilemmas[0]["id"]:
+        print("Error: plain question IDs should resolve to the first dilemma, as before")
+        return False
+    try:
+        dilemmas.get_questions_by_dilemma("Dilemma_missing")
+        print("Error: unknown dilemma was accepted")
+        return False
+    except KeyError:
+        pass
+    if dilemmas.get_dilemma_question(first["id"], first["questions"][0]["id"]) is not question:
+        print("Error: dilemma question lookup returned a different view")
+        return False
+    print(f"✓ {combined_id} and {first['questions'][0]['id']} resolve as expected")
+
+    # 3. Getters share read-only views
+    print("\n3. Checking shared read-only views...")
+    domain = next(iter(wvs.domains))
+    view = wvs.get_questions_by_domain(domain)[0]
+    if view is not wvs.get_questions_by_domain(domain)[0] or view is not wvs.get_question_by_id(view["id"]):
+        print("Error: getters returned different objects for the same question")
+        return False
+    try:
+        view["prompt"] = "changed"
+        print("Error: question view accepted an assignment")
+        return False
+    except TypeError:
+        pass
+    editable = view.copy()
+    editable["prompt"] = "changed"
+    if view["prompt"] == "changed" or view["domain_name"] != wvs.domains[domain]["name"]:
+        print("Error: copying a view changed the shared question")
+        return False
+    raw_question = next(iter(mfq.foundations.values()))["relevance_questions"][0]
+    if "foundation" in raw_question or "type" in raw_question:
+        print("Error: MFQ getters modified the loaded data")
+        return False
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        lookups = list(executor.map(lambda _: [q["id"] for q in mfq.get_questions_by_foundation("care")], range(200)))
+    if any(ids != lookups[0] for ids in lookups):
+        print("Error: concurrent lookups disagreed")
+        return False
+    print("✓ Views are shared, read-only and leave the loaded data untouched")
+
+    # 4. Question records are compact, frozen and picklable
+    print("\n4. Checking question records...")
+    record = mfq.get_question_by_id(raw_question["id"])
+    if hasattr(record, "__dict__"):
+        print("Error: question records should not carry a __dict__")
+        return False
+    try:
+        record.prompt = "changed"
+        print("Error: question record accepted an attribute assignment")
+        return False
+    except AttributeError:
+        pass
+    if pickle.loads(pickle.dumps(record)) != record:
+        print("Error: question record did not survive pickling")
+        return False
+    data = make_wvs_data(1, 1)
+    data["domains"]["domain_0"]["questions"][0]["notes"] = "kept"
+    extra = WorldValuesSurveyInstrument(data=data).get_question_by_id("D0_Q0")
+    if extra["notes"] != "kept" or "notes" not in extra.copy():
+        print("Error: fields outside the record's slots were lost")
+        return False
+    large = WorldValuesSurveyInstrument(data=make_wvs_data(50, 400))
+    questions = large.get_all_questions()
+    record_bytes = sum(sys.getsizeof(q) for q in questions)
+    dict_bytes = sum(sys.getsizeof(q.copy()) for q in questions)
+    if record_bytes >= dict_bytes:
+        print(f"Error: records take {record_bytes} bytes, dicts {dict_bytes}")
+        return False
+    print(f"✓ Frozen, picklable records ({record_bytes // len(questions)} bytes per question, "
+          f"{dict_bytes // len(questions)} as a dict)")
+
+    # 5. Lookups stay fast on a large item bank
+    print("\n5. Timing lookups on a large item bank...")
+    ids = [q["id"] for q in large.get_all_questions()]
+    start = time.perf_counter()
+    for question_id in ids:
+        large.get_question_by_id(question_id)
+    elapsed = time.perf_counter() - start
+    if elapsed > 1.0:
+        print(f"Error: {len(ids)} lookups took {elapsed:.2f}s")
+        return False
+    print(f"✓ {len(ids)} lookups in {elapsed * 1000:.1f}ms")
+
+    print("\n=== Test completed successfully ===")
+    return True
+
+
+if __name__ == "__main__":
+    success = test_instruments()
+    if not success:
+        print("\nTest failed with errors.")
+        exit(1)
@@ -0,0 +1,90 @@
+# tests/test_keywords.py
+import random
+import re
+import sys
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from morals.evaluation.dilemmas_processor import DilemmasResponseProcessor
+from morals.evaluation.keywords import KeywordMatcher
+
+
+def reference_matches(keywords, text, word_boundaries):
+    """Keywords found by searching for each one separately."""
+    return [keyword for keyword in keywords
+            if (re.search(r'\b' + re.escape(keyword) + r'\b', text) if word_boundaries else keyword in text)]
+
+
+def test_keywords():
+    """Test single-pass keyword matching in the dilemmas response processor."""
+    print("=== MORALS Keyword Matcher Test ===")
+    rng = random.Random(0)
+
+    # 1. One pass finds what a search per keyword finds, including overlapping keywords
+    print("\n1. Matching lexicons...")
+    cases = [
+        (["should", "should not", "not", "no"], "You should not, no.", True),
+        (["it depends", "depends on", "on one hand"], "it depends on one hand", False),
+        (["care", "careful", "ful"], "be careful", False),
+        (["non-maleficence", "maleficence"], "non-maleficence matters", True)
+    ]
+    for keywords, text, word_boundaries in cases:
+        found = KeywordMatcher(keywords, word_boundaries).matches(text)
+        if found != reference_matches(keywords, text, word_boundaries):
+            print(f"Error: {found} in {text!r}")
+            return False
+    for _ in range(2000):
+        keywords = ["".join(rng.choice("ab -'") for _ in range(rng.randint(1, 4))) for _ in range(rng.randint(1, 6))]
+        text = "".join(rng.choice("ab -'c") for _ in range(rng.randint(0, 20)))
+        for word_boundaries in (True, False):
+            if KeywordMatcher(keywords, word_boundaries).matches(text) != \
+                    reference_matches(keywords, text, word_boundaries):
+                print(f"Error: lexicon {keywords} on {text!r} (word boundaries: {word_boundaries})")
+                return False
+    print(f"✓ {len(cases)} overlapping lexicons and 2000 random ones match per-keyword search")
+
+    # 2. The processor extracts the same elements as per-keyword searches
+    print("\n2. Processing responses...")
+    processor = DilemmasResponseProcessor()
+    vocabulary = (processor.yes_indicators + processor.no_indicators + processor.maybe_indicators +
+                  processor.argument_indicators + processor.moral_principles + ["the", "people", "nothing"] * 10)
+    for _ in range(500):
+        text = "".join(rng.choice(vocabulary) + rng.choice([" ", " ", ", ", ". ", "\n\n"])
+                       for _ in range(rng.randint(0, 120)))
+        processed = processor.process_response(text)
+        first_chunk = " ".join(text.split()[:200]).lower()
+        if processed["principles"] != reference_matches(processor.moral_principles, text.strip().lower(), True):
+            print(f"Error: principles of {text!r}")
+            return False
+        yes = reference_matches(processor.yes_indicators, first_chunk, True)
+        if processed["position"] == "yes" and not yes:
+            print(f"Error: position of {text!r}")
+            return False
+    print("✓ 500 random responses processed")
+
+    # 3. Lexicons are configurable, and changes to them take effect
+    print("\n3. Configuring lexicons...")
+    custom = DilemmasResponseProcessor(yes_indicators=["aye"], moral_principles=["stewardship"])
+    response = "Aye, stewardship of the land comes first."
+    if custom.process_response(response)["position"] != "yes" or \
+            custom.process_response(response)["principles"] != ["stewardship"]:
+        print("Error: constructor lexicons were ignored")
+        return False
+    custom.moral_principles = custom.moral_principles + ["land"]
+    if custom.process_response(response)["principles"] != ["stewardship", "land"]:
+        print("Error: a replaced lexicon was ignored")
+        return False
+    print("✓ Constructor and replaced lexicons are used")
+
+    print("\n=== Test completed successfully ===")
+    return True
+
+
+if __name__ == "__main__":
+    success = test_keywords()
+    if not success:
+        print("\nTest failed with errors.")
+        exit(1)
@@ -0,0 +1,118 @@
+# tests/test_merge.py
+import asyncio
+import hashlib
+import json
+import sys
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from morals.instruments.mfq import MoralFoundationsQuestionnaire
+from morals.instruments.wvs import WorldValuesSurveyInstrument
+from morals.instruments.dilemmas import MoralDilemmasInstrument
+from morals.llm.base import LLMInterface
+from morals.merge import ShardMerger
+from morals.pipeline import MoralEvaluationPipeline
+from morals.sharding import ShardSpec
+
+
+class VaryingLLM(LLMInterface):
+    """LLM stub whose answers vary deterministically with the prompt."""
+
+    def __init__(self):
+        super().__init__("varying-model")
+
+    async def generate_response(self, prompt: str, **kwargs) -> str:
+        seed = int(hashlib.md5(prompt.encode("utf-8")).hexdigest(), 16)
+        if "Score (0-5)" in prompt:
+            return f"Score (0-5): {seed % 6}\nReasoning: Harm and fairness matter to moral judgment."
+        if "Score (1-4)" in prompt:
+            return f"Score (1-4): {seed % 4 + 1}\nReasoning: Family support is a fundamental part of life."
+        return ("I believe the promise matters because trust depends on it. " * (seed % 3 + 1) +
+                "Fairness suggests Joe has a right to decide, although authority should also be considered.")
+
+
+def normalize(result):
+    """Round-trip a result through JSON, as saved shard results are."""
+    return json.loads(json.dumps(result))
+
+
+async def test_merge():
+    """Test that merging shard results reproduces a single-process run."""
+    print("=== MORALS Shard Merge Test ===")
+
+    data_dir = project_root / "data" / "instruments"
+    mfq = MoralFoundationsQuestionnaire(data_path=str(data_dir / "mfq.json"))
+    wvs = WorldValuesSurveyInstrument(data_path=str(data_dir / "wvs.json"))
+    dilemmas = MoralDilemmasInstrument(data_path=str(data_dir / "dilemmas.json"))
+
+    # 1. Instrument getters partition their questions across shards
+    print("\n1. Checking sharded question getters...")
+    shards = [ShardSpec(index, 3) for index in range(3)]
+    for instrument in (mfq, wvs, dilemmas):
+        all_keys = [instrument.get_shard_key(q) for q in instrument.get_all_questions()]
+        shard_keys = [instrument.get_shard_key(q) for shard in shards for q in instrument.get_all_questions(shard)]
+        if sorted(shard_keys) != sorted(all_keys) or len(set(all_keys)) != len(all_keys):
+            print(f"Error: shards of {type(instrument).__name__} do not partition its questions")
+            return False
+    print("✓ Shards partition the questions of every instrument")
+
+    # 2. Run each instrument once unsharded and once per shard
+    print("\n2. Running single-process and sharded evaluations...")
+    pipeline = MoralEvaluationPipeline(llm=VaryingLLM(), mfq=mfq, wvs=wvs, dilemmas=dilemmas, concurrency=4)
+    runs = {
+        "mfq": lambda shard: pipeline.evaluate_all_mfq_foundations(3, shard),
+        "wvs": lambda shard: pipeline.evaluate_all_wvs_domains(3, shard),
+        "dilemmas": lambda shard: pipeline.evaluate_all_dilemmas(2, shard),
+        "foundation": lambda shard: pipeline.evaluate_mfq_foundation("care", None, shard),
+        "category": lambda shard: pipeline.evaluate_wvs_category("importance", 4, shard),
+        "dilemma": lambda shard: pipeline.evaluate_dilemma("Dilemma_I", None, shard)
+    }
+
+    merger = ShardMerger(mfq=mfq, wvs=wvs, dilemmas=dilemmas)
+    for name, run in runs.items():
+        single = normalize(await run(None))
+        for count in (2, 3):
+            shard_results = [normalize(await run(ShardSpec(index, count))) for index in range(count)]
+            merged = normalize(merger.merge(shard_results))
+
+            if merged != single:
+                print(f"Error: merged {name} results of {count} shards differ from the single-process run")
+                return False
+        print(f"✓ Merged {name} results match the single-process run "
+              f"({len(single['question_results'])} questions)")
+
+    # 3. Coverage is validated
+    print("\n3. Checking coverage validation...")
+    shard_results = [normalize(await runs["mfq"](shard)) for shard in shards]
+    for description, results in [("missing shard", shard_results[:2]),
+                                 ("duplicate shard", shard_results + shard_results[:1])]:
+        try:
+            merger.merge(results)
+            print(f"Error: merge accepted a {description}")
+            return False
+        except ValueError as e:
+            print(f"✓ Rejected {description}: {str(e)[:80]}")
+
+    # 4. Results saved without aggregate states are merged from their question results
+    print("\n4. Merging results without aggregate states...")
+    single = normalize(await runs["wvs"](None))
+    shard_results = [normalize(await runs["wvs"](shard)) for shard in shards]
+    for result in shard_results:
+        del result["aggregate_state"]
+    if normalize(merger.merge(shard_results)) != single:
+        print("Error: aggregates rebuilt from question results differ from the single-process run")
+        return False
+    print("✓ Aggregates rebuilt from question results match the single-process run")
+
+    print("\n=== Test completed successfully ===")
+    return True
+
+
+if __name__ == "__main__":
+    success = asyncio.run(test_merge())
+    if not success:
+        print("\nTest failed with errors.")
+        exit(1)
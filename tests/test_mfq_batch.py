@@ -0,0 +1,98 @@
+# tests/test_mfq_batch.py
+import random
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Add the project root to the Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from morals.evaluation.mfq_evaluator import MFQEvaluator
+from morals.instruments.loader import load_instruments
+
+
+def test_mfq_batch():
+    """Test vectorized MFQ scoring over model × sample × question arrays."""
+    print("=== MORALS MFQ Batch Scoring Test ===")
+    rng = random.Random(0)
+    mfq = load_instruments(["mfq"], str(project_root / "data" / "instruments"))["mfq"]
+    evaluator = MFQEvaluator(mfq)
+    ground_truth = evaluator.ground_truth
+
+    # 1. Ground truth is collected as vectors in instrument order
+    print("\n1. Collecting ground truth...")
+    questions = mfq.get_all_questions()
+    if ground_truth.question_ids != [question["id"] for question in questions] or \
+            ground_truth.means.tolist() != [question["ground_truth"]["mean_score"] for question in questions]:
+        print("Error: ground truth vectors do not follow the instrument")
+        return False
+    print(f"✓ {len(ground_truth)} questions in {len(ground_truth.foundations)} foundations")
+
+    # 2. Batch scores match evaluating each response
+    print("\n2. Scoring a batch...")
+    models, samples = 2, 3
+    responses = [[[rng.choice(["No answer", "Score (0-5): {}\nReasoning: It matters.", "Score (0-5): {}"])
+                   .format(rng.choice([0, 1, 2, 3, 4, 5, 7])) for _ in questions] for _ in range(samples)]
+                 for _ in range(models)]
+    extracted = [[evaluator.processor.process_responses(sample) for sample in model] for model in responses]
+    scores = [[[score for score, _ in sample] for sample in model] for model in extracted]
+    reasoning = [[[text for _, text in sample] for sample in model] for model in extracted]
+    batch = evaluator.score_batch(scores, reasoning)
+    if batch.shape != (models, samples, len(ground_truth)) or \
+            batch.foundation_alignment.shape != (models, samples, len(ground_truth.foundations)):
+        print(f"Error: unexpected shapes {batch.shape} and {batch.foundation_alignment.shape}")
+        return False
+    for model in range(models):
+        for sample in range(samples):
+            results = []
+            results_by_foundation = {}
+            for question, response in zip(questions, responses[model][sample]):
+                result = evaluator.evaluate_response(question["id"], response)
+                results.append(result)
+                results_by_foundation.setdefault(result["foundation"], []).append(result)
+            if batch.question_results(model, sample) != results:
+                print(f"Error: question results of model {model}, sample {sample}")
+                return False
+            expected = evaluator.compile_foundation_results(results_by_foundation)
+            compiled = batch.foundation_results(model, sample)
+            for foundation, foundation_result in expected["foundation_results"].items():
+                alignment = compiled["foundation_results"][foundation]["alignment_score"]
+                if (alignment is None) != (foundation_result["alignment_score"] is None) or \
+                        (alignment is not None and not np.isclose(alignment, foundation_result["alignment_score"])):
+                    print(f"Error: alignment of {foundation} for model {model}, sample {sample}")
+                    return False
+            if not np.isclose(compiled["overall_alignment"], expected["overall_alignment"]):
+                print(f"Error: overall alignment of model {model}, sample {sample}")
+                return False
+    print(f"✓ {models} models × {samples} samples match evaluate_response and compile_foundation_results")
+
+    # 3. Validity follows the reasoning or a mask, and shapes are checked
+    print("\n3. Deciding validity...")
+    empty = np.full(batch.shape, "   ", dtype=object)
+    if evaluator.score_batch(np.full(batch.shape, 3.0), empty).valid.any():
+        print("Error: responses without reasoning should be invalid")
+        return False
+    valid = np.zeros(batch.shape, dtype=bool)
+    if not np.isnan(evaluator.score_batch(np.full(batch.shape, 3.0), valid=valid).overall_alignment).all():
+        print("Error: invalid responses were aggregated")
+        return False
+    for bad_scores, bad_reasoning in ((np.zeros(batch.shape), None), (np.zeros((2, len(ground_truth))), empty)):
+        try:
+            evaluator.score_batch(bad_scores, bad_reasoning)
+            print("Error: scores without reasoning or a sample axis should be rejected")
+            return False
+        except ValueError:
+            pass
+    print("✓ Validity from reasoning and masks, and shape checks")
+
+    print("\n=== Test completed successfully ===")
+    return True
+
+
+if __name__ == "__main__":
+    success = test_mfq_batch()
+    if not success:
+        print("\nTest failed with errors.")
+        exit(1)
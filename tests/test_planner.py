@@ -0,0 +1,109 @@
+# tests/test_planner.py
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from morals.instruments.mfq import MoralFoundationsQuestionnaire
+from morals.instruments.wvs import WorldValuesSurveyInstrument
+from morals.instruments.dilemmas import MoralDilemmasInstrument
+from morals.llm.cache import ResponseCache
+from morals.llm.dilemmas_prompt_formatter import DilemmasPromptFormatter
+from morals.llm.tokens import count_tokens
+from morals.planner import RunPlanner, format_plan
+
+MODEL = "claude-3-7-sonnet-20250219"
+
+
+def test_planner():
+    """Test dry-run planning of calls, tokens, cost and wall-clock time."""
+    print("=== MORALS Dry-Run Planner Test ===")
+
+    data_dir = project_root / "data" / "instruments"
+
+    # 1. Plan the full instrument set
+    print("\n1. Planning the full instrument set...")
+    start = time.perf_counter()
+    mfq = MoralFoundationsQuestionnaire(data_path=str(data_dir / "mfq.json"))
+    wvs = WorldValuesSurveyInstrument(data_path=str(data_dir / "wvs.json"))
+    dilemmas = MoralDilemmasInstrument(data_path=str(data_dir / "dilemmas.json"))
+    planner = RunPlanner(mfq=mfq, wvs=wvs, dilemmas=dilemmas, concurrency=4)
+    questions = {
+        "mfq": planner.select_mfq(),
+        "wvs": planner.select_wvs(),
+        "dilemmas": planner.select_dilemmas()
+    }
+    plan = planner.plan([MODEL, "gpt-4o"], questions)
+    elapsed = time.perf_counter() - start
+
+    if elapsed >= 1.0:
+        print(f"Error: planning took {elapsed:.2f}s")
+        return False
+    expected_calls = len(mfq.get_all_questions()) + len(wvs.get_all_questions()) + len(dilemmas.get_all_questions())
+    if plan["totals"][MODEL]["calls"] != expected_calls or len(plan["rows"]) != 6:
+        print(f"Error: expected {expected_calls} calls per model, got {plan['totals'][MODEL]['calls']}")
+        return False
+    dilemma_row = next(row for row in plan["rows"] if row["model"] == MODEL and row["instrument"] == "dilemmas")
+    if dilemma_row["max_output_tokens"] != 1500 * dilemma_row["calls"] or dilemma_row["cost_usd"] is None:
+        print(f"Error: unexpected dilemmas estimate: {dilemma_row}")
+        return False
+    print(f"✓ Planned {expected_calls} calls per model in {elapsed * 1000:.0f}ms")
+    print(format_plan(plan))
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # 2. Output tokens come from earlier results when available
+        print("\n2. Estimating output tokens from history...")
+        response = "Score (0-5): 4\nReasoning: Harm matters."
+        history_dir = Path(tmp_dir) / "results"
+        (history_dir / "mfq").mkdir(parents=True)
+        for question_id in ("care_r1", "care_r2"):
+            with open(history_dir / "mfq" / f"{question_id}_{MODEL}.json", 'w') as f:
+                json.dump({"question_id": question_id, "raw_response": response}, f)
+
+        history_planner = RunPlanner(mfq=mfq, history_dir=str(history_dir))
+        row = history_planner.plan([MODEL], {"mfq": history_planner.select_mfq()})["rows"][0]
+        if row["output_source"] != "history" or row["output_tokens"] != row["calls"] * count_tokens(response):
+            print(f"Error: history not used for output tokens: {row}")
+            return False
+        print(f"✓ Estimated {row['output_tokens']} output tokens from history")
+
+        # 3. Cached calls and resumed results are not planned
+        print("\n3. Skipping cached and saved calls...")
+        cache = ResponseCache(str(Path(tmp_dir) / "cache"))
+        question = planner.select_dilemmas(["Dilemma_I"], max_questions=1)[0]
+        prompt = DilemmasPromptFormatter.format_prompt(question)
+        cache.put(cache.make_key(MODEL, prompt, {"max_tokens": 1500}), "cached response")
+
+        skip_planner = RunPlanner(dilemmas=dilemmas, mfq=mfq, cache=cache,
+                                  history_dir=str(history_dir), resume=True)
+        skip_plan = skip_planner.plan([MODEL], {"dilemmas": skip_planner.select_dilemmas(),
+                                                "mfq": skip_planner.select_mfq()})
+        skipped = {row["instrument"]: row["skipped"] for row in skip_plan["rows"]}
+        if skipped != {"dilemmas": 1, "mfq": 2}:
+            print(f"Error: unexpected skipped calls: {skipped}")
+            return False
+        print("✓ Cached and saved calls are skipped")
+
+    # 4. Rate limits bound the wall-clock projection
+    print("\n4. Projecting wall-clock under rate limits...")
+    limited = RunPlanner(mfq=mfq, concurrency=32, requests_per_minute=10)
+    total = limited.plan([MODEL], {"mfq": limited.select_mfq()})["totals"][MODEL]
+    if total["bound"] != "rpm" or abs(total["wall_clock_seconds"] - (total["calls"] - 10) * 6.0) > 1e-9:
+        print(f"Error: unexpected rate-limited projection: {total}")
+        return False
+    print(f"✓ Projected {total['wall_clock_seconds']:.0f}s, bound by requests per minute")
+
+    print("\n=== Test completed successfully ===")
+    return True
+
+
+if __name__ == "__main__":
+    success = test_planner()
+    if not success:
+        print("\nTest failed with errors.")
+        exit(1)
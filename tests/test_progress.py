@@ -0,0 +1,92 @@
+# tests/test_progress.py
+import asyncio
+import io
+import sys
+import urllib.request
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from morals.instruments.mfq import MoralFoundationsQuestionnaire
+from morals.llm.base import LLMInterface
+from morals.pipeline import MoralEvaluationPipeline
+from morals.progress import ProgressTracker, TerminalProgressReporter, PrometheusExporter
+
+
+class FixedResponseLLM(LLMInterface):
+    """LLM stub that answers every MFQ prompt with the same well-formed response."""
+
+    def __init__(self):
+        super().__init__("fixed-response-model")
+
+    async def generate_response(self, prompt: str, **kwargs) -> str:
+        await asyncio.sleep(0.001)
+        return "Score (0-5): 4\nReasoning: This consideration matters a great deal to moral judgment."
+
+
+async def test_progress():
+    """Test progress tracking, terminal reporting and the Prometheus endpoint."""
+    print("=== MORALS Progress Reporting Test ===")
+
+    data_path = project_root / "data" / "instruments" / "mfq.json"
+    mfq = MoralFoundationsQuestionnaire(data_path=str(data_path))
+
+    tracker = ProgressTracker()
+    events = []
+    tracker.add_observer(lambda event, metrics: events.append((event, metrics["queued"])))
+
+    pipeline = MoralEvaluationPipeline(llm=FixedResponseLLM(), mfq=mfq, progress=tracker)
+
+    # 1. Run a small evaluation with a terminal reporter attached
+    print("\n1. Running evaluation with progress tracking...")
+    stream = io.StringIO()
+    with TerminalProgressReporter(tracker, interval=0.01, stream=stream):
+        await pipeline.evaluate_all_mfq_foundations(max_questions_per_foundation=2)
+
+    metrics = tracker.snapshot()[("mfq", "fixed-response-model")]
+    expected = 2 * len(mfq.foundations)
+    if metrics["completed"] != expected or metrics["failed"] != 0:
+        print(f"Error: expected {expected} completed questions, got {metrics['completed']}")
+        return False
+    if metrics["queued"] != 0 or metrics["in_flight"] != 0 or metrics["eta_seconds"] != 0.0:
+        print(f"Error: queue not drained: {metrics}")
+        return False
+    if metrics["latency_p50"] is None or metrics["input_tokens"] <= 0:
+        print(f"Error: latency or token metrics missing: {metrics}")
+        return False
+    print(f"✓ {metrics['completed']} questions completed at {metrics['requests_per_sec']:.1f} req/s")
+
+    # The whole run is queued before the first question starts
+    first_started = next(i for i, (event, _) in enumerate(events) if event == "started")
+    if events[first_started][1] != expected - 1:
+        print(f"Error: run was not queued up front: {events[:first_started + 1]}")
+        return False
+    print(f"✓ Observer received {len(events)} events")
+
+    if "[mfq/fixed-response-model]" not in stream.getvalue():
+        print("Error: terminal reporter printed nothing")
+        return False
+    print(f"✓ Terminal line: {tracker.format_line()}")
+
+    # 2. Serve metrics over HTTP
+    print("\n2. Testing Prometheus endpoint...")
+    with PrometheusExporter(tracker, port=0) as exporter:
+        url = f"http://127.0.0.1:{exporter.port}/metrics"
+        body = urllib.request.urlopen(url, timeout=5).read().decode("utf-8")
+    line = f'morals_questions_completed_total{{instrument="mfq",model="fixed-response-model"}} {expected}'
+    if line not in body or 'quantile="0.99"' not in body:
+        print(f"Error: unexpected metrics body:\n{body}")
+        return False
+    print("✓ Prometheus endpoint served metrics")
+
+    print("\n=== Test completed successfully ===")
+    return True
+
+
+if __name__ == "__main__":
+    success = asyncio.run(test_progress())
+    if not success:
+        print("\nTest failed with errors.")
+        exit(1)
@@ -0,0 +1,115 @@
+# tests/test_prompts.py
+import asyncio
+import sys
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from morals.instruments.loader import load_instruments
+from morals.llm import prompts as prompts_module
+from morals.llm.base import LLMInterface
+from morals.llm.prompt_formatter import MFQPromptFormatter
+from morals.llm.prompts import compiled_prompts, render_prompt
+from morals.llm.tokens import count_tokens
+from morals.pipeline import MoralEvaluationPipeline
+from morals.planner import RunPlanner
+
+
+class EchoLLM(LLMInterface):
+    """LLM stub that records the prompts it receives."""
+
+    def __init__(self):
+        super().__init__("echo-model")
+        self.prompts = []
+
+    async def generate_response(self, prompt: str, **kwargs) -> str:
+        self.prompts.append(prompt)
+        return "Score (0-5): 3\nReasoning: It depends on the harm done."
+
+
+async def test_prompts():
+    """Test prompts compiled once per instrument and template version."""
+    print("=== MORALS Prompt Compilation Test ===")
+
+    data_dir = str(project_root / "data" / "instruments")
+    instruments = load_instruments(["mfq", "wvs", "dilemmas"], data_dir)
+
+    # 1. Compiled prompts match the formatters
+    print("\n1. Compiling every prompt...")
+    for name, instrument in instruments.items():
+        compiled = compiled_prompts(name, instrument)
+        for question in instrument.get_all_questions():
+            prompt = compiled.get(question)
+            if prompt.text != render_prompt(name, question) or prompt.tokens != count_tokens(prompt.text):
+                print(f"Error: compiled prompt of {name} question {question['id']} differs")
+                return False
+            if compiled.get(question) is not prompt:
+                print("Error: prompt was compiled twice")
+                return False
+    if compiled_prompts("mfq", instruments["mfq"]) is not compiled_prompts("mfq", instruments["mfq"]):
+        print("Error: compiled prompts are not shared")
+        return False
+    print(f"✓ {sum(len(i.get_all_questions()) for i in instruments.values())} prompts compiled once each")
+
+    # 2. Fingerprints are stable across loads and track the template version
+    print("\n2. Checking fingerprints...")
+    reloaded = load_instruments(["mfq"], data_dir)["mfq"]
+    fingerprint = compiled_prompts("mfq", instruments["mfq"]).fingerprint()
+    if compiled_prompts("mfq", reloaded).fingerprint() != fingerprint:
+        print("Error: fingerprint changed between loads of the same instrument")
+        return False
+    original_version = prompts_module.TEMPLATE_VERSION
+    prompts_module.TEMPLATE_VERSION = "test"
+    try:
+        bumped = compiled_prompts("mfq", load_instruments(["mfq"], data_dir)["mfq"]).fingerprint()
+    finally:
+        prompts_module.TEMPLATE_VERSION = original_version
+    if bumped == fingerprint:
+        print("Error: fingerprint ignored the template version")
+        return False
+    print(f"✓ Fingerprint {fingerprint[:12]} is stable and changes with the template version")
+
+    # 3. The pipeline and planner reuse the compiled prompts
+    print("\n3. Running the pipeline on compiled prompts...")
+    calls = []
+    original_format = MFQPromptFormatter.format_prompt
+
+    def counting_format(question):
+        calls.append(question["id"])
+        return original_format(question)
+
+    mfq = load_instruments(["mfq"], data_dir)["mfq"]
+    MFQPromptFormatter.format_prompt = staticmethod(counting_format)
+    try:
+        llm = EchoLLM()
+        pipeline = MoralEvaluationPipeline(llm=llm, mfq=mfq)
+        question = mfq.get_questions_by_foundation("care")[0]
+        first = await pipeline.evaluate_mfq_question(question["id"])
+        second = await pipeline.evaluate_mfq_question(question["id"], repeat=1)
+        planner = RunPlanner(mfq=mfq)
+        plan = planner.plan(["echo-model"], {"mfq": [question]})
+    finally:
+        MFQPromptFormatter.format_prompt = staticmethod(original_format)
+    prompt = compiled_prompts("mfq", mfq).get(question)
+    if calls != [question["id"]] or llm.prompts != [prompt.text, prompt.text]:
+        print(f"Error: the prompt was rendered {len(calls)} times")
+        return False
+    if first["prompt_sha256"] != prompt.sha256 or second["prompt_sha256"] != prompt.sha256:
+        print("Error: results do not carry the prompt hash")
+        return False
+    if plan["rows"][0]["input_tokens"] != prompt.tokens:
+        print("Error: planner did not use the compiled token count")
+        return False
+    print("✓ Pipeline, repeats and planner share one rendering of the prompt")
+
+    print("\n=== Test completed successfully ===")
+    return True
+
+
+if __name__ == "__main__":
+    success = asyncio.run(test_prompts())
+    if not success:
+        print("\nTest failed with errors.")
+        exit(1)
@@ -0,0 +1,113 @@
+# tests/test_sampling.py
+import asyncio
+import sys
+import tempfile
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from morals.instruments.mfq import MoralFoundationsQuestionnaire
+from morals.llm.base import LLMInterface
+from morals.merge import ShardMerger
+from morals.pipeline import MoralEvaluationPipeline
+from morals.sampling import SequentialSampling
+from morals.sharding import ShardSpec
+
+
+class StableLLM(LLMInterface):
+    """LLM stub that always gives the same answer, counting the calls it receives."""
+
+    def __init__(self):
+        super().__init__("stable-model")
+        self.calls = 0
+
+    async def generate_response(self, prompt: str, **kwargs) -> str:
+        self.calls += 1
+        return "Score (0-5): 4\nReasoning: Harm and fairness matter to moral judgment."
+
+
+async def test_sampling():
+    """Test adaptive sequential sampling and its stopping decisions."""
+    print("=== MORALS Adaptive Sampling Test ===")
+
+    mfq = MoralFoundationsQuestionnaire(data_path=str(project_root / "data" / "instruments" / "mfq.json"))
+    question_count = len(mfq.get_questions_by_foundation("care"))
+
+    # 1. A stable model converges before its samples run out
+    print("\n1. Sampling a stable model...")
+    llm = StableLLM()
+    pipeline = MoralEvaluationPipeline(llm=llm, mfq=mfq, concurrency=4)
+    sampling = SequentialSampling(target_width=0.5, round_size=question_count, repeats=5)
+    result = await pipeline.evaluate_mfq_foundation("care", sampling=sampling)
+    decision = result["sampling"]
+    if decision["stop_reason"] != "converged" or decision["samples"] >= question_count * 5:
+        print(f"Error: expected early convergence, got {decision}")
+        return False
+    if llm.calls != decision["samples"] or len(result["question_results"]) != decision["samples"]:
+        print(f"Error: {llm.calls} calls for {decision['samples']} samples")
+        return False
+    print(f"✓ Converged after {decision['samples']} of {question_count * 5} samples "
+          f"(CI width {decision['ci_width']:.3f})")
+
+    # 2. Budget and exhaustion stops
+    print("\n2. Checking budget and exhaustion stops...")
+    tight = SequentialSampling(target_width=1e-9, round_size=4, budget=10, repeats=3)
+    result = await MoralEvaluationPipeline(llm=StableLLM(), mfq=mfq).evaluate_mfq_foundation("care", sampling=tight)
+    if result["sampling"]["stop_reason"] != "budget" or result["sampling"]["samples"] != 10:
+        print(f"Error: expected a budget stop after 10 samples, got {result['sampling']}")
+        return False
+    exhaustive = SequentialSampling(target_width=1e-9, round_size=4)
+    result = await MoralEvaluationPipeline(llm=StableLLM(), mfq=mfq).evaluate_all_mfq_foundations(
+        sampling=exhaustive)
+    decisions = result["sampling"]
+    if set(decisions) != set(mfq.get_foundation_names()) or \
+            any(d["stop_reason"] != "exhausted" or d["rounds"] != 2 for d in decisions.values()):
+        print(f"Error: expected every foundation to be exhausted in 2 rounds, got {decisions}")
+        return False
+    print("✓ Budget and exhausted question pools stop sampling")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # 3. Repeats are saved separately and reused when resuming
+        print("\n3. Saving and resuming repeated samples...")
+        repeats = SequentialSampling(target_width=1e-9, round_size=5, budget=question_count + 3, repeats=2)
+        pipeline = MoralEvaluationPipeline(llm=StableLLM(), mfq=mfq, output_dir=tmp_dir)
+        first = await pipeline.evaluate_mfq_foundation("care", sampling=repeats)
+        repeat_files = list((Path(tmp_dir) / "mfq").glob("*~1_stable-model.json"))
+        if len(repeat_files) != 3:
+            print(f"Error: expected 3 repeated sample files, found {len(repeat_files)}")
+            return False
+        llm = StableLLM()
+        resumed = await MoralEvaluationPipeline(llm=llm, mfq=mfq, output_dir=tmp_dir,
+                                                resume=True).evaluate_mfq_foundation("care", sampling=repeats)
+        if llm.calls != 0 or resumed["sampling"] != first["sampling"]:
+            print(f"Error: resuming made {llm.calls} calls or changed the decision")
+            return False
+        print("✓ Repeats are saved under their own IDs and reused when resuming")
+
+    # 4. Adaptive results are not sharded or merged
+    print("\n4. Rejecting sharded adaptive runs...")
+    try:
+        await pipeline.evaluate_mfq_foundation("care", shard=ShardSpec(0, 2), sampling=sampling)
+        print("Error: sharded adaptive run was accepted")
+        return False
+    except ValueError:
+        pass
+    try:
+        ShardMerger(mfq=mfq).merge([first])
+        print("Error: adaptive result was merged")
+        return False
+    except ValueError:
+        pass
+    print("✓ Adaptive sampling rejects sharding and merging")
+
+    print("\n=== Test completed successfully ===")
+    return True
+
+
+if __name__ == "__main__":
+    success = asyncio.run(test_sampling())
+    if not success:
+        print("\nTest failed with errors.")
+        exit(1)
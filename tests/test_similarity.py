@@ -0,0 +1,111 @@
+# tests/test_similarity.py
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+# Add the project root to the Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from morals.evaluation.dilemmas_evaluator import DilemmasEvaluator
+from morals.evaluation.similarity import TfidfSimilarity
+from morals.instruments.loader import load_instruments
+
+RESPONSE = """
+No, Joe should not simply refuse his father. First, the promise his father made matters, because
+breaking it damages trust. However, family members should support each other, so Joe could talk
+with his father and look for a compromise that respects both of them.
+"""
+
+
+def test_similarity():
+    """Test the fit-once TF-IDF similarity model behind dilemma scoring."""
+    print("=== MORALS Similarity Model Test ===")
+
+    dilemmas = load_instruments(["dilemmas"], str(project_root / "data" / "instruments"))["dilemmas"]
+    evaluator = DilemmasEvaluator(dilemmas)
+    question = dilemmas.get_all_questions()[0]
+    question_id = dilemmas.get_shard_key(question)
+    ground_truth = question["ground_truth"]
+
+    # 1. The model is fitted once, on the ground-truth corpus
+    print("\n1. Fitting on the ground truth...")
+    fits = []
+    original_fit = TfidfVectorizer.fit_transform
+
+    def counting_fit(self, *args, **kwargs):
+        fits.append(1)
+        return original_fit(self, *args, **kwargs)
+
+    TfidfVectorizer.fit_transform = counting_fit
+    try:
+        first = evaluator.evaluate_response(question_id, RESPONSE)
+        for other in dilemmas.get_all_questions():
+            evaluator.evaluate_response(dilemmas.get_shard_key(other), RESPONSE)
+    finally:
+        TfidfVectorizer.fit_transform = original_fit
+    if len(fits) != 1:
+        print(f"Error: the vectorizer was fitted {len(fits)} times")
+        return False
+    model = evaluator.similarity_model
+    if model.similarity(ground_truth["expected_response"], ground_truth["expected_response"]) < 0.999:
+        print("Error: a reference text is not similar to itself")
+        return False
+    print(f"✓ One fit over {model.dimensions} terms scored {len(dilemmas.get_all_questions()) + 1} responses")
+
+    # 2. Response vectors match the fitted TfidfVectorizer
+    print("\n2. Checking vectors and scores...")
+    texts = [RESPONSE, "", "zzz qqq", ground_truth["expected_response"]]
+    if not np.allclose(model.transform(texts).toarray(), model.vectorizer.transform(texts).toarray()):
+        print("Error: response vectors differ from TfidfVectorizer.transform")
+        return False
+    expected = 0.3 * first["semantic_similarity"] + 0.5 * first["criteria_satisfaction"] + 0.2 * first["reasoning_score"]
+    if abs(first["overall_score"] - expected) > 1e-9 or not 0 < first["semantic_similarity"] <= 1:
+        print("Error: unexpected scores")
+        return False
+    if abs(first["semantic_similarity"] - model.similarity(RESPONSE.strip(), ground_truth["expected_response"])) > 1e-12:
+        print("Error: semantic similarity differs from the model's")
+        return False
+    empty = TfidfSimilarity([])
+    if empty.similarity("a text", "a reference") != 0.0 or evaluator.evaluate_response(question_id, "")["overall_score"]:
+        print("Error: empty inputs should score 0")
+        return False
+    print(f"✓ Semantic similarity {first['semantic_similarity']:.3f}, overall {first['overall_score']:.3f}")
+
+    # 3. Scoring no longer pays for a fit per pair of texts
+    print("\n3. Timing...")
+    start = time.perf_counter()
+    for _ in range(100):
+        evaluator.evaluate_response(question_id, RESPONSE)
+    per_response = (time.perf_counter() - start) * 10
+    if per_response > 20:
+        print(f"Error: {per_response:.1f} ms per response")
+        return False
+    print(f"✓ {per_response:.2f} ms per response")
+
+    # 4. Batches score like single responses
+    print("\n4. Scoring in batches...")
+    responses = [(dilemmas.get_shard_key(other), text) for other in dilemmas.get_all_questions()
+                 for text in (RESPONSE, "", ground_truth["expected_response"])]
+    single = [evaluator.evaluate_response(other_id, text) for other_id, text in responses]
+    if evaluator.evaluate_responses(responses) != single or \
+            evaluator.evaluate_responses(responses[::-1], batch_size=7) != single[::-1]:
+        print("Error: batch results differ from evaluate_response")
+        return False
+    if evaluator.evaluate_responses([]) != []:
+        print("Error: an empty batch should give no results")
+        return False
+    print(f"✓ {len(responses)} batched results equal evaluate_response's")
+
+    print("\n=== Test completed successfully ===")
+    return True
+
+
+if __name__ == "__main__":
+    success = test_similarity()
+    if not success:
+        print("\nTest failed with errors.")
+        exit(1)
@@ -0,0 +1,137 @@
+# tests/test_streaming.py
+import json
+import os
+import sys
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from morals.instruments.compiled import CompiledInstrumentCache
+from morals.instruments.loader import load_instruments
+from morals.instruments.streaming import LazyField, stream_load
+from morals.instruments.wvs import WorldValuesSurveyInstrument
+
+
+def make_heavy_wvs_data(domain_count: int, questions_per_domain: int, samples: int):
+    """Synthetic WVS item bank with large ground-truth payloads."""
+    return {
+        "metadata": {"name": "Synthetic WVS"},
+        "domains": {
+            f"domain_{d}": {
+                "name": f"Domain {d}",
+                "description": f"Synthetic domain {d}",
+                "questions": [{
+                    "id": f"D{d}_Q{q}",
+                    "prompt": f"Question {q} of domain {d}",
+                    "category": ("importance", "agreement")[q % 2],
+                    "ground_truth": {
+                        "mean_score": 2.5,
+                        "std_dev": 0.5,
+                        "sample_valid_responses": [f"Sample response {s} to question {q}, with [brackets] and {{braces}}"
+                                                   for s in range(samples)]
+                    }
+                } for q in range(questions_per_domain)]
+            } for d in range(domain_count)
+        }
+    }
+
+
+def test_streaming():
+    """Test incremental instrument loading with ground truth left on disk."""
+    print("=== MORALS Streaming Loader Test ===")
+
+    data_dir = project_root / "data" / "instruments"
+
+    # 1. Streamed instruments match eagerly loaded ones
+    print("\n1. Streaming the bundled instruments...")
+    names = ["mfq", "wvs", "dilemmas"]
+    eager = load_instruments(names, str(data_dir))
+    streamed = load_instruments(names, str(data_dir), stream=True)
+    for name in names:
+        if streamed[name].get_all_questions() != eager[name].get_all_questions():
+            print(f"Error: streamed {name} questions differ from the eager ones")
+            return False
+    raw = streamed["wvs"].domains[next(iter(streamed["wvs"].domains))]["questions"][0]
+    if type(raw["ground_truth"]) is not LazyField:
+        print("Error: ground truth was loaded instead of being left on disk")
+        return False
+    print("✓ Streamed questions match, with ground truth left on disk")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # 2. The parser handles the whole JSON grammar
+        print("\n2. Parsing tricky JSON...")
+        tricky = {
+            "metadata": {"name": "Tricky \"quoted\" name", "unicode": "é ✓  ", "escapes": "tab\tnew\nline\\"},
+            "numbers": [0, -1, 2.5, 1e3, -4.25E-2, 12345678901234567890],
+            "literals": [True, False, None, [], {}],
+            "ground_truth": {"text": "} ] { [ \" still a string", "nested": [[{"ground_truth": 1}]]}
+        }
+        tricky_path = Path(tmp_dir) / "tricky.json"
+        tricky_path.write_text(json.dumps(tricky, indent=2, ensure_ascii=False), encoding="utf-8")
+        parsed = stream_load(str(tricky_path), ("ground_truth",))
+        lazy = parsed.pop("ground_truth")
+        if parsed != {key: value for key, value in tricky.items() if key != "ground_truth"} or \
+                lazy.load() != tricky["ground_truth"]:
+            print(f"Error: parsed {parsed} differs from the source")
+            return False
+        bad_path = Path(tmp_dir) / "bad.json"
+        bad_path.write_text('{"metadata": {"name": "x"}, "ground_truth": [1, 2', encoding="utf-8")
+        try:
+            stream_load(str(bad_path), ("ground_truth",))
+            print("Error: truncated JSON was accepted")
+            return False
+        except ValueError:
+            pass
+        print("✓ Escapes, unicode, numbers, literals and errors are handled")
+
+        # 3. Memory scales with the index, not the ground truth
+        print("\n3. Comparing peak memory on a large item bank...")
+        large_path = Path(tmp_dir) / "large_wvs.json"
+        large_path.write_text(json.dumps(make_heavy_wvs_data(20, 100, 200)), encoding="utf-8")
+        peaks = {}
+        for stream in (False, True):
+            tracemalloc.start()
+            instrument = WorldValuesSurveyInstrument(data_path=str(large_path), stream=stream)
+            peaks[stream] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        question = instrument.get_question_by_id("D3_Q7")
+        if len(question["ground_truth"]["sample_valid_responses"]) != 200:
+            print("Error: lazy ground truth was not read back")
+            return False
+        if peaks[True] * 5 > peaks[False]:
+            print(f"Error: streaming peaked at {peaks[True]} bytes, eager loading at {peaks[False]}")
+            return False
+        print(f"✓ {os.path.getsize(large_path) // 1024} KB file: eager peak {peaks[False] // 1024} KB, "
+              f"streamed peak {peaks[True] // 1024} KB")
+
+        # 4. Compiled streamed instruments and edited files
+        print("\n4. Compiling streamed instruments and editing their source...")
+        cache = CompiledInstrumentCache(str(Path(tmp_dir) / "compiled"))
+        cache.load(WorldValuesSurveyInstrument, str(large_path), stream=True)
+        compiled = cache.load(WorldValuesSurveyInstrument, str(large_path), stream=True)
+        if compiled.get_question_by_id("D3_Q7") != question:
+            print("Error: compiled streamed instrument differs")
+            return False
+        with open(large_path, 'a', encoding='utf-8') as f:
+            f.write("\n")
+        try:
+            question["ground_truth"]
+            print("Error: ground truth was read from an edited file")
+            return False
+        except ValueError:
+            pass
+        print("✓ Lazy fields survive compilation and refuse to read edited files")
+
+    print("\n=== Test completed successfully ===")
+    return True
+
+
+if __name__ == "__main__":
+    success = test_streaming()
+    if not success:
+        print("\nTest failed with errors.")
+        exit(1)
@@ -0,0 +1,84 @@
+# tests/test_synthetic.py
+import asyncio
+import sys
+import tempfile
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from morals.cli.generate import main as generate_main
+from morals.instruments.loader import load_instruments
+from morals.instruments.synthetic import generate_instruments
+from morals.llm.factory import LLMFactory
+from morals.llm.mock import MockInterface
+from morals.pipeline import MoralEvaluationPipeline
+
+
+async def test_synthetic():
+    """Test the synthetic instrument generator and the mock LLM."""
+    print("=== MORALS Synthetic Instrument Test ===")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # 1. Generated files are valid instruments of the requested size
+        print("\n1. Generating instruments...")
+        paths = generate_instruments(str(Path(tmp_dir) / "a"), 237, seed=7)
+        instruments = load_instruments(["mfq", "wvs", "dilemmas"], str(Path(tmp_dir) / "a"))
+        counts = {name: len(instrument.get_all_questions()) for name, instrument in instruments.items()}
+        if counts != {"mfq": 237, "wvs": 237, "dilemmas": 237}:
+            print(f"Error: unexpected question counts {counts}")
+            return False
+        streamed = load_instruments(["wvs"], str(Path(tmp_dir) / "a"), stream=True)["wvs"]
+        if streamed.get_all_questions() != instruments["wvs"].get_all_questions():
+            print("Error: streamed synthetic WVS differs")
+            return False
+        print(f"✓ {counts} questions load, validate and stream")
+
+        # 2. Generation is deterministic per seed
+        print("\n2. Checking determinism...")
+        same = generate_instruments(str(Path(tmp_dir) / "b"), 237, seed=7)
+        other = generate_instruments(str(Path(tmp_dir) / "c"), 237, seed=8)
+        for name, path in paths.items():
+            if path.read_bytes() != same[name].read_bytes() or path.read_bytes() == other[name].read_bytes():
+                print(f"Error: {name} generation is not deterministic per seed")
+                return False
+        if generate_main(["--questions", "10", "--output", str(Path(tmp_dir) / "cli")]) != 0:
+            print("Error: generate CLI failed")
+            return False
+        print("✓ The same seed writes the same files")
+
+        # 3. The mock LLM answers every instrument in a parsable format
+        print("\n3. Evaluating with the mock LLM...")
+        llm = LLMFactory.create("mock")
+        pipeline = MoralEvaluationPipeline(llm=llm, concurrency=8, **instruments)
+        results = await asyncio.gather(
+            *[pipeline.evaluate_mfq_question(q["id"]) for q in instruments["mfq"].get_all_questions()[:20]],
+            *[pipeline.evaluate_wvs_question(q["id"]) for q in instruments["wvs"].get_all_questions()[:20]],
+            *[pipeline.evaluate_dilemma_question(q["dilemma_id"], q["id"])
+              for q in instruments["dilemmas"].get_all_questions()[:3]])
+        if not all(result["is_valid_response"] for result in results[:40]) or \
+                any(result.get("overall_score") is None for result in results[40:]):
+            print("Error: mock responses were not scored")
+            return False
+        repeat = await MoralEvaluationPipeline(llm=MockInterface(), mfq=instruments["mfq"]).evaluate_mfq_question(
+            results[0]["question_id"])
+        if repeat["raw_response"] != results[0]["raw_response"]:
+            print("Error: mock responses are not deterministic")
+            return False
+        invalid = await MoralEvaluationPipeline(llm=MockInterface(invalid_rate=1.0),
+                                                mfq=instruments["mfq"]).evaluate_mfq_question(results[0]["question_id"])
+        if invalid["is_valid_response"]:
+            print("Error: invalid_rate=1 produced a valid response")
+            return False
+        print(f"✓ {llm.calls} mock calls scored, reproducibly")
+
+    print("\n=== Test completed successfully ===")
+    return True
+
+
+if __name__ == "__main__":
+    success = asyncio.run(test_synthetic())
+    if not success:
+        print("\nTest failed with errors.")
+        exit(1)
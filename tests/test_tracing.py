@@ -0,0 +1,111 @@
+# tests/test_tracing.py
+import asyncio
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from morals.instruments.wvs import WorldValuesSurveyInstrument
+from morals.llm.base import LLMInterface
+from morals.pipeline import MoralEvaluationPipeline
+from morals.tracing import Tracer
+
+
+class FixedResponseLLM(LLMInterface):
+    """LLM stub that answers every WVS prompt with the same well-formed response."""
+
+    def __init__(self):
+        super().__init__("fixed-response-model")
+
+    async def generate_response(self, prompt: str, **kwargs) -> str:
+        return "Score (1-4): 2\nReasoning: Social support and family relationships shape wellbeing."
+
+
+async def test_tracing():
+    """Test span instrumentation of the pipeline and OTLP JSON export."""
+    print("=== MORALS Tracing Test ===")
+
+    data_path = project_root / "data" / "instruments" / "wvs.json"
+    wvs = WorldValuesSurveyInstrument(data_path=str(data_path))
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        trace_path = Path(tmp_dir) / "traces.jsonl"
+        tracer = Tracer(export_path=str(trace_path))
+        pipeline = MoralEvaluationPipeline(llm=FixedResponseLLM(), wvs=wvs,
+                                           output_dir=str(Path(tmp_dir) / "results"), tracer=tracer)
+
+        # 1. Evaluate a domain with tracing enabled
+        print("\n1. Evaluating a traced domain...")
+        await pipeline.evaluate_wvs_domain("core_values", max_questions=2)
+        span_count = tracer.export()
+        print(f"✓ Exported {span_count} spans")
+
+        document = json.loads(trace_path.read_text().splitlines()[0])
+
+    spans = document["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    by_id = {span["spanId"]: span for span in spans}
+    names = [span["name"] for span in spans]
+
+    # 2. Check the span tree
+    print("\n2. Checking span hierarchy...")
+    expected_stages = ["wvs.domain", "wvs.question", "prompt.format", "llm.call",
+                       "response.evaluate", "response.process", "result.save", "aggregate"]
+    for stage in expected_stages:
+        if stage not in names:
+            print(f"Error: missing span {stage} in {names}")
+            return False
+
+    roots = [span for span in spans if "parentSpanId" not in span]
+    if len(roots) != 1 or roots[0]["name"] != "wvs.domain":
+        print(f"Error: expected a single wvs.domain root span, got {[r['name'] for r in roots]}")
+        return False
+
+    if len({span["traceId"] for span in spans}) != 1:
+        print("Error: spans belong to different traces")
+        return False
+
+    for span in spans:
+        parent = by_id.get(span.get("parentSpanId"))
+        if span["name"] == "response.process" and parent["name"] != "response.evaluate":
+            print(f"Error: response.process parented to {parent['name']}")
+            return False
+        if span["name"] == "llm.call" and parent["name"] != "wvs.question":
+            print(f"Error: llm.call parented to {parent['name']}")
+            return False
+    print("✓ Parent/child relationships are correct")
+
+    # 3. Check attributes
+    question_span = next(span for span in spans if span["name"] == "wvs.question")
+    attributes = {a["key"]: a["value"] for a in question_span["attributes"]}
+    if attributes.get("question_id") != {"stringValue": "cv_1"} or "model" not in attributes:
+        print(f"Error: unexpected question attributes {attributes}")
+        return False
+
+    call_span = next(span for span in spans if span["name"] == "llm.call")
+    call_attributes = {a["key"]: a["value"] for a in call_span["attributes"]}
+    if "intValue" not in call_attributes.get("output_tokens", {}):
+        print(f"Error: token attributes missing from llm.call: {call_attributes}")
+        return False
+    print("✓ Span attributes recorded")
+
+    # 4. Disabled tracing records nothing
+    untraced = MoralEvaluationPipeline(llm=FixedResponseLLM(), wvs=wvs)
+    await untraced.evaluate_wvs_question("cv_1")
+    if untraced.tracer.enabled:
+        print("Error: tracing should be disabled by default")
+        return False
+    print("✓ Tracing is disabled by default")
+
+    print("\n=== Test completed successfully ===")
+    return True
+
+
+if __name__ == "__main__":
+    success = asyncio.run(test_tracing())
+    if not success:
+        print("\nTest failed with errors.")
+        exit(1)
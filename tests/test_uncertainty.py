@@ -0,0 +1,156 @@
+# tests/test_uncertainty.py
+import json
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+# Add the project root to the Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from morals.cli.main import main as cli_main
+from morals.cli.stats import main as stats_main
+from morals.uncertainty import Resampler, bootstrap_intervals, collect_samples, compare_models
+
+FOUNDATIONS = ["care", "fairness", "loyalty", "authority", "sanctity"]
+
+
+def make_rows(rng, models, questions):
+    """Question rows of MFQ and WVS results, with alignment rising with the model index."""
+    rows = []
+    for index, model in enumerate(models):
+        for question in range(questions):
+            rows.append({"instrument": "mfq", "model": model, "foundation": FOUNDATIONS[question % 5],
+                         "is_valid_response": rng.random() > 0.05,
+                         "alignment": min(1.0, max(0.0, rng.gauss(0.5 + 0.1 * index, 0.1)))})
+            rows.append({"instrument": "wvs", "model": model, "domain": f"domain_{question % 4}",
+                         "is_valid_response": True, "alignment": rng.random(), "reasoning_quality": None})
+    return rows
+
+
+def test_uncertainty():
+    """Test bootstrap intervals and permutation tests."""
+    print("=== MORALS Uncertainty Test ===")
+    rng = random.Random(0)
+
+    # 1. Scores are grouped by instrument, group and model, counting valid responses only
+    print("\n1. Collecting samples...")
+    rows = make_rows(rng, ["a", "b", "c"], 100)
+    samples = collect_samples(rows, ["alignment", "reasoning_quality"])
+    overall = samples[("mfq", None, None, "alignment")]
+    valid = [row["alignment"] for row in rows if row["instrument"] == "mfq" and row["model"] == "a"
+             and row["is_valid_response"]]
+    if overall["a"].tolist() != valid or ("mfq", "foundation", "care", "alignment") not in samples:
+        print("Error: unexpected samples")
+        return False
+    if any(key[3] == "reasoning_quality" for key in samples):
+        print("Error: missing values were collected")
+        return False
+    print(f"✓ {len(samples)} groups collected")
+
+    # 2. Bootstrap resamples are the means of resampled values, and intervals contain the mean
+    print("\n2. Computing bootstrap intervals...")
+    resampler = Resampler(500, seed=1)
+    values = np.array([0.1, 0.4, 0.35, 0.8, 0.6, 0.2, 0.9])
+    counts = resampler.weights(len(values)) * len(values)
+    if not np.allclose(counts, np.round(counts)) or not np.allclose(counts.sum(axis=1), len(values)):
+        print("Error: bootstrap weights are not resample counts")
+        return False
+    intervals = bootstrap_intervals(samples, 0.95, resampler)
+    if len(intervals) != sum(len(by_model) for by_model in samples.values()):
+        print("Error: missing intervals")
+        return False
+    for interval in intervals:
+        if not interval["ci_lower"] <= interval["mean"] <= interval["ci_upper"]:
+            print(f"Error: interval does not contain the mean: {interval}")
+            return False
+    narrow = bootstrap_intervals({("mfq", None, None, "alignment"): {"a": np.full(50, 0.7)}})[0]
+    if not np.isclose(narrow["ci_lower"], narrow["ci_upper"]):
+        print("Error: constant scores should give an empty interval")
+        return False
+    print(f"✓ {len(intervals)} intervals")
+
+    # 3. Permutation tests separate different models and not identical ones
+    print("\n3. Comparing models...")
+    comparisons = compare_models(samples, Resampler(999, seed=2))
+    by_pair = {(c["instrument"], c["group"], c["model_a"], c["model_b"]): c for c in comparisons
+               if c["metric"] == "alignment"}
+    if by_pair[("mfq", None, "a", "c")]["p_value"] > 0.01 or by_pair[("mfq", None, "a", "c")]["difference"] >= 0:
+        print("Error: clearly different models were not separated")
+        return False
+    same = compare_models({("mfq", None, None, "alignment"): {"a": values, "b": values.copy()}})[0]
+    if same["p_value"] < 0.9:
+        print(f"Error: identical models got p = {same['p_value']}")
+        return False
+    print(f"✓ {len(comparisons)} model comparisons")
+
+    # 4. Dozens of models and thousands of results take seconds
+    print("\n4. Scaling to many models...")
+    start = time.perf_counter()
+    rows = make_rows(rng, [f"model_{index}" for index in range(25)], 200)
+    samples = collect_samples(rows)
+    intervals = bootstrap_intervals(samples)
+    comparisons = compare_models(samples)
+    elapsed = time.perf_counter() - start
+    if elapsed > 10:
+        print(f"Error: {len(rows)} results took {elapsed:.1f}s")
+        return False
+    print(f"✓ {len(intervals)} intervals and {len(comparisons)} comparisons from {len(rows)} results "
+          f"in {elapsed:.2f}s")
+
+    # 5. Hundreds of model pairs with different numbers of valid results stay fast and small
+    print("\n5. Comparing models with unequal sample sizes...")
+    np_rng = np.random.default_rng(3)
+    samples = {("mfq", None, None, "alignment"): {f"model_{index}": np_rng.random(150 + 13 * index)
+                                                  for index in range(30)}}
+    total = sum(len(values) for values in samples[("mfq", None, None, "alignment")].values())
+    tracemalloc.start()
+    start = time.perf_counter()
+    comparisons = compare_models(samples)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    if len(comparisons) != 435 or elapsed > 10 or peak > 100 * 2 ** 20:
+        print(f"Error: {len(comparisons)} comparisons of {total} results took {elapsed:.1f}s "
+              f"and {peak / 2 ** 20:.0f} MB")
+        return False
+    print(f"✓ {len(comparisons)} comparisons of {total} results in {elapsed:.2f}s, "
+          f"peaking at {peak / 2 ** 20:.0f} MB")
+
+    # 6. The CLI reports on saved results of several models
+    print("\n6. Running the CLI...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        results_dirs = []
+        for model in ("mock-a", "mock-b"):
+            results_dir = str(Path(tmp_dir) / model)
+            code = cli_main(["--instrument", "mfq", "--provider", "mock", "--model", model, "--limit", "10",
+                             "--output-dir", results_dir])
+            if code != 0:
+                print("Error: the pipeline run failed")
+                return False
+            results_dirs.append(results_dir)
+        output = Path(tmp_dir) / "stats.json"
+        if stats_main(results_dirs + ["--output", str(output)]) != 0:
+            print("Error: the statistics tool failed")
+            return False
+        with open(output, 'r', encoding='utf-8') as f:
+            report = json.load(f)
+        if not report["intervals"] or not any(c["model_a"] == "mock-a" for c in report["comparisons"]):
+            print("Error: unexpected report")
+            return False
+    print(f"✓ {len(report['intervals'])} intervals and {len(report['comparisons'])} comparisons written")
+
+    print("\n=== Test completed successfully ===")
+    return True
+
+
+if __name__ == "__main__":
+    success = test_uncertainty()
+    if not success:
+        print("\nTest failed with errors.")
+        exit(1)
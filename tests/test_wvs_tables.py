@@ -0,0 +1,123 @@
+# tests/test_wvs_tables.py
+import random
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Add the project root to the Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from morals.evaluation.wvs_evaluator import WVSEvaluator
+from morals.evaluation.wvs_tables import WVSQuestionTable, metrics_from_arrays
+from morals.instruments.wvs import WorldValuesSurveyInstrument
+
+
+def reference_metrics(ground_truth, score):
+    """Score metrics computed directly from the ground truth."""
+    mean = ground_truth.get("mean_score")
+    std = ground_truth.get("std_dev", 0.0)
+    distribution = ground_truth.get("population_distribution", {})
+    if score is None or mean is None:
+        return {}
+    metrics = {"absolute_distance": abs(score - mean), "normalized_distance": abs(score - mean) / 3.0}
+    if std > 0:
+        metrics["z_score"] = (score - mean) / std
+    if distribution:
+        cumulative = sum(distribution.get(str(s), 0.0) for s in range(1, score + 1))
+        bucket = distribution.get(str(score), 0.0)
+        metrics["percentile"] = (cumulative - bucket / 2) * 100 if bucket > 0 else cumulative * 100
+    return metrics
+
+
+def random_instrument(rng, count):
+    """WVS instrument whose questions have random, partly missing ground truth."""
+    questions = []
+    for index in range(count):
+        ground_truth = {}
+        if rng.random() < 0.8:
+            ground_truth["mean_score"] = round(rng.uniform(1, 4), 2)
+        if rng.random() < 0.8:
+            ground_truth["std_dev"] = rng.choice([0.0, round(rng.uniform(0, 1), 2)])
+        if rng.random() < 0.8:
+            ground_truth["acceptable_range"] = rng.choice([[1, 2], [2, 4], [3], []])
+        if rng.random() < 0.8:
+            ground_truth["population_distribution"] = {str(s): rng.random() for s in rng.sample(range(0, 6), 3)}
+        ground_truth["expected_reasoning_elements"] = rng.sample(["Role of family", "Work ethic", "Tradition"], 2)
+        questions.append({"id": f"q{index}", "prompt": "Prompt", "ground_truth": ground_truth})
+    return WorldValuesSurveyInstrument(data={
+        "metadata": {},
+        "domains": {"values": {"name": "Values", "description": "Random values", "questions": questions}}
+    })
+
+
+def test_wvs_tables():
+    """Test precomputed WVS scoring tables and batch scoring."""
+    print("=== MORALS WVS Scoring Tables Test ===")
+    rng = random.Random(0)
+    wvs = random_instrument(rng, 200)
+    evaluator = WVSEvaluator(wvs)
+
+    # 1. A question's table gives the metrics computed from its ground truth
+    print("\n1. Scoring with question tables...")
+    for question in wvs.get_all_questions():
+        table = evaluator.scoring_tables.get(question)
+        for score in (None, 0, 1, 2, 3, 4, 5):
+            if table.score_metrics(score) != reference_metrics(question["ground_truth"], score):
+                print(f"Error: metrics of score {score} for question {question['id']}")
+                return False
+    if evaluator.scoring_tables.get(wvs.get_question_by_id("q0")) is not \
+            evaluator.scoring_tables.get(wvs.get_question_by_id("q0")):
+        print("Error: the table of a question was compiled again")
+        return False
+    table = WVSQuestionTable({"acceptable_range": [2, 3], "expected_reasoning_elements": ["Importance of family"]})
+    if not table.in_acceptable_range(2) or table.in_acceptable_range(4) or table.in_acceptable_range(None):
+        print("Error: unexpected acceptable range checks")
+        return False
+    if table.elements.analyze("FAMILY first")["elements_found"] != ["Importance of family"]:
+        print("Error: key terms of an element were not matched")
+        return False
+    print("✓ Table metrics match the ground truth for every question and score")
+
+    # 2. Arrays of scores are scored at once with the same metrics
+    print("\n2. Scoring arrays of scores...")
+    question_ids = [f"q{rng.randrange(200)}" for _ in range(2000)]
+    scores = [rng.choice([None, 0, 1, 2, 3, 4, 5]) for _ in question_ids]
+    arrays = evaluator.scoring_tables.score_metrics(question_ids, scores)
+    expected = [reference_metrics(wvs.get_question_by_id(question_id)["ground_truth"], score)
+                for question_id, score in zip(question_ids, scores)]
+    if metrics_from_arrays(arrays) != expected:
+        print("Error: array metrics differ from the question tables")
+        return False
+    in_range = [evaluator.scoring_tables.get(wvs.get_question_by_id(question_id)).in_acceptable_range(score)
+                for question_id, score in zip(question_ids, scores)]
+    if not np.array_equal(arrays["in_acceptable_range"], in_range):
+        print("Error: unexpected acceptable range checks")
+        return False
+    print(f"✓ {len(scores)} scores scored as arrays")
+
+    # 3. Batch evaluation gives the results of evaluate_response
+    print("\n3. Evaluating responses in batches...")
+    responses = [(f"q{rng.randrange(200)}",
+                  rng.choice(["No score here", f"Score (1-4): {rng.randint(1, 4)}\nReasoning: Family tradition matters",
+                              f"Score: {rng.randint(1, 4)}"]))
+                 for _ in range(500)]
+    batch = evaluator.evaluate_responses(responses)
+    if batch != [evaluator.evaluate_response(question_id, text) for question_id, text in responses]:
+        print("Error: batch results differ from evaluate_response")
+        return False
+    if evaluator.evaluate_responses([]) != []:
+        print("Error: an empty batch should give no results")
+        return False
+    print(f"✓ {len(batch)} responses evaluated in one batch")
+
+    print("\n=== Test completed successfully ===")
+    return True
+
+
+if __name__ == "__main__":
+    success = test_wvs_tables()
+    if not success:
+        print("\nTest failed with errors.")
+        exit(1)